@@ -1,16 +1,38 @@
 from flask import (Flask, render_template, request, make_response,
-                   redirect, url_for, Response, session, jsonify)
+                   redirect, url_for, Response, session, jsonify, g,
+                   has_request_context)
 import requests
-from datetime import datetime, timedelta
-from collections import defaultdict
+from requests.adapters import HTTPAdapter
+import httpx
+from a2wsgi import WSGIMiddleware
+from werkzeug.http import http_date, parse_date, parse_etags, quote_etag
+import numpy as np
+from datetime import datetime, timedelta, timezone
+from collections import defaultdict, OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 import os
+import base64
+import hashlib
+import bisect
 import csv
 import io
+import json
 import logging
+import mimetypes
 import threading
 import time
+import re
 import secrets
+import socket
+import sqlite3
 from functools import wraps
+from contextlib import contextmanager
+import asyncio
+import gzip
+try:
+    import brotli          # optional: br variants of cached pages when installed
+except ImportError:
+    brotli = None
 
 app = Flask(__name__)
 
@@ -28,97 +50,2441 @@ app.secret_key  = os.environ.get('FLASK_SECRET_KEY', 'bd-dev-secret-change-in-pr
 logging.basicConfig(level=logging.WARNING)
 log = logging.getLogger(__name__)
 
+# ─────────────────────────────────────────────────────────────
+# GAS CLIENT  (one pooled keep-alive session for every Apps Script call)
+# ─────────────────────────────────────────────────────────────
+_GAS_POOL_SIZE   = int(os.environ.get('GAS_POOL_SIZE', 20))
+_GAS_MAX_RETRIES = int(os.environ.get('GAS_MAX_RETRIES', 2))
+_GAS_RETRY_PAUSE = 0.25  # seconds, doubled on each retry
+
+# Default timeout per action (seconds), used when the call site passes none;
+# an explicit GAS_TIMEOUTS='{"get_menu": 20}' env override beats both. A
+# `cap` (e.g. what's left of the request's deadline) always bounds the wait.
+_GAS_TIMEOUT_DEFAULT = 10
+_GAS_TIMEOUTS = {
+    'get_all_companies':    25,
+    'get_corporate_orders': 20,
+    'get_all_orders':       20,
+    'get_menu':             15,
+    'create_magic_token':   15,
+    'lease_order_ids':      15,
+    'submit_corporate_cart': 20,
+}
+try:
+    _GAS_TIMEOUT_OVERRIDES = json.loads(os.environ.get('GAS_TIMEOUTS', '') or '{}')
+except ValueError:
+    _GAS_TIMEOUT_OVERRIDES = {}
+
+# Actions that never change sheet data — safe to retry after a read timeout
+# or a 5xx. Writes are only retried when the connection itself failed, i.e.
+# before GAS could have seen the request.
+_GAS_READ_ACTIONS = {
+    'get_bookings', 'get_company', 'get_all_companies', 'get_employee_by_email',
+    'get_employees', 'get_company_pin', 'get_week_order_counts',
+    'get_orders_by_employee', 'get_corporate_orders', 'get_menu',
+    'get_profile_data', 'get_all_orders', 'get_blocked_dates',
+    'get_invoices', 'get_all_invoices', 'verify_company_pin',
+}
+_GAS_GET_ACTIONS = {'get_bookings'}   # served by doGet rather than doPost
+
+_gas_session = requests.Session()
+_gas_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=_GAS_POOL_SIZE)
+_gas_session.mount('https://', _gas_adapter)
+_gas_session.mount('http://', _gas_adapter)
+
+_gas_stats      = defaultdict(lambda: {'calls': 0, 'errors': 0, 'retries': 0,
+                                       'total_ms': 0.0, 'max_ms': 0.0})
+_gas_stats_lock = threading.Lock()
+
+
+def _gas_timeout(action, timeout=None):
+    if action in _GAS_TIMEOUT_OVERRIDES:
+        return float(_GAS_TIMEOUT_OVERRIDES[action])
+    if timeout is not None:
+        return timeout
+    return _GAS_TIMEOUTS.get(action, _GAS_TIMEOUT_DEFAULT)
+
+
+def _gas_attempt_timeout(timeout, ends):
+    """Timeout for the next attempt given an absolute deadline (monotonic), or
+    None once it has passed."""
+    if ends is None:
+        return timeout
+    left = ends - time.monotonic()
+    return min(timeout, left) if left > 0 else None
+
+
+def _gas_is_read(payload, method):
+    """True when a call can't change sheet data — retried after a read
+    timeout or a 5xx, where a write is only retried when the connection
+    itself failed. A batch counts when every call in it is a read."""
+    action = payload.get('action', '')
+    return method == 'GET' or action in _GAS_READ_ACTIONS or (
+        action == 'batch' and all(c.get('action') in _GAS_READ_ACTIONS for c in payload['calls']))
+
+
+def _record_gas_call(action, started, ok, retries):
+    ms = (time.perf_counter() - started) * 1000
+    with _gas_stats_lock:
+        s = _gas_stats[action]
+        s['calls']    += 1
+        s['errors']   += 0 if ok else 1
+        s['retries']  += retries
+        s['total_ms'] += ms
+        s['max_ms']    = max(s['max_ms'], ms)
+
+
+def _gas_fetch(payload, method='POST', timeout=None, text=False, cap=None):
+    """One Apps Script round trip over the pooled session.
+
+    Returns (status_code, parsed_json). Raises requests exceptions (and
+    ValueError for non-JSON bodies, unless text is set — then a non-JSON
+    body comes back as the raw string) after bounded retries. With `cap`,
+    attempts and retries together end within cap seconds.
+    """
+    action  = payload.get('action', '')
+    timeout = _gas_timeout(action, timeout)
+    ends    = None if cap is None else time.monotonic() + cap
+    is_read = _gas_is_read(payload, method)
+    started = time.perf_counter()
+    attempt = 0
+    wait    = _gas_attempt_timeout(timeout, ends) or 0.001
+    while True:
+        try:
+            if method == 'GET':
+                r = _gas_session.get(GOOGLE_SCRIPT_URL, params=payload, timeout=wait)
+            else:
+                r = _gas_session.post(GOOGLE_SCRIPT_URL, json=payload, timeout=wait)
+            if r.status_code >= 500 and is_read and attempt < _GAS_MAX_RETRIES:
+                raise requests.HTTPError(f'GAS {r.status_code}', response=r)
+            try:
+                data = r.json()
+            except ValueError:
+                if not text:
+                    raise
+                data = r.text
+        except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as ex:
+            retryable = is_read or isinstance(ex, requests.ConnectTimeout)
+            pause     = _GAS_RETRY_PAUSE * (2 ** attempt)
+            wait      = _gas_attempt_timeout(timeout, None if ends is None else ends - pause)
+            if retryable and attempt < _GAS_MAX_RETRIES and wait:
+                time.sleep(pause)
+                attempt += 1
+                continue
+            _record_gas_call(action, started, False, attempt)
+            raise
+        except Exception:
+            _record_gas_call(action, started, False, attempt)
+            raise
+        _record_gas_call(action, started, True, attempt)
+        return r.status_code, data
+
+
+# ─────────────────────────────────────────────────────────────
+# SINGLE-FLIGHT  (identical concurrent reads share one upstream call)
+# ─────────────────────────────────────────────────────────────
+_inflight       = {}   # key → {done: Event, result, error}
+_inflight_lock  = threading.Lock()
+_inflight_stats = {'upstream': 0, 'collapsed': 0}
+
+
+def _single_flight(key, fn):
+    """Run fn() once per key at a time; concurrent callers get the leader's result."""
+    with _inflight_lock:
+        call = _inflight.get(key)
+        leader = call is None
+        if leader:
+            call = _inflight[key] = {'done': threading.Event(), 'result': None, 'error': None}
+            _inflight_stats['upstream'] += 1
+        else:
+            _inflight_stats['collapsed'] += 1
+    if not leader:
+        call['done'].wait()
+        if call['error'] is not None:
+            raise call['error']
+        return call['result']
+    try:
+        call['result'] = fn()
+        return call['result']
+    except Exception as ex:
+        call['error'] = ex
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+        call['done'].set()
+
+
+# ─────────────────────────────────────────────────────────────
+# GAS READ CACHE  (LRU + per-action TTL, invalidated by writes)
+# ─────────────────────────────────────────────────────────────
+_GAS_CACHE_MAX  = int(os.environ.get('GAS_CACHE_MAX', 512))
+_GAS_CACHE_TTLS = {
+    'get_menu':               600,
+    'get_company':            600,
+    'get_all_companies':      300,
+    'get_bookings':            60,
+    'get_blocked_dates':       60,
+    'get_all_orders':          60,
+    'get_invoices':            60,
+    'get_all_invoices':        60,
+    'get_employees':           60,
+    'get_company_pin':         60,
+    'get_corporate_orders':    30,
+    'get_profile_data':        30,
+    'get_week_order_counts':   30,
+    'get_orders_by_employee':  30,
+}
+try:
+    _GAS_CACHE_TTLS.update(json.loads(os.environ.get('GAS_CACHE_TTLS', '') or '{}'))
+except ValueError:
+    pass
+
+_CORP_READS = {'get_corporate_orders', 'get_week_order_counts', 'get_orders_by_employee'}
+_GAS_INVALIDATES = {
+    'submit_corporate_order': _CORP_READS,
+    'submit_corporate_cart':  _CORP_READS,
+    'swap_order_meal':        _CORP_READS,
+    'update_employee_email':  _CORP_READS | {'get_employees'},
+    'register_employee':      {'get_employees'},
+    'remove_employee':        {'get_employees'},
+    'update_company_pin':     {'get_company_pin'},
+    'save_company':           {'get_company', 'get_all_companies'},
+    'book_principal':         {'get_bookings', 'get_profile_data'},
+    'update_booking':         {'get_bookings', 'get_profile_data'},
+    'submit_teacher_order':   {'get_all_orders', 'get_profile_data'},
+    'toggle_block_date':      {'get_blocked_dates'},
+    'update_invoice_status':  {'get_invoices', 'get_all_invoices'},
+    'generate_invoice':       {'get_invoices', 'get_all_invoices'},
+    # Saved through the menu builder's own script; see refresh_menus()
+    'save_menu_state':        {'get_menu'},
+}
+
+_gas_cache       = OrderedDict()   # key → {action, status, data, ts}
+_gas_cache_gen   = defaultdict(int)  # action → bumped on every invalidation
+_gas_cache_lock  = threading.Lock()
+_gas_cache_stats = {'hits': 0, 'shared_hits': 0, 'misses': 0, 'evictions': 0,
+                    'invalidations': 0}
+
+
+def _gas_cache_key(payload, method):
+    return method + ' ' + json.dumps(payload, sort_keys=True, default=str)
+
+
+def _gas_invalidate(action, payload=None):
+    """Drop every cached read that a write action can change."""
+    reads = _GAS_INVALIDATES.get(action)
+    if not reads:
+        return
+    with _gas_cache_lock:
+        for read in reads:
+            _gas_cache_gen[read] += 1
+        stale = [k for k, e in _gas_cache.items() if e['action'] in reads]
+        for k in stale:
+            del _gas_cache[k]
+        _gas_cache_stats['invalidations'] += len(stale)
+    _replica_mark_dirty(action, reads)
+    if _SHARED_CACHE and reads & _SHARED_GAS_ACTIONS:
+        _shared_drop_actions(reads & _SHARED_GAS_ACTIONS)
+    if action == 'save_company' and payload:
+        _company_saved(payload)
+
+
+def _gas_cache_forget(*payloads):
+    """Drop the cached answers to these reads (both tiers), so the next call
+    goes to GAS — for refreshes that must not re-serve what they replace."""
+    keys = [_gas_cache_key(p, 'GET' if p.get('action') in _GAS_GET_ACTIONS else 'POST')
+            for p in payloads]
+    with _gas_cache_lock:
+        for k in keys:
+            _gas_cache.pop(k, None)
+    if _SHARED_CACHE:
+        db = _local_db()
+        for k in keys:
+            db.execute('DELETE FROM shared_cache WHERE key = ?', ('gas:' + k,))
+
+
+def _gas_call(payload, method='POST', timeout=None, text=False, cap=None):
+    """Cached GAS round trip. Returns (status_code, data); raises like _gas_fetch.
+
+    Cached responses are shared between requests — treat them as read-only.
+    """
+    action = payload.get('action', '')
+    ttl    = _GAS_CACHE_TTLS.get(action)
+    key    = _gas_cache_key(payload, method)
+    fetch  = lambda: _gas_fetch(payload, method=method, timeout=timeout, text=text, cap=cap)
+    if not ttl:
+        if method == 'GET' or action in _GAS_READ_ACTIONS:
+            return _single_flight(key, fetch)
+        try:
+            return fetch()
+        finally:
+            # Invalidate even on timeout — GAS may still have applied the write.
+            _gas_invalidate(action, payload)
+
+    hit, gen = _gas_cache_lookup(key, action, ttl)
+    if gen is None:
+        return 200, hit
+
+    # Generation in the key: reads that start after a write never join a
+    # flight that began before it.
+    status, data = _single_flight(f'{key}#{gen}', fetch)
+    if status == 200:
+        _gas_cache_put(key, action, gen, data)
+    return status, data
+
+
+def _gas_cache_lookup(key, action, ttl):
+    """(data, None) on a fresh hit (local or shared tier), else (None, gen)
+    where gen is the generation a fetched response must be stored under."""
+    with _gas_cache_lock:
+        entry = _gas_cache.get(key)
+        if entry and time.time() - entry['ts'] < ttl:
+            _gas_cache.move_to_end(key)
+            _gas_cache_stats['hits'] += 1
+            return entry['data'], None
+        _gas_cache_stats['misses'] += 1
+        gen = _gas_cache_gen[action]
+
+    if _SHARED_CACHE and action in _SHARED_GAS_ACTIONS:
+        hit = _shared_get('gas:' + key, max_age=ttl)
+        if hit:
+            _gas_cache_stats['shared_hits'] += 1
+            _gas_cache_store(key, action, gen, 200, hit[0], ts=hit[1])
+            return hit[0], None
+    return None, gen
+
+
+def _gas_cache_put(key, action, gen, data):
+    if _gas_cache_store(key, action, gen, 200, data) and _SHARED_CACHE \
+            and action in _SHARED_GAS_ACTIONS:
+        _shared_put('gas:' + key, data, action=action)
+
+
+def _gas_cache_store(key, action, gen, status, data, ts=None):
+    with _gas_cache_lock:
+        # A write invalidated this action while we were fetching — don't
+        # store a response that may predate it.
+        if _gas_cache_gen[action] != gen:
+            return False
+        _gas_cache[key] = {'action': action, 'status': status,
+                           'data': data, 'ts': ts or time.time()}
+        _gas_cache.move_to_end(key)
+        while len(_gas_cache) > _GAS_CACHE_MAX:
+            _gas_cache.popitem(last=False)
+            _gas_cache_stats['evictions'] += 1
+    return True
+
+
+def gas_client_stats():
+    """Snapshot of per-action latency, pool reuse, cache and coalescing counters."""
+    with _gas_stats_lock:
+        actions = {
+            a: {'calls': s['calls'], 'errors': s['errors'], 'retries': s['retries'],
+                'avg_ms': round(s['total_ms'] / s['calls'], 1) if s['calls'] else 0.0,
+                'max_ms': round(s['max_ms'], 1)}
+            for a, s in _gas_stats.items()
+        }
+    opened = served = 0
+    pools = _gas_adapter.poolmanager.pools
+    for key in pools.keys():
+        pool = pools.get(key)
+        opened += getattr(pool, 'num_connections', 0)
+        served += getattr(pool, 'num_requests', 0)
+    with _gas_cache_lock:
+        cache = dict(_gas_cache_stats, entries=len(_gas_cache), max_entries=_GAS_CACHE_MAX)
+    with _inflight_lock:
+        single_flight = dict(_inflight_stats, in_flight=len(_inflight))
+    with _gas_batch_lock:
+        batch = dict(_gas_batch_stats, disabled=_gas_batch_off_until > time.time())
+    return {
+        'pool': {'size': _GAS_POOL_SIZE, 'connections_opened': opened,
+                 'requests_sent': served, 'connections_reused': max(served - opened, 0)},
+        'cache': cache,
+        'single_flight': single_flight,
+        'batch': batch,
+        'fan_out': fan_out_stats(),
+        'async': dict(_async_stats),
+        'actions': actions,
+    }
+
+
+# ─────────────────────────────────────────────────────────────
+# GAS BATCHING  (several actions in one Apps Script round trip via the
+#                backend.gs 'batch' action — GAS's fixed per-request
+#                overhead is paid once per page instead of once per call)
+# ─────────────────────────────────────────────────────────────
+_GAS_BATCH_MAX     = int(os.environ.get('GAS_BATCH_MAX', 10))   # actions per round trip
+_GAS_BATCH_TIMEOUT = 60        # cap on the summed per-action timeouts (GAS runs them in order)
+_GAS_BATCH_RETRY   = 600       # seconds before retrying 'batch' on a script without it
+
+_gas_batch_off_until = 0.0
+_gas_batch_lock      = threading.Lock()
+_gas_batch_stats     = {'round_trips': 0, 'actions': 0, 'cache_hits': 0, 'fallbacks': 0}
+
+
+def _gas_batch(payloads, timeout=None):
+    """Run several GAS actions, paying for one round trip.
+
+    Reads are answered from the read cache where possible and the rest go
+    upstream together; fresh reads are cached like single calls and writes
+    invalidate like single calls. Returns each action's data in order, None
+    where it failed (the same contract as _gas_post / _gas_get). None
+    payloads are skipped.
+    """
+    results = [None] * len(payloads)
+    pending = OrderedDict()   # cache key → [payload, method, gen, result indexes]
+    for i, payload in enumerate(payloads):
+        if not payload:
+            continue
+        action = payload.get('action', '')
+        method = 'GET' if action in _GAS_GET_ACTIONS else 'POST'
+        key    = _gas_cache_key(payload, method)
+        if key in pending and action in _GAS_READ_ACTIONS:
+            pending[key][3].append(i)
+            continue
+        ttl = _GAS_CACHE_TTLS.get(action)
+        if ttl:
+            hit, gen = _gas_cache_lookup(key, action, ttl)
+            if gen is None:
+                results[i] = hit
+                with _gas_batch_lock:
+                    _gas_batch_stats['cache_hits'] += 1
+                continue
+        else:
+            gen = None
+        pending[key if key not in pending else f'{key}#{i}'] = [payload, method, gen, [i]]
+
+    calls  = list(pending.items())
+    budget = max(deadline_remaining(), 1.0) if has_request_context() else None
+    if len(calls) == 1 or (calls and time.time() < _gas_batch_off_until):
+        jobs = {key: (lambda c=c: _gas_batch_single(c, timeout, budget)) for key, c in calls}
+    else:
+        jobs = {start: (lambda chunk=calls[start:start + _GAS_BATCH_MAX]:
+                        _gas_batch_round_trip(chunk, timeout, budget))
+                for start in range(0, len(calls), _GAS_BATCH_MAX)}
+    for got in fan_out(jobs).values():
+        for i, data in got.items():
+            results[i] = data
+    return results
+
+
+def _gas_batch_single(call, timeout, budget=None):
+    payload, method, _, idx = call
+    # budget: never wait past the request's deadline
+    data = (_gas_get if method == 'GET' else _gas_post)(payload, timeout=timeout, cap=budget)
+    return {i: data for i in idx}
+
+
+def _gas_batch_round_trip(calls, timeout, budget=None):
+    """One 'batch' request for calls [(key, [payload, method, gen, idx])];
+    returns {result index: data} for the actions that succeeded."""
+    global _gas_batch_off_until
+    payloads = [c[1][0] for c in calls]
+    if timeout is None:
+        timeout = min(sum(_gas_timeout(p.get('action', '')) for p in payloads), _GAS_BATCH_TIMEOUT)
+    with _gas_batch_lock:
+        _gas_batch_stats['round_trips'] += 1
+        _gas_batch_stats['actions']     += len(payloads)
+    out, items = {}, None
+    try:
+        status, data = _gas_fetch({'action': 'batch', 'calls': payloads}, timeout=timeout, cap=budget)
+        if status == 200 and isinstance(data, dict) and isinstance(data.get('results'), list) \
+                and len(data['results']) == len(payloads):
+            items = data['results']
+        else:
+            log.warning('GAS batch: unexpected response (status %s)', status)
+    except ValueError:
+        # Non-JSON answer: a script deployed before 'batch' existed says
+        # "Error: Unknown Action" without running anything — replay the reads
+        # one by one. Writes are not replayed in case it did run them.
+        log.warning('GAS batch unsupported by the deployed script; plain calls for %ss',
+                    _GAS_BATCH_RETRY)
+        with _gas_batch_lock:
+            _gas_batch_off_until = time.time() + _GAS_BATCH_RETRY
+            _gas_batch_stats['fallbacks'] += 1
+        replay = {key: (lambda c=c: _gas_batch_single(c, None, budget)) for key, c in calls
+                  if c[1] == 'GET' or c[0].get('action') in _GAS_READ_ACTIONS}
+        for got in fan_out(replay).values():
+            out.update(got)
+    except Exception as ex:
+        log.warning('GAS batch error (%s): %s', ', '.join(p.get('action', '?') for p in payloads), ex)
+    finally:
+        # Invalidate even on failure — GAS may still have applied the writes.
+        for p in payloads:
+            if p.get('action') not in _GAS_READ_ACTIONS:
+                _gas_invalidate(p.get('action', ''), p)
+    if items is None:
+        return out
+    for (key, (payload, _, gen, idx)), item in zip(calls, items):
+        action = payload.get('action', '')
+        if not (isinstance(item, dict) and item.get('ok')):
+            log.warning('GAS batch action %s failed: %s', action,
+                        item.get('error') if isinstance(item, dict) else item)
+            continue
+        if gen is not None:
+            _gas_cache_put(key, action, gen, item.get('data'))
+        for i in idx:
+            out[i] = item.get('data')
+    return out
+
+
+def _gas_prefetch(*payloads):
+    """Warm the read cache for a page's GAS reads in one round trip, so the
+    helpers it calls next are cache hits. None entries (reads the replica
+    will serve) are skipped."""
+    _gas_batch(list(payloads))
+
+
+# ─────────────────────────────────────────────────────────────
+# FAN-OUT  (one bounded worker pool for the independent calls a request
+#           makes; results are collected up to the request's deadline)
+# ─────────────────────────────────────────────────────────────
+_FANOUT_WORKERS   = int(os.environ.get('FANOUT_WORKERS', 16))
+_REQUEST_DEADLINE = float(os.environ.get('REQUEST_DEADLINE_SECONDS', 25))
+
+_fanout_pool  = ThreadPoolExecutor(max_workers=_FANOUT_WORKERS, thread_name_prefix='fanout')
+_fanout_local = threading.local()   # .worker is True while a pool thread runs a task
+_fanout_lock  = threading.Lock()
+_fanout_stats = {'fan_outs': 0, 'tasks': 0, 'inline': 0, 'late': 0, 'cancelled': 0,
+                 'errors': 0}
+
+
+@app.before_request
+def _start_deadline():
+    g.deadline = time.monotonic() + _REQUEST_DEADLINE
+
+
+def deadline_remaining(cap=None):
+    """Seconds left before the current request's deadline (capped at `cap`)."""
+    deadline = g.get('deadline') if has_request_context() else None
+    left = _REQUEST_DEADLINE if deadline is None else max(deadline - time.monotonic(), 0.0)
+    return left if cap is None else min(left, cap)
+
+
+def _fanout_run(fn):
+    _fanout_local.worker = True
+    try:
+        return fn()
+    finally:
+        _fanout_local.worker = False
+
+
+def fan_out_submit(tasks):
+    """Start {name: zero-arg callable} on the shared pool; pass the returned
+    futures to fan_out_collect. From inside a pool task the callables run
+    inline instead (a bounded pool waiting on itself can deadlock)."""
+    with _fanout_lock:
+        _fanout_stats['fan_outs'] += 1
+        _fanout_stats['tasks']    += len(tasks)
+    if getattr(_fanout_local, 'worker', False):
+        with _fanout_lock:
+            _fanout_stats['inline'] += len(tasks)
+        return {name: _fanout_inline(name, fn) for name, fn in tasks.items()}
+    return {name: _fanout_pool.submit(_fanout_run, fn) for name, fn in tasks.items()}
+
+
+def _fanout_inline(name, fn):
+    future = Future()
+    try:
+        future.set_result(fn())
+    except Exception as ex:
+        future.set_exception(ex)
+    return future
+
+
+def fan_out_collect(futures, timeout=None):
+    """{name: result} for every task that finished by the request deadline
+    (or `timeout` seconds). Failed and late tasks are left out — callers
+    .get() with a default. Late tasks that haven't started are cancelled;
+    running ones finish in the background and their results are dropped."""
+    if timeout is None:
+        timeout = deadline_remaining()
+    done, _ = wait(futures.values(), timeout=timeout)
+    results = {}
+    for name, future in futures.items():
+        if future not in done:
+            cancelled = future.cancel()
+            with _fanout_lock:
+                _fanout_stats['late']      += 1
+                _fanout_stats['cancelled'] += int(cancelled)
+            log.warning('fan-out: %s missed the deadline%s', name, ' (cancelled)' if cancelled else '')
+            continue
+        try:
+            results[name] = future.result()
+        except Exception as ex:
+            with _fanout_lock:
+                _fanout_stats['errors'] += 1
+            log.warning('fan-out: %s failed: %s', name, ex)
+    return results
+
+
+def fan_out(tasks, timeout=None):
+    """Run independent calls concurrently; page latency is the slowest one,
+    bounded by the request deadline. See fan_out_collect for partial results.
+    A single task just runs on the caller's thread."""
+    if len(tasks) == 1:
+        (name, fn), = tasks.items()
+        return fan_out_collect({name: _fanout_inline(name, fn)}, timeout)
+    return fan_out_collect(fan_out_submit(tasks), timeout)
+
+
+def fan_out_stats():
+    with _fanout_lock:
+        return dict(_fanout_stats, workers=_FANOUT_WORKERS, deadline_seconds=_REQUEST_DEADLINE,
+                    queued=_fanout_pool._work_queue.qsize())
+
+# ─────────────────────────────────────────────────────────────
+# LOCAL SQLITE  (WAL file shared by every worker process on the host)
+# ─────────────────────────────────────────────────────────────
+_LOCAL_DB_PATH = os.environ.get(
+    'LOCAL_DB_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'betterday_local.db'))
+_LOCAL_DB_SCHEMA = []   # DDL statements; each feature appends its own tables
+_local_db_state  = threading.local()
+
+
+def _local_db():
+    """Per-thread autocommit connection to the local SQLite file."""
+    conn = getattr(_local_db_state, 'conn', None)
+    if conn is None:
+        conn = sqlite3.connect(_LOCAL_DB_PATH, timeout=10, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        for ddl in _LOCAL_DB_SCHEMA:
+            conn.execute(ddl)
+        _local_db_state.conn = conn
+    return conn
+
+
+# ─────────────────────────────────────────────────────────────
+# SHARED CACHE TIER  (SHARED_CACHE=1: workers on one host share company and
+#                     menu data; one leased worker talks to GAS for refreshes)
+# ─────────────────────────────────────────────────────────────
+_SHARED_CACHE       = os.environ.get('SHARED_CACHE', '').lower() in ('1', 'true', 'yes')
+_SHARED_GAS_ACTIONS = {'get_menu'}   # _gas_call reads these through the shared tier
+
+_LOCAL_DB_SCHEMA.append(
+    'CREATE TABLE IF NOT EXISTS shared_cache ('
+    ' key TEXT PRIMARY KEY, action TEXT, value TEXT NOT NULL, updated_at REAL NOT NULL)')
+_LOCAL_DB_SCHEMA.append(
+    'CREATE TABLE IF NOT EXISTS leases ('
+    ' name TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)')
+
+
+def _worker_id():
+    # Evaluated lazily: with a preloading server the pid changes after fork.
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def _shared_get(key, max_age=None):
+    """Return (value, updated_at) from the shared tier, or None if absent/too old."""
+    row = _local_db().execute('SELECT value, updated_at FROM shared_cache WHERE key = ?',
+                              (key,)).fetchone()
+    if not row or (max_age is not None and time.time() - row['updated_at'] >= max_age):
+        return None
+    return json.loads(row['value']), row['updated_at']
+
+
+def _shared_put(key, value, action=None, updated_at=None):
+    _local_db().execute(
+        'INSERT OR REPLACE INTO shared_cache (key, action, value, updated_at) VALUES (?, ?, ?, ?)',
+        (key, action, json.dumps(value), updated_at or time.time()))
+
+
+def _shared_drop_actions(actions):
+    db = _local_db()
+    for action in actions:
+        db.execute('DELETE FROM shared_cache WHERE action = ?', (action,))
+
+
+def _acquire_lease(name, ttl):
+    """Take or renew a named lease; True if this worker holds it for the next ttl seconds."""
+    now, me = time.time(), _worker_id()
+    cur = _local_db().execute(
+        'INSERT INTO leases (name, owner, expires_at) VALUES (?, ?, ?)'
+        ' ON CONFLICT(name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at'
+        ' WHERE leases.owner = excluded.owner OR leases.expires_at < ?',
+        (name, me, now + ttl, now))
+    return cur.rowcount == 1
+
+
 # ─────────────────────────────────────────────────────────────
 # MAGIC LINK TOKEN STORE  (Flask-side, bypasses GAS verify_magic_token)
+#   TOKEN_STORE=memory  one process, dict with amortized sweeping (default)
+#   TOKEN_STORE=sqlite  shared by all workers via the local SQLite file
 # ─────────────────────────────────────────────────────────────
-_token_store      = {}   # token → {email, company_id, created_at, used}
+_TOKEN_BACKEND    = os.environ.get('TOKEN_STORE', 'memory').lower()
+_token_store      = {}   # token → {email, company_id, created_at}; consumed tokens are removed
 _token_store_lock = threading.Lock()
-_TOKEN_TTL        = 900  # 15 minutes
+_TOKEN_TTL        = 900    # 15 minutes
+_TOKEN_MAX        = int(os.environ.get('TOKEN_STORE_MAX', 10000))
+_TOKEN_SWEEP_EVERY = 60    # seconds between expiry sweeps
+_token_last_sweep = 0.0
+
+_LOCAL_DB_SCHEMA.append(
+    'CREATE TABLE IF NOT EXISTS magic_tokens ('
+    ' token TEXT PRIMARY KEY, email TEXT NOT NULL, company_id TEXT NOT NULL,'
+    ' created_at REAL NOT NULL, used_at REAL)')
+
+
+def _sweep_tokens(now):
+    """Drop used/expired tokens and enforce the cap. Caller holds the lock (memory)."""
+    global _token_last_sweep
+    _token_last_sweep = now
+    cutoff = now - _TOKEN_TTL
+    if _TOKEN_BACKEND == 'sqlite':
+        db = _local_db()
+        db.execute('DELETE FROM magic_tokens WHERE created_at < ? OR used_at IS NOT NULL',
+                   (cutoff,))
+        db.execute('DELETE FROM magic_tokens WHERE token IN (SELECT token FROM magic_tokens'
+                   ' ORDER BY created_at DESC LIMIT -1 OFFSET ?)', (_TOKEN_MAX,))
+        return
+    for token in [t for t, e in _token_store.items() if e['created_at'] < cutoff]:
+        del _token_store[token]
+    # Dicts keep insertion order, so the first keys are the oldest tokens.
+    while len(_token_store) > _TOKEN_MAX:
+        del _token_store[next(iter(_token_store))]
+
+
+def _token_count():
+    """Tokens held by the active backend. Caller holds the lock (memory)."""
+    if _TOKEN_BACKEND == 'sqlite':
+        return _local_db().execute('SELECT COUNT(*) FROM magic_tokens').fetchone()[0]
+    return len(_token_store)
+
 
 def _store_magic_token(token, email, company_id):
+    now = time.time()
+    email, company_id = email.strip().lower(), company_id.strip().upper()
     with _token_store_lock:
-        _token_store[token] = {
-            'email': email.strip().lower(),
-            'company_id': company_id.strip().upper(),
-            'created_at': time.time(),
-            'used': False
-        }
+        if _TOKEN_BACKEND == 'sqlite':
+            _local_db().execute(
+                'INSERT OR REPLACE INTO magic_tokens (token, email, company_id, created_at)'
+                ' VALUES (?, ?, ?, ?)', (token, email, company_id, now))
+        else:
+            _token_store[token] = {
+                'email': email,
+                'company_id': company_id,
+                'created_at': now,
+            }
+        if now - _token_last_sweep > _TOKEN_SWEEP_EVERY or _token_count() > _TOKEN_MAX:
+            _sweep_tokens(now)
 
 def _verify_magic_token_flask(token):
     """Verify a magic link token stored by Flask. Returns (email, company_id) or None."""
+    now = time.time()
+    if _TOKEN_BACKEND == 'sqlite':
+        db = _local_db()
+        # Consume-once across processes: only one UPDATE can flip used_at.
+        cur = db.execute('UPDATE magic_tokens SET used_at = ? WHERE token = ?'
+                         ' AND used_at IS NULL AND created_at >= ?',
+                         (now, token, now - _TOKEN_TTL))
+        if cur.rowcount != 1:
+            return None
+        row = db.execute('SELECT email, company_id FROM magic_tokens WHERE token = ?',
+                         (token,)).fetchone()
+        return (row['email'], row['company_id']) if row else None
     with _token_store_lock:
-        entry = _token_store.get(token)
+        entry = _token_store.pop(token, None)
         if not entry:
             return None
-        if entry['used']:
+        if now - entry['created_at'] > _TOKEN_TTL:
             return None
-        if time.time() - entry['created_at'] > _TOKEN_TTL:
-            return None
-        entry['used'] = True
         return entry['email'], entry['company_id']
 
+
+def token_store_status():
+    with _token_store_lock:
+        count = _token_count()
+    return {'backend': _TOKEN_BACKEND, 'tokens': count, 'max': _TOKEN_MAX,
+            'last_sweep_age': round(time.time() - _token_last_sweep, 1) if _token_last_sweep else None}
+
+
 # ─────────────────────────────────────────────────────────────
 # COMPANY LOOKUP CACHE  (avoids GAS cold-start on every keystroke)
 # ─────────────────────────────────────────────────────────────
-_company_cache      = {}   # CompanyID.upper() → {data, ts}
+_company_cache      = OrderedDict()  # CompanyID.upper() → {data, ts[, stale]}, found only
+_company_misses     = OrderedDict()  # CompanyID.upper() → ts of a {found: false} answer
+_company_index      = []             # sorted (normalized token, CompanyID) for typeahead
 _company_cache_lock = threading.Lock()
-_COMPANY_TTL        = 600  # 10 minutes
+_COMPANY_TTL        = 600  # 10 minutes — after this, serve stale and refresh in background
+_COMPANY_REFRESH    = int(os.environ.get('COMPANY_REFRESH_SECONDS', 300))  # bulk refresh period
+_COMPANY_MAX        = int(os.environ.get('COMPANY_CACHE_MAX', 5000))
+_COMPANY_MISS_TTL   = 60     # mistyped codes are re-checked after a minute
+_COMPANY_MISS_MAX   = 1000
 _warmup_done        = False
+_warmup_lock        = threading.Lock()
+
+_company_refreshing = set()   # codes with a background refresh in progress
+_company_version    = 0       # bumped whenever the cached company table changes
+_company_table_tag  = (-1, None)   # (version, ETag) of the /api/companies list
+_company_status     = {'last_bulk_refresh': 0.0, 'last_bulk_attempt': 0.0,
+                       'last_bulk_error': '', 'bulk_refreshes': 0,
+                       'background_refreshes': 0, 'stale_served': 0,
+                       'shared_loads': 0, 'leader': False}
+
 
 @app.before_request
 def _startup_warmup():
+    _start_warmup()
+
+
+def _start_warmup():
     global _warmup_done
-    if not _warmup_done:
+    with _warmup_lock:
+        if _warmup_done:
+            return
         _warmup_done = True
-        threading.Thread(target=_warmup_gas, daemon=True).start()
+    threading.Thread(target=_warmup_gas, daemon=True).start()
+    threading.Thread(target=_submission_loop, daemon=True).start()
+    threading.Thread(target=_menu_prefetch_loop, daemon=True).start()
+    threading.Thread(target=_availability_loop, daemon=True).start()
+    if _REPLICA_SYNC_EVERY > 0:
+        threading.Thread(target=_replica_loop, daemon=True).start()
+
+
+def _fetch_company(code):
+    """Blocking single-company fetch; stores and returns the GAS result, or None."""
+    try:
+        _, result = _single_flight(
+            'company ' + code,
+            lambda: _gas_fetch({'action': 'get_company', 'company_id': code}, timeout=15))
+    except Exception as ex:
+        log.warning('company lookup error (%s): %s', code, ex)
+        return None
+    _store_company_result(code, result)
+    return result
+
+
+def _store_company_result(code, result):
+    found = isinstance(result, dict) and result.get('found') and result.get('company')
+    with _company_cache_lock:
+        if found:
+            _company_misses.pop(code, None)
+            _company_cache_put(code, {'data': result, 'ts': time.time()})
+        elif isinstance(result, dict) and result.get('found') is False:
+            _company_cache_drop(code)   # deleted from the sheet, or a save that didn't land
+            _company_misses[code] = time.time()
+            _company_misses.move_to_end(code)
+            while len(_company_misses) > _COMPANY_MISS_MAX:
+                _company_misses.popitem(last=False)
+
+
+def _company_cache_put(code, entry):
+    """Insert or replace one company and its index tokens. Caller holds the lock."""
+    global _company_version
+    _company_version += 1
+    _company_cache_drop(code)
+    _company_cache[code] = entry
+    _index_company(code, entry, add=True)
+    while len(_company_cache) > _COMPANY_MAX:
+        _company_cache_drop(next(iter(_company_cache)))
+
+
+def _company_cache_drop(code):
+    """Remove one company and its index tokens. Caller holds the lock."""
+    global _company_version
+    entry = _company_cache.pop(code, None)
+    if entry is not None:
+        _company_version += 1
+        _index_company(code, entry, add=False)
+
+
+def _company_saved(fields):
+    """save_company went out: list the code straight away (merging the saved
+    fields over what we had), marked stale so the next lookup confirms it
+    with GAS. Drops any earlier miss for a newly created code."""
+    code = str(fields.get('CompanyID', '')).strip().upper()
+    if not code:
+        return
+    with _company_cache_lock:
+        _company_misses.pop(code, None)
+        old     = _company_cache.get(code)
+        company = dict((old or {}).get('data', {}).get('company') or {})
+        company.update({k: v for k, v in fields.items() if k not in ('action', 'idempotency_key')})
+        _company_cache_put(code, {'data': {'found': True, 'company': company},
+                                  'ts': old['ts'] if old else time.time(), 'stale': True})
+
+
+def _refresh_company_async(code):
+    with _company_cache_lock:
+        if code in _company_refreshing:
+            return
+        _company_refreshing.add(code)
+        _company_status['background_refreshes'] += 1
+
+    def _run():
+        try:
+            _fetch_company(code)
+        finally:
+            with _company_cache_lock:
+                _company_refreshing.discard(code)
+    threading.Thread(target=_run, daemon=True).start()
 
 
 def _cached_get_company(company_id):
     code = company_id.strip().upper()
+    hit  = _company_cache_probe(code)
+    return hit if hit is not None else _fetch_company(code)
+
+
+def _company_cache_probe(code):
+    """The cached answer for a code — refreshing a stale entry behind the
+    caller — or None when it has to be fetched. Memory only."""
     with _company_cache_lock:
+        missed = _company_misses.get(code)
+        if missed and time.time() - missed < _COMPANY_MISS_TTL:
+            return {'found': False}
         entry = _company_cache.get(code)
-        if entry and time.time() - entry['ts'] < _COMPANY_TTL:
-            return entry['data']
-    result = None
+        if entry:
+            _company_cache.move_to_end(code)
+        if entry and not entry.get('stale'):
+            if time.time() - entry['ts'] < _COMPANY_TTL:
+                return entry['data']
+            _company_status['stale_served'] += 1
+    if entry and not entry.get('stale'):
+        # Stale-while-revalidate: answer now, refresh behind the caller.
+        _refresh_company_async(code)
+        return entry['data']
+    return None
+
+
+def _refresh_all_companies():
+    """Replace the whole company table from one get_all_companies call.
+
+    Returns the number of companies loaded, or 0 if the call failed.
+    """
+    _company_status['last_bulk_attempt'] = time.time()
     try:
-        r = requests.post(GOOGLE_SCRIPT_URL,
-                          json={'action': 'get_company', 'company_id': code},
-                          timeout=15)
-        result = r.json()
+        _, data = _single_flight(
+            'all companies',
+            lambda: _gas_fetch({'action': 'get_all_companies'}))
+        companies = data.get('companies') if isinstance(data, dict) else data
     except Exception as ex:
-        log.warning('company lookup error (%s): %s', code, ex)
-        return None
+        _company_status['last_bulk_error'] = str(ex)
+        log.warning('company bulk refresh error: %s', ex)
+        return 0
+    if not companies:
+        _company_status['last_bulk_error'] = 'empty company list'
+        return 0
+    now   = time.time()
+    count = _install_company_table(companies, now)
     with _company_cache_lock:
-        _company_cache[code] = {'data': result, 'ts': time.time()}
-    return result
+        _company_status.update(last_bulk_error='',
+                               bulk_refreshes=_company_status['bulk_refreshes'] + 1)
+    if _SHARED_CACHE:
+        _shared_put('companies', companies, updated_at=now)
+    log.info('Refreshed company cache: %d companies', count)
+    return count
+
+
+def _install_company_table(companies, ts):
+    global _company_version
+    table = {}
+    for c in companies:
+        cid = str(c.get('CompanyID', '')).strip().upper() if isinstance(c, dict) else ''
+        if cid:
+            table[cid] = {'data': {'found': True, 'company': c}, 'ts': ts}
+    with _company_cache_lock:
+        _company_version += 1
+        _company_cache.clear()
+        _company_cache.update(table)
+        _company_misses.clear()
+        _rebuild_company_index()
+        _company_status['last_bulk_refresh'] = ts
+    return len(table)
+
+
+def _load_shared_companies():
+    """Adopt the company table another worker published, if it is newer than ours."""
+    try:
+        hit = _shared_get('companies')
+    except sqlite3.Error as ex:
+        log.warning('shared company read error: %s', ex)
+        return False
+    if not hit or hit[1] <= _company_status['last_bulk_refresh']:
+        return False
+    _install_company_table(hit[0], hit[1])
+    _company_status['shared_loads'] += 1
+    return True
+
+
+def _normalize_company_token(text):
+    return re.sub(r'[^a-z0-9]', '', str(text or '').lower())
+
+
+def _company_tokens(cid, entry):
+    """Index entries for one company: its code, full name and each name word."""
+    name   = str((entry['data'].get('company') or {}).get('CompanyName') or '')
+    tokens = {_normalize_company_token(cid), _normalize_company_token(name)}
+    tokens.update(_normalize_company_token(word) for word in name.split())
+    return {(t, cid) for t in tokens if t}
+
+
+def _rebuild_company_index():
+    """Rebuild the typeahead index from the cached companies. Caller holds the lock."""
+    entries = set()
+    for cid, entry in _company_cache.items():
+        entries |= _company_tokens(cid, entry)
+    _company_index[:] = sorted(entries)
+
+
+def _index_company(cid, entry, add):
+    """Add or remove one company's index entries in place. Caller holds the lock."""
+    for token in _company_tokens(cid, entry):
+        i = bisect.bisect_left(_company_index, token)
+        present = i < len(_company_index) and _company_index[i] == token
+        if add and not present:
+            _company_index.insert(i, token)
+        elif not add and present:
+            del _company_index[i]
+
+
+def company_is_warm():
+    """True once a bulk refresh has loaded the full company table recently."""
+    refreshed = _company_status['last_bulk_refresh']
+    return bool(refreshed) and time.time() - refreshed < max(_COMPANY_TTL, 2 * _COMPANY_REFRESH)
+
+
+def search_companies(query, limit=8):
+    """Prefix match on company code, full name or any word of the name — memory only."""
+    q = _normalize_company_token(query)
+    if not q:
+        return []
+    matches = []
+    with _company_cache_lock:
+        i = bisect.bisect_left(_company_index, (q, ''))
+        while i < len(_company_index) and _company_index[i][0].startswith(q):
+            cid = _company_index[i][1]
+            if cid not in matches:
+                matches.append(cid)
+            i += 1
+        companies = [_company_cache[cid]['data']['company'] for cid in matches
+                     if cid in _company_cache]
+    # Exact code first, then shortest code, then name
+    companies.sort(key=lambda c: (_normalize_company_token(c.get('CompanyID')) != q,
+                                  len(str(c.get('CompanyID', ''))),
+                                  str(c.get('CompanyName', '')).lower()))
+    return [{'CompanyID': c.get('CompanyID', ''), 'CompanyName': c.get('CompanyName', '')}
+            for c in companies[:limit]]
+
+
+def company_cache_status():
+    """Age and refresh state of the company cache, for admin visibility."""
+    now = time.time()
+    with _company_cache_lock:
+        ages = [now - e['ts'] for e in _company_cache.values()]
+        status = dict(_company_status, entries=len(_company_cache),
+                      negative_entries=len(_company_misses),
+                      index_size=len(_company_index),
+                      refreshing=len(_company_refreshing))
+    status['oldest_entry_age'] = round(max(ages), 1) if ages else None
+    status['bulk_age'] = (round(now - status['last_bulk_refresh'], 1)
+                          if status['last_bulk_refresh'] else None)
+    status['ttl'] = _COMPANY_TTL
+    status['refresh_every'] = _COMPANY_REFRESH
+    status['shared'] = _SHARED_CACHE
+    status['worker'] = _worker_id()
+    return status
 
 
 def _warmup_gas():
-    """Pre-load all companies into the Flask cache so lookups are instant."""
+    """Pre-load all companies, then keep the table fresh with periodic bulk refreshes."""
+    if _SHARED_CACHE:
+        return _shared_refresh_loop()
+    if not _refresh_all_companies():
+        # Fallback: fire a cheap single-company call just to wake GAS
+        try:
+            _gas_fetch({'action': 'get_company', 'company_id': '__warmup__'}, timeout=20)
+        except Exception:
+            pass
+    while _COMPANY_REFRESH > 0:
+        time.sleep(_COMPANY_REFRESH)
+        _refresh_all_companies()
+
+
+def _shared_refresh_loop():
+    """Multi-worker variant: the lease holder refreshes from GAS and publishes;
+    every other worker just adopts the published table from the shared tier."""
+    period = _COMPANY_REFRESH or _COMPANY_TTL
+    poll   = min(30, period)
+    while True:
+        try:
+            leader = _acquire_lease('company_refresh', ttl=max(3 * poll, 90))
+            _company_status['leader'] = leader
+            _load_shared_companies()
+            if leader and time.time() - _company_status['last_bulk_refresh'] >= period:
+                _refresh_all_companies()
+        except sqlite3.Error as ex:
+            log.warning('shared refresh loop error: %s', ex)
+        time.sleep(poll)
+
+
+# ─────────────────────────────────────────────────────────────
+# HUB REPLICA  (local SQLite copy of the big Hub sheets; dashboards read it
+#               instead of pulling the full history from GAS on every load)
+#   Append-only sheets sync by row cursor (since_row); every sheet gets a
+#   full reconcile on a slower period to pick up edited rows.
+# ─────────────────────────────────────────────────────────────
+_REPLICA_SYNC_EVERY = int(os.environ.get('REPLICA_SYNC_SECONDS', 30))   # 0 disables the replica
+_REPLICA_FULL_EVERY = int(os.environ.get('REPLICA_FULL_SECONDS', 900))
+_REPLICA_MAX_AGE    = max(5 * _REPLICA_SYNC_EVERY, 120)  # older than this → read from GAS again
+_REPLICA_SHEETS = {
+    # name → GAS read; 'incremental' sheets are append-only and support since_row
+    'corporate_orders': {'action': 'get_corporate_orders', 'method': 'POST', 'key': None,
+                         'incremental': True,  'timeout': 30, 'rollup': True, 'order_ids': True},
+    'teacher_orders':   {'action': 'get_all_orders',       'method': 'POST', 'key': None,
+                         'incremental': True,  'timeout': 30},
+    'bookings':         {'action': 'get_bookings',         'method': 'GET',  'key': None,
+                         'incremental': False, 'timeout': 20},
+    'invoices':         {'action': 'get_all_invoices',     'method': 'POST', 'key': 'invoices',
+                         'incremental': False, 'timeout': 20},
+}
+_REPLICA_BY_READ = {spec['action']: name for name, spec in _REPLICA_SHEETS.items()}
+_REPLICA_EDITS   = {'swap_order_meal', 'update_employee_email'}  # rewrite rows in place
+
+_replica_mem    = {}   # name → (version, rows) decoded copy of the replica for this process
+_replica_dirty  = {}   # name → {since, full} written through this worker, not yet synced
+_replica_lock   = threading.Lock()
+_replica_wake   = threading.Event()
+_replica_status = {'leader': False, 'syncs': 0, 'full_syncs': 0, 'rows_pulled': 0,
+                   'errors': 0, 'gas_fallbacks': 0}
+
+_LOCAL_DB_SCHEMA.append(
+    'CREATE TABLE IF NOT EXISTS replica_rows ('
+    ' sheet TEXT NOT NULL, row_num INTEGER NOT NULL, data TEXT NOT NULL,'
+    ' PRIMARY KEY (sheet, row_num)) WITHOUT ROWID')
+_LOCAL_DB_SCHEMA.append(
+    'CREATE TABLE IF NOT EXISTS replica_state ('
+    ' sheet TEXT PRIMARY KEY, cursor INTEGER, version INTEGER NOT NULL DEFAULT 0,'
+    ' last_sync REAL, last_full REAL, row_count INTEGER NOT NULL DEFAULT 0,'
+    " last_error TEXT NOT NULL DEFAULT '')")
+
+
+def _replica_mark_dirty(action, reads):
+    """A write went through this worker: stop serving the affected sheets from
+    the replica until a sync that started after the write has landed."""
+    if not _REPLICA_SYNC_EVERY:
+        return
+    now = time.time()
+    with _replica_lock:
+        for read in reads:
+            name = _REPLICA_BY_READ.get(read)
+            if not name:
+                continue
+            prev = _replica_dirty.get(name)
+            _replica_dirty[name] = {'since': now,
+                                    'full': action in _REPLICA_EDITS or bool(prev and prev['full'])}
+    _replica_wake.set()
+
+
+def _replica_row_tag(row):
+    """The sheet row number GAS tagged a since_row row with, or None."""
+    n = row.get('_row')
+    return n if isinstance(n, int) and not isinstance(n, bool) and n > 0 else None
+
+
+def _replica_sync(name, full=False):
+    """Pull new (or, for a full sync, all) rows of one sheet into the replica.
+
+    Returns the number of rows added, changed or removed.
+    """
+    spec  = _REPLICA_SHEETS[name]
+    db    = _local_db()
+    state = db.execute('SELECT cursor, last_full FROM replica_state WHERE sheet = ?',
+                       (name,)).fetchone()
+    cursor = state['cursor'] if state else None
+    if not spec['incremental'] or cursor is None or not state['last_full'] \
+            or time.time() - state['last_full'] >= _REPLICA_FULL_EVERY:
+        full = True
+    if spec.get('rollup') and not _rollups_built(db, name):
+        full = True
+
+    payload = {'action': spec['action']}
+    if spec['incremental']:
+        payload['since_row'] = 0 if full else cursor
+    started = time.time()
+    status, data = _gas_fetch(payload, method=spec['method'], timeout=spec['timeout'])
+    if status != 200:
+        raise ValueError(f"{spec['action']} returned HTTP {status}")
+    if spec['key']:
+        data = data.get(spec['key']) if isinstance(data, dict) else None
+
+    next_row = None
+    if isinstance(data, dict) and isinstance(data.get('rows'), list):
+        next_row = data.get('next_row')
+        # GAS restarts from row 1 when our cursor is past the end (rows deleted)
+        if not full and next_row is not None and next_row < cursor:
+            full = True
+        rows = [row for row in data['rows'] if isinstance(row, dict)]
+        untagged = sum(1 for row in rows if not _replica_row_tag(row))
+        if untagged:
+            # Without a row number a row can't be placed: re-read everything
+            # once, and skip the batch if the full read is no better.
+            log.error('replica %s: %d of %d rows without a valid _row tag%s', name, untagged,
+                      len(rows), '' if full else '; retrying as a full sync')
+            if not full:
+                return _replica_sync(name, full=True)
+            raise ValueError(f"{spec['action']} returned rows without a _row tag")
+        numbered = [(row.pop('_row'), row) for row in rows]
+    elif isinstance(data, list):
+        # Backend without since_row support: always a full snapshot, no cursor
+        numbered = list(enumerate(data, 1))
+        full = True
+    else:
+        raise ValueError(f"unexpected {spec['action']} response")
+
+    encoded = {n: json.dumps(row, default=str, sort_keys=True) for n, row in numbered}
+    db.execute('BEGIN IMMEDIATE')
     try:
-        r = requests.post(GOOGLE_SCRIPT_URL,
-                          json={'action': 'get_all_companies'},
-                          timeout=25)
-        data = r.json()
-        companies = data.get('companies') or []
-        if companies:
-            now = time.time()
-            with _company_cache_lock:
-                for c in companies:
-                    cid = str(c.get('CompanyID', '')).strip().upper()
-                    if cid:
-                        _company_cache[cid] = {'data': {'found': True, 'company': c}, 'ts': now}
-            log.info('Warmed company cache: %d companies', len(companies))
-            return
-    except Exception:
+        # Diff against what we hold so only new/edited/removed rows are written
+        # and fed to the rollups.
+        since = 0 if full else min(encoded, default=None)
+        old = {} if since is None else {r['row_num']: r['data'] for r in db.execute(
+            'SELECT row_num, data FROM replica_rows WHERE sheet = ? AND row_num >= ?', (name, since))}
+        changed = [(n, d) for n, d in encoded.items() if old.get(n) != d]
+        removed = [n for n in old if n not in encoded] if full else []
+        db.executemany('INSERT OR REPLACE INTO replica_rows (sheet, row_num, data) VALUES (?, ?, ?)',
+                       [(name, n, d) for n, d in changed])
+        db.executemany('DELETE FROM replica_rows WHERE sheet = ? AND row_num = ?',
+                       [(name, n) for n in removed])
+        if spec.get('rollup'):
+            _rollup_replica_changes(db, name, old, changed, removed)
+        if spec.get('order_ids'):
+            _order_map_replica_changes(db, changed)
+        count = db.execute('SELECT COUNT(*) FROM replica_rows WHERE sheet = ?',
+                           (name,)).fetchone()[0]
+        bump = 1 if changed or removed else 0
+        db.execute(
+            'INSERT INTO replica_state (sheet, cursor, version, last_sync, last_full, row_count, last_error)'
+            " VALUES (?, ?, 1, ?, ?, ?, '')"
+            ' ON CONFLICT(sheet) DO UPDATE SET cursor = excluded.cursor,'
+            ' version = replica_state.version + ?, last_sync = excluded.last_sync,'
+            ' last_full = COALESCE(excluded.last_full, replica_state.last_full),'
+            " row_count = excluded.row_count, last_error = ''",
+            (name, next_row, started, started if full else None, count, bump))
+        db.execute('COMMIT')
+    except BaseException:
+        db.execute('ROLLBACK')
+        raise
+    _replica_status['syncs'] += 1
+    _replica_status['full_syncs'] += 1 if full else 0
+    _replica_status['rows_pulled'] += len(numbered)
+    return len(changed) + len(removed)
+
+
+def _replica_record_error(name, ex):
+    _replica_status['errors'] += 1
+    log.warning('replica sync error (%s): %s', name, ex)
+    try:
+        _local_db().execute(
+            "INSERT INTO replica_state (sheet, last_error) VALUES (?, ?)"
+            ' ON CONFLICT(sheet) DO UPDATE SET last_error = excluded.last_error',
+            (name, str(ex)[:500]))
+    except sqlite3.Error:
         pass
-    # Fallback: fire a cheap single-company call just to wake GAS
+
+
+def _replica_loop():
+    """Keep the replica current. The lease holder syncs every sheet on schedule;
+    any worker syncs sheets it wrote to (so its own writes show up quickly)."""
+    last_run = {}
+    while True:
+        try:
+            leader = _acquire_lease('replica_sync', ttl=max(3 * _REPLICA_SYNC_EVERY, 90))
+        except sqlite3.Error as ex:
+            log.warning('replica lease error: %s', ex)
+            leader = False
+        _replica_status['leader'] = leader
+        for name in _REPLICA_SHEETS:
+            with _replica_lock:
+                dirty = dict(_replica_dirty.get(name) or {})
+            due = leader and time.time() - last_run.get(name, 0) >= _REPLICA_SYNC_EVERY
+            if not (dirty or due):
+                continue
+            started = time.time()
+            try:
+                _replica_sync(name, full=dirty.get('full', False))
+            except Exception as ex:
+                _replica_record_error(name, ex)
+                continue
+            last_run[name] = started
+            with _replica_lock:
+                if name in _replica_dirty and _replica_dirty[name]['since'] <= started:
+                    del _replica_dirty[name]
+        _replica_wake.wait(_REPLICA_SYNC_EVERY)
+        _replica_wake.clear()
+
+
+def _replica_current(name):
+    """The sheet's replica_state row if the replica can be served, else None."""
+    if not _REPLICA_SYNC_EVERY:
+        return None
+    state = _local_db().execute('SELECT version, last_sync FROM replica_state WHERE sheet = ?',
+                                (name,)).fetchone()
+    if not state or not state['last_sync'] or time.time() - state['last_sync'] > _REPLICA_MAX_AGE:
+        return None
+    with _replica_lock:
+        dirty = _replica_dirty.get(name)
+    if dirty and dirty['since'] > state['last_sync']:
+        return None
+    return state
+
+
+def replica_rows(name):
+    """All rows of a replicated sheet in sheet order, or None when the replica
+    can't be trusted (disabled, never synced, too old, or behind our own write).
+
+    The list is shared between requests — treat it as read-only.
+    """
+    try:
+        state = _replica_current(name)
+        if state is None:
+            return None
+        with _replica_lock:
+            cached = _replica_mem.get(name)
+        if cached and cached[0] == state['version']:
+            return cached[1]
+        rows = [json.loads(r['data']) for r in _local_db().execute(
+            'SELECT data FROM replica_rows WHERE sheet = ? ORDER BY row_num', (name,))]
+    except sqlite3.Error as ex:
+        log.warning('replica read error (%s): %s', name, ex)
+        return None
+    with _replica_lock:
+        _replica_mem[name] = (state['version'], rows)
+    return rows
+
+
+def replica_status():
+    """Per-sheet cursor, size and age of the replica, for admin visibility."""
+    now = time.time()
+    sheets = {}
     try:
-        requests.post(GOOGLE_SCRIPT_URL,
-                      json={'action': 'get_company', 'company_id': '__warmup__'},
-                      timeout=20)
+        for r in _local_db().execute('SELECT * FROM replica_state'):
+            sheets[r['sheet']] = {
+                'cursor': r['cursor'], 'version': r['version'], 'rows': r['row_count'],
+                'age': round(now - r['last_sync'], 1) if r['last_sync'] else None,
+                'full_age': round(now - r['last_full'], 1) if r['last_full'] else None,
+                'last_error': r['last_error']}
+    except sqlite3.Error as ex:
+        sheets = {'error': str(ex)}
+    with _replica_lock:
+        dirty = sorted(_replica_dirty)
+    return dict(_replica_status, enabled=bool(_REPLICA_SYNC_EVERY), sync_every=_REPLICA_SYNC_EVERY,
+                full_every=_REPLICA_FULL_EVERY, max_age=_REPLICA_MAX_AGE, dirty=dirty,
+                sheets=sheets)
+
+
+@app.template_global()
+def data_freshness():
+    """Header pill for admin pages: how old the replicated dashboard data is."""
+    if not _REPLICA_SYNC_EVERY:
+        return None
+    sheets = replica_status()['sheets']
+    ages = [s.get('age') for name, s in sheets.items() if name in _REPLICA_SHEETS]
+    with _replica_lock:
+        dirty = bool(_replica_dirty)
+    if dirty or len(ages) < len(_REPLICA_SHEETS) or None in ages or max(ages) > _REPLICA_MAX_AGE:
+        return {'label': 'Live from Hub', 'title': 'Reading directly from the Hub sheets',
+                'live': True}
+    age = int(max(ages))
+    label = f'{age}s ago' if age < 60 else f'{age // 60}m ago'
+    return {'label': 'Synced ' + label,
+            'title': f'Local replica of the Hub sheets, synced every {_REPLICA_SYNC_EVERY}s',
+            'live': False}
+
+
+def _corporate_orders(company_id=None, sunday_anchor=None, timeout=None):
+    """get_corporate_orders, from the replica when it is current."""
+    rows = replica_rows('corporate_orders')
+    if rows is None:
+        _replica_status['gas_fallbacks'] += 1
+        rows = _gas_post(_corporate_orders_payload(company_id, sunday_anchor), timeout=timeout) or []
+        return rows if isinstance(rows, list) else []
+    # Same (exact-match) filters backend.gs applies
+    if company_id:
+        rows = [o for o in rows if o.get('CompanyID') == company_id]
+    if sunday_anchor:
+        rows = [o for o in rows if o.get('SundayAnchor') == sunday_anchor]
+    return rows
+
+
+def _teacher_orders(timeout=None):
+    """get_all_orders, from the replica when it is current."""
+    rows = replica_rows('teacher_orders')
+    if rows is None:
+        _replica_status['gas_fallbacks'] += 1
+        rows = _gas_post({'action': 'get_all_orders'}, timeout=timeout) or []
+    return rows if isinstance(rows, list) else []
+
+
+def _bookings_rows():
+    """Raw Sheet1 rows (header included), from the replica when it is current."""
+    rows = replica_rows('bookings')
+    if rows is None:
+        _replica_status['gas_fallbacks'] += 1
+        rows = _gas_get({'action': 'get_bookings'}) or []
+    return rows if isinstance(rows, list) else []
+
+
+def _all_invoices(company_id=None, timeout=12):
+    """Invoice dicts (optionally one company's), from the replica when it is current."""
+    rows = replica_rows('invoices')
+    if rows is None:
+        _replica_status['gas_fallbacks'] += 1
+        data = _gas_post(_invoices_payload(company_id), timeout=timeout)
+        rows = (data or {}).get('invoices', []) if isinstance(data, dict) else []
+        return rows
+    if company_id:
+        code = str(company_id).strip().upper()
+        rows = [i for i in rows if str(i.get('companyId', '')).strip().upper() == code]
+    return rows
+
+
+def _corporate_orders_payload(company_id=None, sunday_anchor=None):
+    payload = {'action': 'get_corporate_orders'}
+    if company_id:    payload['company_id']    = company_id
+    if sunday_anchor: payload['sunday_anchor'] = sunday_anchor
+    return payload
+
+
+def _invoices_payload(company_id=None):
+    if company_id:
+        return {'action': 'get_invoices', 'company_id': company_id}
+    return {'action': 'get_all_invoices'}
+
+
+def replica_fallback(name, payload):
+    """The GAS read a helper above would make for `name` right now — payload
+    when the replica can't serve it, None when it can. For _gas_prefetch."""
+    try:
+        return None if _replica_current(name) else payload
+    except sqlite3.Error:
+        return payload
+
+
+# ─────────────────────────────────────────────────────────────
+# SUBMISSION JOURNAL  (write-behind queue for order submissions)
+#   /work/submit and /submit-order journal the GAS write to the local
+#   SQLite file and answer at once; a flusher thread sends due entries in
+#   'batch' round trips with backoff. Every entry carries an idempotency
+#   key that GAS remembers, so a resend after a timeout can't add a
+#   second row. Entries are claimed before sending, so any number of
+#   workers can flush the same file.
+# ─────────────────────────────────────────────────────────────
+_SUBMIT_BATCH        = int(os.environ.get('SUBMIT_BATCH_MAX', 20))     # entries per round trip
+_SUBMIT_MAX_ATTEMPTS = int(os.environ.get('SUBMIT_MAX_ATTEMPTS', 8))   # then 'failed' for an admin
+_SUBMIT_BACKOFF      = 5       # seconds before the first retry, doubled on each attempt
+_SUBMIT_BACKOFF_MAX  = 900
+_SUBMIT_CLAIM_TTL    = 120     # a worker that dies mid-send releases its entries after this
+_SUBMIT_POLL         = 5       # seconds between sweeps for due retries and other workers' entries
+_SUBMIT_KEEP_SENT    = 7 * 86400
+
+_submission_wake  = threading.Event()
+_submission_lock  = threading.Lock()
+_submission_stats = {'queued': 0, 'duplicates': 0, 'sent': 0, 'retries': 0, 'failed': 0,
+                     'round_trips': 0, 'last_flush': 0.0}
+
+_LOCAL_DB_SCHEMA.append(
+    'CREATE TABLE IF NOT EXISTS submissions ('
+    ' id INTEGER PRIMARY KEY AUTOINCREMENT, idem_key TEXT NOT NULL UNIQUE,'
+    ' action TEXT NOT NULL, payload TEXT NOT NULL,'
+    " status TEXT NOT NULL DEFAULT 'pending', attempts INTEGER NOT NULL DEFAULT 0,"
+    ' next_attempt REAL NOT NULL, claimed_by TEXT, claimed_until REAL,'
+    " created_at REAL NOT NULL, sent_at REAL, last_error TEXT NOT NULL DEFAULT '')")
+_LOCAL_DB_SCHEMA.append(
+    'CREATE INDEX IF NOT EXISTS submissions_due ON submissions (status, next_attempt)')
+
+
+def _submission_key(headers, data):
+    """Client-supplied idempotency key (header or body field), or None."""
+    key = headers.get('Idempotency-Key') or (data or {}).get('idempotency_key')
+    key = str(key or '').strip()[:128]
+    return key or None
+
+
+def enqueue_submission(payload, key=None):
+    """Journal a GAS write for the flusher. Returns (idempotency key, created);
+    a key seen before keeps its original entry, so a retried request never
+    queues the order twice."""
+    key     = key or secrets.token_hex(16)
+    payload = dict(payload, idempotency_key=key)
+    now     = time.time()
+    cur = _local_db().execute(
+        'INSERT OR IGNORE INTO submissions (idem_key, action, payload, next_attempt, created_at)'
+        ' VALUES (?, ?, ?, ?, ?)',
+        (key, payload['action'], json.dumps(payload, default=str), now, now))
+    created = cur.rowcount == 1
+    with _submission_lock:
+        _submission_stats['queued' if created else 'duplicates'] += 1
+    if created:
+        _submission_wake.set()
+    return key, created
+
+
+def _submission_claim(limit):
+    """Take up to limit due entries for this worker."""
+    now, me = time.time(), _worker_id()
+    db = _local_db()
+    db.execute('BEGIN IMMEDIATE')
+    try:
+        rows = db.execute(
+            "SELECT id, action, payload, attempts FROM submissions WHERE status = 'pending'"
+            ' AND next_attempt <= ? AND (claimed_until IS NULL OR claimed_until < ?)'
+            ' ORDER BY id LIMIT ?', (now, now, limit)).fetchall()
+        db.executemany('UPDATE submissions SET claimed_by = ?, claimed_until = ? WHERE id = ?',
+                       [(me, now + _SUBMIT_CLAIM_TTL, r['id']) for r in rows])
+        db.execute('COMMIT')
+    except BaseException:
+        db.execute('ROLLBACK')
+        raise
+    return rows
+
+
+def _submission_outcome(body):
+    """Map one GAS reply to ('sent' | 'retry' | 'failed', error text)."""
+    if isinstance(body, dict):
+        if body.get('success') or body.get('duplicate'):
+            return 'sent', ''
+        return 'failed', str(body.get('error') or body)[:500]
+    text = str(body or '').strip()
+    if text.endswith('Success'):     # older scripts answer teacher orders in plain text
+        return 'sent', ''
+    if text.startswith('Error'):     # the script rejected it — resending won't help
+        return 'failed', text[:500]
+    return 'retry', text[:200] or 'empty response'
+
+
+def _submission_send_one(payload):
+    action  = payload['action']
+    started = time.perf_counter()
+    try:
+        # Not _gas_fetch: these handlers may answer in plain text, and the
+        # journal does its own retrying.
+        r = _gas_session.post(GOOGLE_SCRIPT_URL, json=payload, timeout=_gas_timeout(action))
+    except requests.RequestException as ex:
+        _record_gas_call(action, started, False, 0)
+        return 'retry', str(ex)[:200]
+    _record_gas_call(action, started, r.status_code < 500, 0)
+    if r.status_code >= 500:
+        return 'retry', f'HTTP {r.status_code}'
+    try:
+        return _submission_outcome(r.json())
+    except ValueError:
+        return _submission_outcome(r.text)
+
+
+def _submission_deliver(payloads):
+    """Send entries to GAS; returns one (outcome, error) per payload."""
+    global _gas_batch_off_until
+    with _submission_lock:
+        _submission_stats['round_trips'] += 1
+    if len(payloads) == 1 or time.time() < _gas_batch_off_until:
+        return [_submission_send_one(p) for p in payloads]
+    try:
+        status, data = _gas_fetch({'action': 'batch', 'calls': payloads}, timeout=_GAS_BATCH_TIMEOUT)
+    except ValueError:
+        # Script without 'batch' — it ran nothing, so send them one at a time.
+        with _gas_batch_lock:
+            _gas_batch_off_until = time.time() + _GAS_BATCH_RETRY
+            _gas_batch_stats['fallbacks'] += 1
+        return [_submission_send_one(p) for p in payloads]
+    except Exception as ex:
+        return [('retry', str(ex)[:200])] * len(payloads)
+    items = data.get('results') if status == 200 and isinstance(data, dict) else None
+    if not isinstance(items, list) or len(items) != len(payloads):
+        return [('retry', f'unexpected batch response (HTTP {status})')] * len(payloads)
+    return [_submission_outcome(item.get('data') if item.get('ok') else item.get('error'))
+            if isinstance(item, dict) else ('retry', 'malformed batch result') for item in items]
+
+
+def _submission_record(rows, outcomes):
+    now = time.time()
+    db  = _local_db()
+    counts = defaultdict(int)
+    for row, (outcome, error) in zip(rows, outcomes):
+        attempts = row['attempts'] + 1
+        if outcome == 'retry' and attempts >= _SUBMIT_MAX_ATTEMPTS:
+            outcome = 'failed'
+        counts[outcome] += 1
+        if outcome == 'sent':
+            db.execute("UPDATE submissions SET status = 'sent', attempts = ?, sent_at = ?,"
+                       " claimed_until = NULL, last_error = '' WHERE id = ?",
+                       (attempts, now, row['id']))
+        elif outcome == 'failed':
+            log.warning('submission %s failed after %s attempt(s): %s', row['id'], attempts, error)
+            db.execute("UPDATE submissions SET status = 'failed', attempts = ?,"
+                       ' claimed_until = NULL, last_error = ? WHERE id = ?',
+                       (attempts, error, row['id']))
+        else:
+            pause = min(_SUBMIT_BACKOFF * 2 ** (attempts - 1), _SUBMIT_BACKOFF_MAX)
+            db.execute('UPDATE submissions SET attempts = ?, next_attempt = ?,'
+                       ' claimed_until = NULL, last_error = ? WHERE id = ?',
+                       (attempts, now + pause, error, row['id']))
+    with _submission_lock:
+        _submission_stats['sent']    += counts['sent']
+        _submission_stats['retries'] += counts['retry']
+        _submission_stats['failed']  += counts['failed']
+
+
+def flush_submissions():
+    """Send every due journal entry; returns how many GAS accepted."""
+    sent = 0
+    while True:
+        rows = _submission_claim(_SUBMIT_BATCH)
+        if not rows:
+            return sent
+        payloads = [json.loads(r['payload']) for r in rows]
+        try:
+            outcomes = _submission_deliver(payloads)
+        finally:
+            # Invalidate even on failure — GAS may still have applied the writes.
+            for action in {p['action'] for p in payloads}:
+                _gas_invalidate(action)
+        _submission_record(rows, outcomes)
+        sent += sum(1 for outcome, _ in outcomes if outcome == 'sent')
+        with _submission_lock:
+            _submission_stats['last_flush'] = time.time()
+
+
+def _submission_loop():
+    last_prune = 0.0
+    while True:
+        _submission_wake.clear()
+        try:
+            flush_submissions()
+            if time.time() - last_prune > 3600:
+                last_prune = time.time()
+                _local_db().execute("DELETE FROM submissions WHERE status = 'sent' AND sent_at < ?",
+                                    (last_prune - _SUBMIT_KEEP_SENT,))
+        except Exception as ex:
+            log.warning('submission flush error: %s', ex)
+        _submission_wake.wait(_submission_next_wait())
+
+
+def _submission_next_wait():
+    """Seconds until the next retry is due, capped at the poll period."""
+    try:
+        due = _local_db().execute("SELECT MIN(next_attempt) FROM submissions WHERE status = 'pending'"
+                                  ).fetchone()[0]
+    except sqlite3.Error:
+        return _SUBMIT_POLL
+    return _SUBMIT_POLL if due is None else min(max(due - time.time(), 0.05), _SUBMIT_POLL)
+
+
+def submission_queue_status():
+    """Journal depth by status, age of the oldest unsent entry, and counters."""
+    try:
+        db = _local_db()
+        by_status = {r['status']: r['n'] for r in db.execute(
+            'SELECT status, COUNT(*) AS n FROM submissions GROUP BY status')}
+        oldest = db.execute("SELECT MIN(created_at) FROM submissions WHERE status = 'pending'"
+                            ).fetchone()[0]
+    except sqlite3.Error as ex:
+        return {'error': str(ex)}
+    with _submission_lock:
+        stats = dict(_submission_stats)
+    return dict(stats, pending=by_status.get('pending', 0), failed_entries=by_status.get('failed', 0),
+                sent_entries=by_status.get('sent', 0),
+                oldest_pending_age=round(time.time() - oldest, 1) if oldest else None)
+
+
+# ─────────────────────────────────────────────────────────────
+# ORDER IDS  (blocks of OrderIDs leased from GAS and handed out locally,
+#             plus the (email, week) → OrderID map so repeat checkouts in
+#             a week reuse their ID without a GAS call)
+#   A block is persisted before any of its IDs is used and every hand-out
+#   is committed before it's returned, so a crash can leave gaps but never
+#   reissues an ID. GAS's LastOrderID moves past each block, so its own
+#   reserve_order_id can't collide with it either.
+# ─────────────────────────────────────────────────────────────
+_ORDER_ID_BLOCK     = int(os.environ.get('ORDER_ID_BLOCK', 100))
+_ORDER_ID_LOW       = max(_ORDER_ID_BLOCK // 5, 1)   # lease the next block in the background below this
+_ORDER_ID_LEASE_OFF = 600     # seconds before retrying on a script without lease_order_ids
+_ORDER_MAP_WEEKS    = 12      # map entries for older delivery weeks are dropped
+
+_order_id_lock      = threading.Lock()
+_order_id_leasing   = False
+_order_id_off_until = 0.0
+_order_id_stats     = {'map_hits': 0, 'allocated': 0, 'leases': 0, 'lease_errors': 0,
+                       'gas_fallbacks': 0}
+
+_LOCAL_DB_SCHEMA.append(
+    'CREATE TABLE IF NOT EXISTS order_id_blocks ('
+    ' first INTEGER PRIMARY KEY, last INTEGER NOT NULL, next INTEGER NOT NULL,'
+    ' leased_at REAL NOT NULL)')
+_LOCAL_DB_SCHEMA.append(
+    'CREATE TABLE IF NOT EXISTS order_id_map ('
+    ' email TEXT NOT NULL, sunday_anchor TEXT NOT NULL, order_id NOT NULL,'
+    ' PRIMARY KEY (email, sunday_anchor)) WITHOUT ROWID')
+
+
+def _order_id_key(email, sunday_anchor):
+    return str(email or '').strip().lower(), str(sunday_anchor or '').strip()
+
+
+def reserve_order_id(email, sunday_anchor):
+    """The employee's OrderID for a delivery week: the one they already have,
+    else the next ID from a leased block. None if no ID could be had locally
+    or from GAS — callers then leave the choice to GAS."""
+    email, anchor = _order_id_key(email, sunday_anchor)
+    if not email or not anchor:
+        return None
+    hit = _order_map_get(email, anchor)
+    if hit:
+        _order_id_stats['map_hits'] += 1
+        return hit
+
+    order_id = _allocate_order_id() if _order_map_complete() else None
+    if order_id is None:
+        # The map can't rule out an ID GAS already holds for this week (or
+        # no block could be leased) — let GAS look it up.
+        _order_id_stats['gas_fallbacks'] += 1
+        data = _gas_post({'action': 'reserve_order_id', 'email': email, 'sunday_anchor': anchor})
+        order_id = data.get('order_id') if isinstance(data, dict) else None
+        if not order_id:
+            return None
+    return _order_map_put(email, anchor, order_id)
+
+
+def _order_map_get(email, anchor):
+    hit = _local_db().execute('SELECT order_id FROM order_id_map WHERE email = ? AND sunday_anchor = ?',
+                              (email, anchor)).fetchone()
+    return hit[0] if hit else None
+
+
+def _order_map_put(email, anchor, order_id):
+    """Record the week's ID and return the one that stands. A concurrent
+    checkout may have claimed this week first; its ID wins and order_id
+    becomes a gap."""
+    db = _local_db()
+    db.execute('INSERT OR IGNORE INTO order_id_map (email, sunday_anchor, order_id) VALUES (?, ?, ?)',
+               (email, anchor, order_id))
+    return db.execute('SELECT order_id FROM order_id_map WHERE email = ? AND sunday_anchor = ?',
+                      (email, anchor)).fetchone()[0]
+
+
+def _order_map_complete():
+    """True when the map has seen every CorporateOrders row: the replica has
+    done a full sync recently. Our own unsynced writes don't matter here —
+    their IDs came from this map."""
+    if not _REPLICA_SYNC_EVERY:
+        return False
+    state = _local_db().execute('SELECT last_sync, last_full FROM replica_state WHERE sheet = ?',
+                                ('corporate_orders',)).fetchone()
+    return bool(state and state['last_full'] and state['last_sync']
+                and time.time() - state['last_sync'] <= _REPLICA_MAX_AGE)
+
+
+def _order_ids_left():
+    return _local_db().execute('SELECT COALESCE(SUM(last - next + 1), 0) FROM order_id_blocks'
+                               ' WHERE next <= last').fetchone()[0]
+
+
+def _take_order_id():
+    """Next unused ID from the persisted blocks, or None when they're empty.
+    Starts a background lease when running low."""
+    db = _local_db()
+    db.execute('BEGIN IMMEDIATE')
+    try:
+        row = db.execute('SELECT first, next FROM order_id_blocks WHERE next <= last'
+                         ' ORDER BY first LIMIT 1').fetchone()
+        if row:
+            db.execute('UPDATE order_id_blocks SET next = next + 1 WHERE first = ?',
+                       (row['first'],))
+        remaining = _order_ids_left()
+        db.execute('COMMIT')
+    except BaseException:
+        db.execute('ROLLBACK')
+        raise
+    if not row:
+        return None
+    _order_id_stats['allocated'] += 1
+    if remaining < _ORDER_ID_LOW:
+        _lease_order_ids_background()
+    return row['next']
+
+
+def _allocate_order_id():
+    """Next unused ID, leasing a block when the persisted ones are empty."""
+    for _ in range(3):
+        order_id = _take_order_id()
+        if order_id is not None:
+            return order_id
+        if not _lease_order_ids(below=1):
+            return None
+    return None
+
+
+def _store_order_block(data):
+    """Persist a lease_order_ids answer; raises ValueError on a bad block."""
+    first, last = int(data['first']), int(data['last'])
+    if last < first:
+        raise ValueError(f'empty block {first}..{last}')
+    db = _local_db()
+    db.execute('INSERT OR IGNORE INTO order_id_blocks (first, last, next, leased_at)'
+               ' VALUES (?, ?, ?, ?)', (first, last, first, time.time()))
+    db.execute('DELETE FROM order_id_blocks WHERE next > last')
+    cutoff = (datetime.now() - timedelta(weeks=_ORDER_MAP_WEEKS)).strftime('%Y-%m-%d')
+    db.execute('DELETE FROM order_id_map WHERE sunday_anchor < ?', (cutoff,))
+    _order_id_stats['leases'] += 1
+
+
+def _order_lease_failed(ex, unknown_action):
+    global _order_id_off_until
+    _order_id_stats['lease_errors'] += 1
+    if unknown_action:
+        # "Error: Unknown Action" — the deployed script predates leasing.
+        _order_id_off_until = time.time() + _ORDER_ID_LEASE_OFF
+    log.warning('order ID lease failed: %s', ex)
+
+
+def _lease_order_ids(below):
+    """Lease a block from GAS if fewer than `below` IDs are left. False when
+    the lease failed."""
+    with _order_id_lock:
+        if _order_ids_left() >= below:
+            return True   # another thread leased while we waited
+        if time.time() < _order_id_off_until:
+            return False
+        try:
+            _, data = _gas_call({'action': 'lease_order_ids', 'count': _ORDER_ID_BLOCK})
+            _store_order_block(data)
+        except Exception as ex:
+            _order_lease_failed(ex, isinstance(ex, requests.JSONDecodeError))
+            return False
+        return True
+
+
+def _lease_order_ids_background():
+    global _order_id_leasing
+    with _order_id_lock:
+        if _order_id_leasing:
+            return
+        _order_id_leasing = True
+
+    def run():
+        global _order_id_leasing
+        try:
+            _lease_order_ids(below=_ORDER_ID_LOW)
+        except Exception as ex:
+            log.warning('order ID lease error: %s', ex)
+        finally:
+            _order_id_leasing = False
+
+    threading.Thread(target=run, daemon=True).start()
+
+
+def _order_map_replica_changes(db, changed):
+    """Learn (email, week) → OrderID from CorporateOrders rows a replica sync
+    pulled (caller holds the transaction). An empty map learns every row."""
+    if db.execute('SELECT 1 FROM order_id_map LIMIT 1').fetchone() is None:
+        changed = [(r['row_num'], r['data']) for r in db.execute(
+            'SELECT row_num, data FROM replica_rows WHERE sheet = ?', ('corporate_orders',))]
+    learned = []
+    for _, data in changed:
+        row    = json.loads(data)
+        email  = str(row.get('EmployeeEmail') or '').strip().lower()
+        anchor = str(row.get('SundayAnchor') or '').strip()[:10]
+        if row.get('OrderID') and email and anchor:
+            learned.append((email, anchor, row['OrderID']))
+    db.executemany('INSERT OR IGNORE INTO order_id_map (email, sunday_anchor, order_id)'
+                   ' VALUES (?, ?, ?)', learned)
+
+
+def _assign_cart_order_ids(payload):
+    """Give each cart line its week's OrderID; lines left without one get
+    theirs from GAS when the cart is applied."""
+    ids = {}
+    for line in payload['lines']:
+        anchor = line['sunday_anchor']
+        if anchor not in ids:
+            try:
+                ids[anchor] = reserve_order_id(payload['employee_email'], anchor)
+            except sqlite3.Error as ex:
+                log.warning('order ID reservation error: %s', ex)
+                ids[anchor] = None
+        if ids[anchor]:
+            line['order_id'] = ids[anchor]
+    return ids
+
+
+def order_id_status():
+    try:
+        left   = _order_ids_left()
+        mapped = _local_db().execute('SELECT COUNT(*) FROM order_id_map').fetchone()[0]
+    except sqlite3.Error as ex:
+        return {'error': str(ex)}
+    return dict(_order_id_stats, ids_left=left, map_entries=mapped, block=_ORDER_ID_BLOCK,
+                map_complete=_order_map_complete())
+
+
+# ─────────────────────────────────────────────────────────────
+# ORDER ROLLUPS  (per-(company, week) and per-(company, month, tier) totals,
+#                 kept in step with the CorporateOrders replica row by row)
+# ─────────────────────────────────────────────────────────────
+_ROLLUP_SCHEMA = [
+    # one row per order (OrderID, or email-anchor for old rows) so order and
+    # employee counts can be adjusted when its first/last meal comes or goes
+    'CREATE TABLE IF NOT EXISTS rollup_orders ('
+    ' order_key TEXT PRIMARY KEY, company TEXT, week TEXT, month TEXT, email TEXT,'
+    ' meals INTEGER NOT NULL DEFAULT 0)',
+    'CREATE TABLE IF NOT EXISTS rollup_week ('
+    ' company TEXT, week TEXT, orders INTEGER NOT NULL DEFAULT 0, meals INTEGER NOT NULL DEFAULT 0,'
+    ' emp REAL NOT NULL DEFAULT 0, co REAL NOT NULL DEFAULT 0, bd REAL NOT NULL DEFAULT 0,'
+    " last_delivery TEXT NOT NULL DEFAULT '', PRIMARY KEY (company, week))",
+    'CREATE TABLE IF NOT EXISTS rollup_month ('
+    ' company TEXT, month TEXT, orders INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (company, month))',
+    'CREATE TABLE IF NOT EXISTS rollup_month_tier ('
+    ' company TEXT, month TEXT, tier TEXT, meals INTEGER NOT NULL DEFAULT 0,'
+    ' emp REAL NOT NULL DEFAULT 0, co REAL NOT NULL DEFAULT 0, bd REAL NOT NULL DEFAULT 0,'
+    ' PRIMARY KEY (company, month, tier))',
+    'CREATE TABLE IF NOT EXISTS rollup_week_emp ('
+    ' company TEXT, week TEXT, email TEXT, orders INTEGER NOT NULL DEFAULT 0,'
+    ' PRIMARY KEY (company, week, email))',
+    'CREATE TABLE IF NOT EXISTS rollup_employee ('
+    ' company TEXT, email TEXT, orders INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (company, email))',
+    'CREATE TABLE IF NOT EXISTS rollup_dish ('
+    ' company TEXT, dish TEXT, meals INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (company, dish))',
+    # meals per delivery day, so a week's last delivery can move back when rows go
+    'CREATE TABLE IF NOT EXISTS rollup_week_day ('
+    ' company TEXT, week TEXT, day TEXT, meals INTEGER NOT NULL DEFAULT 0,'
+    ' PRIMARY KEY (company, week, day))',
+    'CREATE TABLE IF NOT EXISTS rollup_state (sheet TEXT PRIMARY KEY, built_at REAL NOT NULL)',
+]
+_LOCAL_DB_SCHEMA.extend(_ROLLUP_SCHEMA)
+_ROLLUP_TABLES = ('rollup_orders', 'rollup_week', 'rollup_month', 'rollup_month_tier',
+                  'rollup_week_emp', 'rollup_employee', 'rollup_dish', 'rollup_week_day')
+_ROLLUP_VERSION = 2   # bump when the rollup tables change; older local stores are rebuilt
+_TIER_ORDER    = {'free': 0, 'tier1': 1, 'tier2': 2, 'tier3': 3, 'full': 4}
+_ROLLUP_MEM_MAX = 32
+_rollup_mem     = OrderedDict()   # company_id → (GAS rows, in-memory rollups, lock) when the replica is off
+_rollup_mem_lock = threading.Lock()
+
+
+def _money(value):
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _order_key(row):
+    oid = str(row.get('OrderID') or '').strip()
+    return oid or f"{row.get('EmployeeEmail','anon')}-{row.get('SundayAnchor','')}"
+
+
+def _rollup_apply(db, row, sign):
+    """Add (sign=1) or remove (sign=-1) one CorporateOrders meal row."""
+    company = str(row.get('CompanyID', '') or '').upper()
+    week    = str(row.get('SundayAnchor', '') or '')
+    day     = str(row.get('DeliveryDate', '') or '')
+    month   = day[:7] if len(day) >= 7 else ''
+    email   = str(row.get('EmployeeEmail', '') or '')
+    tier    = str(row.get('Tier') or 'Full').strip() or 'Full'
+    dish    = str(row.get('DishName', '') or '')
+    emp, co, bd = (sign * _money(row.get(k)) for k in ('EmployeePrice', 'CompanyCoverage', 'BDCoverage'))
+
+    db.execute(
+        'INSERT INTO rollup_week (company, week, meals, emp, co, bd, last_delivery) VALUES (?, ?, ?, ?, ?, ?, ?)'
+        ' ON CONFLICT(company, week) DO UPDATE SET meals = meals + excluded.meals,'
+        ' emp = emp + excluded.emp, co = co + excluded.co, bd = bd + excluded.bd,'
+        ' last_delivery = MAX(last_delivery, excluded.last_delivery)',
+        (company, week, sign, emp, co, bd, day if sign > 0 else ''))
+    if month:
+        db.execute(
+            'INSERT INTO rollup_month_tier (company, month, tier, meals, emp, co, bd) VALUES (?, ?, ?, ?, ?, ?, ?)'
+            ' ON CONFLICT(company, month, tier) DO UPDATE SET meals = meals + excluded.meals,'
+            ' emp = emp + excluded.emp, co = co + excluded.co, bd = bd + excluded.bd',
+            (company, month, tier, sign, emp, co, bd))
+    if dish:
+        db.execute('INSERT INTO rollup_dish (company, dish, meals) VALUES (?, ?, ?)'
+                   ' ON CONFLICT(company, dish) DO UPDATE SET meals = meals + excluded.meals',
+                   (company, dish, sign))
+    if day:
+        db.execute('INSERT INTO rollup_week_day (company, week, day, meals) VALUES (?, ?, ?, ?)'
+                   ' ON CONFLICT(company, week, day) DO UPDATE SET meals = meals + excluded.meals',
+                   (company, week, day, sign))
+
+    # Order-level counts move only when an order gains its first or loses its last meal
+    key   = _order_key(row)
+    order = db.execute('SELECT company, week, month, email, meals FROM rollup_orders WHERE order_key = ?',
+                       (key,)).fetchone()
+    if order is None and sign > 0:
+        db.execute('INSERT INTO rollup_orders (order_key, company, week, month, email, meals)'
+                   ' VALUES (?, ?, ?, ?, ?, 1)', (key, company, week, month, email))
+        _rollup_count_order(db, company, week, month, email, 1)
+    elif order is not None and order['meals'] + sign <= 0:
+        db.execute('DELETE FROM rollup_orders WHERE order_key = ?', (key,))
+        _rollup_count_order(db, order['company'], order['week'], order['month'], order['email'], -1)
+    elif order is not None:
+        db.execute('UPDATE rollup_orders SET meals = meals + ? WHERE order_key = ?', (sign, key))
+
+    if sign < 0:
+        # MAX() can't take a date back; recount from the days still delivered
+        db.execute('DELETE FROM rollup_week_day WHERE company = ? AND week = ? AND day = ? AND meals <= 0',
+                   (company, week, day))
+        db.execute("UPDATE rollup_week SET last_delivery = COALESCE((SELECT MAX(day) FROM rollup_week_day"
+                   " WHERE company = ?1 AND week = ?2), '') WHERE company = ?1 AND week = ?2",
+                   (company, week))
+        db.execute('DELETE FROM rollup_week WHERE company = ? AND week = ? AND meals <= 0 AND orders <= 0',
+                   (company, week))
+        db.execute('DELETE FROM rollup_month_tier WHERE company = ? AND month = ? AND tier = ? AND meals <= 0',
+                   (company, month, tier))
+        db.execute('DELETE FROM rollup_dish WHERE company = ? AND dish = ? AND meals <= 0', (company, dish))
+
+
+def _rollup_count_order(db, company, week, month, email, sign):
+    db.execute('INSERT INTO rollup_week (company, week, orders) VALUES (?, ?, ?)'
+               ' ON CONFLICT(company, week) DO UPDATE SET orders = orders + excluded.orders',
+               (company, week, sign))
+    db.execute('INSERT INTO rollup_week_emp (company, week, email, orders) VALUES (?, ?, ?, ?)'
+               ' ON CONFLICT(company, week, email) DO UPDATE SET orders = orders + excluded.orders',
+               (company, week, email, sign))
+    db.execute('INSERT INTO rollup_employee (company, email, orders) VALUES (?, ?, ?)'
+               ' ON CONFLICT(company, email) DO UPDATE SET orders = orders + excluded.orders',
+               (company, email, sign))
+    if month:
+        db.execute('INSERT INTO rollup_month (company, month, orders) VALUES (?, ?, ?)'
+                   ' ON CONFLICT(company, month) DO UPDATE SET orders = orders + excluded.orders',
+                   (company, month, sign))
+    if sign < 0:
+        db.execute('DELETE FROM rollup_week WHERE company = ? AND week = ? AND meals <= 0 AND orders <= 0',
+                   (company, week))
+        db.execute('DELETE FROM rollup_week_emp WHERE company = ? AND week = ? AND email = ? AND orders <= 0',
+                   (company, week, email))
+        db.execute('DELETE FROM rollup_employee WHERE company = ? AND email = ? AND orders <= 0',
+                   (company, email))
+        db.execute('DELETE FROM rollup_month WHERE company = ? AND month = ? AND orders <= 0',
+                   (company, month))
+
+
+def _rollup_state_key(sheet):
+    return f'{sheet}/v{_ROLLUP_VERSION}'
+
+
+def _rollups_built(db, sheet):
+    return db.execute('SELECT 1 FROM rollup_state WHERE sheet = ?',
+                      (_rollup_state_key(sheet),)).fetchone() is not None
+
+
+def _rollup_replica_changes(db, sheet, old, changed, removed):
+    """Apply one replica sync's row diff to the rollups (caller holds the transaction)."""
+    if not _rollups_built(db, sheet):
+        for table in _ROLLUP_TABLES:
+            db.execute(f'DELETE FROM {table}')
+        for r in db.execute('SELECT data FROM replica_rows WHERE sheet = ?', (sheet,)).fetchall():
+            _rollup_apply(db, json.loads(r['data']), 1)
+        db.execute('DELETE FROM rollup_state WHERE sheet = ? OR sheet LIKE ?', (sheet, sheet + '/%'))
+        db.execute('INSERT INTO rollup_state (sheet, built_at) VALUES (?, ?)',
+                   (_rollup_state_key(sheet), time.time()))
+        return
+    for n, data in changed:
+        if n in old:
+            _rollup_apply(db, json.loads(old[n]), -1)   # edited in place (e.g. a meal swap)
+        _rollup_apply(db, json.loads(data), 1)
+    for n in removed:
+        _rollup_apply(db, json.loads(old[n]), -1)
+
+
+@contextmanager
+def _rollup_db(company_id=None):
+    """Connection holding current rollups: the local store when the replica is
+    current, otherwise an in-memory one built from (and cached with) the GAS read.
+    Cached in-memory connections are shared between threads, so they are
+    held under their lock for the with-block — keep it to the queries."""
+    try:
+        local = _replica_current('corporate_orders') and _rollups_built(_local_db(), 'corporate_orders')
+    except sqlite3.Error as ex:
+        log.warning('rollup store unavailable: %s', ex)
+        local = False
+    if local:
+        yield _local_db()   # per-thread connection
+        return
+    rows = _corporate_orders(company_id)
+    with _rollup_mem_lock:
+        hit = _rollup_mem.get(company_id)
+        if hit and hit[0] is rows:
+            _rollup_mem.move_to_end(company_id)
+    if not (hit and hit[0] is rows):
+        db = sqlite3.connect(':memory:', isolation_level=None, check_same_thread=False)
+        db.row_factory = sqlite3.Row
+        for ddl in _ROLLUP_SCHEMA:
+            db.execute(ddl)
+        db.execute('BEGIN')
+        for row in rows:
+            if isinstance(row, dict):
+                _rollup_apply(db, row, 1)
+        db.execute('COMMIT')
+        hit = (rows, db, threading.Lock())
+        with _rollup_mem_lock:
+            _rollup_mem[company_id] = hit
+            while len(_rollup_mem) > _ROLLUP_MEM_MAX:
+                _rollup_mem.popitem(last=False)
+    with hit[2]:
+        yield hit[1]
+
+
+def _week_label(anchor):
+    try:
+        monday = datetime.strptime(anchor, '%Y-%m-%d') + timedelta(days=1)
+        return f"Week of {monday.strftime('%b %d, %Y')}"
     except Exception:
-        pass
+        return anchor
+
+
+def rollup_weeks(db, company=None):
+    """Per-week totals, newest first (weeks without an anchor are left out)."""
+    employees = dict(db.execute(
+        "SELECT week, COUNT(DISTINCT email) FROM rollup_week_emp WHERE email != '' AND week != ''"
+        ' AND (?1 IS NULL OR company = ?1) GROUP BY week', (company,)).fetchall())
+    return [{'anchor': r['week'], 'label': _week_label(r['week']),
+             'order_count': r['orders'], 'meal_count': r['meals'],
+             'emp_spend': round(r['emp'], 2), 'co_spend': round(r['co'], 2), 'bd_spend': round(r['bd'], 2),
+             'employees': employees.get(r['week'], 0)}
+            for r in db.execute(
+                'SELECT week, SUM(orders) orders, SUM(meals) meals, SUM(emp) emp, SUM(co) co, SUM(bd) bd'
+                " FROM rollup_week WHERE week != '' AND (?1 IS NULL OR company = ?1)"
+                ' GROUP BY week HAVING SUM(orders) > 0 ORDER BY week DESC', (company,))]
+
+
+def rollup_months(db, company=None):
+    """Per-month totals with a per-tier breakdown, newest first."""
+    months = OrderedDict()
+    for r in db.execute('SELECT month, SUM(orders) orders FROM rollup_month'
+                        ' WHERE (?1 IS NULL OR company = ?1) GROUP BY month ORDER BY month DESC',
+                        (company,)):
+        try:
+            label = datetime.strptime(r['month'], '%Y-%m').strftime('%B %Y')
+        except ValueError:
+            label = r['month']
+        months[r['month']] = {'key': r['month'], 'label': label, 'orders': r['orders'], 'meals': 0,
+                              'emp_spend': 0.0, 'co_spend': 0.0, 'bd_spend': 0.0, 'tiers': []}
+    for r in db.execute('SELECT month, tier, SUM(meals) meals, SUM(emp) emp, SUM(co) co, SUM(bd) bd'
+                        ' FROM rollup_month_tier WHERE (?1 IS NULL OR company = ?1)'
+                        ' GROUP BY month, tier', (company,)):
+        m = months.get(r['month'])
+        if m is None:
+            continue
+        m['meals']     += r['meals']
+        m['emp_spend'] += r['emp']
+        m['co_spend']  += r['co']
+        m['bd_spend']  += r['bd']
+        m['tiers'].append({'name': r['tier'], 'meals': r['meals'], 'emp': round(r['emp'], 2),
+                           'co': round(r['co'], 2), 'bd': round(r['bd'], 2),
+                           'total': round(r['emp'] + r['co'] + r['bd'], 2)})
+    for m in months.values():
+        for k in ('emp_spend', 'co_spend', 'bd_spend'):
+            m[k] = round(m[k], 2)
+        m['tiers'].sort(key=lambda t: _TIER_ORDER.get(str(t['name']).lower().replace(' ', ''), 5))
+    return list(months.values())
+
+
+def rollup_companies(db, week=None):
+    """Per-company totals (all time, or one week), keyed by upper-case CompanyID."""
+    if week is None:
+        rows = db.execute('SELECT company, SUM(orders) orders, SUM(meals) meals, SUM(emp) emp,'
+                          ' SUM(co) co, SUM(bd) bd, MAX(last_delivery) last_delivery'
+                          " FROM rollup_week WHERE company != '' GROUP BY company").fetchall()
+        employees = dict(db.execute('SELECT company, COUNT(*) FROM rollup_employee'
+                                    ' GROUP BY company').fetchall())
+    else:
+        rows = db.execute('SELECT company, orders, meals, emp, co, bd, last_delivery FROM rollup_week'
+                          " WHERE company != '' AND week = ? AND orders > 0", (week,)).fetchall()
+        employees = dict(db.execute('SELECT company, COUNT(*) FROM rollup_week_emp WHERE week = ?'
+                                    ' GROUP BY company', (week,)).fetchall())
+    return {r['company']: {'orders': r['orders'], 'meals': r['meals'],
+                           'employee_count': employees.get(r['company'], 0),
+                           'emp_spend': round(r['emp'], 2), 'co_spend': round(r['co'], 2),
+                           'bd_spend': round(r['bd'], 2), 'last_order': r['last_delivery']}
+            for r in rows}
+
+
+def rollup_totals(db, company=None, week=None):
+    """All-time totals plus employee repeat/new-this-week counts."""
+    t = db.execute('SELECT COALESCE(SUM(orders), 0) orders, COALESCE(SUM(meals), 0) meals,'
+                   ' COALESCE(SUM(emp), 0) emp, COALESCE(SUM(co), 0) co, COALESCE(SUM(bd), 0) bd'
+                   ' FROM rollup_week WHERE (?1 IS NULL OR company = ?1)', (company,)).fetchone()
+    per_email = dict(db.execute("SELECT email, SUM(orders) FROM rollup_employee WHERE email != ''"
+                                ' AND (?1 IS NULL OR company = ?1) GROUP BY email', (company,)).fetchall())
+    new_this_week = 0
+    if week:
+        # First-time orderers: every order they have is in this week
+        for email, n in db.execute("SELECT email, SUM(orders) FROM rollup_week_emp WHERE email != ''"
+                                   ' AND week = ?2 AND (?1 IS NULL OR company = ?1) GROUP BY email',
+                                   (company, week)):
+            new_this_week += per_email.get(email) == n
+    top_dish = db.execute("SELECT dish FROM rollup_dish WHERE (?1 IS NULL OR company = ?1)"
+                          ' GROUP BY dish ORDER BY SUM(meals) DESC, dish LIMIT 1', (company,)).fetchone()
+    top_co = db.execute('SELECT company FROM rollup_week GROUP BY company'
+                        ' ORDER BY SUM(meals) DESC, company LIMIT 1').fetchone()
+    return {'orders': t['orders'], 'meals': t['meals'], 'emp_spend': round(t['emp'], 2),
+            'co_spend': round(t['co'], 2), 'bd_spend': round(t['bd'], 2),
+            'employees': len(per_email),
+            'repeat_employees': sum(1 for n in per_email.values() if n > 1),
+            'new_employees_week': new_this_week,
+            'top_dish': top_dish[0] if top_dish else '',
+            'top_company': top_co[0] if top_co else ''}
+
+
+# ─────────────────────────────────────────────────────────────
+# REPORT ENGINE  (order history as columnar NumPy arrays, built once per
+#                 data version; weekly reports are array masks + bincounts)
+# ─────────────────────────────────────────────────────────────
+_report_frames = {}   # kind → (source rows, frame); rebuilt when the source list changes
+_report_lock   = threading.Lock()
+
+
+def _date_column(values):
+    """datetime64[D] array from 'YYYY-MM-DD[T…]' values; NaT where unparseable."""
+    days = [str(v).split('T')[0] if v else 'NaT' for v in values]
+    try:
+        return np.array(days, dtype='datetime64[D]')
+    except ValueError:
+        out = np.full(len(days), np.datetime64('NaT'), dtype='datetime64[D]')
+        for i, d in enumerate(days):
+            try:
+                out[i] = datetime.strptime(d, '%Y-%m-%d').date()
+            except ValueError:
+                pass
+        return out
+
+
+def _weekday_column(dates):
+    # 1970-01-01 was a Thursday; Monday = 0 like datetime.weekday()
+    return (dates.astype('int64') + 3) % 7
+
+
+def _anchor_column(dates):
+    """Vectorized get_sunday_anchor: the Sunday strictly before each date."""
+    back = (_weekday_column(dates) + 1) % 7
+    back[back == 0] = 7
+    return dates - back.astype('timedelta64[D]')
+
+
+def _deadline_column(dates):
+    """Vectorized get_deadline_obj (date part; the cutoff is always 4pm)."""
+    back = (_weekday_column(dates) - 2) % 7
+    back[back <= 2] += 7
+    return dates - back.astype('timedelta64[D]')
+
+
+def _categorical(values):
+    """(sorted distinct names, int code per row) — None/'' become the name ''."""
+    names, codes = np.unique(np.array([str(v) if v not in (None, '') else '' for v in values],
+                                      dtype=str), return_inverse=True)
+    return names.tolist(), codes.astype(np.int64)
+
+
+def _build_teacher_frame(rows):
+    rows = [o for o in rows if isinstance(o, dict)]
+    dates = _date_column([o.get('date') for o in rows])
+    dish_names, dish = _categorical([o.get('dish_name') or f"Dish #{o.get('meal_id')}" for o in rows])
+    school_names, school = _categorical([o.get('school') for o in rows])
+    diet_names, diet = _categorical([o.get('diet') for o in rows])
+    plant = np.array([('Plant' in d or 'Vegan' in d) for d in diet_names], dtype=bool)
+    return {'anchor': _anchor_column(dates), 'dish': dish, 'dish_names': dish_names,
+            'school': school, 'school_names': school_names,
+            'plant': plant[diet] if len(diet) else np.zeros(0, dtype=bool)}
+
+
+def _build_corp_frame(rows):
+    rows = [o for o in rows if isinstance(o, dict)]
+    company_names, company = _categorical([o.get('CompanyName') for o in rows])
+    employee_names, employee = _categorical([o.get('EmployeeName') for o in rows])
+    return {'anchor': _date_column([o.get('SundayAnchor') for o in rows]),
+            'company': company, 'company_names': company_names,
+            'employee': employee, 'employee_names': employee_names}
+
+
+def _build_bookings_frame(rows):
+    """Sheet1 rows minus the header and junk rows, with anchor/deadline columns."""
+    rows = [b for b in rows if isinstance(b, list) and len(b) >= 3
+            and 'Date' not in str(b[0]) and not str(b[2]).isdigit()]
+    days  = [str(b[0]).split('T')[0] for b in rows]
+    dates = _date_column(days)
+    school_names, school = _categorical([b[2] for b in rows])
+    return {'rows': rows, 'day': days, 'anchor': _anchor_column(dates),
+            'deadline': _deadline_column(dates),
+            'school': school, 'school_names': school_names}
+
+
+_REPORT_BUILDERS = {
+    'teacher_orders':   _build_teacher_frame,
+    'corporate_orders': _build_corp_frame,
+    'bookings':         _build_bookings_frame,
+}
+
+
+def _report_frame(kind, rows):
+    """Columnar view of a row list. Replica and GAS-cache lists are shared and
+    only replaced when the data changes, so identity is the cache key."""
+    with _report_lock:
+        hit = _report_frames.get(kind)
+        if hit and hit[0] is rows:
+            return hit[1]
+    frame = _REPORT_BUILDERS[kind](rows if isinstance(rows, list) else [])
+    with _report_lock:
+        _report_frames[kind] = (rows, frame)
+    return frame
+
+
+def _week_mask(anchors, sunday):
+    try:
+        week = np.datetime64(str(sunday), 'D')
+    except ValueError:
+        return np.zeros(len(anchors), dtype=bool)
+    return anchors == week
+
+
+def _count_by(codes, names, sel):
+    """{name: count} over the selected rows, in name order."""
+    counts = np.bincount(codes[sel], minlength=len(names))
+    return {names[i]: int(counts[i]) for i in np.flatnonzero(counts)}
+
+
+def _distinct(codes, names, sel):
+    """Number of distinct non-blank names among the selected rows."""
+    return sum(1 for i in np.unique(codes[sel]) if names[i])
+
+
+# ─────────────────────────────────────────────────────────────
+# ORDER LISTS  (meal rows grouped into orders, plus keyset/cursor paging
+#               for the dashboard JSON APIs)
+# ─────────────────────────────────────────────────────────────
+_order_lists      = OrderedDict()   # name → (source rows, orders sorted oldest → newest)
+_order_lists_lock = threading.Lock()
+_ORDER_LISTS_MAX  = 32
+_PAGE_DEFAULT     = 25
+_PAGE_MAX         = 200
+
+
+def _group_orders(rows):
+    """CorporateOrders meal rows → one dict per order, oldest delivery first."""
+    order_map = {}
+    for row in rows:
+        if not isinstance(row, dict):
+            continue
+        oid = _order_key(row)
+        rec = order_map.get(oid)
+        if rec is None:
+            rec = order_map[oid] = {
+                'order_id':       oid,
+                'company_id':     str(row.get('CompanyID', '') or '').upper(),
+                'employee_name':  row.get('EmployeeName', ''),
+                'employee_email': row.get('EmployeeEmail', ''),
+                'delivery_date':  str(row.get('DeliveryDate', '') or ''),
+                'sunday_anchor':  str(row.get('SundayAnchor', '') or ''),
+                'status':         row.get('Status', ''),
+                'meals':          [],
+                'emp_total':      0.0,
+                'co_total':       0.0,
+                'bd_total':       0.0,
+            }
+        emp = _money(row.get('EmployeePrice'))
+        co  = _money(row.get('CompanyCoverage'))
+        bd  = _money(row.get('BDCoverage'))
+        rec['meals'].append({'dish_name': row.get('DishName', ''), 'tier': row.get('Tier', ''),
+                             'emp_price': round(emp, 2), 'co_coverage': round(co, 2),
+                             'bd_coverage': round(bd, 2), 'total_subsidy': round(co + bd, 2)})
+        rec['emp_total'] += emp
+        rec['co_total']  += co
+        rec['bd_total']  += bd
+    for rec in order_map.values():
+        for k in ('emp_total', 'co_total', 'bd_total'):
+            rec[k] = round(rec[k], 2)
+    return sorted(order_map.values(), key=_order_sort_key)
+
+
+def _order_sort_key(order):
+    return (order['delivery_date'], str(order['order_id']))
+
+
+def _order_list(name, rows):
+    """Grouped orders for a row list, cached on the list's identity (replica and
+    GAS-cache lists are only replaced when the data changes). Read-only."""
+    with _order_lists_lock:
+        hit = _order_lists.get(name)
+        if hit and hit[0] is rows:
+            _order_lists.move_to_end(name)
+            return hit[1]
+    orders = _group_orders(rows if isinstance(rows, list) else [])
+    with _order_lists_lock:
+        _order_lists[name] = (rows, orders)
+        while len(_order_lists) > _ORDER_LISTS_MAX:
+            _order_lists.popitem(last=False)
+    return orders
+
+
+def _encode_cursor(key):
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode()).decode().rstrip('=')
+
+
+def _decode_cursor(cursor):
+    """Tuple key from a cursor string; None for no cursor. Raises ValueError if malformed."""
+    if not cursor:
+        return None
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (ValueError, TypeError) as ex:
+        raise ValueError('bad cursor') from ex
+    if not isinstance(key, list):
+        raise ValueError('bad cursor')
+    return tuple(key)
+
+
+def _page_limit(value):
+    try:
+        return max(1, min(int(value), _PAGE_MAX))
+    except (TypeError, ValueError):
+        return _PAGE_DEFAULT
+
+
+def _paginate(items, key, cursor=None, limit=_PAGE_DEFAULT, newest_first=True):
+    """Keyset page over items sorted ascending by key.
+
+    newest_first pages from the end of the list (orders, invoices), otherwise
+    from the start (A→Z lists). Returns (page, next_cursor); next_cursor is
+    None on the last page. Items added at the newest end never shift later pages.
+    """
+    keys = [key(i) for i in items]
+    try:
+        if newest_first:
+            end   = bisect.bisect_left(keys, cursor) if cursor is not None else len(items)
+            start = max(end - limit, 0)
+            return items[start:end][::-1], (_encode_cursor(keys[start]) if start > 0 else None)
+        start = bisect.bisect_right(keys, cursor) if cursor is not None else 0
+        end   = min(start + limit, len(items))
+        return items[start:end], (_encode_cursor(keys[end - 1]) if end < len(items) else None)
+    except TypeError as ex:
+        raise ValueError('bad cursor') from ex
+
+
+def _invoice_sort_key(inv):
+    return (str(inv.get('sundayAnchor') or inv.get('weekOf') or ''), str(inv.get('invoiceId') or ''))
+
+
+def _company_sort_key(company):
+    return ((company.get('CompanyName') or company.get('CompanyID') or '').lower(),
+            str(company.get('CompanyID') or '').upper())
+
+
+def _order_matches(order, q):
+    return (q in str(order['employee_name']).lower() or q in str(order['order_id']).lower()
+            or q in str(order['employee_email']).lower())
+
+
+def _order_summary(orders):
+    return {'orders': len(orders), 'meals': sum(len(o['meals']) for o in orders),
+            'emp_total': round(sum(o['emp_total'] for o in orders), 2),
+            'co_total':  round(sum(o['co_total'] for o in orders), 2),
+            'bd_total':  round(sum(o['bd_total'] for o in orders), 2)}
+
+
+def _bad_request(message):
+    return jsonify({'error': message}), 400
 
 
 # ─────────────────────────────────────────────────────────────
@@ -142,6 +2508,8 @@ def admin_login():
             next_url = request.args.get('next') or url_for('work_admin')
             return redirect(next_url)
         error = 'Incorrect password.'
+    if error is None:
+        return cached_page('admin_login.html', cache_control='private, no-cache')
     return render_template('admin_login.html', error=error)
 
 
@@ -151,6 +2519,251 @@ def admin_logout():
     return redirect(url_for('admin_login'))
 
 
+# ─────────────────────────────────────────────────────────────
+# CONDITIONAL GET  (ETag / Last-Modified validators from the cached data;
+#                   a client holding the current copy gets a bodiless 304
+#                   and the response — JSON or template — is never built)
+# ─────────────────────────────────────────────────────────────
+_VALIDATOR_MAX = 10000
+
+_validator_changes = OrderedDict()   # name → (etag, when that etag first appeared)
+_validator_lock    = threading.Lock()
+_validator_stats   = {'checked': 0, 'not_modified': 0}
+
+
+def etag_digest(value):
+    """Content ETag for JSON-able data — the same data gets the same tag in
+    every worker and across restarts."""
+    raw = json.dumps(value, sort_keys=True, separators=(',', ':'), default=str).encode()
+    return hashlib.sha256(raw).hexdigest()[:32]
+
+
+def _entry_etag(entry, data, lock):
+    """etag_digest(data), memoized on the cache entry holding it (entry may be None)."""
+    with lock:
+        if entry is not None and entry.get('data') is data and entry.get('etag'):
+            return entry['etag']
+    etag = etag_digest(data)
+    if entry is not None:
+        with lock:
+            if entry.get('data') is data:
+                entry['etag'] = etag
+    return etag
+
+
+def _last_modified(name, etag):
+    """Last-Modified for a resource: when this process first saw its current ETag."""
+    now = time.time()
+    with _validator_lock:
+        seen = _validator_changes.get(name)
+        if seen and seen[0] == etag:
+            _validator_changes.move_to_end(name)
+            return seen[1]
+        _validator_changes[name] = (etag, now)
+        _validator_changes.move_to_end(name)
+        while len(_validator_changes) > _VALIDATOR_MAX:
+            _validator_changes.popitem(last=False)
+    return now
+
+
+def _client_has_current(if_none_match, if_modified_since, etag, modified):
+    """If-None-Match decides when present (weak comparison), else If-Modified-Since."""
+    if if_none_match:
+        return parse_etags(if_none_match).contains_weak(etag)
+    if if_modified_since and modified:
+        since = parse_date(if_modified_since)
+        return since is not None and int(modified) <= since.timestamp()
+    return False
+
+
+def _not_modified_check(headers, etag, modified):
+    _validator_stats['checked'] += 1
+    current = _client_has_current(headers.get('If-None-Match'), headers.get('If-Modified-Since'),
+                                  etag, modified)
+    if current:
+        _validator_stats['not_modified'] += 1
+    return current
+
+
+def conditional_response(etag, build, modified=None, weak=False, cache_control='no-cache'):
+    """304 when the request's validators match, else build()'s response with
+    validators attached. build only runs on a miss; non-200 answers go out
+    without validators."""
+    if _not_modified_check(request.headers, etag, modified):
+        resp = app.response_class(status=304)
+    else:
+        resp = make_response(build())
+        if resp.status_code != 200:
+            return resp
+    resp.set_etag(etag, weak=weak)
+    if modified:
+        resp.last_modified = datetime.fromtimestamp(int(modified), tz=timezone.utc)
+    resp.headers.setdefault('Cache-Control', cache_control)
+    return resp
+
+
+def _validator_headers(etag, modified=None, weak=False, cache_control='no-cache'):
+    """The validator headers conditional_response sets, for the ASGI path."""
+    headers = [(b'etag', quote_etag(etag, weak).encode()),
+               (b'cache-control', cache_control.encode())]
+    if modified:
+        headers.append((b'last-modified', http_date(int(modified)).encode()))
+    return headers
+
+
+def validator_status():
+    with _validator_lock:
+        tracked = len(_validator_changes)
+    return dict(_validator_stats, tracked=tracked)
+
+
+# ─────────────────────────────────────────────────────────────
+# PAGE CACHE  (pages that take no per-request data are rendered once per
+#              process and kept with gzip / brotli variants; each request
+#              is a memory copy picked by Accept-Encoding)
+# ─────────────────────────────────────────────────────────────
+_page_cache = {}             # name → {'identity': bytes, 'gzip': bytes, 'br': bytes, 'etag'}
+_page_lock  = threading.Lock()
+_page_stats = {'rendered': 0, 'served': 0, 'not_modified': 0,
+               'identity': 0, 'gzip': 0, 'br': 0}
+
+
+def _page_variants(body):
+    # mtime=0 keeps the gzip bytes (and so their ETag) identical across workers
+    variants = {'identity': body, 'gzip': gzip.compress(body, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['br'] = brotli.compress(body, quality=11)
+    variants['etag'] = hashlib.sha256(body).hexdigest()[:32]
+    return variants
+
+
+def _page_entry(name, render):
+    with _page_lock:
+        entry = _page_cache.get(name)
+    if entry is not None and not app.jinja_env.auto_reload:
+        return entry
+    entry = _page_variants(render().encode('utf-8'))
+    with _page_lock:
+        _page_cache[name] = entry
+        _page_stats['rendered'] += 1
+    return entry
+
+
+def send_variants(entry, mimetype, cache_control, stats):
+    """Answer from a _page_variants entry: the encoding follows Accept-Encoding
+    and each encoding carries its own strong ETag."""
+    offered = ['br', 'gzip', 'identity'] if 'br' in entry else ['gzip', 'identity']
+    coding = request.accept_encodings.best_match(offered) or 'identity'
+    etag = entry['etag'] if coding == 'identity' else f"{entry['etag']}-{coding}"
+
+    def build():
+        resp = app.response_class(entry[coding], mimetype=mimetype)
+        if coding != 'identity':
+            resp.headers['Content-Encoding'] = coding
+        return resp
+
+    resp = conditional_response(etag, build, cache_control=cache_control)
+    resp.headers['Vary'] = 'Accept-Encoding'
+    stats['served'] += 1
+    if resp.status_code == 304:
+        stats['not_modified'] += 1
+    else:
+        stats[coding] += 1
+    return resp
+
+
+def cached_page(name, render=None, cache_control='no-cache'):
+    """Serve a data-free page from the render-once cache; render defaults to
+    render_template(name)."""
+    entry = _page_entry(name, render or (lambda: render_template(name)))
+    return send_variants(entry, 'text/html', cache_control, _page_stats)
+
+
+def page_cache_status():
+    with _page_lock:
+        pages = {name: {enc: len(e[enc]) for enc in ('identity', 'gzip', 'br') if enc in e}
+                 for name, e in _page_cache.items()}
+    return dict(_page_stats, brotli=brotli is not None, pages=pages)
+
+
+# ─────────────────────────────────────────────────────────────
+# STATIC ASSETS  (static/css and static/js fingerprinted by content hash,
+#                 precompressed in memory and served immutable; templates
+#                 link them through asset_url)
+# ─────────────────────────────────────────────────────────────
+_ASSET_DIRS    = ('css', 'js')
+_ASSET_MAX_AGE = 365 * 86400
+
+_asset_manifest = {}         # 'js/work.js' → 'js/work.<hash>.js'
+_asset_files    = {}         # 'js/work.<hash>.js' → _page_variants entry
+_asset_mtimes   = {}         # source path → mtime it was fingerprinted at
+_asset_lock     = threading.Lock()
+_asset_stats    = {'served': 0, 'not_modified': 0, 'identity': 0, 'gzip': 0, 'br': 0}
+
+
+def _load_assets():
+    """(Re)fingerprint every bundle whose source changed since the last scan."""
+    root = app.static_folder
+    for sub in _ASSET_DIRS:
+        folder = os.path.join(root, sub)
+        if not os.path.isdir(folder):
+            continue
+        for fname in sorted(os.listdir(folder)):
+            path = os.path.join(folder, fname)
+            mtime = os.path.getmtime(path)
+            if _asset_mtimes.get(path) == mtime:
+                continue
+            with open(path, 'rb') as f:
+                entry = _page_variants(f.read())
+            stem, ext = os.path.splitext(fname)
+            logical = f'{sub}/{fname}'
+            hashed = f"{sub}/{stem}.{entry['etag'][:12]}{ext}"
+            with _asset_lock:
+                stale = _asset_manifest.get(logical)
+                if stale and stale != hashed:
+                    _asset_files.pop(stale, None)
+                _asset_manifest[logical] = hashed
+                _asset_files[hashed] = entry
+                _asset_mtimes[path] = mtime
+
+
+def asset_url(path):
+    """Fingerprinted URL for a static/css or static/js bundle; files outside
+    the manifest fall back to the plain static URL."""
+    if app.jinja_env.auto_reload:
+        _load_assets()
+    with _asset_lock:
+        hashed = _asset_manifest.get(path)
+    if hashed is None:
+        return url_for('static', filename=path)
+    return url_for('fingerprinted_asset', name=hashed)
+
+
+app.jinja_env.globals['asset_url'] = asset_url
+
+
+@app.route('/assets/<path:name>')
+def fingerprinted_asset(name):
+    with _asset_lock:
+        entry = _asset_files.get(name)
+    if entry is None:
+        return 'Not found', 404
+    # the URL changes whenever the content does, so browsers never revalidate
+    return send_variants(entry, mimetypes.guess_type(name)[0] or 'application/octet-stream',
+                         f'public, max-age={_ASSET_MAX_AGE}, immutable', _asset_stats)
+
+
+def asset_status():
+    with _asset_lock:
+        manifest = dict(_asset_manifest)
+        sizes = {name: {enc: len(e[enc]) for enc in ('identity', 'gzip', 'br') if enc in e}
+                 for name, e in _asset_files.items()}
+    return dict(_asset_stats, manifest=manifest, sizes=sizes)
+
+
+_load_assets()
+
+
 # ─────────────────────────────────────────────────────────────
 # GAS PROXY  — single endpoint, keeps the Apps Script URL
 #              server-side and out of the browser
@@ -161,12 +2774,7 @@ def gas_proxy():
 
     # ── create_magic_token: Flask generates + stores token; GAS just sends the email ──
     if payload.get('action') == 'create_magic_token':
-        token      = secrets.token_hex(32)
-        company_id = str(payload.get('company_id', '')).strip().upper()
-        email      = str(payload.get('email', '')).strip().lower()
-        _store_magic_token(token, email, company_id)
-        payload['token_override'] = token
-        payload['sign_in_url'] = f"{APP_BASE_URL}/work?token={token}&co={company_id}"
+        _prepare_magic_token(payload)
 
     # ── verify_magic_token: Flask checks its own store (fast, no GAS round-trip) ──
     elif payload.get('action') == 'verify_magic_token':
@@ -174,20 +2782,36 @@ def gas_proxy():
         result = _verify_magic_token_flask(token)
         if result:
             email, company_id = result
-            # Get employee + company data from GAS
-            emp_data = _gas_post({'action': 'get_employee_by_email',
-                                  'email': email, 'company_id': company_id}, timeout=12)
-            comp_data = _cached_get_company(company_id)
-            employee = emp_data.get('employee') if emp_data and emp_data.get('found') else None
-            company  = comp_data.get('company') if comp_data and comp_data.get('found') else None
-            if employee:
-                return jsonify({'valid': True, 'employee': employee, 'company': company})
+            # Employee + company data, fetched side by side
+            got = fan_out({
+                'employee': lambda: _gas_post({'action': 'get_employee_by_email',
+                                               'email': email, 'company_id': company_id}, timeout=12),
+                'company':  lambda: _cached_get_company(company_id),
+            })
+            verified = _magic_token_answer(got.get('employee'), got.get('company'))
+            if verified:
+                return jsonify(verified)
         # Token not in Flask store — fall through to GAS (handles tokens from old emails)
-        # (fall through to the requests.post below)
+        # (fall through to the GAS call below)
+
+    # ── get_menu: answered by the menu service ──
+    elif payload.get('action') == 'get_menu' and _valid_anchor(payload.get('sunday_anchor')):
+        entry = week_menu(payload['sunday_anchor'])
+        if entry:
+            return _menu_response(payload['sunday_anchor'], entry)
+
+    # ── reserve_order_id: answered from the leased blocks / week map ──
+    elif payload.get('action') == 'reserve_order_id':
+        order_id = reserve_order_id(payload.get('email'), payload.get('sunday_anchor'))
+        if order_id:
+            return jsonify({'order_id': order_id})
 
     try:
-        r = requests.post(GOOGLE_SCRIPT_URL, json=payload, timeout=15)
-        return jsonify(r.json()), r.status_code
+        status, data = _gas_call(payload)
+        if status == 200 and payload.get('action') in _GAS_READ_ACTIONS:
+            etag, modified = _gas_read_validators(payload, data)
+            return conditional_response(etag, lambda: jsonify(data), modified=modified)
+        return jsonify(data), status
     except requests.Timeout:
         log.warning('GAS timeout: action=%s', payload.get('action'))
         return jsonify({'error': 'Request timed out — please try again.'}), 504
@@ -196,22 +2820,91 @@ def gas_proxy():
         return jsonify({'error': 'Server error — please try again.'}), 500
 
 
+def _gas_read_validators(payload, data):
+    """(ETag, Last-Modified) for a read answered through _gas_call; the
+    ETag is memoized on the read-cache entry."""
+    key  = _gas_cache_key(payload, 'POST')
+    etag = _entry_etag(_gas_cache.get(key), data, _gas_cache_lock)
+    return etag, _last_modified('gas ' + key, etag)
+
+
+def _prepare_magic_token(payload):
+    """Generate and store the sign-in token and hand GAS the link to email."""
+    token      = secrets.token_hex(32)
+    company_id = str(payload.get('company_id', '')).strip().upper()
+    email      = str(payload.get('email', '')).strip().lower()
+    _store_magic_token(token, email, company_id)
+    payload['token_override'] = token
+    payload['sign_in_url'] = f"{APP_BASE_URL}/work?token={token}&co={company_id}"
+
+
+def _magic_token_answer(emp_data, comp_data):
+    """verify_magic_token response from the employee + company lookups, or
+    None when the employee wasn't found (GAS gets to answer instead)."""
+    employee = emp_data.get('employee') if emp_data and emp_data.get('found') else None
+    company  = comp_data.get('company') if comp_data and comp_data.get('found') else None
+    if employee:
+        return {'valid': True, 'employee': employee, 'company': company}
+    return None
+
+
+@app.route('/bd-admin/gas-stats')
+@admin_required
+def gas_stats():
+    """Per-action GAS latency, pool reuse and cache counters."""
+    return jsonify(dict(gas_client_stats(), company_cache=company_cache_status(),
+                        tokens=token_store_status(), replica=replica_status(),
+                        submissions=submission_queue_status(), order_ids=order_id_status(),
+                        menus=menu_status(), validators=validator_status(),
+                        pages=page_cache_status(), assets=asset_status(),
+                        availability=availability_status()))
+
+
+@app.route('/bd-admin/submissions')
+@admin_required
+def submissions_admin():
+    """Submission journal: depth, plus the failed (or ?status=pending) entries."""
+    status = request.args.get('status', 'failed')
+    if status not in ('pending', 'failed', 'sent'):
+        return _bad_request('status must be pending, failed or sent')
+    limit = _page_limit(request.args.get('limit'))
+    rows  = _local_db().execute(
+        'SELECT id, idem_key, action, payload, status, attempts, next_attempt, created_at,'
+        ' sent_at, last_error FROM submissions WHERE status = ? ORDER BY id DESC LIMIT ?',
+        (status, limit)).fetchall()
+    entries = [dict(r, payload=json.loads(r['payload'])) for r in rows]
+    return jsonify({'queue': submission_queue_status(), 'status': status, 'entries': entries})
+
+
+@app.route('/bd-admin/submissions/<int:entry_id>/retry', methods=['POST'])
+@admin_required
+def submissions_retry(entry_id):
+    """Put a failed entry back in the queue (GAS dedupes on its idempotency key)."""
+    cur = _local_db().execute(
+        "UPDATE submissions SET status = 'pending', attempts = 0, next_attempt = ?,"
+        " last_error = '' WHERE id = ? AND status = 'failed'", (time.time(), entry_id))
+    if cur.rowcount != 1:
+        return jsonify({'error': 'no failed entry with that id'}), 404
+    _submission_wake.set()
+    return jsonify({'status': 'ok', 'id': entry_id})
+
+
 # ─────────────────────────────────────────────────────────────
 # INTERNAL HELPERS
 # ─────────────────────────────────────────────────────────────
-def _gas_get(params, timeout=10):
+def _gas_get(params, timeout=None, cap=None):
     try:
-        r = requests.get(GOOGLE_SCRIPT_URL, params=params, timeout=timeout)
-        return r.json() if r.status_code == 200 else None
+        status, data = _gas_call(params, method='GET', timeout=timeout, cap=cap)
+        return data if status == 200 else None
     except Exception as ex:
         log.warning('GAS GET error (%s): %s', params, ex)
         return None
 
 
-def _gas_post(payload, timeout=10):
+def _gas_post(payload, timeout=None, cap=None):
     try:
-        r = requests.post(GOOGLE_SCRIPT_URL, json=payload, timeout=timeout)
-        return r.json() if r.status_code == 200 else None
+        status, data = _gas_call(payload, timeout=timeout, cap=cap)
+        return data if status == 200 else None
     except Exception as ex:
         log.warning('GAS POST error (action=%s): %s', payload.get('action'), ex)
         return None
@@ -267,41 +2960,170 @@ def decode_school_filter(s):
 
 
 # ─────────────────────────────────────────────────────────────
-# SCHOOL BOOKING — PUBLIC CALENDAR
+# AVAILABILITY INDEX  (booked + blocked dates held in memory; /book and
+#                      /toggle-date update it as they write and a loop
+#                      reconciles it with GAS, so the calendar never
+#                      waits on a sheet scan)
 # ─────────────────────────────────────────────────────────────
-@app.route('/')
-def index():
-    booked_date_raw  = request.cookies.get('user_booked_date')
-    booked_date_nice = get_nice_date(booked_date_raw) if booked_date_raw else None
+_AVAILABILITY_RECONCILE = int(os.environ.get('AVAILABILITY_RECONCILE_SECONDS', 60))
+
+_availability       = {'booked': frozenset(), 'blocked': frozenset(), 'etag': '',
+                       'loaded': 0.0, 'writes': 0}
+_availability_lock  = threading.Lock()
+_availability_stats = {'reconciles': 0, 'reconcile_errors': 0, 'reconcile_skipped': 0,
+                       'local_updates': 0, 'drift': 0, 'cold_loads': 0}
+
+
+def _booked_dates(rows):
+    """Delivery dates (YYYY-MM-DD) from raw Sheet1 rows, header skipped."""
+    dates = set()
+    for row in rows if isinstance(rows, list) else []:
+        if isinstance(row, list) and row and 'Date' not in str(row[0]):
+            dates.add(str(row[0]).split('T')[0])
+    return dates
+
+
+def _availability_set(booked, blocked):
+    # caller holds _availability_lock
+    _availability['booked']  = frozenset(booked)
+    _availability['blocked'] = frozenset(blocked)
+    _availability['etag']    = etag_digest(sorted(_availability['booked'] | _availability['blocked']))
+
+
+def reconcile_availability():
+    """Reload both sets from the replica / GAS. A side that can't be read keeps
+    its current value; a pass that raced a local write is dropped."""
+    with _availability_lock:
+        writes = _availability['writes']
+    rows = replica_rows('bookings')
+    if rows is None:
+        rows = _gas_get({'action': 'get_bookings'})
+    blocked = _gas_post({'action': 'get_blocked_dates'})
+    if not isinstance(rows, list) and not isinstance(blocked, list):
+        _availability_stats['reconcile_errors'] += 1
+        return False
+    with _availability_lock:
+        if _availability['writes'] != writes:
+            _availability_stats['reconcile_skipped'] += 1
+            return False
+        booked  = _booked_dates(rows) if isinstance(rows, list) else _availability['booked']
+        blocked = set(blocked) if isinstance(blocked, list) else _availability['blocked']
+        if _availability['loaded'] and (booked != _availability['booked']
+                                        or blocked != _availability['blocked']):
+            _availability_stats['drift'] += 1
+        _availability_set(booked, blocked)
+        _availability['loaded'] = time.time()
+    _availability_stats['reconciles'] += 1
+    return True
+
+
+def availability():
+    """(booked, blocked, etag) — loads synchronously only before the first
+    reconcile has landed."""
+    with _availability_lock:
+        loaded = _availability['loaded']
+    if not loaded:
+        _availability_stats['cold_loads'] += 1
+        try:
+            _single_flight('availability', reconcile_availability)
+        except Exception as ex:
+            log.warning('availability load error: %s', ex)
+    with _availability_lock:
+        return _availability['booked'], _availability['blocked'], _availability['etag']
+
 
-    taken_dates = []
-    taken_raw = _gas_get({'action': 'get_bookings'}) or []
-    if isinstance(taken_raw, list):
-        for row in taken_raw:
-            if isinstance(row, list) and row and 'Date' not in str(row[0]):
-                taken_dates.append(str(row[0]).split('T')[0])
+# What the plain-text booking-sheet handlers answer on success
+_AVAILABILITY_REPLIES = {'book_principal': 'Booking Success', 'toggle_block_date': 'Toggled'}
 
-    blocked_dates  = _gas_post({'action': 'get_blocked_dates'}) or []
-    all_unavailable = set(taken_dates + (blocked_dates if isinstance(blocked_dates, list) else []))
 
+def _availability_write(payload):
+    """Send a booking-sheet write; True only when GAS answered 200 with the
+    handler's success reply (an error page or login redirect is not one)."""
+    try:
+        status, data = _gas_call(payload, text=True)
+    except Exception as ex:
+        log.warning('GAS POST error (action=%s): %s', payload.get('action'), ex)
+        return False
+    if status != 200:
+        return False
+    if isinstance(data, str):
+        return data.strip() == _AVAILABILITY_REPLIES.get(payload.get('action'))
+    return isinstance(data, dict) and bool(data.get('success'))
+
+
+def _availability_apply(change):
+    """Apply change(booked, blocked) to copies of the sets right after a write."""
+    with _availability_lock:
+        booked, blocked = set(_availability['booked']), set(_availability['blocked'])
+        change(booked, blocked)
+        _availability_set(booked, blocked)
+        _availability['writes'] += 1
+    _availability_stats['local_updates'] += 1
+
+
+def calendar_weeks(unavailable, day_format='%A, %b %d', weeks=10):
+    """Mon–Wed delivery days for the next `weeks` weeks, flagged blocked
+    (date in unavailable) and past."""
     start_date = _current_monday()
     today_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-
-    weeks = []
-    for i in range(10):
+    out = []
+    for i in range(weeks):
         monday = start_date + timedelta(weeks=i)
         days = []
         for d in [monday, monday + timedelta(1), monday + timedelta(2)]:
             d_str = d.strftime('%Y-%m-%d')
             days.append({
                 'raw_date': d_str,
-                'display':  d.strftime('%A, %b %d'),
-                'blocked':  d_str in all_unavailable,
+                'display':  d.strftime(day_format),
+                'blocked':  d_str in unavailable,
                 'past':     d < today_date,
             })
-        weeks.append({'week_label': monday.strftime('Week of %b %d'), 'days': days})
+        out.append({'week_label': monday.strftime('Week of %b %d'), 'days': days})
+    return out
+
+
+def _availability_loop():
+    while True:
+        try:
+            reconcile_availability()
+        except Exception as ex:
+            _availability_stats['reconcile_errors'] += 1
+            log.warning('availability reconcile error: %s', ex)
+        if _AVAILABILITY_RECONCILE <= 0:
+            return
+        time.sleep(_AVAILABILITY_RECONCILE)
+
 
-    return render_template('index.html', weeks=weeks, booked_date=booked_date_nice)
+def availability_status():
+    with _availability_lock:
+        age = round(time.time() - _availability['loaded'], 1) if _availability['loaded'] else None
+        booked, blocked = len(_availability['booked']), len(_availability['blocked'])
+    return dict(_availability_stats, booked=booked, blocked=blocked, age=age,
+                reconcile=_AVAILABILITY_RECONCILE)
+
+
+# ─────────────────────────────────────────────────────────────
+# SCHOOL BOOKING — PUBLIC CALENDAR
+# ─────────────────────────────────────────────────────────────
+@app.route('/')
+def index():
+    booked_date_raw  = request.cookies.get('user_booked_date')
+    booked_date_nice = get_nice_date(booked_date_raw) if booked_date_raw else None
+
+    booked, blocked, availability_etag = availability()
+    today = datetime.now().strftime('%Y-%m-%d')
+
+    # Everything the page depends on; unchanged → 304 before any rendering.
+    etag = etag_digest([availability_etag, today, booked_date_nice])
+    return conditional_response(
+        etag, lambda: _render_calendar(booked | blocked, booked_date_nice),
+        modified=_last_modified('calendar ' + (booked_date_raw or ''), etag),
+        cache_control='private, no-cache')
+
+
+def _render_calendar(all_unavailable, booked_date_nice):
+    return render_template('index.html', weeks=calendar_weeks(all_unavailable),
+                           booked_date=booked_date_nice)
 
 
 @app.route('/book/<date_raw>', methods=['GET', 'POST'])
@@ -309,7 +3131,7 @@ def book(date_raw):
     if request.method == 'GET':
         return render_template('form.html', date_display=date_raw, raw_date=date_raw)
 
-    _gas_post({
+    accepted = _availability_write({
         'action':         'book_principal',
         'date':           date_raw,
         'contact_name':   request.form.get('contact_name'),
@@ -320,6 +3142,8 @@ def book(date_raw):
         'lunch_time':     request.form.get('lunch_time'),
         'delivery_notes': request.form.get('delivery_notes'),
     })
+    if accepted:
+        _availability_apply(lambda booked, blocked: booked.add(date_raw))
 
     resp = make_response(redirect(url_for('index')))
     resp.set_cookie('user_booked_date', date_raw, max_age=60 * 60 * 24 * 30)
@@ -332,9 +3156,11 @@ def book(date_raw):
 @app.route('/BD-Admin')
 @admin_required
 def bd_admin():
-    bookings_raw  = _gas_get({'action': 'get_bookings'}) or []
-    all_orders    = _gas_post({'action': 'get_all_orders'}) or []
-    blocked_dates = _gas_post({'action': 'get_blocked_dates'}) or []
+    _gas_prefetch(replica_fallback('bookings', {'action': 'get_bookings'}),
+                  replica_fallback('teacher_orders', {'action': 'get_all_orders'}))
+    got = fan_out({'bookings': _bookings_rows, 'orders': _teacher_orders})
+    bookings_raw  = got.get('bookings') or []
+    all_orders    = got.get('orders') or []
 
     order_counts = {}
     if isinstance(all_orders, list):
@@ -343,210 +3169,95 @@ def bd_admin():
                 key = f"{o.get('school')}_{o.get('date')}"
                 order_counts[key] = order_counts.get(key, 0) + 1
 
+    bookings  = _report_frame('bookings', bookings_raw)
+    anchors   = bookings['anchor'].astype(str)         # 'NaT' where the date didn't parse
+    deadlines = bookings['deadline'].astype(object)    # datetime.date or None
+
     production_weeks = {}
-    if isinstance(bookings_raw, list):
-        for b in bookings_raw:
-            try:
-                if not isinstance(b, list) or len(b) < 3:
-                    continue
-                if 'Date' in str(b[0]) or str(b[2]).isdigit():
-                    continue
-
-                d_date  = str(b[0]).split('T')[0]
-                anchor  = get_sunday_anchor(d_date)
-                if not anchor:
-                    continue
-
-                deadline_obj  = get_deadline_obj(d_date)
-                school_name   = str(b[2])
-                is_office     = 'Health' in school_name or 'Headversity' in school_name
-                meals_ordered = order_counts.get(f'{school_name}_{d_date}', 0)
-
-                booking_obj = {
-                    'delivery_date_raw':     d_date,
-                    'delivery_date_display': get_nice_date(d_date),
-                    'school':        school_name,
-                    'status':        str(b[7]) if len(b) > 7 else 'New Booking',
-                    'staff_count':   str(b[4]) if len(b) > 4 else '0',
-                    'meals_ordered': meals_ordered,
-                    'deadline':      deadline_obj.strftime('%b %d') if deadline_obj else 'TBD',
-                    'type':          'Office' if is_office else 'School',
-                }
+    for b, d_date, anchor, deadline_obj in zip(bookings['rows'], bookings['day'], anchors, deadlines):
+        try:
+            if anchor == 'NaT':
+                continue
 
-                if anchor not in production_weeks:
-                    production_weeks[anchor] = {
-                        'nice_date': format_week_header(anchor),
-                        'anchor_id': anchor,
-                        'bookings':  [],
-                    }
-                production_weeks[anchor]['bookings'].append(booking_obj)
-            except Exception as ex:
-                log.debug('bd_admin booking parse error: %s', ex)
+            school_name   = str(b[2])
+            is_office     = 'Health' in school_name or 'Headversity' in school_name
+            meals_ordered = order_counts.get(f'{school_name}_{d_date}', 0)
+
+            booking_obj = {
+                'delivery_date_raw':     d_date,
+                'delivery_date_display': get_nice_date(d_date),
+                'school':        school_name,
+                'status':        str(b[7]) if len(b) > 7 else 'New Booking',
+                'staff_count':   str(b[4]) if len(b) > 4 else '0',
+                'meals_ordered': meals_ordered,
+                'deadline':      deadline_obj.strftime('%b %d') if deadline_obj else 'TBD',
+                'type':          'Office' if is_office else 'School',
+            }
 
-    sorted_weeks = dict(sorted(production_weeks.items()))
-    start_date   = _current_monday()
-    today_date   = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+            if anchor not in production_weeks:
+                production_weeks[anchor] = {
+                    'nice_date': format_week_header(anchor),
+                    'anchor_id': anchor,
+                    'bookings':  [],
+                }
+            production_weeks[anchor]['bookings'].append(booking_obj)
+        except Exception as ex:
+            log.debug('bd_admin booking parse error: %s', ex)
 
-    toggle_weeks = []
-    for i in range(10):
-        monday = start_date + timedelta(weeks=i)
-        days = []
-        for d in [monday, monday + timedelta(1), monday + timedelta(2)]:
-            d_str = d.strftime('%Y-%m-%d')
-            days.append({
-                'raw_date': d_str,
-                'display':  d.strftime('%a, %b %d'),
-                'blocked':  d_str in (blocked_dates if isinstance(blocked_dates, list) else []),
-                'past':     d < today_date,
-            })
-        toggle_weeks.append({'week_label': monday.strftime('Week of %b %d'), 'days': days})
+    sorted_weeks = dict(sorted(production_weeks.items()))
+    _, blocked_dates, _ = availability()
+    toggle_weeks = calendar_weeks(blocked_dates, day_format='%a, %b %d')
 
     return render_template('admin.html', weeks=sorted_weeks, toggle_weeks=toggle_weeks)
 
 
-# ─────────────────────────────────────────────────────────────
-# BD ADMIN DASHBOARD  (new — corporate + system-wide view)
-# ─────────────────────────────────────────────────────────────
-@app.route('/bd-admin/dashboard')
-@admin_required
-def bd_admin_dashboard():
-    import json as _json
-    from collections import defaultdict
-
-    # ── Companies from cache (instant) ──────────────────────
-    with _company_cache_lock:
-        companies = [
-            entry['data']['company']
-            for entry in _company_cache.values()
-            if entry.get('data') and entry['data'].get('found') and entry['data'].get('company')
-        ]
-    companies.sort(key=lambda c: (c.get('CompanyName') or c.get('CompanyID') or '').lower())
-
-    # ── Parallel GAS calls ───────────────────────────────────
-    results = {}
-    def _fetch(key, payload, timeout):
-        results[key] = _gas_post(payload, timeout=timeout) or {}
-
-    threads = [
-        threading.Thread(target=_fetch, args=('orders',   {'action': 'get_corporate_orders'}, 20)),
-        threading.Thread(target=_fetch, args=('invoices', {'action': 'get_all_invoices'},     12)),
-    ]
-    for t in threads: t.start()
-    for t in threads: t.join()
-
-    invoices = results.get('invoices', {}).get('invoices', [])
-    raw = results.get('orders', {})
-    if not isinstance(raw, list): raw = []
-
-    # ── Group meal rows by OrderID ───────────────────────────
-    order_map = {}
-    for row in raw:
-        oid = str(row.get('OrderID') or '').strip()
-        if not oid:
-            oid = f"{row.get('EmployeeEmail','anon')}-{row.get('SundayAnchor','')}"
-        if oid not in order_map:
-            order_map[oid] = {
-                'order_id':       oid,
-                'company_id':     str(row.get('CompanyID', '') or '').upper(),
-                'employee_name':  row.get('EmployeeName', ''),
-                'employee_email': row.get('EmployeeEmail', ''),
-                'delivery_date':  str(row.get('DeliveryDate', '') or ''),
-                'sunday_anchor':  str(row.get('SundayAnchor', '') or ''),
-                'status':         row.get('Status', ''),
-                'meals':          [],
-                'emp_total':      0.0,
-                'co_total':       0.0,
-                'bd_total':       0.0,
-            }
-        rec = order_map[oid]
-        emp = float(row.get('EmployeePrice')   or 0)
-        co  = float(row.get('CompanyCoverage') or 0)
-        bd  = float(row.get('BDCoverage')      or 0)
-        rec['meals'].append({'dish_name': row.get('DishName', ''), 'tier': row.get('Tier', ''),
-                             'emp_price': emp, 'co_coverage': co, 'bd_coverage': bd})
-        rec['emp_total'] += emp
-        rec['co_total']  += co
-        rec['bd_total']  += bd
-
-    all_orders = sorted(order_map.values(), key=lambda o: o['delivery_date'], reverse=True)
-
-    # ── Per-company stats ────────────────────────────────────
-    co_stats = {}
-    for o in all_orders:
-        cid = o['company_id']
-        if not cid:
-            continue
-        if cid not in co_stats:
-            co_stats[cid] = {'meals': 0, 'orders': 0, 'employees': set(),
-                             'co_spend': 0.0, 'bd_spend': 0.0, 'emp_spend': 0.0, 'last_order': ''}
-        s = co_stats[cid]
-        s['meals']    += len(o['meals'])
-        s['orders']   += 1
-        s['employees'].add(o['employee_email'])
-        s['co_spend'] += o['co_total']
-        s['bd_spend'] += o['bd_total']
-        s['emp_spend'] += o['emp_total']
-        if o['delivery_date'] > s['last_order']:
-            s['last_order'] = o['delivery_date']
-    for s in co_stats.values():
-        s['employee_count'] = len(s['employees'])
-        del s['employees']
-
-    # ── Group by week ────────────────────────────────────────
-    week_map = defaultdict(list)
-    for o in all_orders:
-        if o['sunday_anchor']:
-            week_map[o['sunday_anchor']].append(o)
-
-    sorted_weeks = []
-    for anchor in sorted(week_map.keys(), reverse=True):
-        try:
-            monday = datetime.strptime(anchor, '%Y-%m-%d') + timedelta(days=1)
-            nice_label = f"Week of {monday.strftime('%b %d, %Y')}"
-        except Exception:
-            nice_label = anchor
-        wo = week_map[anchor]
-        sorted_weeks.append({
-            'anchor':      anchor,
-            'label':       nice_label,
-            'orders':      wo,
-            'order_count': len(wo),
-            'meal_count':  sum(len(o['meals']) for o in wo),
-            'emp_spend':   round(sum(o['emp_total'] for o in wo), 2),
-            'co_spend':    round(sum(o['co_total']  for o in wo), 2),
-            'bd_spend':    round(sum(o['bd_total']  for o in wo), 2),
-        })
+# ─────────────────────────────────────────────────────────────
+# BD ADMIN DASHBOARD  (new — corporate + system-wide view)
+# ─────────────────────────────────────────────────────────────
+@app.route('/bd-admin/dashboard')
+@admin_required
+def bd_admin_dashboard():
+    # ── Companies from cache (instant) ──────────────────────
+    with _company_cache_lock:
+        companies = [
+            entry['data']['company']
+            for entry in _company_cache.values()
+            if entry.get('data') and entry['data'].get('found') and entry['data'].get('company')
+        ]
+    companies.sort(key=lambda c: (c.get('CompanyName') or c.get('CompanyID') or '').lower())
 
-    empty_week = {'orders': [], 'order_count': 0, 'meal_count': 0,
+    # ── Whatever the replica can't serve, in one GAS round trip ──
+    _gas_prefetch(replica_fallback('invoices', _invoices_payload()),
+                  replica_fallback('corporate_orders', _corporate_orders_payload()))
+    pending = fan_out_submit({'invoices': lambda: _all_invoices(timeout=12)})
+
+    # ── Aggregates from the rollups (cost independent of order history) ──
+    empty_week = {'order_count': 0, 'meal_count': 0, 'employees': 0,
                   'emp_spend': 0.0, 'co_spend': 0.0, 'bd_spend': 0.0, 'label': '—', 'anchor': ''}
-    active_week = sorted_weeks[0] if sorted_weeks else empty_week
+    with _rollup_db() as rollups:
+        sorted_weeks = rollup_weeks(rollups)
+        co_stats     = rollup_companies(rollups)
+        active_week  = sorted_weeks[0] if sorted_weeks else empty_week
+        totals       = rollup_totals(rollups, week=active_week['anchor'])
+        week_by_co   = rollup_companies(rollups, week=active_week['anchor']) if sorted_weeks else {}
+
+    invoices = fan_out_collect(pending).get('invoices') or []
 
     # ── Week snapshot by company ─────────────────────────────
-    week_by_co = {}
-    for o in active_week['orders']:
-        cid = o['company_id']
-        if not cid: continue
-        if cid not in week_by_co:
-            week_by_co[cid] = {'meals': 0, 'employees': set(), 'co_spend': 0.0, 'bd_spend': 0.0}
-        week_by_co[cid]['meals']    += len(o['meals'])
-        week_by_co[cid]['employees'].add(o['employee_email'])
-        week_by_co[cid]['co_spend'] += o['co_total']
-        week_by_co[cid]['bd_spend'] += o['bd_total']
     week_snapshot = sorted([
-        {'company_id': cid, 'meals': s['meals'],
-         'employee_count': len(s['employees']),
-         'co_spend': round(s['co_spend'], 2), 'bd_spend': round(s['bd_spend'], 2)}
+        {'company_id': cid, 'meals': s['meals'], 'employee_count': s['employee_count'],
+         'co_spend': s['co_spend'], 'bd_spend': s['bd_spend']}
         for cid, s in week_by_co.items()
     ], key=lambda x: x['meals'], reverse=True)
 
     # ── System-wide stats ────────────────────────────────────
-    total_meals            = sum(len(o['meals']) for o in all_orders)
-    total_co_spend         = round(sum(o['co_total'] for o in all_orders), 2)
-    total_bd_spend         = round(sum(o['bd_total'] for o in all_orders), 2)
-    total_emp_spend        = round(sum(o['emp_total'] for o in all_orders), 2)
-    total_unique_employees = len(set(o['employee_email'] for o in all_orders if o['employee_email']))
+    total_meals            = totals['meals']
+    total_co_spend         = totals['co_spend']
+    total_bd_spend         = totals['bd_spend']
+    total_emp_spend        = totals['emp_spend']
+    total_unique_employees = totals['employees']
     total_companies        = len(companies)
-    active_companies_week  = len(set(o['company_id'] for o in active_week['orders']))
+    active_companies_week  = len(week_by_co)
     pending_invoices_value = round(sum(
         float(inv.get('companyOwed', 0) or 0)
         for inv in invoices if (inv.get('status') or 'pending') == 'pending'
@@ -554,40 +3265,21 @@ def bd_admin_dashboard():
     pending_invoices_count = sum(1 for inv in invoices if (inv.get('status') or 'pending') == 'pending')
 
     # This week stats
-    week_orders      = active_week['orders']
-    week_order_count = len(week_orders)
-    week_meal_count  = sum(len(o['meals']) for o in week_orders)
-    week_employees   = len(set(o['employee_email'] for o in week_orders if o['employee_email']))
-    week_revenue     = round(sum(o['emp_total'] + o['co_total'] for o in week_orders), 2)
+    week_order_count = active_week['order_count']
+    week_meal_count  = active_week['meal_count']
+    week_employees   = active_week['employees']
+    week_revenue     = round(active_week['emp_spend'] + active_week['co_spend'], 2)
 
     # All-time revenue & avg order value
     total_revenue    = round(total_emp_spend + total_co_spend, 2)
-    total_orders     = len(all_orders)
+    total_orders     = totals['orders']
     avg_order_value  = round(total_revenue / total_orders, 2) if total_orders else 0
 
     # Growth / fun stats
-    # Top company (most meals this month)
-    from collections import Counter
-    co_meal_counts = Counter()
-    for o in all_orders:
-        co_meal_counts[o['company_id']] += len(o['meals'])
-    top_company_id = co_meal_counts.most_common(1)[0][0] if co_meal_counts else ''
-
-    # Most popular meal
-    dish_counts = Counter()
-    for o in all_orders:
-        for m in o['meals']:
-            if m['dish_name']:
-                dish_counts[m['dish_name']] += 1
-    top_meal = dish_counts.most_common(1)[0][0] if dish_counts else '—'
+    top_company_id = totals['top_company']
+    top_meal       = totals['top_dish'] or '—'
     top_meal_short = top_meal[:22] + ('...' if len(top_meal) > 22 else '')
-
-    # New employees this week (first-time orderers)
-    all_emails_before = set()
-    for o in all_orders:
-        if o['sunday_anchor'] != active_week.get('anchor', ''):
-            all_emails_before.add(o['employee_email'])
-    new_employees_week = len(set(o['employee_email'] for o in week_orders if o['employee_email']) - all_emails_before)
+    new_employees_week = totals['new_employees_week']
 
     # Busiest week ever
     busiest_week_label = '—'
@@ -598,9 +3290,8 @@ def bd_admin_dashboard():
             busiest_week_label = w['label']
 
     # Repeat order rate
-    emp_order_counts = Counter(o['employee_email'] for o in all_orders if o['employee_email'])
-    repeat_employees = sum(1 for c in emp_order_counts.values() if c > 1)
-    repeat_rate = round(repeat_employees / len(emp_order_counts) * 100) if emp_order_counts else 0
+    repeat_rate = (round(totals['repeat_employees'] / total_unique_employees * 100)
+                   if total_unique_employees else 0)
 
     # Program growth (% change vs previous week)
     program_growth = 0
@@ -615,27 +3306,19 @@ def bd_admin_dashboard():
         for c in companies
     }
 
-    orders_json   = _json.dumps([{
-        'order_id': o['order_id'], 'company_id': o['company_id'],
-        'employee_name': o['employee_name'], 'employee_email': o['employee_email'],
-        'delivery_date': o['delivery_date'], 'sunday_anchor': o['sunday_anchor'],
-        'emp_total': round(o['emp_total'], 2),
-        'co_total':  round(o['co_total'],  2),
-        'bd_total':  round(o['bd_total'],  2),
-        'meals': [{'dish_name': m['dish_name'], 'tier': m['tier'],
-                   'emp_price': round(m['emp_price'], 2),
-                   'co_coverage': round(m['co_coverage'], 2),
-                   'bd_coverage': round(m['bd_coverage'], 2)} for m in o['meals']],
-    } for o in all_orders])
-    invoices_json  = _json.dumps(invoices)
-    companies_json = _json.dumps(companies)
+    # ── Invoices: render the active week, older pages come from /bd-admin/api/invoices ──
+    invoices_sorted = sorted(invoices, key=_invoice_sort_key)
+    keys  = [_invoice_sort_key(i) for i in invoices_sorted]
+    first = bisect.bisect_left(keys, (active_week['anchor'],)) if active_week['anchor'] else max(len(keys) - _PAGE_DEFAULT, 0)
+    week_invoices   = invoices_sorted[first:][::-1]
+    invoices_cursor = _encode_cursor(keys[first]) if first < len(keys) else ''
 
     return render_template('bd_admin_dashboard.html',
-        companies=companies, companies_json=companies_json,
+        companies=companies,
         co_names=co_names, co_stats=co_stats, week_snapshot=week_snapshot,
-        all_orders=all_orders, sorted_weeks=sorted_weeks, active_week=active_week,
-        invoices=invoices, invoices_json=invoices_json,
-        orders_json=orders_json,
+        sorted_weeks=sorted_weeks, active_week=active_week,
+        invoices=week_invoices, invoices_json=json.dumps(week_invoices),
+        invoices_more=first > 0, invoices_cursor=invoices_cursor,
         total_companies=total_companies, active_companies_week=active_companies_week,
         total_meals=total_meals, total_co_spend=total_co_spend, total_bd_spend=total_bd_spend,
         total_emp_spend=total_emp_spend, total_unique_employees=total_unique_employees,
@@ -650,6 +3333,99 @@ def bd_admin_dashboard():
     )
 
 
+# ─────────────────────────────────────────────────────────────
+# BD ADMIN JSON API  (cursor-paginated, newest first; the dashboard
+#                     fetches anything beyond the active week from here)
+#   ?limit=  page size (default 25, max 200)
+#   ?cursor= next_cursor from the previous page
+# ─────────────────────────────────────────────────────────────
+@app.route('/bd-admin/api/orders')
+@admin_required
+def bd_admin_api_orders():
+    """Orders, filterable by ?week= (Sunday anchor), ?company=, ?employee= (email) and ?q=."""
+    week     = request.args.get('week', '').strip()
+    company  = request.args.get('company', '').strip().upper()
+    employee = request.args.get('employee', '').strip().lower()
+    q        = request.args.get('q', '').strip().lower()
+    try:
+        cursor = _decode_cursor(request.args.get('cursor'))
+    except ValueError as ex:
+        return _bad_request(str(ex))
+
+    orders = _order_list('all', _corporate_orders())
+    if week or company or employee or q:
+        orders = [o for o in orders
+                  if (not week or o['sunday_anchor'] == week)
+                  and (not company or o['company_id'] == company)
+                  and (not employee or str(o['employee_email']).strip().lower() == employee)
+                  and (not q or _order_matches(o, q))]
+    try:
+        page, next_cursor = _paginate(orders, _order_sort_key, cursor,
+                                      _page_limit(request.args.get('limit')))
+    except ValueError as ex:
+        return _bad_request(str(ex))
+    body = {'orders': page, 'next_cursor': next_cursor}
+    if cursor is None:
+        body['summary'] = _order_summary(orders)   # first page only; totals for the whole filter
+    return jsonify(body)
+
+
+@app.route('/bd-admin/api/invoices')
+@admin_required
+def bd_admin_api_invoices():
+    """Invoices, filterable by ?company=, ?status= and ?week= (Sunday anchor)."""
+    company = request.args.get('company', '').strip().upper()
+    status  = request.args.get('status', '').strip().lower()
+    week    = request.args.get('week', '').strip()
+    try:
+        cursor = _decode_cursor(request.args.get('cursor'))
+    except ValueError as ex:
+        return _bad_request(str(ex))
+
+    invoices = [i for i in _all_invoices(company_id=company or None)
+                if (not status or (i.get('status') or 'pending') == status)
+                and (not week or _invoice_sort_key(i)[0] == week)]
+    invoices.sort(key=_invoice_sort_key)
+    try:
+        page, next_cursor = _paginate(invoices, _invoice_sort_key, cursor,
+                                      _page_limit(request.args.get('limit')))
+    except ValueError as ex:
+        return _bad_request(str(ex))
+    return jsonify({'invoices': page, 'next_cursor': next_cursor})
+
+
+@app.route('/bd-admin/api/companies')
+@admin_required
+def bd_admin_api_companies():
+    """Companies A→Z with all-time order stats, optionally filtered by ?q=."""
+    q = request.args.get('q', '').strip()
+    try:
+        cursor = _decode_cursor(request.args.get('cursor'))
+    except ValueError as ex:
+        return _bad_request(str(ex))
+
+    if q:
+        matches = [str(c['CompanyID']).upper() for c in search_companies(q, limit=_PAGE_MAX)]
+        with _company_cache_lock:
+            companies = [_company_cache[cid]['data']['company'] for cid in matches
+                         if cid in _company_cache]
+    else:
+        with _company_cache_lock:
+            companies = [e['data']['company'] for e in _company_cache.values()
+                         if e['data'].get('company')]
+    companies.sort(key=_company_sort_key)
+    try:
+        page, next_cursor = _paginate(companies, _company_sort_key, cursor,
+                                      _page_limit(request.args.get('limit')), newest_first=False)
+    except ValueError as ex:
+        return _bad_request(str(ex))
+    with _rollup_db() as rollups:
+        stats = rollup_companies(rollups)
+    return jsonify({'companies': [dict(c, stats=stats.get(str(c.get('CompanyID', '')).upper(), {}))
+                                  for c in page],
+                    'next_cursor': next_cursor})
+
+
 @app.route('/bd-admin/invoice-status', methods=['POST'])
 @admin_required
 def bd_admin_invoice_status():
@@ -668,34 +3444,185 @@ def bd_admin_invoice_status():
 @app.route('/toggle-date', methods=['POST'])
 @admin_required
 def toggle_date():
-    _gas_post({'action': 'toggle_block_date', 'date': request.form.get('date')})
+    date = request.form.get('date')
+    if _availability_write({'action': 'toggle_block_date', 'date': date}) and date:
+        _availability_apply(lambda booked, blocked: blocked.symmetric_difference_update({date}))
     return 'OK', 200
 
 
+# ─────────────────────────────────────────────────────────────
+# BULK EXPORTS  (CSV / NDJSON streamed from a generator: rows come off a
+#                SQLite cursor when the replica is current, so memory stays
+#                flat however large the export, and the CSV header goes out
+#                before the first row is read)
+# ─────────────────────────────────────────────────────────────
+_EXPORT_FLUSH_ROWS = 500
+
+_CORP_EXPORT_COLUMNS = ['OrderID', 'CompanyID', 'CompanyName', 'DeliveryDate', 'SundayAnchor',
+                        'EmployeeName', 'EmployeeEmail', 'MealID', 'DishName', 'DietType', 'Tier',
+                        'EmployeePrice', 'CompanyCoverage', 'BDCoverage', 'Status', 'Timestamp']
+_TEACHER_EXPORT_COLUMNS = ['school', 'date', 'meal_id', 'dish_name', 'diet']
+_INVOICE_EXPORT_COLUMNS = ['invoiceId', 'companyId', 'companyName', 'weekOf', 'sundayAnchor',
+                           'totalOrders', 'totalMeals', 'totalEmployees', 'employeePaid',
+                           'companyOwed', 'bdContributed', 'status', 'createdAt', 'paidAt',
+                           'paymentMethod', 'notes', 'breakdown']
+
+
+def _export_source(name, fallback):
+    """Rows of a replicated sheet, lazily off a SQLite cursor when the replica
+    is current, else fallback()'s list (one GAS read)."""
+    try:
+        current = _replica_current(name) is not None
+    except sqlite3.Error:
+        current = False
+    if not current:
+        return iter(fallback())
+
+    def rows():
+        cur = _local_db().execute(
+            'SELECT data FROM replica_rows WHERE sheet = ? ORDER BY row_num', (name,))
+        while True:
+            chunk = cur.fetchmany(_EXPORT_FLUSH_ROWS)
+            if not chunk:
+                return
+            for r in chunk:
+                yield json.loads(r['data'])
+    return rows()
+
+
+def _export_cell(value):
+    return json.dumps(value, default=str) if isinstance(value, (list, dict)) else value
+
+
+def _export_stream(rows, columns, fmt):
+    """Yield the export in chunks of _EXPORT_FLUSH_ROWS rows (the first row —
+    and the CSV header — on its own, so bytes reach the client at once)."""
+    buf = io.StringIO()
+    writer = csv.writer(buf) if fmt == 'csv' else None
+    if writer:
+        writer.writerow(columns)
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+    n = 0
+    for row in rows:
+        if writer:
+            writer.writerow([_export_cell(row.get(c, '')) for c in columns])
+        else:
+            buf.write(json.dumps({c: row.get(c) for c in columns}, default=str) + '\n')
+        n += 1
+        if n == 1 or n % _EXPORT_FLUSH_ROWS == 0:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+    if buf.tell():
+        yield buf.getvalue()
+
+
+def _export_response(rows, columns, filename, fmt):
+    resp = Response(_export_stream(rows, columns, fmt),
+                    mimetype='text/csv' if fmt == 'csv' else 'application/x-ndjson')
+    resp.headers['Content-Disposition'] = f'attachment; filename={filename}.{fmt}'
+    resp.headers['Cache-Control'] = 'no-store'
+    resp.headers['X-Accel-Buffering'] = 'no'   # don't let a proxy hold the stream back
+    return resp
+
+
+def _export_args():
+    """(format, from, to) from the query string; the bounds are YYYY-MM-DD or ''."""
+    fmt   = request.args.get('format', 'csv').strip().lower()
+    start = request.args.get('from', '').strip()
+    end   = request.args.get('to', '').strip()
+    if fmt not in ('csv', 'ndjson'):
+        raise ValueError('format must be csv or ndjson')
+    for value in (start, end):
+        if value and not _valid_anchor(value):
+            raise ValueError('from / to must be YYYY-MM-DD')
+    return fmt, start, end
+
+
+def _in_range(day, start, end):
+    day = str(day or '').split('T')[0]
+    return (not start or day >= start) and (not end or day <= end)
+
+
+@app.route('/bd-admin/export/corporate-orders')
+@admin_required
+def export_corporate_orders():
+    """Corporate order lines, filterable by ?company=, ?week= (Sunday anchor)
+    and a ?from=/?to= delivery date range."""
+    company = request.args.get('company', '').strip().upper()
+    week    = request.args.get('week', '').strip()
+    if week and not _valid_anchor(week):
+        return _bad_request('week must be YYYY-MM-DD')
+    try:
+        fmt, start, end = _export_args()
+    except ValueError as ex:
+        return _bad_request(str(ex))
+    rows = _export_source('corporate_orders',
+                          lambda: _corporate_orders(company_id=company or None))
+    rows = (o for o in rows if isinstance(o, dict)
+            and (not company or o.get('CompanyID') == company)
+            and (not week or o.get('SundayAnchor') == week)
+            and _in_range(o.get('DeliveryDate'), start, end))
+    name = '_'.join(filter(None, ['corporate_orders', company, week, start, end]))
+    return _export_response(rows, _CORP_EXPORT_COLUMNS, name, fmt)
+
+
+@app.route('/bd-admin/export/teacher-orders')
+@admin_required
+def export_teacher_orders():
+    """Teacher orders for one ?week= (Sunday anchor) or a ?from=/?to= delivery
+    date range, optionally one ?school=."""
+    week   = request.args.get('week', '').strip()
+    school = request.args.get('school', '').strip().replace('+', ' ')
+    if week and not _valid_anchor(week):
+        return _bad_request('week must be YYYY-MM-DD')
+    try:
+        fmt, start, end = _export_args()
+    except ValueError as ex:
+        return _bad_request(str(ex))
+    rows = _export_source('teacher_orders', lambda: _teacher_orders())
+    rows = (o for o in rows if isinstance(o, dict)
+            and (not school or o.get('school') == school)
+            and (not week or get_sunday_anchor(o.get('date')) == week)
+            and _in_range(o.get('date'), start, end))
+    name = '_'.join(filter(None, ['teacher_orders', week, start, end]))
+    return _export_response(rows, _TEACHER_EXPORT_COLUMNS, name, fmt)
+
+
+@app.route('/bd-admin/export/invoices')
+@admin_required
+def export_invoices():
+    """Invoice ledger, filterable by ?company=, ?status= and a ?from=/?to= week range."""
+    company = request.args.get('company', '').strip().upper()
+    status  = request.args.get('status', '').strip().lower()
+    try:
+        fmt, start, end = _export_args()
+    except ValueError as ex:
+        return _bad_request(str(ex))
+    rows = _export_source('invoices', lambda: _all_invoices(company_id=company or None, timeout=30))
+    rows = (i for i in rows if isinstance(i, dict)
+            and (not company or str(i.get('companyId', '')).strip().upper() == company)
+            and (not status or (i.get('status') or 'pending') == status)
+            and _in_range(_invoice_sort_key(i)[0], start, end))
+    name = '_'.join(filter(None, ['invoices', company, status, start, end]))
+    return _export_response(rows, _INVOICE_EXPORT_COLUMNS, name, fmt)
+
+
 # ─────────────────────────────────────────────────────────────
 # CULINARY & INVOICES
 # ─────────────────────────────────────────────────────────────
 @app.route('/culinary-summary/<sunday>')
 @admin_required
 def culinary_summary(sunday):
-    all_orders  = _gas_post({'action': 'get_all_orders'}, timeout=20) or []
-    totals      = {'Meat': {}, 'Plant-Based': {}}
-    total_count = 0
-
-    if isinstance(all_orders, list):
-        for o in all_orders:
-            if not isinstance(o, dict):
-                continue
-            if get_sunday_anchor(o.get('date')) != sunday:
-                continue
-            dish = str(o.get('dish_name') or f"Dish #{o.get('meal_id')}")
-            diet = str(o.get('diet') or '')
-            cat  = 'Plant-Based' if ('Plant' in diet or 'Vegan' in diet) else 'Meat'
-            totals[cat][dish] = totals[cat].get(dish, 0) + 1
-            total_count += 1
-
-    for cat in totals:
-        totals[cat] = dict(sorted(totals[cat].items()))
+    orders = _report_frame('teacher_orders', _teacher_orders())
+    week   = _week_mask(orders['anchor'], sunday)
+    totals = {
+        'Meat':        _count_by(orders['dish'], orders['dish_names'], week & ~orders['plant']),
+        'Plant-Based': _count_by(orders['dish'], orders['dish_names'], week & orders['plant']),
+    }
+    total_count = int(np.count_nonzero(week))
 
     return render_template('culinary_picklist.html',
                            sunday=format_week_header(sunday),
@@ -705,35 +3632,37 @@ def culinary_summary(sunday):
 @app.route('/batch-invoices/<sunday>')
 @admin_required
 def batch_invoices(sunday):
-    bookings_raw = _gas_get({'action': 'get_bookings'}) or []
-    all_orders   = _gas_post({'action': 'get_all_orders'}) or []
+    _gas_prefetch(replica_fallback('bookings', {'action': 'get_bookings'}),
+                  replica_fallback('teacher_orders', {'action': 'get_all_orders'}))
+    got = fan_out({'bookings': _bookings_rows, 'orders': _teacher_orders})
+    bookings = _report_frame('bookings', got.get('bookings') or [])
+    orders   = _report_frame('teacher_orders', got.get('orders') or [])
 
     schools_this_week = {}
-    if isinstance(bookings_raw, list):
-        for b in bookings_raw:
-            try:
-                if not isinstance(b, list) or len(b) < 3:
-                    continue
-                if 'Date' in str(b[0]) or str(b[2]).isdigit():
-                    continue
-                d_date = str(b[0]).split('T')[0]
-                if get_sunday_anchor(d_date) == sunday:
-                    schools_this_week[str(b[2])] = get_nice_date(d_date)
-            except Exception as ex:
-                log.debug('batch_invoices parse: %s', ex)
+    for i in np.flatnonzero(_week_mask(bookings['anchor'], sunday)):
+        schools_this_week[bookings['school_names'][bookings['school'][i]]] = get_nice_date(bookings['day'][i])
 
     summaries = {name: {'delivery_date': nd, 'dishes': {}, 'total': 0}
                  for name, nd in schools_this_week.items()}
 
-    if isinstance(all_orders, list):
-        for o in all_orders:
-            if not isinstance(o, dict):
-                continue
-            school = o.get('school')
-            if get_sunday_anchor(o.get('date')) == sunday and school in summaries:
-                dish = str(o.get('dish_name') or f"Dish #{o.get('meal_id')}")
-                summaries[school]['dishes'][dish] = summaries[school]['dishes'].get(dish, 0) + 1
-                summaries[school]['total'] += 1
+    # One (school, dish) group-by over this week's rows for the booked schools
+    booked = np.array([name in summaries for name in orders['school_names']], dtype=bool)
+    sel    = _week_mask(orders['anchor'], sunday)
+    if booked.any():
+        sel &= booked[orders['school']]
+    else:
+        sel[:] = False
+    n_dish = max(len(orders['dish_names']), 1)
+    pairs, first, counts = np.unique(orders['school'][sel] * n_dish + orders['dish'][sel],
+                                     return_index=True, return_counts=True)
+    # np.unique sorts by code; list each school's dishes in the order they were
+    # first ordered, as the printed invoices always have
+    by_first = np.argsort(first, kind='stable')
+    for pair, count in zip(pairs[by_first].tolist(), counts[by_first].tolist()):
+        school, dish = divmod(pair, n_dish)
+        summary = summaries[orders['school_names'][school]]
+        summary['dishes'][orders['dish_names'][dish]] = count
+        summary['total'] += count
 
     return render_template('batch_invoices.html',
                            sunday=format_week_header(sunday), summaries=summaries)
@@ -839,7 +3768,8 @@ def teacher_order(delivery_date):
     deadline_obj = get_deadline_obj(delivery_date)
     deadline_str = deadline_obj.strftime('%b %d @ 4:00 PM') if deadline_obj else 'TBD'
 
-    menu_data  = _gas_post({'action': 'get_menu', 'sunday_anchor': anchor}, timeout=15) or {}
+    menu_entry = week_menu(anchor) if anchor else None
+    menu_data  = menu_entry['data'] if menu_entry else {}
     meat_menu  = menu_data.get('meat',  []) if isinstance(menu_data, dict) else []
     vegan_menu = menu_data.get('vegan', []) if isinstance(menu_data, dict) else []
     menu_error = ('Menu is currently unavailable — please try again in a few minutes.'
@@ -848,14 +3778,15 @@ def teacher_order(delivery_date):
     return render_template('orderform.html',
                            delivery_date=delivery_date, deadline=deadline_str,
                            meat_menu=meat_menu, vegan_menu=vegan_menu,
-                           school_name=school, menu_error=menu_error)
+                           school_name=school, menu_error=menu_error,
+                           submission_key=secrets.token_hex(16))
 
 
 @app.route('/submit-order', methods=['POST'])
 def submit_order():
     school = request.form.get('school_name')
     date   = request.form.get('delivery_date')
-    _gas_post({
+    enqueue_submission({
         'action':        'submit_teacher_order',
         'name':          request.form.get('teacher_name'),
         'meal_id':       request.form.get('meal_id'),
@@ -864,7 +3795,7 @@ def submit_order():
         'delivery_date': date,
         'school':        school,
         'timestamp':     datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-    }, timeout=10)
+    }, _submission_key(request.headers, request.form))
 
     share_link = url_for('teacher_order', delivery_date=date, school=school, _external=True)
     resp = make_response(render_template('order_success.html', share_link=share_link, existing=False))
@@ -901,6 +3832,8 @@ def manager_login():
             error = 'Incorrect password.'
         else:
             error = 'Company not found.'
+    if error is None:
+        return cached_page('manager_login.html', cache_control='private, no-cache')
     return render_template('manager_login.html', error=error)
 
 
@@ -922,200 +3855,53 @@ def manager_auth():
 @app.route('/manager/dashboard')
 @manager_required
 def manager_dashboard():
-    import json
     company_id = session.get('manager_company_id')
 
-    # Company data comes from cache (populated at startup) — instant
-    company = (_cached_get_company(company_id) or {}).get('company', {})
-
-    # Fire remaining GAS calls in parallel — cuts load from ~15s sequential to ~5s
-    results = {}
-    def _fetch(key, payload, timeout):
-        results[key] = _gas_post(payload, timeout=timeout) or {}
-
-    threads = [
-        threading.Thread(target=_fetch, args=('pin',      {'action': 'get_company_pin',      'company_id': company_id}, 8)),
-        threading.Thread(target=_fetch, args=('employees',{'action': 'get_employees',        'company_id': company_id}, 10)),
-        threading.Thread(target=_fetch, args=('invoices', {'action': 'get_invoices',         'company_id': company_id}, 10)),
-        threading.Thread(target=_fetch, args=('orders',   {'action': 'get_corporate_orders', 'company_id': company_id}, 15)),
-    ]
-    for t in threads: t.start()
-    for t in threads: t.join()
-
-    current_pin = results.get('pin', {}).get('pin', '')
-    employees   = results.get('employees', {}).get('employees', [])
-    invoices    = results.get('invoices', {}).get('invoices', [])
-    raw = results.get('orders', {})
-    if not isinstance(raw, list): raw = []
-    if not isinstance(raw, list):
-        raw = []
-
-    # ── Group individual meal rows by OrderID ──────────────────
-    order_map = {}
-    for row in raw:
-        oid = str(row.get('OrderID') or '').strip()
-        if not oid:
-            oid = f"{row.get('EmployeeEmail','anon')}-{row.get('SundayAnchor','')}"
-        if oid not in order_map:
-            order_map[oid] = {
-                'order_id':      oid,
-                'employee_name': row.get('EmployeeName', ''),
-                'employee_email': row.get('EmployeeEmail', ''),
-                'delivery_date': str(row.get('DeliveryDate', '') or ''),
-                'sunday_anchor': str(row.get('SundayAnchor', '') or ''),
-                'status':        row.get('Status', ''),
-                'meals':         [],
-                'emp_total':     0.0,
-                'co_total':      0.0,
-                'bd_total':      0.0,
-            }
-        rec  = order_map[oid]
-        emp  = float(row.get('EmployeePrice')   or 0)
-        co   = float(row.get('CompanyCoverage') or 0)
-        bd   = float(row.get('BDCoverage')      or 0)
-        rec['meals'].append({
-            'dish_name':     row.get('DishName', ''),
-            'tier':          row.get('Tier', ''),
-            'emp_price':     emp,
-            'co_coverage':   co,
-            'bd_coverage':   bd,
-            'total_subsidy': round(co + bd, 2),
-        })
-        rec['emp_total'] += emp
-        rec['co_total']  += co
-        rec['bd_total']  += bd
-
-    all_orders = sorted(order_map.values(), key=lambda o: o['delivery_date'], reverse=True)
-
-    # ── Group orders by week ───────────────────────────────────
-    week_map = defaultdict(list)
-    for o in all_orders:
-        anchor = o['sunday_anchor']
-        if anchor:
-            week_map[anchor].append(o)
-
-    sorted_weeks = []
-    for anchor in sorted(week_map.keys(), reverse=True):
-        try:
-            anchor_dt  = datetime.strptime(anchor, '%Y-%m-%d')
-            monday     = anchor_dt + timedelta(days=1)
-            nice_label = f"Week of {monday.strftime('%b %d, %Y')}"
-        except Exception:
-            nice_label = anchor
-        wo = week_map[anchor]
-        sorted_weeks.append({
-            'anchor':      anchor,
-            'label':       nice_label,
-            'orders':      wo,
-            'order_count': len(wo),
-            'meal_count':  sum(len(o['meals']) for o in wo),
-            'emp_spend':   sum(o['emp_total'] for o in wo),
-            'co_spend':    sum(o['co_total'] for o in wo),
-            'bd_spend':    sum(o['bd_total'] for o in wo),
-        })
-
-    # ── Monthly summaries with per-tier breakdown ─────────────
-    def tier_sort_key(name):
-        order = {'free': 0, 'tier1': 1, 'tier2': 2, 'tier3': 3, 'full': 4}
-        return order.get(str(name).lower().replace(' ', ''), 5)
-
-    month_map = {}
-    for o in all_orders:
-        date_str = o['delivery_date']
-        if len(date_str) < 7:
-            continue
-        mk = date_str[:7]
-        if mk not in month_map:
-            month_map[mk] = {'orders': 0, 'meals': 0,
-                             'emp_spend': 0.0, 'co_spend': 0.0, 'bd_spend': 0.0,
-                             'tiers': {}}
-        md = month_map[mk]
-        md['orders'] += 1
-        for m in o['meals']:
-            tier = str(m.get('tier') or 'Full').strip() or 'Full'
-            emp  = m['emp_price']
-            co   = m['co_coverage']
-            bd   = m['bd_coverage']
-            md['meals']     += 1
-            md['emp_spend'] += emp
-            md['co_spend']  += co
-            md['bd_spend']  += bd
-            if tier not in md['tiers']:
-                md['tiers'][tier] = {'meals': 0, 'emp': 0.0, 'co': 0.0, 'bd': 0.0}
-            md['tiers'][tier]['meals'] += 1
-            md['tiers'][tier]['emp']   += emp
-            md['tiers'][tier]['co']    += co
-            md['tiers'][tier]['bd']    += bd
-
-    def fmt_month(mk):
-        try:    return datetime.strptime(mk, '%Y-%m').strftime('%B %Y')
-        except: return mk
-
-    sorted_monthly = []
-    for k in sorted(month_map.keys(), reverse=True):
-        v = month_map[k]
-        tiers_list = sorted([
-            {'name': tn, 'meals': ts['meals'],
-             'emp': round(ts['emp'], 2), 'co': round(ts['co'], 2), 'bd': round(ts['bd'], 2),
-             'total': round(ts['emp'] + ts['co'] + ts['bd'], 2)}
-            for tn, ts in v['tiers'].items()
-        ], key=lambda t: tier_sort_key(t['name']))
-        sorted_monthly.append({
-            'key': k, 'label': fmt_month(k),
-            'orders':    v['orders'],    'meals':    v['meals'],
-            'emp_spend': round(v['emp_spend'], 2),
-            'co_spend':  round(v['co_spend'],  2),
-            'bd_spend':  round(v['bd_spend'],  2),
-            'tiers':     tiers_list,
-        })
+    # Company data comes from cache (populated at startup) — a miss is
+    # fetched alongside the batch below
+    pending = fan_out_submit({'company': lambda: _cached_get_company(company_id)})
+
+    # Remaining GAS reads in one batched round trip (the replica serves the
+    # invoice and order reads when it is current)
+    pin_data, emp_data, _, _ = _gas_batch([
+        {'action': 'get_company_pin', 'company_id': company_id},
+        {'action': 'get_employees',   'company_id': company_id},
+        replica_fallback('invoices', _invoices_payload(company_id)),
+        replica_fallback('corporate_orders', _corporate_orders_payload(company_id)),
+    ])
+    company     = (fan_out_collect(pending).get('company') or {}).get('company', {})
+    current_pin = (pin_data or {}).get('pin', '')
+    employees   = (emp_data or {}).get('employees', [])
+    invoices    = _all_invoices(company_id=company_id, timeout=10)
+
+    # ── Weekly / monthly aggregates from the rollups ──────────
+    company_key = str(company_id or '').upper()
+    with _rollup_db(company_id) as rollups:
+        sorted_weeks   = rollup_weeks(rollups, company_key)
+        sorted_monthly = rollup_months(rollups, company_key)
+        totals         = rollup_totals(rollups, company_key)
 
     # ── Active week = most recent week with orders ────────────
-    empty_week  = {'orders': [], 'order_count': 0, 'meal_count': 0,
+    empty_week  = {'order_count': 0, 'meal_count': 0, 'employees': 0,
                    'emp_spend': 0.0, 'co_spend': 0.0, 'bd_spend': 0.0,
                    'label': 'Latest Week', 'anchor': ''}
     active_week = sorted_weeks[0] if sorted_weeks else empty_week
 
     # ── Staff participation ────────────────────────────────────
-    active_week_unique     = len(set(
-        o['employee_email'] for o in active_week['orders'] if o.get('employee_email')
-    ))
-    total_unique_employees = len(set(
-        o['employee_email'] for o in all_orders if o.get('employee_email')
-    ))
+    active_week_unique     = active_week['employees']
+    total_unique_employees = totals['employees']
     _denom = total_unique_employees or 1
     active_week_pct = round(active_week_unique / _denom * 100)
     if sorted_weeks and total_unique_employees:
-        _week_pcts = [
-            len(set(o['employee_email'] for o in w['orders'] if o.get('employee_email'))) / total_unique_employees * 100
-            for w in sorted_weeks
-        ]
-        avg_participation_pct = round(sum(_week_pcts) / len(_week_pcts))
+        avg_participation_pct = round(sum(w['employees'] for w in sorted_weeks)
+                                      / total_unique_employees * 100 / len(sorted_weeks))
     else:
         avg_participation_pct = 0
 
     # ── All-time totals ────────────────────────────────────────
-    total_meals    = sum(len(o['meals'])  for o in all_orders)
-    total_co_spend = sum(o['co_total']   for o in all_orders)
-    total_bd_spend = sum(o['bd_total']   for o in all_orders)
-
-    # ── Serialize orders for JS invoice modal ─────────────────
-    orders_json = json.dumps([{
-        'order_id':      o['order_id'],
-        'employee_name': o['employee_name'],
-        'employee_email': o.get('employee_email', ''),
-        'delivery_date': o['delivery_date'],
-        'sunday_anchor': o.get('sunday_anchor', ''),
-        'status':        o.get('status', ''),
-        'emp_total':     round(o['emp_total'], 2),
-        'co_total':      round(o['co_total'],  2),
-        'bd_total':      round(o['bd_total'],  2),
-        'meals':         [{
-            'dish_name':     m['dish_name'],
-            'tier':          m['tier'],
-            'emp_price':     round(m['emp_price'],    2),
-            'total_subsidy': round(m['total_subsidy'], 2),
-        } for m in o['meals']],
-    } for o in all_orders])
+    total_meals    = totals['meals']
+    total_co_spend = totals['co_spend']
+    total_bd_spend = totals['bd_spend']
 
     saved_tab = request.args.get('saved')
 
@@ -1133,13 +3919,75 @@ def manager_dashboard():
                            total_unique_employees=total_unique_employees,
                            sorted_weeks=sorted_weeks,
                            sorted_monthly=sorted_monthly,
-                           orders_json=orders_json,
                            current_pin=current_pin,
                            employees=employees,
                            invoices=invoices,
                            saved_tab=saved_tab)
 
 
+
+# ─────────────────────────────────────────────────────────────
+# MANAGER JSON API  (scoped to session['manager_company_id']; the dashboard
+#                    loads order pages and invoice line items from here)
+# ─────────────────────────────────────────────────────────────
+def _company_orders(company_id, timeout=None):
+    """The company's grouped orders, oldest first."""
+    return _order_list(('company', company_id), _corporate_orders(company_id=company_id, timeout=timeout))
+
+
+@app.route('/manager/api/orders')
+@manager_required
+def manager_api_orders():
+    """Orders newest first, filterable by ?week= (Sunday anchor) and ?q=."""
+    week = request.args.get('week', '').strip()
+    q    = request.args.get('q', '').strip().lower()
+    try:
+        cursor = _decode_cursor(request.args.get('cursor'))
+    except ValueError as ex:
+        return _bad_request(str(ex))
+
+    orders = _company_orders(session.get('manager_company_id'))
+    if week or q:
+        orders = [o for o in orders
+                  if (not week or o['sunday_anchor'] == week)
+                  and (not q or _order_matches(o, q))]
+    try:
+        page, next_cursor = _paginate(orders, _order_sort_key, cursor,
+                                      _page_limit(request.args.get('limit')))
+    except ValueError as ex:
+        return _bad_request(str(ex))
+    body = {'orders': page, 'next_cursor': next_cursor}
+    if cursor is None:
+        body['summary'] = _order_summary(orders)
+    return jsonify(body)
+
+
+@app.route('/manager/api/orders/<order_id>')
+@manager_required
+def manager_api_order(order_id):
+    """One order with its meal lines (receipt modal)."""
+    for order in _company_orders(session.get('manager_company_id')):
+        if str(order['order_id']) == order_id:
+            return jsonify({'order': order})
+    return jsonify({'error': 'Order not found'}), 404
+
+
+@app.route('/manager/api/invoices/<invoice_id>')
+@manager_required
+def manager_api_invoice(invoice_id):
+    """An invoice plus the orders it bills (the company's orders for that week)."""
+    company_id = session.get('manager_company_id')
+    invoice = next((i for i in _all_invoices(company_id=company_id, timeout=10)
+                    if str(i.get('invoiceId', '')) == invoice_id
+                    and str(i.get('companyId', '')).upper() == str(company_id).upper()), None)
+    if invoice is None:
+        return jsonify({'error': 'Invoice not found'}), 404
+    anchor = _invoice_sort_key(invoice)[0]
+    orders = [o for o in _company_orders(company_id) if o['sunday_anchor'] == anchor]
+    orders.sort(key=lambda o: (str(o['employee_name']).lower(), str(o['order_id'])))
+    return jsonify({'invoice': invoice, 'orders': orders, 'summary': _order_summary(orders)})
+
+
 @app.route('/manager/update-account', methods=['POST'])
 @manager_required
 def manager_update_account():
@@ -1214,18 +4062,18 @@ def manager_logout():
 # ─────────────────────────────────────────────────────────────
 # BETTERDAY FOR WORK — CORPORATE EMPLOYEE ORDERING
 # ─────────────────────────────────────────────────────────────
-@app.route('/lander')
-def lander_redirect():
-    """Instant pass-through — redirects to /work immediately, token verified client-side."""
-    import json as _json
-    qs = request.query_string.decode('utf-8')
-    target = '/work' + ('?' + qs if qs else '')
-    html = f'''<!DOCTYPE html><html><head>
+_LANDER_SHELL = '''<!DOCTYPE html><html><head>
 <meta charset="UTF-8">
-<meta http-equiv="refresh" content="0;url={target}">
-<script>window.location.replace({_json.dumps(target)});</script>
+<noscript><meta http-equiv="refresh" content="0;url=/work"></noscript>
+<script>window.location.replace('/work' + window.location.search + window.location.hash);</script>
 </head><body></body></html>'''
-    return html, 200, {'Cache-Control': 'no-store, no-cache', 'Content-Type': 'text/html'}
+
+
+@app.route('/lander')
+def lander_redirect():
+    """Instant pass-through — redirects to /work immediately, token verified client-side.
+    The query string is carried over by the browser, so the shell is one cached page."""
+    return cached_page('lander', lambda: _LANDER_SHELL)
 
 
 @app.route('/api/magic-session')
@@ -1241,35 +4089,93 @@ def magic_session():
 @app.route('/work')
 def work_order():
     """Employee-facing corporate ordering portal."""
-    return render_template('work.html')
+    return cached_page('work.html')
 
 
 @app.route('/api/companies')
 def companies_list():
     """Return all companies currently in the Flask cache — instant, no GAS call."""
+    etag = _companies_etag()
+    return conditional_response(etag, _companies_body, modified=_last_modified('companies', etag),
+                                weak=True)   # weak: cache_age drifts, the list doesn't
+
+
+def _cached_companies():
     with _company_cache_lock:
-        companies = [
-            entry['data']['company']
-            for entry in _company_cache.values()
-            if entry['data'].get('found') and entry['data'].get('company')
-        ]
-    return jsonify({'companies': companies})
+        return [entry['data']['company'] for entry in _company_cache.values()
+                if entry['data'].get('found') and entry['data'].get('company')]
+
+
+def _companies_body():
+    refreshed = _company_status['last_bulk_refresh']
+    cache_age = round(time.time() - refreshed) if refreshed else None
+    return jsonify({'companies': _cached_companies(), 'cache_age': cache_age})
+
+
+def _companies_etag():
+    """ETag of the cached company list, recomputed only when the table changes."""
+    global _company_table_tag
+    with _company_cache_lock:
+        version, tag = _company_table_tag
+        if version == _company_version:
+            return tag
+        version = _company_version
+    tag = etag_digest(_cached_companies())
+    with _company_cache_lock:
+        if version == _company_version:
+            _company_table_tag = (version, tag)
+    return tag
 
 
 @app.route('/api/company/<company_id>')
 def company_lookup(company_id):
     """Fast cached company lookup — avoids GAS cold-start on every user keystroke."""
-    result = _cached_get_company(company_id)
-    if result is None:
-        return jsonify({'error': 'lookup failed'}), 502
-    return jsonify(result)
+    if _company_unknown(company_id):
+        result = {'found': False}
+    else:
+        result = _cached_get_company(company_id)
+        if result is None:
+            return jsonify({'error': 'lookup failed'}), 502
+    etag, modified = _company_validators(company_id, result)
+    return conditional_response(etag, lambda: jsonify(result), modified=modified)
+
+
+def _company_validators(company_id, result):
+    code = company_id.strip().upper()
+    etag = _entry_etag(_company_cache.get(code), result, _company_cache_lock)
+    return etag, _last_modified('company ' + code, etag)
+
+
+def _company_unknown(company_id):
+    """True when the full table is loaded and the code isn't in it — a typo,
+    not a cache gap. (save_company lists a new code right away.)"""
+    if not company_is_warm():
+        return False
+    with _company_cache_lock:
+        return company_id.strip().upper() not in _company_cache
+
+
+@app.route('/api/companies/search')
+def company_search():
+    """Typeahead over partial company codes and names — answered from memory.
+    `complete` says whether the full table is loaded, i.e. whether no match
+    means no such company."""
+    limit = min(request.args.get('limit', 8, type=int) or 8, 25)
+    return jsonify({'results': search_companies(request.args.get('q', ''), limit),
+                    'complete': company_is_warm()})
 
 
 @app.route('/work/submit', methods=['POST'])
 def work_submit():
-    """Server-side fallback / future Stripe integration point."""
-    data   = request.get_json(force=True) or {}
-    result = _gas_post({
+    """Server-side fallback / future Stripe integration point. The order is
+    journaled and acknowledged; the flusher delivers it to GAS."""
+    data = request.get_json(force=True) or {}
+    key, _ = enqueue_submission(_work_submit_payload(data), _submission_key(request.headers, data))
+    return jsonify({'status': 'ok', 'queued': True, 'idempotency_key': key}), 202
+
+
+def _work_submit_payload(data):
+    return {
         'action':           'submit_corporate_order',
         'company_id':       data.get('company_id'),
         'company_name':     data.get('company_name'),
@@ -1283,10 +4189,85 @@ def work_submit():
         'employee_price':   data.get('employee_price'),
         'company_coverage': data.get('company_coverage'),
         'bd_coverage':      data.get('bd_coverage', '0.00'),
-    }, timeout=12)
-    if result is None:
-        return jsonify({'status': 'error', 'message': 'Submission failed — please try again.'}), 500
-    return jsonify({'status': 'ok'}), 200
+    }
+
+
+_CART_MAX_LINES = 50
+_CART_LINE_FIELDS = ('sunday_anchor', 'delivery_date', 'meal_id', 'dish_name', 'diet_type',
+                     'tier', 'employee_price', 'company_coverage', 'bd_coverage')
+
+
+@app.route('/work/cart', methods=['POST'])
+def work_cart():
+    """Whole checkout in one submission: GAS reserves the OrderID per delivery
+    week and appends every meal in one locked operation. The cart is journaled
+    like /work/submit; the response carries a result per line, and a cart with
+    any invalid line is rejected whole (400)."""
+    data = request.get_json(force=True, silent=True)
+    payload, lines, error = _work_cart_payload(data)
+    if error:
+        return jsonify({'status': 'error', 'message': error, 'lines': lines}), 400
+    _cart_line_ids(lines, _assign_cart_order_ids(payload), data['lines'])
+    key, _ = enqueue_submission(payload, _submission_key(request.headers, data))
+    return jsonify({'status': 'ok', 'queued': True, 'idempotency_key': key, 'lines': lines}), 202
+
+
+def _work_cart_payload(data):
+    """(submit_corporate_cart payload, per-line results, error message or None)."""
+    if not isinstance(data, dict):
+        return None, [], 'Invalid JSON body'
+    raw = data.get('lines')
+    if not isinstance(raw, list) or not raw:
+        return None, [], 'lines must be a non-empty list'
+    if len(raw) > _CART_MAX_LINES:
+        return None, [], f'at most {_CART_MAX_LINES} lines per cart'
+    if not data.get('company_id') or not data.get('employee_email'):
+        return None, [], 'company_id and employee_email are required'
+    lines, results = [], []
+    for line in raw:
+        problem = _cart_line_problem(line)
+        if problem:
+            results.append({'ok': False, 'error': problem})
+            continue
+        lines.append({f: line.get(f) for f in _CART_LINE_FIELDS})
+        results.append({'ok': True})
+    rejected = len(raw) - len(lines)
+    if rejected:
+        # All or nothing: the employee confirms the cart they saw, not part of it
+        return None, results, f'{rejected} of {len(raw)} lines rejected — nothing was ordered'
+    payload = {
+        'action':         'submit_corporate_cart',
+        'company_id':     data.get('company_id'),
+        'company_name':   data.get('company_name'),
+        'employee_name':  data.get('employee_name'),
+        'employee_email': data.get('employee_email'),
+        'lines':          lines,
+    }
+    return payload, results, None
+
+
+def _cart_line_ids(results, ids, raw_lines):
+    """Add the reserved OrderID to each accepted line's result."""
+    for result, line in zip(results, raw_lines):
+        if result['ok'] and ids.get(line.get('sunday_anchor')):
+            result['order_id'] = ids[line['sunday_anchor']]
+
+
+def _cart_line_problem(line):
+    if not isinstance(line, dict):
+        return 'line must be an object'
+    if not line.get('meal_id'):
+        return 'meal_id is required'
+    try:
+        datetime.strptime(str(line.get('sunday_anchor', '')), '%Y-%m-%d')
+    except ValueError:
+        return 'sunday_anchor must be YYYY-MM-DD'
+    for field in ('employee_price', 'company_coverage', 'bd_coverage'):
+        try:
+            float(line.get(field) or 0)
+        except (TypeError, ValueError):
+            return f'{field} must be a number'
+    return None
 
 
 @app.route('/work/companies')
@@ -1323,8 +4304,12 @@ def company_editor(company_id):
 @app.route('/work/invoices/<sunday>')
 @admin_required
 def corporate_invoices(sunday):
-    all_corp       = _gas_post({'action': 'get_corporate_orders'}, timeout=15) or []
-    companies_list = _gas_post({'action': 'get_all_companies'}, timeout=10) or []
+    _gas_prefetch(replica_fallback('corporate_orders', _corporate_orders_payload()),
+                  {'action': 'get_all_companies'})
+    got = fan_out({'orders':    lambda: _corporate_orders(),
+                   'companies': lambda: _gas_post({'action': 'get_all_companies'})})
+    all_corp       = got.get('orders') or []
+    companies_list = got.get('companies') or []
 
     company_map = {}
     if isinstance(companies_list, list):
@@ -1385,43 +4370,35 @@ def work_admin():
     company_id    = request.args.get('company_id', '')
     sunday_anchor = request.args.get('sunday', '')
 
-    payload = {'action': 'get_corporate_orders'}
-    if company_id:    payload['company_id']    = company_id
-    if sunday_anchor: payload['sunday_anchor'] = sunday_anchor
-    orders = _gas_post(payload) or []
-
-    companies_list     = _gas_post({'action': 'get_all_companies'}) or []
-    all_teacher_orders = _gas_post({'action': 'get_all_orders'}) or []
-    bookings_raw       = _gas_get({'action': 'get_bookings'}) or []
+    _gas_prefetch(
+        replica_fallback('corporate_orders', _corporate_orders_payload(company_id, sunday_anchor)),
+        replica_fallback('corporate_orders', _corporate_orders_payload())
+        if company_id or sunday_anchor else None,
+        {'action': 'get_all_companies'},
+        replica_fallback('teacher_orders', {'action': 'get_all_orders'}),
+        replica_fallback('bookings', {'action': 'get_bookings'}),
+    )
 
+    tasks = {
+        'orders':    lambda: _corporate_orders(company_id, sunday_anchor),
+        'companies': lambda: _gas_post({'action': 'get_all_companies'}),
+        'teacher':   _teacher_orders,
+        'bookings':  _bookings_rows,
+    }
     # Full corp list always needed for week summaries even when filtered
-    full_corp = orders
     if company_id or sunday_anchor:
-        full_corp = _gas_post({'action': 'get_corporate_orders'}) or []
-
-    corp_by_anchor = defaultdict(list)
-    for o in (full_corp if isinstance(full_corp, list) else []):
-        corp_by_anchor[o.get('SundayAnchor', '')].append(o)
+        tasks['full_corp'] = _corporate_orders
+    got = fan_out(tasks)
 
-    teacher_by_anchor = defaultdict(list)
-    for o in (all_teacher_orders if isinstance(all_teacher_orders, list) else []):
-        anchor = get_sunday_anchor(o.get('date', ''))
-        if anchor:
-            teacher_by_anchor[anchor].append(o)
+    orders             = got.get('orders') or []
+    companies_list     = got.get('companies') or []
+    all_teacher_orders = got.get('teacher') or []
+    bookings_raw       = got.get('bookings') or []
+    full_corp          = got.get('full_corp', orders) or []
 
-    school_by_anchor = defaultdict(set)
-    for b in (bookings_raw if isinstance(bookings_raw, list) else []):
-        try:
-            if not isinstance(b, list) or len(b) < 3:
-                continue
-            if 'Date' in str(b[0]) or str(b[2]).isdigit():
-                continue
-            d_date = str(b[0]).split('T')[0]
-            anchor = get_sunday_anchor(d_date)
-            if anchor:
-                school_by_anchor[anchor].add(str(b[2]))
-        except Exception as ex:
-            log.debug('work_admin school parse: %s', ex)
+    corp     = _report_frame('corporate_orders', full_corp)
+    teacher  = _report_frame('teacher_orders', all_teacher_orders)
+    bookings = _report_frame('bookings', bookings_raw)
 
     start_date     = _current_monday()
     week_summaries = []
@@ -1429,20 +4406,21 @@ def work_admin():
         monday = start_date + timedelta(weeks=i)
         sunday = (monday - timedelta(days=1)).strftime('%Y-%m-%d')
 
-        corp_orders  = corp_by_anchor.get(sunday, [])
-        teach_orders = teacher_by_anchor.get(sunday, [])
-        school_names = school_by_anchor.get(sunday, set())
+        corp_week    = _week_mask(corp['anchor'], sunday)
+        office_meals = int(np.count_nonzero(corp_week))
+        school_meals = int(np.count_nonzero(_week_mask(teacher['anchor'], sunday)))
+        school_week  = _week_mask(bookings['anchor'], sunday)
 
         week_summaries.append({
             'anchor':          sunday,
             'nice_date':       format_week_header(sunday),
             'delivery_monday': monday.strftime('%b %d'),
-            'offices':         len({o.get('CompanyName') for o in corp_orders if o.get('CompanyName')}),
-            'office_meals':    len(corp_orders),
-            'employees':       len({o.get('EmployeeName') for o in corp_orders if o.get('EmployeeName')}),
-            'schools':         len(school_names),
-            'school_meals':    len(teach_orders),
-            'total_meals':     len(corp_orders) + len(teach_orders),
+            'offices':         _distinct(corp['company'], corp['company_names'], corp_week),
+            'office_meals':    office_meals,
+            'employees':       _distinct(corp['employee'], corp['employee_names'], corp_week),
+            'schools':         len(np.unique(bookings['school'][school_week])),
+            'school_meals':    school_meals,
+            'total_meals':     office_meals + school_meals,
         })
 
     grouped = defaultdict(lambda: defaultdict(list))
@@ -1463,18 +4441,578 @@ def work_admin():
                            sunday_anchor=sunday_anchor)
 
 
+# ─────────────────────────────────────────────────────────────
+# MENU SERVICE  (weekly menus keyed by sunday_anchor, served from memory
+#                with strong ETags; get_menu opens the BUFFER spreadsheet
+#                and scans two sheets on every GAS call)
+#   The current week and the next few are prefetched at warm-up and kept
+#   warm; stale entries are served while a background refresh runs.
+# ─────────────────────────────────────────────────────────────
+_MENU_REFRESH = _GAS_CACHE_TTLS['get_menu']   # seconds before an entry is refreshed
+_MENU_WEEKS   = int(os.environ.get('MENU_PREFETCH_WEEKS', 3))   # this week + the next ones
+_MENU_MAX     = 52
+
+_menu_cache      = OrderedDict()   # sunday_anchor → {data, body, etag, ts}
+_menu_lock       = threading.Lock()
+_menu_refreshing = set()
+_menu_stats      = {'hits': 0, 'misses': 0, 'refreshes': 0, 'not_modified': 0, 'errors': 0}
+
+
+def _valid_anchor(anchor):
+    try:
+        datetime.strptime(anchor, '%Y-%m-%d')
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+def _load_menu(anchor, fresh=False):
+    """Read one week's menu through the GAS read cache and store it; returns
+    the entry, or None if GAS had no answer. fresh: skip the read cache (its
+    TTL matches _MENU_REFRESH, so a refresh would otherwise re-serve it)."""
+    if fresh:
+        _gas_cache_forget({'action': 'get_menu', 'sunday_anchor': anchor})
+    try:
+        status, data = _gas_call({'action': 'get_menu', 'sunday_anchor': anchor})
+    except Exception as ex:
+        status, data = None, ex
+    return _store_menu(anchor, status, data)
+
+
+def _store_menu(anchor, status, data):
+    """Cache a get_menu answer (status None: data is the exception)."""
+    if status != 200 or not isinstance(data, dict):
+        _menu_stats['errors'] += 1
+        log.warning('menu load failed (%s): %s', anchor, data if status is None else status)
+        return None
+    body  = json.dumps(data, sort_keys=True, separators=(',', ':')).encode()
+    entry = {'data': data, 'body': body, 'etag': hashlib.sha256(body).hexdigest()[:32],
+             'ts': time.time()}
+    with _menu_lock:
+        _menu_cache[anchor] = entry
+        _menu_cache.move_to_end(anchor)
+        while len(_menu_cache) > _MENU_MAX:
+            _menu_cache.popitem(last=False)
+    return entry
+
+
+def week_menu(anchor):
+    """Cached menu entry for a week ({data, body, etag, ts}), or None when GAS
+    couldn't provide one. The entry is shared — treat it as read-only."""
+    entry = _menu_probe(anchor)
+    if entry is None:
+        return _single_flight('menu ' + anchor, lambda: _load_menu(anchor))
+    return entry
+
+
+def _menu_probe(anchor):
+    """The cached entry (refreshed in the background when stale), or None
+    on a miss."""
+    with _menu_lock:
+        entry = _menu_cache.get(anchor)
+        if entry:
+            _menu_cache.move_to_end(anchor)
+            _menu_stats['hits'] += 1
+    if entry is None:
+        _menu_stats['misses'] += 1
+        return None
+    if time.time() - entry['ts'] > _MENU_REFRESH:
+        _refresh_menu_async(anchor)
+    return entry
+
+
+def _refresh_menu_async(anchor):
+    with _menu_lock:
+        if anchor in _menu_refreshing:
+            return
+        _menu_refreshing.add(anchor)
+
+    def run():
+        try:
+            _menu_stats['refreshes'] += 1
+            _load_menu(anchor, fresh=True)
+        finally:
+            with _menu_lock:
+                _menu_refreshing.discard(anchor)
+
+    threading.Thread(target=run, daemon=True).start()
+
+
+def _menu_week_anchors():
+    today  = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    sunday = today - timedelta(days=(today.weekday() + 1) % 7)
+    return [(sunday + timedelta(weeks=w)).strftime('%Y-%m-%d') for w in range(_MENU_WEEKS)]
+
+
+def _load_menus(anchors, fresh=False):
+    """Load several weeks, paying for one GAS round trip (fresh: as _load_menu)."""
+    payloads = [{'action': 'get_menu', 'sunday_anchor': a} for a in anchors]
+    if fresh:
+        _gas_cache_forget(*payloads)
+    _gas_prefetch(*payloads)
+    for anchor in anchors:
+        _load_menu(anchor)
+
+
+def _menu_prefetch_loop():
+    """Keep the current and upcoming weeks loaded (and roll over on Sundays)."""
+    while True:
+        now = time.time()
+        with _menu_lock:
+            due = [a for a in _menu_week_anchors()
+                   if a not in _menu_cache or now - _menu_cache[a]['ts'] > _MENU_REFRESH]
+        if due:
+            try:
+                _load_menus(due, fresh=True)
+            except Exception as ex:
+                log.warning('menu prefetch error: %s', ex)
+        if _MENU_REFRESH <= 0:
+            return
+        time.sleep(_MENU_REFRESH)
+
+
+def refresh_menus():
+    """A menu was saved: drop cached get_menu reads and reload every cached
+    week. Returns the anchors reloaded."""
+    _gas_invalidate('save_menu_state')
+    with _menu_lock:
+        anchors = sorted(set(_menu_cache) | set(_menu_week_anchors()))
+    _load_menus(anchors)
+    return anchors
+
+
+def _menu_response(anchor, entry):
+    # no-cache: always revalidate; an unchanged menu costs a 304
+    resp = conditional_response(
+        entry['etag'], lambda: app.response_class(entry['body'], mimetype='application/json'),
+        modified=_last_modified('menu ' + anchor, entry['etag']))
+    if resp.status_code == 304:
+        _menu_stats['not_modified'] += 1
+    return resp
+
+
+def menu_status():
+    with _menu_lock:
+        weeks = {a: round(time.time() - e['ts'], 1) for a, e in _menu_cache.items()}
+    return dict(_menu_stats, refresh=_MENU_REFRESH, weeks=weeks)
+
+
+@app.route('/api/menu/<anchor>')
+def menu_api(anchor):
+    """One week's menu (same shape as GAS get_menu), ETag-revalidated."""
+    if not _valid_anchor(anchor):
+        return _bad_request('anchor must be YYYY-MM-DD')
+    entry = week_menu(anchor)
+    if entry is None:
+        return jsonify({'error': 'Menu is currently unavailable — please try again.'}), 502
+    return _menu_response(anchor, entry)
+
+
+@app.route('/api/menu/refresh', methods=['POST'])
+@admin_required
+def menu_refresh():
+    """Called by the menu builder after a save."""
+    return jsonify({'status': 'ok', 'refreshed': refresh_menus()})
+
+
 # ─────────────────────────────────────────────────────────────
 # MENU BUILDER
 # ─────────────────────────────────────────────────────────────
 @app.route('/menubuilder')
 @admin_required
 def menubuilder():
-    return render_template('menubuilder-chef.html')
+    return cached_page('menubuilder-chef.html', cache_control='private, no-cache')
+
+
+# ─────────────────────────────────────────────────────────────
+# ASYNC SERVING PATH  (uvicorn app:asgi_app)
+#   /api/gas, /api/company/<id> and the /work order submissions are answered
+#   on the event loop with an async GAS client, so a slow or cold Apps Script holds a
+#   coroutine rather than a worker thread. Every other route is the Flask
+#   app, run on a bounded thread pool. Caches, stats and invalidation are
+#   shared with the sync path.
+# ─────────────────────────────────────────────────────────────
+_GAS_ASYNC_MAX_CONNECTIONS = int(os.environ.get('GAS_ASYNC_MAX_CONNECTIONS', 200))
+_WSGI_THREADS              = int(os.environ.get('WSGI_THREADS', 16))
+
+_async_client_ref = None   # (event loop, httpx.AsyncClient)
+_async_inflight   = {}     # single-flight key → Future, on the serving loop
+_async_stats      = {'requests': 0, 'in_flight': 0, 'max_in_flight': 0}
+
+
+def _async_gas_client():
+    global _async_client_ref
+    loop = asyncio.get_running_loop()
+    if _async_client_ref is None or _async_client_ref[0] is not loop:
+        client = httpx.AsyncClient(
+            follow_redirects=True,   # Apps Script answers from a googleusercontent redirect
+            limits=httpx.Limits(max_connections=_GAS_ASYNC_MAX_CONNECTIONS,
+                                max_keepalive_connections=_GAS_POOL_SIZE))
+        _async_client_ref = (loop, client)
+    return _async_client_ref[1]
+
+
+async def _gas_fetch_async(payload, method='POST', timeout=None, cap=None):
+    """_gas_fetch on the event loop: same timeouts, cap, retry rules and stats."""
+    action  = payload.get('action', '')
+    timeout = _gas_timeout(action, timeout)
+    ends    = None if cap is None else time.monotonic() + cap
+    is_read = _gas_is_read(payload, method)
+    client  = _async_gas_client()
+    started = time.perf_counter()
+    attempt = 0
+    wait    = _gas_attempt_timeout(timeout, ends) or 0.001
+    while True:
+        # pool=None: queue for a connection rather than fail
+        limits = httpx.Timeout(wait, pool=None)
+        try:
+            if method == 'GET':
+                r = await client.get(GOOGLE_SCRIPT_URL, params=payload, timeout=limits)
+            else:
+                r = await client.post(GOOGLE_SCRIPT_URL, json=payload, timeout=limits)
+            if r.status_code >= 500 and is_read and attempt < _GAS_MAX_RETRIES:
+                raise httpx.HTTPStatusError(f'GAS {r.status_code}', request=r.request, response=r)
+            data = r.json()
+        except (httpx.TransportError, httpx.HTTPStatusError) as ex:
+            retryable = is_read or isinstance(ex, httpx.ConnectTimeout)
+            pause     = _GAS_RETRY_PAUSE * (2 ** attempt)
+            wait      = _gas_attempt_timeout(timeout, None if ends is None else ends - pause)
+            if retryable and attempt < _GAS_MAX_RETRIES and wait:
+                await asyncio.sleep(pause)
+                attempt += 1
+                continue
+            _record_gas_call(action, started, False, attempt)
+            raise
+        except Exception:
+            _record_gas_call(action, started, False, attempt)
+            raise
+        _record_gas_call(action, started, True, attempt)
+        return r.status_code, data
+
+
+async def _single_flight_async(key, fetch):
+    """_single_flight for coroutines: concurrent callers await the leader's result."""
+    future = _async_inflight.get(key)
+    if future is not None:
+        with _inflight_lock:
+            _inflight_stats['collapsed'] += 1
+        return await asyncio.shield(future)
+    future = _async_inflight[key] = asyncio.get_running_loop().create_future()
+    with _inflight_lock:
+        _inflight_stats['upstream'] += 1
+    try:
+        result = await fetch()
+        future.set_result(result)
+        return result
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as ex:
+        future.set_exception(ex)
+        future.exception()   # retrieved — no "never retrieved" warning without followers
+        raise
+    finally:
+        _async_inflight.pop(key, None)
+
+
+async def _off_loop(fn, *args):
+    """Run a call that may touch SQLite (shared cache tier, token store)
+    without stalling the loop; memory-only setups run it inline."""
+    if _SHARED_CACHE or _TOKEN_BACKEND == 'sqlite':
+        return await asyncio.to_thread(fn, *args)
+    return fn(*args)
+
+
+async def _gas_call_async(payload, method='POST', timeout=None, cap=None):
+    """_gas_call on the event loop — shares its cache, generations and invalidation."""
+    action = payload.get('action', '')
+    ttl    = _GAS_CACHE_TTLS.get(action)
+    key    = _gas_cache_key(payload, method)
+    fetch  = lambda: _gas_fetch_async(payload, method=method, timeout=timeout, cap=cap)
+    if not ttl:
+        if method == 'GET' or action in _GAS_READ_ACTIONS:
+            return await _single_flight_async(key, fetch)
+        try:
+            return await fetch()
+        finally:
+            # Invalidate even on timeout — GAS may still have applied the write.
+            await asyncio.to_thread(_gas_invalidate, action, payload)
+
+    hit, gen = await _off_loop(_gas_cache_lookup, key, action, ttl)
+    if gen is None:
+        return 200, hit
+    status, data = await _single_flight_async(f'{key}#{gen}', fetch)
+    if status == 200:
+        await _off_loop(_gas_cache_put, key, action, gen, data)
+    return status, data
+
+
+async def _gas_post_async(payload, timeout=None, cap=None):
+    try:
+        status, data = await _gas_call_async(payload, timeout=timeout, cap=cap)
+        return data if status == 200 else None
+    except Exception as ex:
+        log.warning('GAS POST error (action=%s): %s', payload.get('action'), ex)
+        return None
+
+
+async def _cached_get_company_async(company_id):
+    code = company_id.strip().upper()
+    hit  = _company_cache_probe(code)
+    if hit is not None:
+        return hit
+    try:
+        _, result = await _single_flight_async(
+            'company ' + code,
+            lambda: _gas_fetch_async({'action': 'get_company', 'company_id': code}, timeout=15))
+    except Exception as ex:
+        log.warning('company lookup error (%s): %s', code, ex)
+        return None
+    await asyncio.to_thread(_store_company_result, code, result)   # index upkeep, off the loop
+    return result
+
+
+async def _week_menu_async(anchor):
+    """week_menu on the event loop."""
+    entry = _menu_probe(anchor)
+    if entry is not None:
+        return entry
+
+    async def load():
+        try:
+            status, data = await _gas_call_async({'action': 'get_menu', 'sunday_anchor': anchor})
+        except Exception as ex:
+            status, data = None, ex
+        return await asyncio.to_thread(_store_menu, anchor, status, data)   # serializes and hashes
+
+    return await _single_flight_async('menu ' + anchor, load)
+
+
+async def _lease_order_ids_async():
+    """_lease_order_ids(below=1) on the event loop. False when the lease failed."""
+    async def lease():
+        if await asyncio.to_thread(_order_ids_left) >= 1:
+            return True
+        if time.time() < _order_id_off_until:
+            return False
+        try:
+            _, data = await _gas_call_async({'action': 'lease_order_ids', 'count': _ORDER_ID_BLOCK})
+            await asyncio.to_thread(_store_order_block, data)
+        except Exception as ex:
+            _order_lease_failed(ex, isinstance(ex, json.JSONDecodeError))
+            return False
+        return True
+
+    return await _single_flight_async('lease_order_ids', lease)
+
+
+async def _reserve_order_id_async(email, sunday_anchor):
+    """reserve_order_id on the event loop: SQLite work goes to a thread,
+    GAS round trips stay on the loop."""
+    email, anchor = _order_id_key(email, sunday_anchor)
+    if not email or not anchor:
+        return None
+    hit = await asyncio.to_thread(_order_map_get, email, anchor)
+    if hit:
+        _order_id_stats['map_hits'] += 1
+        return hit
+
+    order_id = None
+    if await asyncio.to_thread(_order_map_complete):
+        for _ in range(3):
+            order_id = await asyncio.to_thread(_take_order_id)
+            if order_id is not None or not await _lease_order_ids_async():
+                break
+    if order_id is None:
+        _order_id_stats['gas_fallbacks'] += 1
+        data = await _gas_post_async({'action': 'reserve_order_id', 'email': email,
+                                      'sunday_anchor': anchor})
+        order_id = data.get('order_id') if isinstance(data, dict) else None
+        if not order_id:
+            return None
+    return await asyncio.to_thread(_order_map_put, email, anchor, order_id)
+
+
+async def _assign_cart_order_ids_async(payload):
+    """_assign_cart_order_ids on the event loop; the cart's weeks are
+    reserved concurrently."""
+    anchors = list(dict.fromkeys(line['sunday_anchor'] for line in payload['lines']))
+    results = await asyncio.gather(
+        *[_reserve_order_id_async(payload['employee_email'], a) for a in anchors],
+        return_exceptions=True)
+    ids = {}
+    for anchor, result in zip(anchors, results):
+        if isinstance(result, sqlite3.Error):
+            log.warning('order ID reservation error: %s', result)
+            result = None
+        elif isinstance(result, BaseException):
+            raise result
+        ids[anchor] = result
+    for line in payload['lines']:
+        if ids[line['sunday_anchor']]:
+            line['order_id'] = ids[line['sunday_anchor']]
+    return ids
+
+
+async def _async_gas_proxy(body, headers):
+    """/api/gas — mirrors gas_proxy()."""
+    payload = body if isinstance(body, dict) else {}
+    if payload.get('action') == 'create_magic_token':
+        await asyncio.to_thread(_prepare_magic_token, payload)
+    elif payload.get('action') == 'verify_magic_token':
+        token  = str(payload.get('token', '')).strip()
+        result = await asyncio.to_thread(_verify_magic_token_flask, token)
+        if result:
+            email, company_id = result
+            emp_data, comp_data = await asyncio.gather(
+                _gas_post_async({'action': 'get_employee_by_email',
+                                 'email': email, 'company_id': company_id}, timeout=12),
+                _cached_get_company_async(company_id))
+            verified = _magic_token_answer(emp_data, comp_data)
+            if verified:
+                return 200, verified
+    elif payload.get('action') == 'get_menu' and _valid_anchor(payload.get('sunday_anchor')):
+        anchor = payload['sunday_anchor']
+        entry  = await _week_menu_async(anchor)
+        if entry:
+            return 200, entry['data'], (entry['etag'], _last_modified('menu ' + anchor, entry['etag']))
+    elif payload.get('action') == 'reserve_order_id':
+        order_id = await _reserve_order_id_async(payload.get('email'), payload.get('sunday_anchor'))
+        if order_id:
+            return 200, {'order_id': order_id}
+
+    try:
+        status, data = await _gas_call_async(payload)
+        if status == 200 and payload.get('action') in _GAS_READ_ACTIONS:
+            # hashing a large read would stall every coroutine on the loop
+            return status, data, await asyncio.to_thread(_gas_read_validators, payload, data)
+        return status, data
+    except httpx.TimeoutException:
+        log.warning('GAS timeout: action=%s', payload.get('action'))
+        return 504, {'error': 'Request timed out — please try again.'}
+    except Exception as ex:
+        log.error('GAS proxy error: %s', ex)
+        return 500, {'error': 'Server error — please try again.'}
+
+
+async def _async_company_lookup(company_id):
+    """/api/company/<id> — mirrors company_lookup()."""
+    if _company_unknown(company_id):
+        result = {'found': False}
+    else:
+        result = await _cached_get_company_async(company_id)
+        if result is None:
+            return 502, {'error': 'lookup failed'}
+    return 200, result, await asyncio.to_thread(_company_validators, company_id, result)
+
+
+async def _async_work_submit(body, headers):
+    """/work/submit — mirrors work_submit()."""
+    data = body if isinstance(body, dict) else {}
+    key, _ = await asyncio.to_thread(enqueue_submission, _work_submit_payload(data),
+                                     _submission_key(headers, data))
+    return 202, {'status': 'ok', 'queued': True, 'idempotency_key': key}
+
+
+async def _async_work_cart(body, headers):
+    """/work/cart — mirrors work_cart()."""
+    payload, lines, error = _work_cart_payload(body)
+    if error:
+        return 400, {'status': 'error', 'message': error, 'lines': lines}
+    _cart_line_ids(lines, await _assign_cart_order_ids_async(payload), body['lines'])
+    key, _ = await asyncio.to_thread(enqueue_submission, payload, _submission_key(headers, body))
+    return 202, {'status': 'ok', 'queued': True, 'idempotency_key': key, 'lines': lines}
+
+
+_ASYNC_ROUTES = [
+    # (method, path pattern, handler, handler takes the JSON body and headers)
+    # Handlers return (status, body) or, for cacheable reads,
+    # (status, body, (etag, last_modified)).
+    ('POST', re.compile(r'/api/gas'),              _async_gas_proxy,       True),
+    ('GET',  re.compile(r'/api/company/([^/]+)'),  _async_company_lookup,  False),
+    ('POST', re.compile(r'/work/submit'),          _async_work_submit,     True),
+    ('POST', re.compile(r'/work/cart'),            _async_work_cart,       True),
+]
+
+_wsgi_app = WSGIMiddleware(app, workers=_WSGI_THREADS)
+
+
+async def _asgi_read_json(receive):
+    chunks = []
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return None
+        chunks.append(message.get('body', b''))
+        if not message.get('more_body'):
+            break
+    raw = b''.join(chunks)
+    return json.loads(raw) if raw.strip() else None
+
+
+async def _asgi_send_json(send, status, body, extra_headers=()):
+    data = json.dumps(body, separators=(',', ':')).encode()
+    await send({'type': 'http.response.start', 'status': status,
+                'headers': [(b'content-type', b'application/json'),
+                            (b'content-length', str(len(data)).encode()), *extra_headers]})
+    await send({'type': 'http.response.body', 'body': data})
+
+
+async def _asgi_lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            _start_warmup()
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            if _async_client_ref is not None:
+                await _async_client_ref[1].aclose()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def asgi_app(scope, receive, send):
+    """ASGI entrypoint: async handlers for the GAS-bound JSON endpoints, Flask
+    for everything else."""
+    if scope['type'] == 'lifespan':
+        return await _asgi_lifespan(receive, send)
+    if scope['type'] == 'http':
+        for method, pattern, handler, takes_body in _ASYNC_ROUTES:
+            match = pattern.fullmatch(scope['path'])
+            if match and scope['method'] == method:
+                return await _asgi_dispatch(handler, takes_body, match.groups(), scope, receive, send)
+    return await _wsgi_app(scope, receive, send)
+
+
+async def _asgi_dispatch(handler, takes_body, args, scope, receive, send):
+    _start_warmup()
+    _async_stats['requests']  += 1
+    _async_stats['in_flight'] += 1
+    _async_stats['max_in_flight'] = max(_async_stats['max_in_flight'], _async_stats['in_flight'])
+    headers = {k.decode('latin-1').title(): v.decode('latin-1') for k, v in scope['headers']}
+    try:
+        if takes_body:
+            try:
+                body = await _asgi_read_json(receive)
+            except ValueError:
+                return await _asgi_send_json(send, 400, {'error': 'Invalid JSON body'})
+            args = (body or {}, headers) + args
+        status, response, *validators = await handler(*args)
+        if validators and status == 200:
+            etag, modified = validators[0]
+            extra = _validator_headers(etag, modified)
+            if _not_modified_check(headers, etag, modified):
+                await send({'type': 'http.response.start', 'status': 304, 'headers': extra})
+                return await send({'type': 'http.response.body', 'body': b''})
+            return await _asgi_send_json(send, status, response, extra)
+        await _asgi_send_json(send, status, response)
+    finally:
+        _async_stats['in_flight'] -= 1
 
 
 # ─────────────────────────────────────────────────────────────
 # ENTRYPOINT
 # ─────────────────────────────────────────────────────────────
 if __name__ == '__main__':
-    threading.Thread(target=_warmup_gas, daemon=True).start()
+    _start_warmup()
     app.run(host='0.0.0.0', port=int(os.environ.get('PORT', 5001)))
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+End-to-end load benchmark for the BetterDay Flask app.
+
+By default this starts the local GAS emulator (gas_emulator.py) and the Flask
+app in-process, both on ephemeral ports, then drives the main user paths with
+N concurrent virtual users and reports p50/p95/p99 latency and throughput:
+
+  work        GET /work, /api/company/<id> and the /api/gas reads work.html makes
+  manager     GET /manager/dashboard (after a manager login)
+  bd_admin    GET /bd-admin/dashboard (after an admin login)
+  work_admin  GET /work/admin
+
+  python bench.py --users 20 --requests 25
+  python bench.py --scenario work --users 50 --latency 0.3 --row-cost 0.00002
+  python bench.py --target http://127.0.0.1:5001   # app already running against an emulator
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+import requests
+
+import gas_emulator
+
+SCENARIOS = ('work', 'manager', 'bd_admin', 'work_admin')
+
+
+def _current_anchor():
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    monday = today - timedelta(days=today.weekday())
+    return (monday - timedelta(days=1)).strftime('%Y-%m-%d')
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+class VirtualUser:
+    def __init__(self, base, scenario, uid, companies, admin_password):
+        self.base = base
+        self.scenario = scenario
+        self.http = requests.Session()
+        self.company_id = companies[uid % len(companies)]
+        self.email = f"emp{uid % 15:03d}@{self.company_id.lower()}.example.com"
+        self.admin_password = admin_password
+
+    def login(self):
+        if self.scenario == 'manager':
+            self.http.post(f"{self.base}/manager",
+                           data={'company_id': self.company_id, 'password': '1234'},
+                           allow_redirects=False)
+        elif self.scenario in ('bd_admin', 'work_admin'):
+            self.http.post(f"{self.base}/admin-login",
+                           data={'password': self.admin_password}, allow_redirects=False)
+
+    def iteration(self):
+        """One page view; returns a list of (label, seconds, ok)."""
+        calls = []
+
+        def hit(label, method, path, **kw):
+            t0 = time.perf_counter()
+            try:
+                r = self.http.request(method, self.base + path, timeout=60, **kw)
+                ok = r.status_code < 400
+            except requests.RequestException:
+                ok = False
+            calls.append((label, time.perf_counter() - t0, ok))
+
+        if self.scenario == 'work':
+            anchor = _current_anchor()
+            hit('GET /work', 'GET', '/work')
+            hit('GET /api/company', 'GET', f'/api/company/{self.company_id}')
+            for week in range(3):
+                a = (datetime.strptime(anchor, '%Y-%m-%d') + timedelta(weeks=week)).strftime('%Y-%m-%d')
+                hit('POST /api/gas get_menu', 'POST', '/api/gas',
+                    json={'action': 'get_menu', 'sunday_anchor': a})
+            hit('POST /api/gas get_week_order_counts', 'POST', '/api/gas',
+                json={'action': 'get_week_order_counts', 'email': self.email})
+        elif self.scenario == 'manager':
+            hit('GET /manager/dashboard', 'GET', '/manager/dashboard')
+        elif self.scenario == 'bd_admin':
+            hit('GET /bd-admin/dashboard', 'GET', '/bd-admin/dashboard')
+        elif self.scenario == 'work_admin':
+            hit('GET /work/admin', 'GET', '/work/admin')
+        return calls
+
+
+def run_scenario(base, scenario, users, per_user, companies, admin_password):
+    samples = []
+    samples_lock = threading.Lock()
+    vus = [VirtualUser(base, scenario, i, companies, admin_password) for i in range(users)]
+    for vu in vus:
+        vu.login()
+    barrier = threading.Barrier(users + 1)
+
+    def worker(vu):
+        barrier.wait()
+        for _ in range(per_user):
+            calls = vu.iteration()
+            with samples_lock:
+                samples.extend(calls)
+
+    threads = [threading.Thread(target=worker, args=(vu,), daemon=True) for vu in vus]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for t in threads:
+        t.join()
+    return samples, time.perf_counter() - started
+
+
+def summarize(scenario, samples, wall):
+    by_label = {}
+    for label, secs, ok in samples:
+        by_label.setdefault(label, []).append((secs, ok))
+    rows = []
+    for label, vals in by_label.items():
+        lat = [s * 1000 for s, _ in vals]
+        rows.append({
+            'scenario': scenario, 'endpoint': label, 'requests': len(vals),
+            'errors': sum(1 for _, ok in vals if not ok),
+            'p50_ms': round(_percentile(lat, 50), 1),
+            'p95_ms': round(_percentile(lat, 95), 1),
+            'p99_ms': round(_percentile(lat, 99), 1),
+            'mean_ms': round(statistics.fmean(lat), 1),
+            'rps': round(len(vals) / wall, 1) if wall else 0.0,
+        })
+    return rows
+
+
+def _print_table(rows):
+    cols = ['scenario', 'endpoint', 'requests', 'errors', 'p50_ms', 'p95_ms', 'p99_ms', 'rps']
+    widths = {c: max(len(c), *(len(str(r[c])) for r in rows)) for c in cols}
+    print('  '.join(c.ljust(widths[c]) for c in cols))
+    for r in rows:
+        print('  '.join(str(r[c]).ljust(widths[c]) for c in cols))
+
+
+def main():
+    p = argparse.ArgumentParser(description='BetterDay end-to-end load benchmark')
+    p.add_argument('--scenario', action='append', choices=SCENARIOS,
+                   help='repeatable; default runs all scenarios')
+    p.add_argument('--users', type=int, default=10, help='concurrent virtual users')
+    p.add_argument('--requests', type=int, default=10, help='iterations per user')
+    p.add_argument('--target', help='benchmark an already-running app instead of starting one')
+    p.add_argument('--admin-password', default=os.environ.get('ADMIN_PASSWORD', 'betterday2024'))
+    p.add_argument('--companies', type=int, default=20)
+    p.add_argument('--weeks', type=int, default=26)
+    p.add_argument('--cold-start', type=float, default=0.0)
+    p.add_argument('--latency', type=float, default=0.05)
+    p.add_argument('--row-cost', type=float, default=0.00001)
+    p.add_argument('--json', dest='json_out', help='also write results as JSON to this path')
+    args = p.parse_args()
+
+    companies = [f"CO{c:03d}" for c in range(args.companies)]
+    emulator = None
+    base = args.target
+    if not base:
+        hub = gas_emulator.Hub(companies=args.companies, weeks=args.weeks)
+        server, emulator = gas_emulator.serve(port=0, hub=hub, cold_start=args.cold_start,
+                                              latency=args.latency, row_cost=args.row_cost)
+        os.environ['GOOGLE_SCRIPT_URL'] = f"http://127.0.0.1:{server.server_port}/exec"
+        from werkzeug.serving import make_server
+        import app as betterday
+        logging.getLogger('werkzeug').setLevel(logging.WARNING)
+        app_server = make_server('127.0.0.1', 0, betterday.app, threaded=True)
+        threading.Thread(target=app_server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{app_server.server_port}"
+        print(f"emulator: {os.environ['GOOGLE_SCRIPT_URL']} "
+              f"({len(hub.corp) - 1} corporate rows)  app: {base}")
+
+    results = []
+    for scenario in args.scenario or SCENARIOS:
+        samples, wall = run_scenario(base, scenario, args.users, args.requests,
+                                     companies, args.admin_password)
+        results.extend(summarize(scenario, samples, wall))
+
+    _print_table(results)
+    if emulator:
+        print(f"\nupstream GAS calls: {emulator.stats()['calls']}")
+    if args.json_out:
+        with open(args.json_out, 'w') as f:
+            json.dump({'args': vars(args), 'results': results,
+                       'upstream': emulator.stats() if emulator else None}, f, indent=2)
+    return 1 if any(r['errors'] for r in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -37,6 +37,17 @@ function doPost(e) {
     var ssHub = SpreadsheetApp.getActiveSpreadsheet();
     var sheet1 = ssHub.getSheetByName("Sheet1");
     // ─────────────────────────────────────────
+    // BATCH  (several actions in one round trip)
+    // {action:"batch", calls:[{action:...}, ...]} → {results:[{ok, data|error}, ...]}
+    // in call order; get_bookings is answered as the GET would be
+    // ─────────────────────────────────────────
+    if (data.action === "batch") {
+      var calls = data.calls || [];
+      var results = [];
+      for (var b = 0; b < calls.length; b++) results.push(runBatchCall(calls[b]));
+      return jsonOut({results: results});
+    }
+    // ─────────────────────────────────────────
     // GET COMPANY
     // ─────────────────────────────────────────
     if (data.action === "get_company") {
@@ -508,34 +519,41 @@ function doPost(e) {
       return jsonOut({ order_id: getNextOrderId(ssHub) });
     }
     // ─────────────────────────────────────────
+    // LEASE ORDER IDS  (Flask hands these out locally)
+    // {count} → {first, last}; LastOrderID moves past the block
+    // ─────────────────────────────────────────
+    if (data.action === "lease_order_ids") {
+      var count = Math.min(Math.max(parseInt(data.count, 10) || 0, 1), 1000);
+      var lock = LockService.getScriptLock();
+      lock.waitLock(20000);
+      try {
+        var first = getNextOrderId(ssHub, count);
+        return jsonOut({first: first, last: first + count - 1});
+      } finally {
+        lock.releaseLock();
+      }
+    }
+    // ─────────────────────────────────────────
     // SUBMIT CORPORATE ORDER
     // ─────────────────────────────────────────
     if (data.action === "submit_corporate_order") {
-      var corpSheet = ssHub.getSheetByName("CorporateOrders");
-      if (!corpSheet) {
-        corpSheet = ssHub.insertSheet("CorporateOrders");
-        corpSheet.appendRow(["Timestamp","CompanyID","CompanyName","DeliveryDate","SundayAnchor","EmployeeName","EmployeeEmail","MealID","DishName","DietType","Tier","EmployeePrice","CompanyCoverage","BDCoverage","StripePaymentIntentID","Status","OrderID"]);
-      }
-      corpSheet.appendRow([
-        new Date(),
-        data.company_id,
-        data.company_name,
-        data.delivery_date,
-        data.sunday_anchor,
-        data.employee_name,
-        data.employee_email || "",
-        data.meal_id,
-        data.dish_name,
-        data.diet_type,
-        data.tier,
-        data.employee_price,
-        data.company_coverage,
-        data.bd_coverage || "0.00",
-        "",
-        "pending",
-        data.order_id || ""
-      ]);
-      return jsonOut({success: true});
+      return withSubmissionKey(data.idempotency_key, function() {
+        return jsonOut(submitCorporateOrder(ssHub, data));
+      });
+    }
+    // ─────────────────────────────────────────
+    // SUBMIT CORPORATE CART  (a whole checkout in one locked operation)
+    // {company_id, company_name, employee_name, employee_email,
+    //  lines:[{sunday_anchor, delivery_date, meal_id, dish_name, diet_type,
+    //          tier, employee_price, company_coverage, bd_coverage}]}
+    // Reserves one OrderID per delivery week (reusing the employee's existing
+    // one) and appends every valid line with a single setValues.
+    // → {success, order_ids:{anchor: id}, lines:[{ok, order_id} | {ok:false, error}]}
+    // ─────────────────────────────────────────
+    if (data.action === "submit_corporate_cart") {
+      return withSubmissionKey(data.idempotency_key, function() {
+        return jsonOut(submitCorporateCart(ssHub, data));
+      }, true);
     }
     // ─────────────────────────────────────────
     // SWAP ORDER MEAL  (SKU swap — replace one meal in an existing order)
@@ -616,6 +634,25 @@ function doPost(e) {
     // ─────────────────────────────────────────
     if (data.action === "get_corporate_orders") {
       var corpSheet = ssHub.getSheetByName("CorporateOrders");
+      // Row-cursor sync (Flask replica): only rows after since_row, each tagged with _row
+      if (data.since_row !== undefined && data.since_row !== null && data.since_row !== "") {
+        if (!corpSheet) return jsonOut({rows: [], next_row: 0});
+        var page = readRowsSince(corpSheet, data.since_row);
+        var tz = Session.getScriptTimeZone();
+        var synced = [];
+        page.rows.forEach(function(row, n) {
+          if (!row[0]) return;
+          var order = {_row: page.firstRow + n};
+          page.headers.forEach(function(h, idx) {
+            var val = row[idx];
+            if (Object.prototype.toString.call(val) === "[object Date]")
+              val = Utilities.formatDate(val, tz, "yyyy-MM-dd");
+            order[h] = val;
+          });
+          synced.push(order);
+        });
+        return jsonOut({rows: synced, next_row: page.nextRow});
+      }
       if (!corpSheet) return jsonOut([]);
       var rows = corpSheet.getDataRange().getValues();
       var headers = rows[0];
@@ -736,13 +773,9 @@ function doPost(e) {
       return ContentService.createTextOutput("Error: Booking not found");
     }
     if (data.action === "submit_teacher_order") {
-      var orderSheet = ssHub.getSheetByName("TeacherOrders");
-      if (!orderSheet) {
-        orderSheet = ssHub.insertSheet("TeacherOrders");
-        orderSheet.appendRow(["Timestamp","School","Delivery Date","Teacher Name","Meal ID","Dish Name","Diet Type"]);
-      }
-      orderSheet.appendRow([new Date(), data.school, data.delivery_date, data.name, data.meal_id, data.dish_name || ("Dish #" + data.meal_id), data.diet || "Unknown"]);
-      return ContentService.createTextOutput("Order Success");
+      return withSubmissionKey(data.idempotency_key, function() {
+        return jsonOut(submitTeacherOrder(ssHub, data));
+      });
     }
     if (data.action === "book_principal") {
       sheet1.appendRow([data.date, data.contact_name, data.school_name, data.address, data.staff_count, data.lunch_time, data.delivery_notes, "🆕 New Booking", data.email]);
@@ -750,6 +783,18 @@ function doPost(e) {
     }
     if (data.action === "get_all_orders") {
       var orderSheet = ssHub.getSheetByName("TeacherOrders");
+      // Row-cursor sync (Flask replica): only rows after since_row, each tagged with _row
+      if (data.since_row !== undefined && data.since_row !== null && data.since_row !== "") {
+        if (!orderSheet) return jsonOut({rows: [], next_row: 0});
+        var page = readRowsSince(orderSheet, data.since_row);
+        var synced = [];
+        page.rows.forEach(function(row, n) {
+          var d = row[2];
+          if (Object.prototype.toString.call(d) === "[object Date]") d = Utilities.formatDate(d, Session.getScriptTimeZone(), "yyyy-MM-dd");
+          synced.push({ _row: page.firstRow + n, school: row[1], date: d, meal_id: row[4], dish_name: row[5] || "", diet: row[6] || "" });
+        });
+        return jsonOut({rows: synced, next_row: page.nextRow});
+      }
       var orders = [];
       if (orderSheet) {
         var rows = orderSheet.getDataRange().getValues();
@@ -967,19 +1012,180 @@ function getOrCreateSettingsSheet(ssHub) {
   }
   return sheet;
 }
-function getNextOrderId(ssHub) {
+/**
+ * Allocate `count` (default 1) consecutive OrderIDs; returns the first.
+ */
+function getNextOrderId(ssHub, count) {
+  count = count || 1;
   var settings = getOrCreateSettingsSheet(ssHub);
   var rows = settings.getDataRange().getValues();
   for (var i = 1; i < rows.length; i++) {
     if (String(rows[i][0]) === "LastOrderID") {
       var next = parseInt(rows[i][1]) + 1;
-      settings.getRange(i + 1, 2).setValue(next);
+      settings.getRange(i + 1, 2).setValue(next + count - 1);
       return next;
     }
   }
-  settings.appendRow(["LastOrderID", 10001]);
+  settings.appendRow(["LastOrderID", 10000 + count]);
   return 10001;
 }
+/**
+ * Read only the data rows after `since` (count of data rows already synced),
+ * without pulling the whole sheet. Returns {headers, rows, firstRow, nextRow}
+ * where firstRow is the data-row number of rows[0] and nextRow is the cursor
+ * to send next time.
+ */
+function readRowsSince(sheet, since) {
+  var lastRow = sheet.getLastRow();
+  var lastCol = sheet.getLastColumn();
+  var headers = lastRow > 0 ? sheet.getRange(1, 1, 1, lastCol).getValues()[0] : [];
+  var start   = Math.max(parseInt(since, 10) || 0, 0);
+  var dataRows = Math.max(lastRow - 1, 0);
+  // Cursor past the end means rows were deleted — resend everything
+  if (start > dataRows) start = 0;
+  var rows = dataRows > start ? sheet.getRange(start + 2, 1, dataRows - start, lastCol).getValues() : [];
+  return {headers: headers, rows: rows, firstRow: start + 1, nextRow: dataRows};
+}
+/**
+ * Run one action of a batch through the normal handlers and unwrap the
+ * response: {ok: true, data: <parsed JSON>} or {ok: false, error: <text>}.
+ */
+function runBatchCall(call) {
+  if (!call || !call.action || call.action === "batch") return {ok: false, error: "Invalid batch call"};
+  try {
+    var out = call.action === "get_bookings"
+      ? doGet({parameter: {action: "get_bookings"}})
+      : doPost({postData: {contents: JSON.stringify(call)}});
+    var text = out.getContent();
+    try {
+      return {ok: true, data: JSON.parse(text)};
+    } catch (e) {
+      return {ok: false, error: text};
+    }
+  } catch (err) {
+    return {ok: false, error: err.toString()};
+  }
+}
+/**
+ * Apply a submission once per idempotency key. Flask's submission journal
+ * resends after a timeout; a key applied in the last 6 hours (the script
+ * cache limit) answers {success, duplicate} without writing again.
+ */
+function withSubmissionKey(key, apply, alwaysLock) {
+  if (!key && !alwaysLock) return apply();
+  var lock = LockService.getScriptLock();
+  lock.waitLock(20000);
+  try {
+    var cache = CacheService.getScriptCache();
+    if (key && cache.get("submission:" + key)) return jsonOut({success: true, duplicate: true});
+    var out = apply();
+    if (key) cache.put("submission:" + key, "1", 21600);
+    return out;
+  } finally {
+    lock.releaseLock();
+  }
+}
+/**
+ * submit_corporate_cart body; the caller holds the script lock. One read
+ * of CorporateOrders finds the employee's existing OrderIDs, one write
+ * appends the cart.
+ */
+function submitCorporateCart(ssHub, data) {
+  var corpSheet = ssHub.getSheetByName("CorporateOrders");
+  if (!corpSheet) {
+    corpSheet = ssHub.insertSheet("CorporateOrders");
+    corpSheet.appendRow(["Timestamp","CompanyID","CompanyName","DeliveryDate","SundayAnchor","EmployeeName","EmployeeEmail","MealID","DishName","DietType","Tier","EmployeePrice","CompanyCoverage","BDCoverage","StripePaymentIntentID","Status","OrderID"]);
+  }
+  var email = String(data.employee_email || "").trim().toLowerCase();
+  var lines = data.lines || [];
+  // Lines may arrive with an OrderID Flask reserved; only the weeks without
+  // one need the sheet scan.
+  var orderIds = {}, wanted = {}, scan = false;
+  lines.forEach(function(line) {
+    if (!line || !line.sunday_anchor) return;
+    var anchor = String(line.sunday_anchor).trim();
+    if (line.order_id) orderIds[anchor] = line.order_id;
+    else { wanted[anchor] = true; scan = true; }
+  });
+  var rows = scan ? corpSheet.getDataRange().getValues() : [[]];
+  var headers = rows[0];
+  var orderIdIdx = headers.indexOf("OrderID");
+  var emailIdx   = headers.indexOf("EmployeeEmail");
+  var anchorIdx  = headers.indexOf("SundayAnchor");
+  if (scan && email && orderIdIdx >= 0 && emailIdx >= 0 && anchorIdx >= 0) {
+    for (var i = 1; i < rows.length; i++) {
+      if (!rows[i][orderIdIdx] || String(rows[i][emailIdx]).trim().toLowerCase() !== email) continue;
+      var rawAn = rows[i][anchorIdx];
+      var an = (rawAn instanceof Date)
+        ? Utilities.formatDate(rawAn, Session.getScriptTimeZone(), "yyyy-MM-dd")
+        : String(rawAn).trim();
+      if (wanted[an] && !orderIds[an]) orderIds[an] = rows[i][orderIdIdx];
+    }
+  }
+  var now = new Date(), out = [], results = [];
+  lines.forEach(function(line) {
+    if (!line || !line.meal_id || !line.sunday_anchor) {
+      results.push({ok: false, error: "meal_id and sunday_anchor are required"});
+      return;
+    }
+    var anchor = String(line.sunday_anchor).trim();
+    if (!orderIds[anchor]) orderIds[anchor] = getNextOrderId(ssHub);
+    var orderId = line.order_id || orderIds[anchor];
+    out.push([
+      now, data.company_id, data.company_name, line.delivery_date, anchor,
+      data.employee_name, data.employee_email || "", line.meal_id, line.dish_name,
+      line.diet_type, line.tier, line.employee_price, line.company_coverage,
+      line.bd_coverage || "0.00", "", "pending", orderId
+    ]);
+    results.push({ok: true, order_id: orderId});
+  });
+  if (out.length) corpSheet.getRange(corpSheet.getLastRow() + 1, 1, out.length, out[0].length).setValues(out);
+  return out.length
+    ? {success: true, order_ids: orderIds, lines: results}
+    : {success: false, error: "No valid lines", lines: results};
+}
+/**
+ * submit_corporate_order body: appends one line to CorporateOrders.
+ */
+function submitCorporateOrder(ssHub, data) {
+  var corpSheet = ssHub.getSheetByName("CorporateOrders");
+  if (!corpSheet) {
+    corpSheet = ssHub.insertSheet("CorporateOrders");
+    corpSheet.appendRow(["Timestamp","CompanyID","CompanyName","DeliveryDate","SundayAnchor","EmployeeName","EmployeeEmail","MealID","DishName","DietType","Tier","EmployeePrice","CompanyCoverage","BDCoverage","StripePaymentIntentID","Status","OrderID"]);
+  }
+  corpSheet.appendRow([
+    new Date(),
+    data.company_id,
+    data.company_name,
+    data.delivery_date,
+    data.sunday_anchor,
+    data.employee_name,
+    data.employee_email || "",
+    data.meal_id,
+    data.dish_name,
+    data.diet_type,
+    data.tier,
+    data.employee_price,
+    data.company_coverage,
+    data.bd_coverage || "0.00",
+    "",
+    "pending",
+    data.order_id || ""
+  ]);
+  return {success: true};
+}
+/**
+ * submit_teacher_order body: appends one line to TeacherOrders.
+ */
+function submitTeacherOrder(ssHub, data) {
+  var orderSheet = ssHub.getSheetByName("TeacherOrders");
+  if (!orderSheet) {
+    orderSheet = ssHub.insertSheet("TeacherOrders");
+    orderSheet.appendRow(["Timestamp","School","Delivery Date","Teacher Name","Meal ID","Dish Name","Diet Type"]);
+  }
+  orderSheet.appendRow([new Date(), data.school, data.delivery_date, data.name, data.meal_id, data.dish_name || ("Dish #" + data.meal_id), data.diet || "Unknown"]);
+  return {success: true};
+}
 function jsonOut(obj) {
   return ContentService.createTextOutput(JSON.stringify(obj)).setMimeType(ContentService.MimeType.JSON);
 }
@@ -0,0 +1,734 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the BetterDay Apps Script deployment (gas/backend.gs).
+
+Speaks the same JSON action protocol — POST {"action": ...} and
+GET ?action=get_bookings — against in-memory sheets, so the Flask app can be
+load-tested without touching the live Hub spreadsheet.
+
+  python gas_emulator.py --port 8765 --companies 40 --weeks 52
+  GOOGLE_SCRIPT_URL=http://127.0.0.1:8765/exec python app.py
+
+Latency knobs (mirroring what makes the real deployment slow):
+  --cold-start   seconds added to the first call after --idle seconds of quiet
+  --latency      fixed per-request overhead in seconds
+  --row-cost     seconds per sheet row scanned (getDataRange().getValues())
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+CORP_HEADERS = ["Timestamp", "CompanyID", "CompanyName", "DeliveryDate", "SundayAnchor",
+                "EmployeeName", "EmployeeEmail", "MealID", "DishName", "DietType", "Tier",
+                "EmployeePrice", "CompanyCoverage", "BDCoverage", "StripePaymentIntentID",
+                "Status", "OrderID"]
+COMPANY_HEADERS = ["CompanyID", "CompanyName", "CompanyEmailDomain", "BasePrice",
+                   "ManagerPassword", "AddressLine1", "City", "PostalCode",
+                   "DeliveryInstructions", "PrimaryContactName", "PrimaryContactEmail",
+                   "PrimaryContactPhone", "BillingContactEmail"]
+INVOICE_HEADERS = ["InvoiceID", "CompanyID", "CompanyName", "WeekOf", "SundayAnchor",
+                   "TotalOrders", "TotalMeals", "TotalEmployees",
+                   "EmployeePaid", "CompanyOwed", "BDContributed",
+                   "TierBreakdownJSON", "Status", "CreatedAt", "PaidAt", "PaymentMethod", "Notes"]
+
+TIERS = [("Free", "0.00", "16.99"), ("Tier1", "0.00", "12.00"),
+         ("Tier2", "4.00", "10.00"), ("Tier3", "8.00", "8.00")]
+
+
+def sunday_anchor(d):
+    return (d - timedelta(days=(d.weekday() + 1) % 7 or 7)).strftime('%Y-%m-%d')
+
+
+class Hub:
+    """In-memory copy of the Hub spreadsheet plus the BUFFER menu sheets."""
+
+    def __init__(self, companies=20, employees_per_company=15, weeks=26,
+                 schools=12, seed=1):
+        rnd = random.Random(seed)
+        self.lock = threading.RLock()
+        self.sheet1 = [["Date", "Contact", "School", "Address", "Staff", "Lunch",
+                        "Notes", "Status", "Email"]]
+        self.companies = [list(COMPANY_HEADERS)]
+        self.employees = [["EmployeeID", "CompanyID", "FirstName", "LastName", "Email",
+                           "CreatedAt", "StripeCustomerID", "IsManager"]]
+        self.pins = [["CompanyID", "CompanyPin", "UpdatedAt"]]
+        self.magic_tokens = [["Token", "Email", "CompanyID", "CreatedAt", "UsedAt"]]
+        self.manager_tokens = [["Token", "Email", "CompanyID", "CreatedAt", "UsedAt"]]
+        self.corp = [list(CORP_HEADERS)]
+        self.teacher = [["Timestamp", "School", "Delivery Date", "Teacher Name",
+                         "Meal ID", "Dish Name", "Diet Type"]]
+        self.blocked = [["Blocked Date"]]
+        self.invoices = [list(INVOICE_HEADERS)]
+        self.last_order_id = 10000
+        self.submission_keys = set()
+
+        self.dishes = {}
+        for n in range(1, 61):
+            did = f"#{100 + n}"
+            self.dishes[did] = {
+                'name': f"Dish {100 + n}", 'diet': 'Plant-Based' if n % 3 == 0 else 'Meat',
+                'image': '', 'description': f"Test dish {n}", 'cal': 500 + n,
+                'protein': 30, 'carbs': 50, 'fat': 15, 'tags': '',
+            }
+        meat  = [d for d, v in self.dishes.items() if v['diet'] == 'Meat']
+        vegan = [d for d, v in self.dishes.items() if v['diet'] != 'Meat']
+
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        this_monday = today - timedelta(days=today.weekday())
+        self.schedule = {}
+        for w in range(-weeks, 8):
+            anchor = sunday_anchor(this_monday + timedelta(weeks=w))
+            self.schedule[anchor] = (rnd.sample(meat, 8), rnd.sample(vegan, 4))
+
+        for c in range(companies):
+            cid = f"CO{c:03d}"
+            domain = f"co{c:03d}.example.com"
+            self.companies.append([cid, f"Test Company {c:03d}", domain, "16.99", "1234",
+                                   f"{c} Main St", "Toronto", "M5V 1A1", "", "Pat Manager",
+                                   f"manager@{domain}", "555-0100", f"billing@{domain}"])
+            self.pins.append([cid, "2026", today.strftime('%Y-%m-%d')])
+            staff = []
+            for e in range(employees_per_company):
+                email = f"emp{e:03d}@{domain}"
+                staff.append((f"Emp{e:03d} Test", email))
+                self.employees.append([f"EMP{c:03d}{e:05d}", cid, f"Emp{e:03d}", "Test",
+                                       email, today.strftime('%Y-%m-%d'), "", e == 0])
+            for w in range(-weeks, 1):
+                monday = this_monday + timedelta(weeks=w)
+                anchor = sunday_anchor(monday)
+                delivery = monday.strftime('%Y-%m-%d')
+                meat_ids, vegan_ids = self.schedule[anchor]
+                for name, email in staff:
+                    if rnd.random() > 0.6:
+                        continue
+                    self.last_order_id += 1
+                    for _ in range(rnd.randint(1, 3)):
+                        did = rnd.choice(meat_ids + vegan_ids)
+                        tier, emp, co = rnd.choice(TIERS)
+                        self.corp.append([
+                            monday.strftime('%Y-%m-%d'), cid, f"Test Company {c:03d}",
+                            delivery, anchor, name, email, did, self.dishes[did]['name'],
+                            self.dishes[did]['diet'], tier, emp, co, "0.00", "", "pending",
+                            self.last_order_id])
+
+        for s in range(schools):
+            for w in range(-weeks, 8, 3):
+                d = this_monday + timedelta(weeks=w, days=s % 3)
+                school = f"Test School {s:02d}"
+                self.sheet1.append([d.strftime('%Y-%m-%d'), "Principal", school, "1 School Rd",
+                                    "30", "12:00", "", "New Booking", f"principal{s}@example.com"])
+                if w > 0:
+                    continue
+                meat_ids, vegan_ids = self.schedule[sunday_anchor(d)]
+                for t in range(rnd.randint(5, 25)):
+                    did = rnd.choice(meat_ids + vegan_ids)
+                    self.teacher.append([d.strftime('%Y-%m-%d'), school, d.strftime('%Y-%m-%d'),
+                                         f"Teacher {t}", did, self.dishes[did]['name'],
+                                         self.dishes[did]['diet']])
+
+    def sheets(self):
+        return {
+            'Sheet1': self.sheet1, 'Companies': self.companies, 'Employees': self.employees,
+            'CompanyPINs': self.pins, 'MagicTokens': self.magic_tokens,
+            'ManagerTokens': self.manager_tokens, 'CorporateOrders': self.corp,
+            'TeacherOrders': self.teacher, 'BlockedDates': self.blocked,
+            'CompanyInvoices': self.invoices,
+        }
+
+
+def _record(headers, row):
+    return {h: (row[i] if i < len(row) else "") for i, h in enumerate(headers)}
+
+
+class Emulator:
+    """Dispatches backend.gs actions against a Hub, charging simulated cost."""
+
+    def __init__(self, hub, cold_start=0.0, idle=300.0, latency=0.0, row_cost=0.0):
+        self.hub = hub
+        self.cold_start = cold_start
+        self.idle = idle
+        self.latency = latency
+        self.row_cost = row_cost
+        self.last_call = 0.0
+        self.calls = 0
+        self.calls_by_action = {}
+        self._stat_lock = threading.Lock()
+
+    # ── cost model ─────────────────────────────────────────
+    def _charge(self, action, rows_scanned):
+        now = time.time()
+        with self._stat_lock:
+            cold = self.cold_start and now - self.last_call > self.idle
+            self.last_call = now
+            self.calls += 1
+            self.calls_by_action[action] = self.calls_by_action.get(action, 0) + 1
+        delay = self.latency + rows_scanned * self.row_cost + (self.cold_start if cold else 0)
+        if delay > 0:
+            time.sleep(delay)
+
+    def stats(self):
+        with self._stat_lock:
+            return {'calls': self.calls, 'by_action': dict(self.calls_by_action)}
+
+    # ── protocol ───────────────────────────────────────────
+    def do_get(self, params):
+        result, scanned = self._get(params)
+        self._charge('get_bookings', scanned)
+        return result
+
+    def do_post(self, data):
+        action = data.get('action', '')
+        if action == 'batch':
+            return self._batch(data)
+        result, scanned = self._post(data)
+        self._charge(action, scanned)
+        return result
+
+    def _get(self, params):
+        h = self.hub
+        with h.lock:
+            rows = [list(r) for r in h.sheet1]
+        if params.get('action') == 'get_bookings':
+            return rows, len(rows)
+        return [r[0] for r in rows[1:] if r[0]], len(rows)
+
+    def _post(self, data):
+        handler = getattr(self, 'a_' + data.get('action', ''), None)
+        if handler is None:
+            return "Error: Unknown Action", 0
+        with self.hub.lock:
+            return handler(data)
+
+    def _batch(self, data):
+        """Several actions, one request overhead (backend.gs runs them in order)."""
+        results, scanned = [], 0
+        for call in data.get('calls') or []:
+            action = call.get('action') if isinstance(call, dict) else None
+            if not action or action == 'batch':
+                results.append({'ok': False, 'error': 'Invalid batch call'})
+                continue
+            try:
+                result, n = self._get(call) if action == 'get_bookings' else self._post(call)
+            except Exception as ex:
+                result, n = "Error: " + str(ex), 0
+            scanned += n
+            results.append({'ok': False, 'error': result} if isinstance(result, str)
+                           else {'ok': True, 'data': result})
+        self._charge('batch', scanned)
+        return {'results': results}
+
+    # Each handler returns (response, rows_scanned).
+    def a_get_company(self, d):
+        rows = self.hub.companies
+        code = str(d.get('company_id', '')).strip().upper()
+        for r in rows[1:]:
+            if str(r[0]).strip().upper() == code:
+                return {'found': True, 'company': _record(rows[0], r)}, len(rows)
+        return {'found': False}, len(rows)
+
+    def a_get_all_companies(self, d):
+        rows = self.hub.companies
+        return {'companies': [_record(rows[0], r) for r in rows[1:] if r[0]]}, len(rows)
+
+    def a_get_employee_by_email(self, d):
+        rows = self.hub.employees
+        email = str(d.get('email', '')).strip().lower()
+        cid = str(d.get('company_id', '')).strip().upper()
+        for r in rows[1:]:
+            if str(r[4]).lower() == email and str(r[1]).upper() == cid:
+                return {'found': True, 'employee': {'firstName': r[2], 'lastName': r[3],
+                                                    'email': r[4], 'isManager': r[7] is True}}, len(rows)
+        return {'found': False}, len(rows)
+
+    def a_register_employee(self, d):
+        rows = self.hub.employees
+        email = str(d.get('email', '')).strip().lower()
+        cid = str(d.get('company_id', '')).strip().upper()
+        for r in rows[1:]:
+            if str(r[4]).lower() == email and str(r[1]).upper() == cid:
+                return {'success': False, 'exists': True}, len(rows)
+        emp_id = "EMP" + str(int(time.time() * 1000))[-8:]
+        rows.append([emp_id, cid, str(d.get('first_name', '')).strip(),
+                     str(d.get('last_name', '')).strip(), email,
+                     datetime.now().strftime('%Y-%m-%d'), "", False])
+        return {'success': True, 'employeeId': emp_id}, len(rows)
+
+    def a_get_employees(self, d):
+        rows = self.hub.employees
+        cid = str(d.get('company_id', '')).strip().upper()
+        return {'employees': [
+            {'employeeId': r[0], 'firstName': r[2], 'lastName': r[3], 'email': r[4],
+             'createdAt': r[5], 'isManager': r[7] is True}
+            for r in rows[1:] if str(r[1]).upper() == cid]}, len(rows)
+
+    def a_remove_employee(self, d):
+        rows = self.hub.employees
+        email = str(d.get('email', '')).strip().lower()
+        cid = str(d.get('company_id', '')).strip().upper()
+        for i in range(len(rows) - 1, 0, -1):
+            if str(rows[i][4]).lower() == email and str(rows[i][1]).upper() == cid:
+                del rows[i]
+                return {'success': True}, len(rows)
+        return {'success': False, 'error': 'Employee not found'}, len(rows)
+
+    def a_update_employee_email(self, d):
+        rows = self.hub.employees
+        old = str(d.get('old_email', '')).strip().lower()
+        new = str(d.get('new_email', '')).strip().lower()
+        cid = str(d.get('company_id', '')).strip().upper()
+        if '@' not in new:
+            return {'success': False, 'error': 'Invalid email address.'}, 0
+        if any(str(r[4]).lower() == new and str(r[1]).upper() == cid for r in rows[1:]):
+            return {'success': False, 'error': 'That email is already in use.'}, len(rows)
+        for r in rows[1:]:
+            if str(r[4]).lower() == old and str(r[1]).upper() == cid:
+                r[4] = new
+                break
+        else:
+            return {'success': False, 'error': 'Account not found.'}, len(rows)
+        for r in self.hub.corp[1:]:
+            if str(r[6]).lower() == old:
+                r[6] = new
+        return {'success': True}, len(rows) + len(self.hub.corp)
+
+    def a_verify_company_pin(self, d):
+        rows = self.hub.pins
+        cid = str(d.get('company_id', '')).strip().upper()
+        for r in rows[1:]:
+            if str(r[0]).upper() == cid:
+                return {'valid': str(r[1]).strip() == str(d.get('pin', '')).strip()}, len(rows)
+        return {'valid': False, 'error': 'No PIN configured for this company'}, len(rows)
+
+    def a_get_company_pin(self, d):
+        rows = self.hub.pins
+        cid = str(d.get('company_id', '')).strip().upper()
+        for r in rows[1:]:
+            if str(r[0]).upper() == cid:
+                return {'found': True, 'pin': str(r[1]).strip()}, len(rows)
+        return {'found': False, 'pin': ''}, len(rows)
+
+    def a_update_company_pin(self, d):
+        rows = self.hub.pins
+        cid = str(d.get('company_id', '')).strip().upper()
+        pin = str(d.get('pin', '')).strip()
+        if not pin:
+            return {'success': False, 'error': 'PIN cannot be empty'}, 0
+        for r in rows[1:]:
+            if str(r[0]).upper() == cid:
+                r[1] = pin
+                return {'success': True}, len(rows)
+        rows.append([cid, pin, datetime.now().strftime('%Y-%m-%d')])
+        return {'success': True}, len(rows)
+
+    def a_create_magic_token(self, d):
+        token = d.get('token_override') or uuid.uuid4().hex + uuid.uuid4().hex
+        self.hub.magic_tokens.append([token, str(d.get('email', '')).strip().lower(),
+                                      str(d.get('company_id', '')).strip().upper(), time.time(), ""])
+        return {'success': True}, 1
+
+    def a_verify_magic_token(self, d):
+        rows = self.hub.magic_tokens
+        token = str(d.get('token', '')).strip()
+        for r in rows[1:]:
+            if r[0] != token:
+                continue
+            if r[4]:
+                return {'valid': False, 'error': 'Token already used'}, len(rows)
+            if time.time() - r[3] > 900:
+                return {'valid': False, 'error': 'Token expired'}, len(rows)
+            r[4] = time.time()
+            emp, _ = self.a_get_employee_by_email({'email': r[1], 'company_id': r[2]})
+            if not emp.get('found'):
+                return {'valid': False, 'error': 'Employee not found'}, len(rows)
+            comp, _ = self.a_get_company({'company_id': r[2]})
+            return {'valid': True, 'employee': emp['employee'],
+                    'company': comp.get('company')}, len(rows) + len(self.hub.employees)
+        return {'valid': False, 'error': 'Token not found'}, len(rows)
+
+    def a_create_manager_token(self, d):
+        email = str(d.get('email', '')).strip().lower()
+        rows = self.hub.companies
+        for r in rows[1:]:
+            rec = _record(rows[0], r)
+            if email in (str(rec.get('PrimaryContactEmail', '')).lower(),
+                         str(rec.get('BillingContactEmail', '')).lower()):
+                self.hub.manager_tokens.append([uuid.uuid4().hex, email, r[0], time.time(), ""])
+                return {'success': True}, len(rows)
+        return {'success': False, 'error': 'not_found'}, len(rows)
+
+    def a_verify_manager_token(self, d):
+        rows = self.hub.manager_tokens
+        token = str(d.get('token', '')).strip()
+        for r in rows[1:]:
+            if r[0] != token:
+                continue
+            if r[4]:
+                return {'valid': False, 'error': 'Token already used'}, len(rows)
+            if time.time() - r[3] > 900:
+                return {'valid': False, 'error': 'Token expired'}, len(rows)
+            r[4] = time.time()
+            comp, _ = self.a_get_company({'company_id': r[2]})
+            if comp.get('found'):
+                return {'valid': True, 'email': r[1], 'company': comp['company']}, len(rows)
+            return {'valid': False, 'error': 'Company not found'}, len(rows)
+        return {'valid': False, 'error': 'Token not found'}, len(rows)
+
+    def a_create_manager_session(self, d):
+        emp, scanned = self.a_get_employee_by_email(d)
+        if not (emp.get('found') and emp['employee']['isManager']):
+            return {'success': False, 'error': 'Not authorized'}, scanned
+        token = uuid.uuid4().hex + uuid.uuid4().hex
+        self.hub.manager_tokens.append([token, d.get('email', ''),
+                                        str(d.get('company_id', '')).upper(), time.time(), ""])
+        return {'success': True, 'token': token}, scanned
+
+    def _corp_records(self):
+        rows = self.hub.corp
+        return [_record(rows[0], r) for r in rows[1:] if r[0]]
+
+    def a_get_week_order_counts(self, d):
+        email = str(d.get('email', '')).strip().lower()
+        counts = {}
+        for r in self.hub.corp[1:]:
+            if str(r[6]).lower() == email:
+                counts[r[4]] = counts.get(r[4], 0) + 1
+        return {'counts': counts}, len(self.hub.corp)
+
+    def a_get_orders_by_employee(self, d):
+        email = str(d.get('email', '')).strip().lower()
+        orders = [o for o in self._corp_records()
+                  if not email or str(o['EmployeeEmail']).lower() == email]
+        orders.reverse()
+        return orders[:20], len(self.hub.corp)
+
+    def a_reserve_order_id(self, d):
+        email = str(d.get('email', '')).strip().lower()
+        anchor = str(d.get('sunday_anchor', '')).strip()
+        for r in self.hub.corp[1:]:
+            if r[16] and str(r[6]).lower() == email and r[4] == anchor:
+                return {'order_id': r[16]}, len(self.hub.corp)
+        self.hub.last_order_id += 1
+        return {'order_id': self.hub.last_order_id}, len(self.hub.corp)
+
+    def _duplicate_submission(self, d):
+        """Mirror of backend.gs withSubmissionKey(): True if this key was applied."""
+        key = d.get('idempotency_key')
+        if not key:
+            return False
+        if key in self.hub.submission_keys:
+            return True
+        self.hub.submission_keys.add(key)
+        return False
+
+    def a_lease_order_ids(self, d):
+        count = min(max(int(d.get('count') or 0), 1), 1000)
+        first = self.hub.last_order_id + 1
+        self.hub.last_order_id += count
+        return {'first': first, 'last': first + count - 1}, 1
+
+    def a_submit_corporate_order(self, d):
+        if self._duplicate_submission(d):
+            return {'success': True, 'duplicate': True}, 1
+        self.hub.corp.append([
+            datetime.now().isoformat(), d.get('company_id'), d.get('company_name'),
+            d.get('delivery_date'), d.get('sunday_anchor'), d.get('employee_name'),
+            d.get('employee_email') or "", d.get('meal_id'), d.get('dish_name'),
+            d.get('diet_type'), d.get('tier'), d.get('employee_price'),
+            d.get('company_coverage'), d.get('bd_coverage') or "0.00", "", "pending",
+            d.get('order_id') or ""])
+        return {'success': True}, 1
+
+    def a_submit_corporate_cart(self, d):
+        if self._duplicate_submission(d):
+            return {'success': True, 'duplicate': True}, 1
+        email = str(d.get('employee_email', '')).strip().lower()
+        lines = d.get('lines') or []
+        order_ids, wanted = {}, set()
+        for l in lines:
+            if isinstance(l, dict) and l.get('sunday_anchor'):
+                anchor = str(l['sunday_anchor']).strip()
+                if l.get('order_id'):
+                    order_ids[anchor] = l['order_id']
+                else:
+                    wanted.add(anchor)
+        for r in (self.hub.corp[1:] if wanted else []):
+            if r[16] and str(r[6]).lower() == email and r[4] in wanted:
+                order_ids.setdefault(r[4], r[16])
+        now, results, added = datetime.now().isoformat(), [], 0
+        for line in lines:
+            if not isinstance(line, dict) or not line.get('meal_id') or not line.get('sunday_anchor'):
+                results.append({'ok': False, 'error': 'meal_id and sunday_anchor are required'})
+                continue
+            anchor = str(line['sunday_anchor']).strip()
+            if anchor not in order_ids:
+                self.hub.last_order_id += 1
+                order_ids[anchor] = self.hub.last_order_id
+            order_id = line.get('order_id') or order_ids[anchor]
+            self.hub.corp.append([
+                now, d.get('company_id'), d.get('company_name'), line.get('delivery_date'),
+                anchor, d.get('employee_name'), d.get('employee_email') or "",
+                line.get('meal_id'), line.get('dish_name'), line.get('diet_type'),
+                line.get('tier'), line.get('employee_price'), line.get('company_coverage'),
+                line.get('bd_coverage') or "0.00", "", "pending", order_id])
+            results.append({'ok': True, 'order_id': order_id})
+            added += 1
+        if not added:
+            return {'success': False, 'error': 'No valid lines', 'lines': results}, len(self.hub.corp)
+        return {'success': True, 'order_ids': order_ids, 'lines': results}, len(self.hub.corp)
+
+    def a_swap_order_meal(self, d):
+        oid = str(d.get('order_id', '')).strip()
+        old = str(d.get('old_meal_id', '')).strip()
+        email = str(d.get('email', '')).strip().lower()
+        for r in self.hub.corp[1:]:
+            if str(r[16]) == oid and str(r[6]).lower() == email and str(r[7]) == old:
+                r[7] = str(d.get('new_meal_id', '')).strip()
+                r[8] = d.get('new_dish_name') or ""
+                r[9] = d.get('new_diet_type') or ""
+                return {'success': True}, len(self.hub.corp)
+        return {'success': False, 'error': 'Meal not found in order'}, len(self.hub.corp)
+
+    def _rows_since(self, rows, since):
+        """Mirror of backend.gs readRowsSince(): (first data-row number, rows, next cursor)."""
+        start = max(int(since or 0), 0)
+        data_rows = len(rows) - 1
+        if start > data_rows:
+            start = 0
+        return start + 1, rows[1 + start:], data_rows
+
+    def a_get_corporate_orders(self, d):
+        if d.get('since_row') not in (None, ''):
+            first, page, next_row = self._rows_since(self.hub.corp, d['since_row'])
+            synced = [dict(_record(self.hub.corp[0], r), _row=first + n)
+                      for n, r in enumerate(page) if r[0]]
+            return {'rows': synced, 'next_row': next_row}, len(page) + 1
+        orders = self._corp_records()
+        if d.get('company_id'):
+            orders = [o for o in orders if o['CompanyID'] == d['company_id']]
+        if d.get('sunday_anchor'):
+            orders = [o for o in orders if o['SundayAnchor'] == d['sunday_anchor']]
+        return orders, len(self.hub.corp)
+
+    def a_get_menu(self, d):
+        meat_ids, vegan_ids = self.hub.schedule.get(d.get('sunday_anchor'), ([], []))
+        scanned = len(self.hub.schedule) + len(self.hub.dishes)
+        return {'meat':  [dict(id=i, **self.hub.dishes[i]) for i in meat_ids],
+                'vegan': [dict(id=i, **self.hub.dishes[i]) for i in vegan_ids]}, scanned
+
+    def a_get_profile_data(self, d):
+        booking = {}
+        for r in self.hub.sheet1[1:]:
+            if r[2] == d.get('school') and r[0] == d.get('date'):
+                booking = {'contact': r[1], 'address': r[3], 'staff_count': r[4],
+                           'lunch_hours': r[5], 'notes': r[6], 'status': r[7], 'email': r[8]}
+                break
+        booking['orders'] = [
+            {'teacher': r[3], 'meal_id': r[4], 'dish_name': r[5], 'diet': r[6]}
+            for r in self.hub.teacher[1:] if r[1] == d.get('school') and r[2] == d.get('date')]
+        return booking, len(self.hub.sheet1) + len(self.hub.teacher)
+
+    def a_update_booking(self, d):
+        for r in self.hub.sheet1[1:]:
+            if r[2] == d.get('school') and r[0] == d.get('date'):
+                r[7] = d.get('status')
+                r[8] = d.get('email')
+                return "Update Success", len(self.hub.sheet1)
+        return "Error: Booking not found", len(self.hub.sheet1)
+
+    def a_submit_teacher_order(self, d):
+        if self._duplicate_submission(d):
+            return {'success': True, 'duplicate': True}, 1
+        self.hub.teacher.append([datetime.now().isoformat(), d.get('school'),
+                                 d.get('delivery_date'), d.get('name'), d.get('meal_id'),
+                                 d.get('dish_name') or f"Dish #{d.get('meal_id')}",
+                                 d.get('diet') or "Unknown"])
+        return {'success': True}, 1
+
+    def a_book_principal(self, d):
+        self.hub.sheet1.append([d.get('date'), d.get('contact_name'), d.get('school_name'),
+                                d.get('address'), d.get('staff_count'), d.get('lunch_time'),
+                                d.get('delivery_notes'), "🆕 New Booking", d.get('email')])
+        return "Booking Success", 1
+
+    def a_get_all_orders(self, d):
+        if d.get('since_row') not in (None, ''):
+            first, page, next_row = self._rows_since(self.hub.teacher, d['since_row'])
+            synced = [{'_row': first + n, 'school': r[1], 'date': r[2], 'meal_id': r[4],
+                       'dish_name': r[5], 'diet': r[6]} for n, r in enumerate(page)]
+            return {'rows': synced, 'next_row': next_row}, len(page) + 1
+        return [{'school': r[1], 'date': r[2], 'meal_id': r[4], 'dish_name': r[5], 'diet': r[6]}
+                for r in self.hub.teacher[1:]], len(self.hub.teacher)
+
+    def a_get_blocked_dates(self, d):
+        return [r[0] for r in self.hub.blocked[1:] if r[0]], len(self.hub.blocked)
+
+    def a_toggle_block_date(self, d):
+        rows = self.hub.blocked
+        for i in range(1, len(rows)):
+            if rows[i][0] == d.get('date'):
+                del rows[i]
+                break
+        else:
+            rows.append([d.get('date')])
+        return "Toggled", len(rows)
+
+    def a_save_company(self, d):
+        rows = self.hub.companies
+        fields = {k: v for k, v in d.items() if k != 'action'}
+        cid = str(fields.get('CompanyID', '')).strip().upper()
+        if not cid:
+            return {'success': False, 'error': 'CompanyID required'}, 0
+        headers = rows[0]
+        for key in fields:
+            if key and key not in headers:
+                headers.append(key)
+                for r in rows[1:]:
+                    r.append("")
+        for r in rows[1:]:
+            if str(r[0]).strip().upper() == cid:
+                for key, val in fields.items():
+                    if key:
+                        r[headers.index(key)] = val
+                break
+        else:
+            rows.append([fields.get(h, "") for h in headers])
+        return {'success': True}, len(rows)
+
+    def _invoice_records(self, company_id=None):
+        rows = self.hub.invoices
+        out = []
+        for r in rows[1:]:
+            if not r[0] or (company_id and str(r[1]).upper() != company_id):
+                continue
+            out.append({
+                'invoiceId': r[0], 'companyId': r[1], 'companyName': r[2], 'weekOf': r[3],
+                'sundayAnchor': r[4], 'totalOrders': r[5], 'totalMeals': r[6],
+                'totalEmployees': r[7], 'employeePaid': r[8], 'companyOwed': r[9],
+                'bdContributed': r[10], 'breakdown': json.loads(r[11] or '[]'),
+                'status': r[12] or 'pending', 'createdAt': r[13], 'paidAt': r[14],
+                'paymentMethod': r[15], 'notes': r[16]})
+        out.sort(key=lambda i: i['weekOf'], reverse=True)
+        return out
+
+    def a_get_invoices(self, d):
+        cid = str(d.get('company_id', '')).strip().upper()
+        return {'invoices': self._invoice_records(cid)}, len(self.hub.invoices)
+
+    def a_get_all_invoices(self, d):
+        return {'invoices': self._invoice_records()}, len(self.hub.invoices)
+
+    def a_update_invoice_status(self, d):
+        for r in self.hub.invoices[1:]:
+            if r[0] == str(d.get('invoice_id', '')).strip():
+                r[12] = d.get('status', '')
+                if r[12] == 'paid':
+                    r[14] = datetime.now().strftime('%Y-%m-%d')
+                if d.get('payment_method'):
+                    r[15] = d['payment_method']
+                if d.get('notes'):
+                    r[16] = d['notes']
+                return {'success': True}, len(self.hub.invoices)
+        return {'success': False, 'error': 'Invoice not found'}, len(self.hub.invoices)
+
+    def a_generate_invoice(self, d):
+        anchor = str(d.get('sunday_anchor', '')).strip()
+        cid = str(d.get('company_id', '')).strip().upper()
+        if not anchor or not cid:
+            return {'success': False, 'error': 'Missing params'}, 0
+        rows = [o for o in self._corp_records()
+                if str(o['CompanyID']).upper() == cid and o['SundayAnchor'] == anchor]
+        if not rows:
+            return {'success': False, 'error': 'No orders found for this week'}, len(self.hub.corp)
+        invoice_id = f"BD-{anchor.replace('-', '')[:8]}-{cid}"
+        emp = sum(float(o['EmployeePrice'] or 0) for o in rows)
+        co = sum(float(o['CompanyCoverage'] or 0) for o in rows)
+        bd = sum(float(o['BDCoverage'] or 0) for o in rows)
+        self.hub.invoices.append([
+            invoice_id, cid, rows[0]['CompanyName'], rows[0]['DeliveryDate'], anchor,
+            len({o['OrderID'] for o in rows}), len(rows), len({o['EmployeeEmail'] for o in rows}),
+            round(emp, 2), round(co, 2), round(bd, 2), "[]", "pending",
+            datetime.now().strftime('%Y-%m-%d'), "", "", ""])
+        return {'success': True, 'invoiceId': invoice_id}, len(self.hub.corp)
+
+
+def make_handler(emulator):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, fmt, *args):
+            pass
+
+        def _send(self, result):
+            if isinstance(result, str):
+                body, ctype = result.encode('utf-8'), 'text/plain; charset=utf-8'
+            else:
+                body, ctype = json.dumps(result).encode('utf-8'), 'application/json'
+            self.send_response(200)
+            self.send_header('Content-Type', ctype)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == '/__stats':
+                return self._send(emulator.stats())
+            params = {k: v[0] for k, v in parse_qs(url.query).items()}
+            self._send(emulator.do_get(params))
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            try:
+                data = json.loads(self.rfile.read(length) or b'{}')
+                result = emulator.do_post(data)
+            except Exception as ex:
+                result = "Error: " + str(ex)
+            self._send(result)
+
+    return Handler
+
+
+def serve(host='127.0.0.1', port=8765, hub=None, **cost):
+    """Start the emulator on a background thread; returns (server, emulator)."""
+    emulator = Emulator(hub or Hub(), **cost)
+    server = ThreadingHTTPServer((host, port), make_handler(emulator))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, emulator
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    p.add_argument('--host', default='127.0.0.1')
+    p.add_argument('--port', type=int, default=8765)
+    p.add_argument('--companies', type=int, default=20)
+    p.add_argument('--employees', type=int, default=15, help='employees per company')
+    p.add_argument('--weeks', type=int, default=26, help='weeks of order history')
+    p.add_argument('--schools', type=int, default=12)
+    p.add_argument('--cold-start', type=float, default=0.0)
+    p.add_argument('--idle', type=float, default=300.0)
+    p.add_argument('--latency', type=float, default=0.0)
+    p.add_argument('--row-cost', type=float, default=0.0)
+    args = p.parse_args()
+
+    hub = Hub(args.companies, args.employees, args.weeks, args.schools)
+    server, _ = serve(args.host, args.port, hub, cold_start=args.cold_start, idle=args.idle,
+                      latency=args.latency, row_cost=args.row_cost)
+    print(f"GAS emulator on http://{args.host}:{server.server_port}/exec "
+          f"({len(hub.companies) - 1} companies, {len(hub.corp) - 1} corporate rows, "
+          f"{len(hub.teacher) - 1} teacher rows)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,221 @@
+function esc(v) {
+    return String(v == null ? '' : v).replace(/[&<>"']/g, function(c) {
+        return {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'}[c];
+    });
+}
+
+function apiGet(path, params) {
+    var qs = Object.keys(params).filter(k => params[k]).map(k => k + '=' + encodeURIComponent(params[k])).join('&');
+    return fetch(path + (qs ? '?' + qs : ''), {credentials: 'same-origin'}).then(function(r) {
+        if (!r.ok) throw new Error('HTTP ' + r.status);
+        return r.json();
+    });
+}
+
+/* ── Tab Switching ── */
+function switchTab(id) {
+    document.querySelectorAll('.tab-panel').forEach(p => p.classList.remove('active'));
+    document.querySelectorAll('.tab').forEach(t => t.classList.remove('active'));
+    document.getElementById('tab-' + id).classList.add('active');
+    document.querySelectorAll('.tab')[['overview','companies','invoices','orders'].indexOf(id)].classList.add('active');
+    if (id === 'orders' && !ordLoaded) filterOrders();
+}
+
+/* ── Invoice Detail Toggle ── */
+function toggleInvDetail(iid) {
+    var el = document.getElementById('inv-detail-' + iid);
+    if (!el) return;
+    var open = el.style.display === 'table-row';
+    el.style.display = open ? 'none' : 'table-row';
+    if (!open) {
+        var inv = INVOICES[iid];
+        if (inv) {
+            var bd = [];
+            try { bd = typeof inv.breakdown === 'string' ? JSON.parse(inv.breakdown) : (inv.breakdown || []); } catch(e) {}
+            var html = '';
+            bd.forEach(function(t) {
+                html += '<tr><td>' + (t.tier||'—') + '</td><td>' + (t.meals||0) + '</td><td class="td-co">$' + (t.companyTotal||0).toFixed(2) + '</td></tr>';
+            });
+            if (!html) html = '<tr><td colspan="3" style="color:var(--muted);">No breakdown data</td></tr>';
+            document.getElementById('inv-bd-' + iid).innerHTML = html;
+        }
+    }
+}
+
+/* ── Invoice Filter / older pages (from /bd-admin/api/invoices) ── */
+
+function invoiceRowHtml(inv) {
+    var iid = String(inv.invoiceId || ''), cid = String(inv.companyId || '').toUpperCase();
+    var status = inv.status || 'pending', safe = esc(iid).replace(/\\/g, '\\\\');
+    var actions = status === 'pending'
+        ? '<button class="btn-outline" onclick="markInvoice(\'' + safe + '\',\'sent\')">Mark Sent</button> <button class="btn-outline" onclick="markInvoice(\'' + safe + '\',\'paid\')">Mark Paid</button>'
+        : status === 'sent'
+        ? '<button class="btn-outline" onclick="markInvoice(\'' + safe + '\',\'paid\')">Mark Paid</button>'
+        : '<span style="color:var(--muted);font-size:.75rem;">Paid</span>';
+    return '<tr class="clickable inv-row" data-iid="' + esc(iid) + '" data-co="' + esc(cid) + '" data-status="' + esc(status) + '" onclick="toggleInvDetail(\'' + safe + '\')">'
+        + '<td style="font-weight:700;">' + esc(iid) + '</td>'
+        + '<td class="td-name">' + esc(CO_NAMES[cid] || inv.companyName || cid) + '</td>'
+        + '<td>' + esc(inv.weekOf || '—') + '</td>'
+        + '<td>' + esc(inv.totalMeals || 0) + '</td>'
+        + '<td class="td-co">$' + (parseFloat(inv.companyOwed) || 0).toFixed(2) + '</td>'
+        + '<td class="td-bd">$' + (parseFloat(inv.bdContributed) || 0).toFixed(2) + '</td>'
+        + '<td><span class="badge badge-' + esc(status) + '">' + esc(status.charAt(0).toUpperCase() + status.slice(1)) + '</span></td>'
+        + '<td class="inv-actions" onclick="event.stopPropagation();">' + actions + '</td>'
+        + '</tr>'
+        + '<tr class="inv-detail" id="inv-detail-' + esc(iid) + '"><td colspan="8"><table class="inv-tier-table">'
+        + '<thead><tr><th>Tier</th><th>Meals</th><th>Company Total</th></tr></thead>'
+        + '<tbody id="inv-bd-' + esc(iid) + '"></tbody></table></td></tr>';
+}
+
+function loadInvoices(reset) {
+    var body = document.getElementById('invoiceBody');
+    if (!body) return;
+    if (reset) { body.innerHTML = ''; invCursor = ''; }
+    var more = document.getElementById('invMore');
+    more.disabled = true;
+    apiGet('/bd-admin/api/invoices', {
+        company: document.getElementById('invCompanyFilter').value,
+        status:  document.getElementById('invStatusFilter').value,
+        cursor:  invCursor, limit: 25
+    }).then(function(d) {
+        var html = '';
+        d.invoices.forEach(function(inv) { INVOICES[inv.invoiceId] = inv; html += invoiceRowHtml(inv); });
+        body.insertAdjacentHTML('beforeend', html);
+        invCursor = d.next_cursor || '';
+        more.style.display = d.next_cursor ? '' : 'none';
+        more.disabled = false;
+        var shown = body.querySelectorAll('.inv-row').length;
+        document.getElementById('invPageInfo').textContent = shown ? shown + ' invoices' : 'No invoices match your filters.';
+    }).catch(function() { more.disabled = false; alert('Could not load invoices'); });
+}
+
+function filterInvoices() { loadInvoices(true); }
+
+/* ── Exports (streamed CSV from /bd-admin/export/*) ── */
+function exportUrl(path, params) {
+    var qs = Object.keys(params).filter(k => params[k]).map(k => k + '=' + encodeURIComponent(params[k])).join('&');
+    return path + (qs ? '?' + qs : '');
+}
+
+function exportInvoices() {
+    window.location.href = exportUrl('/bd-admin/export/invoices', {
+        company: document.getElementById('invCompanyFilter').value,
+        status:  document.getElementById('invStatusFilter').value
+    });
+}
+
+function exportOrders() {
+    window.location.href = exportUrl('/bd-admin/export/corporate-orders', {
+        company: document.getElementById('orderCoFilter').value,
+        week:    document.getElementById('orderWeekFilter').value
+    });
+}
+
+/* ── Mark Invoice Status ── */
+function markInvoice(iid, newStatus) {
+    fetch('/bd-admin/invoice-status', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({invoice_id: iid, status: newStatus})
+    }).then(r => r.json()).then(function(d) {
+        if (d.success) location.reload();
+        else alert('Error: ' + (d.error || 'Unknown'));
+    }).catch(function(e) { alert('Network error'); });
+}
+
+/* ── Order tables (from /bd-admin/api/orders, cursor-paginated) ── */
+function orderRowHtml(o) {
+    return '<tr>'
+        + '<td style="font-weight:700;">' + esc(String(o.order_id).substring(0,12)) + '</td>'
+        + '<td class="td-name">' + esc(o.employee_name) + '</td>'
+        + '<td>' + esc(CO_NAMES[o.company_id] || o.company_id) + '</td>'
+        + '<td>' + esc(o.delivery_date) + '</td>'
+        + '<td>' + o.meals.length + '</td>'
+        + '<td>$' + o.emp_total.toFixed(2) + '</td>'
+        + '<td class="td-co">$' + o.co_total.toFixed(2) + '</td>'
+        + '<td class="td-bd">$' + o.bd_total.toFixed(2) + '</td>'
+        + '</tr>';
+}
+
+// One pager per table: cursors[i] is the cursor that fetches page i.
+function makeOrderPager(opts) {
+    var p = {cursors: [''], page: 0, total: 0, seq: 0};
+    p.reset = function() { p.cursors = ['']; p.page = 0; p.load(); };
+    p.move = function(dir) { p.page = Math.max(0, p.page + dir); p.load(); };
+    p.load = function() {
+        var seq = ++p.seq, page = p.page;
+        var params = opts.params();
+        params.cursor = p.cursors[page];
+        params.limit = opts.perPage;
+        apiGet('/bd-admin/api/orders', params).then(function(d) {
+            if (seq !== p.seq) return;   // a newer request superseded this one
+            if (d.summary) { p.total = d.summary.orders; if (opts.onSummary) opts.onSummary(d.summary); }
+            p.cursors[page + 1] = d.next_cursor;
+            var html = d.orders.map(orderRowHtml).join('');
+            if (!html) html = '<tr><td colspan="8" style="text-align:center;padding:40px;color:var(--muted);">' + opts.empty + '</td></tr>';
+            document.getElementById(opts.body).innerHTML = html;
+            var start = page * opts.perPage;
+            document.getElementById(opts.info).textContent = p.total
+                ? (start + 1) + '–' + (start + d.orders.length) + ' of ' + p.total + opts.unit : 'No orders';
+            document.getElementById(opts.prev).disabled = page === 0;
+            document.getElementById(opts.next).disabled = !d.next_cursor;
+        }).catch(function() {
+            if (seq === p.seq) document.getElementById(opts.info).textContent = 'Could not load orders';
+        });
+    };
+    return p;
+}
+
+function debounce(fn, ms) {
+    var t;
+    return function() { clearTimeout(t); t = setTimeout(fn, ms); };
+}
+
+/* ── Orders Tab ── */
+var ordPager = makeOrderPager({
+    body: 'ordersBody', info: 'ordPageInfo', prev: 'ordPrev', next: 'ordNext',
+    perPage: 25, unit: ' orders', empty: 'No orders match your filters.',
+    params: function() {
+        return {q:       document.getElementById('orderSearch').value.trim(),
+                company: document.getElementById('orderCoFilter').value,
+                week:    document.getElementById('orderWeekFilter').value};
+    },
+    onSummary: function(s) {
+        document.getElementById('ordSumOrders').textContent = s.orders;
+        document.getElementById('ordSumMeals').textContent = s.meals;
+        document.getElementById('ordSumEmp').textContent = '$' + s.emp_total.toFixed(2);
+        document.getElementById('ordSumCo').textContent = '$' + s.co_total.toFixed(2);
+        document.getElementById('ordSumBd').textContent = '$' + s.bd_total.toFixed(2);
+    }
+});
+var ordLoaded = false;
+var filterOrders = debounce(function() { ordLoaded = true; ordPager.reset(); }, 250);
+function ordPage(dir) { ordPager.move(dir); }
+
+/* ── Toggle Recent Orders ── */
+function toggleRecent() {
+    var panel = document.getElementById('recentPanel');
+    var arrow = document.getElementById('recentArrow');
+    var open = panel.style.display !== 'none';
+    panel.style.display = open ? 'none' : 'block';
+    arrow.classList.toggle('open', !open);
+    if (!open) recPager.reset();
+}
+
+/* ── Recent Orders (Overview tab) ── */
+var recPager = makeOrderPager({
+    body: 'recentBody', info: 'recPageInfo', prev: 'recPrev', next: 'recNext',
+    perPage: 10, unit: '', empty: 'No orders found.',
+    params: function() { return {q: document.getElementById('recentSearch').value.trim()}; }
+});
+var filterRecent = debounce(function() { recPager.reset(); }, 250);
+function recPage(dir) { recPager.move(dir); }
+
+/* ── Sidebar Navigation ── */
+function sidebarNav(id, el) {
+    document.querySelectorAll('.tab-panel').forEach(p => p.classList.remove('active'));
+    document.querySelectorAll('.sb-item').forEach(s => s.classList.remove('active'));
+    document.getElementById('tab-' + id).classList.add('active');
+    if (el) el.classList.add('active');
+    if (id === 'orders' && !ordLoaded) filterOrders();
+}
@@ -0,0 +1,649 @@
+// ── Impact banner count-up ──
+(function() {
+    function fmt(n, format) {
+        if (format === 'money') {
+            if (n >= 1000000) return (n/1000000).toFixed(1) + 'M';
+            if (n >= 1000)    return (n/1000).toFixed(0) + 'K';
+            return n.toLocaleString();
+        }
+        return n.toLocaleString();
+    }
+    function countUp(el, target, duration) {
+        const start = performance.now();
+        const format = el.dataset.format || 'number';
+        ;(function update(now) {
+            const p = Math.min((now - start) / duration, 1);
+            const eased = 1 - Math.pow(1 - p, 3);
+            el.textContent = fmt(Math.round(eased * target), format);
+            if (p < 1) requestAnimationFrame(update);
+        })(performance.now());
+    }
+    window.addEventListener('DOMContentLoaded', function() {
+        document.querySelectorAll('.count-up').forEach(function(el) {
+            const target = parseInt(el.dataset.target, 10) || 0;
+            setTimeout(function() { countUp(el, target, 1400); }, 300);
+        });
+    });
+})();
+
+// ── Tab switching (via sidebar) ──
+function showTab(name, el) {
+    document.querySelectorAll('.tab').forEach(t => t.classList.remove('active'));
+    document.querySelectorAll('.tab-panel').forEach(p => p.classList.remove('active'));
+    if (el) el.classList.add('active');
+    document.getElementById('tab-' + name).classList.add('active');
+}
+function sidebarNav(name, el) {
+    document.querySelectorAll('.sb-item').forEach(s => s.classList.remove('active'));
+    document.querySelectorAll('.tab-panel').forEach(p => p.classList.remove('active'));
+    if (el) el.classList.add('active');
+    document.getElementById('tab-' + name).classList.add('active');
+}
+
+// Auto-open tab from query param (e.g. after save)
+(function() {
+    const params = new URLSearchParams(window.location.search);
+    const saved = params.get('saved');
+    if (saved) {
+        const sbItem = document.querySelector(`.sb-item[onclick*="'${saved}'"]`);
+        if (sbItem) sidebarNav(saved, sbItem);
+    }
+})();
+
+// ── Month filter ──
+function filterMonth(key) {
+    document.querySelectorAll('.month-block').forEach(el => {
+        el.classList.toggle('active', el.id === 'month-' + key);
+    });
+}
+
+// ── Order history: search, filter, paginate (pages come from /manager/api/orders) ──
+let _orderSearch = '';
+let _orderWeek = '';
+let _orderPage = 0;
+let _orderCursors = [''];   // _orderCursors[i] fetches page i
+let _orderTotal = 0;
+let _orderSeq = 0;
+let _orderTimer = null;
+const ORDER_PAGE_SIZE = 25;
+const ORDER_CACHE = {};     // order_id → order, for the receipt modal
+
+function esc(v) {
+    return String(v == null ? '' : v).replace(/[&<>"']/g, c =>
+        ({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'}[c]));
+}
+
+function applyOrderFilters() {
+    clearTimeout(_orderTimer);
+    _orderTimer = setTimeout(() => {
+        _orderSearch  = (document.getElementById('orderSearch')?.value || '').toLowerCase().trim();
+        _orderWeek    = document.getElementById('orderWeekFilter')?.value || '';
+        _orderPage    = 0;
+        _orderCursors = [''];
+        loadOrderPage();
+    }, 250);
+}
+
+async function loadOrderPage() {
+    const seq = ++_orderSeq, pageNum = _orderPage;
+    const params = new URLSearchParams({limit: ORDER_PAGE_SIZE});
+    if (_orderSearch) params.set('q', _orderSearch);
+    if (_orderWeek) params.set('week', _orderWeek);
+    if (_orderCursors[pageNum]) params.set('cursor', _orderCursors[pageNum]);
+    let d;
+    try {
+        const res = await fetch('/manager/api/orders?' + params, {credentials: 'same-origin'});
+        if (!res.ok) throw new Error();
+        d = await res.json();
+    } catch {
+        if (seq === _orderSeq) document.getElementById('pageInfo').textContent = 'Could not load orders';
+        return;
+    }
+    if (seq !== _orderSeq) return;   // superseded by a newer filter/page
+    if (d.summary) { _orderTotal = d.summary.orders; renderOrderSummary(d.summary); }
+    _orderCursors[pageNum + 1] = d.next_cursor;
+    d.orders.forEach(o => { ORDER_CACHE[o.order_id] = o; });
+    renderOrderTable(d.orders, pageNum, !!d.next_cursor);
+}
+
+function renderOrderSummary(s) {
+    document.getElementById('sb-orders').textContent = s.orders;
+    document.getElementById('sb-meals').textContent  = s.meals;
+    document.getElementById('sb-emp').textContent    = '$' + s.emp_total.toFixed(2);
+    document.getElementById('sb-co').textContent     = '$' + s.co_total.toFixed(2);
+    document.getElementById('sb-bd').textContent     = '$' + s.bd_total.toFixed(2);
+    document.getElementById('sb-total').textContent  = '$' + (s.emp_total + s.co_total + s.bd_total).toFixed(2);
+}
+
+function renderOrderTable(page, pageNum, hasNext) {
+    const tbody = document.getElementById('orderTbody');
+    if (!page.length) {
+        tbody.innerHTML = `<tr><td colspan="8" style="text-align:center;padding:44px;color:var(--muted);font-size:.9rem;">No orders match your search.</td></tr>`;
+    } else {
+        tbody.innerHTML = page.map(o => `
+            <tr class="clickable" onclick='openInvoice(${esc(JSON.stringify(o.order_id))})'>
+                <td class="td-name">${esc(o.employee_name) || '—'}</td>
+                <td>${o.meals.length} meal${o.meals.length !== 1 ? 's' : ''}</td>
+                <td class="td-emp">$${o.emp_total.toFixed(2)}</td>
+                <td class="td-co">$${o.co_total.toFixed(2)}</td>
+                <td class="td-bd">$${o.bd_total.toFixed(2)}</td>
+                <td style="color:var(--muted)">${esc(o.delivery_date) || '—'}</td>
+                <td><span class="status-badge status-${esc((o.status||'pending').toLowerCase())}">${esc(o.status||'Pending')}</span></td>
+                <td class="td-action">View →</td>
+            </tr>
+        `).join('');
+    }
+
+    // Pagination
+    const start = pageNum * ORDER_PAGE_SIZE;
+    document.getElementById('pageInfo').textContent = _orderTotal === 0 ? 'No orders'
+        : `${start + 1}–${start + page.length} of ${_orderTotal} orders`;
+    document.getElementById('btnPrev').disabled = pageNum <= 0;
+    document.getElementById('btnNext').disabled = !hasNext;
+}
+
+function changePage(delta) {
+    _orderPage = Math.max(0, _orderPage + delta);
+    loadOrderPage();
+    window.scrollTo({top: 0, behavior: 'smooth'});
+}
+
+// Initial render
+if (document.getElementById('orderTbody')) loadOrderPage();
+
+// ── Account: sticky dirty-state save banner ──
+let _formDirty = false;
+const _accountForm = document.getElementById('accountForm');
+if (_accountForm) {
+    _accountForm.addEventListener('input', () => {
+        if (!_formDirty) {
+            _formDirty = true;
+            document.getElementById('saveBanner').classList.add('visible');
+        }
+    });
+}
+
+async function saveAccount(e) {
+    if (e) e.preventDefault();
+    const btn = document.getElementById('saveBannerBtn');
+    const msg = document.getElementById('saveBannerMsg');
+    btn.textContent = 'Saving…';
+    btn.disabled = true;
+    try {
+        const res = await fetch('/manager/update-account', {
+            method: 'POST',
+            headers: {'X-Requested-With': 'XMLHttpRequest'},
+            body: new FormData(document.getElementById('accountForm'))
+        });
+        if (res.ok) {
+            _formDirty = false;
+            btn.textContent = '✓ Saved';
+            msg.textContent = 'All changes saved';
+            document.getElementById('saveBanner').classList.add('saved');
+            setTimeout(() => {
+                document.getElementById('saveBanner').classList.remove('visible', 'saved');
+                btn.textContent = 'Save Changes';
+                btn.disabled = false;
+                msg.textContent = 'Unsaved changes';
+            }, 2500);
+        } else { throw new Error(); }
+    } catch {
+        btn.textContent = 'Error — try again';
+        setTimeout(() => { btn.textContent = 'Save Changes'; btn.disabled = false; }, 3000);
+    }
+}
+
+// ── Employee Access PIN ──
+function startEditPIN() {
+    document.getElementById('pinDisplay').style.display = 'none';
+    document.getElementById('pinEditRow').style.display = 'flex';
+    document.getElementById('pinInput').focus();
+}
+function cancelEditPIN() {
+    document.getElementById('pinEditRow').style.display = 'none';
+    document.getElementById('pinDisplay').style.display = 'flex';
+    document.getElementById('pinMsg').style.display = 'none';
+}
+async function savePIN() {
+    const pin = document.getElementById('pinInput').value.trim();
+    const msg = document.getElementById('pinMsg');
+    const btn = document.getElementById('pinSaveBtn');
+    if (!pin) { msg.style.display='block'; msg.style.color='#c0392b'; msg.textContent='PIN cannot be empty.'; return; }
+    btn.textContent = 'Saving…'; btn.disabled = true;
+    try {
+        const res = await fetch('/api/gas', {
+            method: 'POST', headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify({ action: 'update_company_pin', company_id: COMPANY_ID, pin })
+        });
+        const d = await res.json();
+        if (d.success) {
+            document.getElementById('pinValue').textContent = pin;
+            cancelEditPIN();
+        } else {
+            msg.style.display = 'block'; msg.style.color = '#c0392b';
+            msg.textContent = d.error || 'Could not save — try again.';
+        }
+    } catch(e) {
+        msg.style.display = 'block'; msg.style.color = '#c0392b'; msg.textContent = 'Network error — try again.';
+    }
+    btn.textContent = 'Save'; btn.disabled = false;
+}
+
+// ── Invoice modal ──
+let currentOrder = null;
+
+async function openInvoice(orderId) {
+    let order = ORDER_CACHE[orderId];
+    if (!order) {
+        try {
+            const res = await fetch('/manager/api/orders/' + encodeURIComponent(orderId), {credentials: 'same-origin'});
+            if (!res.ok) return;
+            order = ORDER_CACHE[orderId] = (await res.json()).order;
+        } catch { return; }
+    }
+    currentOrder = order;
+
+    document.getElementById('modalTitle').textContent = order.employee_name || 'Order Details';
+    document.getElementById('modalSub').textContent = 'Order #' + order.order_id + ' · Delivery: ' + (order.delivery_date || '—');
+
+    // Meta grid
+    document.getElementById('invoiceMeta').innerHTML = `
+        <div class="im-cell"><div class="im-label">Employee</div><div class="im-val">${order.employee_name || '—'}</div></div>
+        <div class="im-cell"><div class="im-label">Order ID</div><div class="im-val">${order.order_id}</div></div>
+        <div class="im-cell"><div class="im-label">Delivery Date</div><div class="im-val">${order.delivery_date || '—'}</div></div>
+        <div class="im-cell"><div class="im-label">Meals</div><div class="im-val">${order.meals.length} meal${order.meals.length !== 1 ? 's' : ''}</div></div>
+    `;
+
+    // Meal rows
+    document.getElementById('invoiceMeals').innerHTML = order.meals.map(m => `
+        <tr>
+            <td>${m.dish_name || '—'}</td>
+            <td class="td-r">${m.emp_price === 0 ? '<span style="color:var(--muted)">$0.00</span>' : '$' + m.emp_price.toFixed(2)}</td>
+            <td class="td-r subsidy-green">$${m.total_subsidy.toFixed(2)}</td>
+        </tr>
+    `).join('');
+
+    // Totals
+    const totalSubsidy = order.co_total + order.bd_total;
+    document.getElementById('invoiceTotals').innerHTML = `
+        <div class="it-row"><span class="it-label">Employee paid</span><span class="it-val">$${order.emp_total.toFixed(2)}</span></div>
+        <div class="it-row"><span class="it-label">Total subsidy coverage</span><span class="it-val green">$${totalSubsidy.toFixed(2)}</span></div>
+        <div class="it-row total"><span class="it-label">Total meal value</span><span class="it-val">$${(order.emp_total + totalSubsidy).toFixed(2)}</span></div>
+    `;
+
+    document.getElementById('invoiceOverlay').classList.add('open');
+    document.body.style.overflow = 'hidden';
+}
+
+function closeInvoice() {
+    document.getElementById('invoiceOverlay').classList.remove('open');
+    document.body.style.overflow = '';
+}
+
+function handleOverlayClick(e) {
+    if (e.target === document.getElementById('invoiceOverlay')) closeInvoice();
+}
+
+// ── Print receipt (opens new window with clean receipt) ──
+function printReceipt() {
+    if (!currentOrder) return;
+    const o = currentOrder;
+    const totalSubsidy = o.co_total + o.bd_total;
+    const totalValue   = o.emp_total + totalSubsidy;
+
+    const mealsHTML = o.meals.map(m => `
+        <tr>
+            <td>${m.dish_name || 'Meal'}</td>
+            <td class="r">${m.emp_price === 0 ? '—' : '$' + m.emp_price.toFixed(2)}</td>
+            <td class="r g">$${m.total_subsidy.toFixed(2)}</td>
+        </tr>
+    `).join('');
+
+    const html = `<!DOCTYPE html>
+<html>
+<head>
+<meta charset="UTF-8">
+<title>BetterDay Receipt — ${o.employee_name}</title>
+<style>
+  * { box-sizing: border-box; margin: 0; padding: 0; }
+  body { font-family: 'DM Sans', -apple-system, sans-serif; color: #222; padding: 48px 52px; max-width: 640px; margin: 0 auto; }
+  .top { display: flex; align-items: center; justify-content: space-between; margin-bottom: 32px; padding-bottom: 20px; border-bottom: 2px solid #222; }
+  .co-name { font-size: 1rem; font-weight: 700; color: #222; }
+  .co-addr { font-size: .8rem; color: #717171; margin-top: 2px; }
+  .receipt-label { font-size: .72rem; font-weight: 700; text-transform: uppercase; letter-spacing: .8px; color: #717171; text-align: right; }
+  .receipt-title { font-size: 1.2rem; font-weight: 700; text-align: right; margin-top: 2px; }
+  .meta-grid { display: grid; grid-template-columns: 1fr 1fr; gap: 16px; margin-bottom: 28px; }
+  .meta-label { font-size: .7rem; font-weight: 600; text-transform: uppercase; letter-spacing: .3px; color: #717171; margin-bottom: 3px; }
+  .meta-val { font-size: .9rem; font-weight: 600; }
+  table { width: 100%; border-collapse: collapse; margin-bottom: 20px; }
+  th { text-align: left; font-size: .7rem; font-weight: 700; text-transform: uppercase; letter-spacing: .4px; color: #717171; padding: 8px 0; border-bottom: 1.5px solid #222; }
+  td { padding: 10px 0; font-size: .9rem; border-bottom: 1px solid #EBEBEB; }
+  .r { text-align: right; font-weight: 600; }
+  .g { color: #008A05; }
+  .totals { background: #F7F7F7; border-radius: 10px; padding: 16px 18px; margin-bottom: 28px; }
+  .t-row { display: flex; justify-content: space-between; padding: 5px 0; font-size: .9rem; }
+  .t-row.total { font-weight: 700; font-size: 1rem; padding-top: 10px; margin-top: 6px; border-top: 1.5px solid #DDDDDD; }
+  .t-label { color: #484848; }
+  .t-val.g { color: #008A05; font-weight: 700; }
+  .footer { text-align: center; font-size: .75rem; color: #717171; line-height: 1.7; border-top: 1px solid #EBEBEB; padding-top: 20px; }
+  @media print { body { padding: 24px 28px; } }
+</style>
+</head>
+<body>
+<div class="top">
+  <div>
+    <div class="co-name">${COMPANY_NAME}</div>
+    ${COMPANY_ADDR ? `<div class="co-addr">${COMPANY_ADDR}</div>` : ''}
+  </div>
+  <div>
+    <div class="receipt-label">BetterDay Catering</div>
+    <div class="receipt-title">Meal Receipt</div>
+  </div>
+</div>
+<div class="meta-grid">
+  <div><div class="meta-label">Employee</div><div class="meta-val">${o.employee_name || '—'}</div></div>
+  <div><div class="meta-label">Order ID</div><div class="meta-val">${o.order_id}</div></div>
+  <div><div class="meta-label">Delivery Date</div><div class="meta-val">${o.delivery_date || '—'}</div></div>
+  <div><div class="meta-label">Meals</div><div class="meta-val">${o.meals.length}</div></div>
+</div>
+<table>
+  <thead><tr><th style="width:55%">Meal</th><th class="r">Employee Price</th><th class="r">Subsidy Applied</th></tr></thead>
+  <tbody>${mealsHTML}</tbody>
+</table>
+<div class="totals">
+  <div class="t-row"><span class="t-label">Employee paid</span><span class="t-val">$${o.emp_total.toFixed(2)}</span></div>
+  <div class="t-row"><span class="t-label">Total subsidy coverage</span><span class="t-val g">$${totalSubsidy.toFixed(2)}</span></div>
+  <div class="t-row total"><span class="t-label">Total meal value</span><span class="t-val">$${totalValue.toFixed(2)}</span></div>
+</div>
+<div class="footer">
+  This receipt confirms meal program coverage for the delivery date noted above.<br>
+  BetterDay Catering &nbsp;·&nbsp; eatbetterday.ca &nbsp;·&nbsp; hello@eatbetterday.ca
+</div>
+</body>
+</html>`;
+
+    const win = window.open('', '_blank', 'width=700,height=900');
+    win.document.write(html);
+    win.document.close();
+    win.onload = () => { win.focus(); win.print(); };
+}
+
+// ── Employees tab ──
+async function resendLink(email, btn) {
+    const orig = btn.textContent;
+    btn.textContent = 'Sending…'; btn.disabled = true;
+    try {
+        const r = await fetch('/manager/resend-link', {
+            method: 'POST', headers: {'Content-Type':'application/json'},
+            body: JSON.stringify({email})
+        });
+        const d = await r.json();
+        btn.textContent = d.success ? 'Sent ✓' : 'Failed';
+        setTimeout(() => { btn.textContent = orig; btn.disabled = false; }, 2500);
+    } catch(e) {
+        btn.textContent = 'Error'; setTimeout(() => { btn.textContent = orig; btn.disabled = false; }, 2000);
+    }
+}
+
+async function removeEmployee(email, name, rowIndex) {
+    if (!confirm(`Remove ${name} from your team?\n\nThey will no longer be able to sign in. This cannot be undone.`)) return;
+    try {
+        const r = await fetch('/manager/remove-employee', {
+            method: 'POST', headers: {'Content-Type':'application/json'},
+            body: JSON.stringify({email})
+        });
+        const d = await r.json();
+        if (d.success) {
+            const row = document.getElementById('emp-row-' + rowIndex);
+            if (row) row.remove();
+            // Update tab count
+            const tbody = document.querySelector('#empTable tbody');
+            const remaining = tbody ? tbody.querySelectorAll('tr[id^="emp-row-"]').length : 0;
+            document.querySelectorAll('.tab-count').forEach(el => el.textContent = remaining);
+        } else {
+            alert(d.error || 'Could not remove employee — try again.');
+        }
+    } catch(e) { alert('Network error — try again.'); }
+}
+
+// ── Monthly Report PDF ──
+function downloadMonthlyPDF() {
+    const key = document.getElementById('monthSelect')?.value;
+    const m   = MONTHLY.find(x => x.key === key) || MONTHLY[0];
+    if (!m) return;
+
+    const fmt$ = n => '$' + (parseFloat(n) || 0).toFixed(2);
+    const addr = [COMPANY_ADDR_LINE1, COMPANY_CITY].filter(Boolean).join(', ');
+    const total = (parseFloat(m.emp_spend)||0) + (parseFloat(m.co_spend)||0) + (parseFloat(m.bd_spend)||0);
+
+    const tierRows = (m.tiers || []).map(t => `
+        <tr>
+            <td>${t.name}</td>
+            <td style="text-align:right">${t.meals}</td>
+            <td style="text-align:right">${fmt$(t.emp)}</td>
+            <td style="text-align:right">${fmt$(t.co)}</td>
+            <td style="text-align:right">${fmt$(t.bd)}</td>
+            <td style="text-align:right;font-weight:600">${fmt$(t.total)}</td>
+        </tr>`).join('');
+
+    const html = `<!DOCTYPE html><html><head><meta charset="UTF-8">
+<title>Monthly Report — ${m.label} — ${COMPANY_NAME}</title>
+<link href="https://fonts.googleapis.com/css2?family=DM+Sans:wght@400;600;700;800&display=swap" rel="stylesheet">
+<style>
+  *{box-sizing:border-box;margin:0;padding:0}
+  body{font-family:'DM Sans',sans-serif;color:#222;padding:48px;max-width:800px;margin:0 auto;}
+  .logo{font-size:1.4rem;font-weight:800;color:#00465e;}.logo span{color:#0077a3;}
+  .header{display:flex;justify-content:space-between;align-items:flex-start;margin-bottom:36px;}
+  .report-label{font-size:.72rem;font-weight:700;text-transform:uppercase;letter-spacing:.4px;color:#717171;margin-bottom:4px;}
+  .report-title{font-size:1.3rem;font-weight:800;}
+  .meta{display:flex;gap:40px;margin-bottom:32px;font-size:.85rem;color:#484848;line-height:1.7;}
+  .stats{display:grid;grid-template-columns:repeat(4,1fr);gap:14px;margin-bottom:32px;}
+  .stat{background:#f7f7f7;border-radius:10px;padding:14px 16px;}
+  .stat-lbl{font-size:.68rem;font-weight:700;text-transform:uppercase;letter-spacing:.4px;color:#717171;margin-bottom:4px;}
+  .stat-val{font-size:1.2rem;font-weight:800;color:#00465e;}
+  h2{font-size:.82rem;font-weight:700;text-transform:uppercase;letter-spacing:.4px;color:#717171;margin-bottom:12px;}
+  table{width:100%;border-collapse:collapse;margin-bottom:24px;}
+  th{text-align:left;font-size:.68rem;font-weight:700;text-transform:uppercase;letter-spacing:.4px;color:#717171;padding:8px 10px;border-bottom:1px solid #ebebeb;}
+  td{padding:10px 10px;border-bottom:1px solid #ebebeb;font-size:.88rem;}
+  .total-row td{font-weight:700;background:#fafafa;border-top:2px solid #222;border-bottom:none;}
+  .green{color:#008A05;}.blue{color:#0077A3;}
+  .footer{margin-top:40px;font-size:.75rem;color:#717171;border-top:1px solid #ebebeb;padding-top:14px;}
+  @media print{body{padding:24px}}
+</style></head><body>
+<div class="header">
+  <div>
+    <div class="logo">Better<span>Day</span></div>
+    <div style="font-size:.78rem;color:#717171;margin-top:2px;">Monthly Report</div>
+  </div>
+  <div style="text-align:right;">
+    <div class="report-label">Report Period</div>
+    <div class="report-title">${m.label}</div>
+  </div>
+</div>
+
+<div class="meta">
+  <div><strong>Company</strong><br>${COMPANY_NAME}${addr ? '<br>'+addr : ''}</div>
+  <div><strong>Generated</strong><br>${new Date().toLocaleDateString('en-CA')}</div>
+</div>
+
+<div class="stats">
+  <div class="stat"><div class="stat-lbl">Total Orders</div><div class="stat-val">${m.orders}</div></div>
+  <div class="stat"><div class="stat-lbl">Total Meals</div><div class="stat-val">${m.meals}</div></div>
+  <div class="stat"><div class="stat-lbl">Company Covered</div><div class="stat-val green">${fmt$(m.co_spend)}</div></div>
+  <div class="stat"><div class="stat-lbl">BD Contributed</div><div class="stat-val blue">${fmt$(m.bd_spend)}</div></div>
+</div>
+
+<h2>Breakdown by Tier</h2>
+<table>
+  <thead><tr>
+    <th>Tier</th>
+    <th style="text-align:right">Meals</th>
+    <th style="text-align:right">Staff Paid</th>
+    <th style="text-align:right">Co. Covered</th>
+    <th style="text-align:right">BD Contributed</th>
+    <th style="text-align:right">Total Value</th>
+  </tr></thead>
+  <tbody>
+    ${tierRows}
+    <tr class="total-row">
+      <td>Total</td>
+      <td style="text-align:right">${m.meals}</td>
+      <td style="text-align:right">${fmt$(m.emp_spend)}</td>
+      <td style="text-align:right" class="green">${fmt$(m.co_spend)}</td>
+      <td style="text-align:right" class="blue">${fmt$(m.bd_spend)}</td>
+      <td style="text-align:right">${fmt$(total)}</td>
+    </tr>
+  </tbody>
+</table>
+
+<div class="footer">
+  BetterDay Corporate · ${COMPANY_NAME} · ${m.label} Monthly Report · Generated ${new Date().toLocaleDateString('en-CA')}
+</div>
+<script>window.onload=function(){window.print();}<\/script>
+</body></html>`;
+
+    const win = window.open('', '_blank');
+    win.document.write(html);
+    win.document.close();
+}
+
+// ── Weekly Invoices tab ──
+function toggleInvDetail(idx) {
+    const row = document.getElementById('inv-detail-' + idx);
+    if (!row) return;
+    const open = row.style.display === 'table-row';
+    // close all
+    document.querySelectorAll('.inv-row-detail').forEach(r => r.style.display = 'none');
+    if (!open) {
+        row.style.display = 'table-row';
+        loadInvoiceLines(idx);
+    }
+}
+
+// Orders billed on an invoice, fetched the first time its row is opened
+async function loadInvoiceLines(idx) {
+    const box = document.getElementById('inv-lines-' + idx);
+    const inv = INVOICES[idx];
+    if (!box || !inv || box.dataset.loaded) return;
+    box.dataset.loaded = '1';
+    box.innerHTML = '<div style="font-size:.78rem;color:var(--muted);">Loading orders…</div>';
+    try {
+        const res = await fetch('/manager/api/invoices/' + encodeURIComponent(inv.invoiceId), {credentials: 'same-origin'});
+        if (!res.ok) throw new Error();
+        const d = await res.json();
+        d.orders.forEach(o => { ORDER_CACHE[o.order_id] = o; });
+        box.innerHTML = !d.orders.length ? '' : `
+            <table class="inv-tier-table">
+                <thead><tr><th>Employee</th><th style="text-align:right">Meals</th><th style="text-align:right">Co. Covered</th></tr></thead>
+                <tbody>${d.orders.map(o => `
+                    <tr class="clickable" onclick='openInvoice(${esc(JSON.stringify(o.order_id))})'>
+                        <td>${esc(o.employee_name) || '—'}</td>
+                        <td style="text-align:right;">${o.meals.length}</td>
+                        <td style="text-align:right;">$${o.co_total.toFixed(2)}</td>
+                    </tr>`).join('')}
+                </tbody>
+            </table>`;
+    } catch {
+        delete box.dataset.loaded;
+        box.innerHTML = '<div style="font-size:.78rem;color:var(--muted);">Could not load orders.</div>';
+    }
+}
+
+function downloadInvPDF(idx) {
+    const inv = INVOICES[idx];
+    if (!inv) return;
+
+    const fmtDate = s => s ? s.replace(/-/g, '/') : '—';
+    const fmt$ = n => '$' + (parseFloat(n) || 0).toFixed(2);
+
+    let tierRows = '';
+    (inv.breakdown || []).forEach(t => {
+        tierRows += `<tr>
+            <td>${t.tier}</td>
+            <td style="text-align:right">${t.meals}</td>
+            <td style="text-align:right">${fmt$(t.companyTotal)}</td>
+        </tr>`;
+    });
+
+    const statusColor = {pending:'#b56b10', sent:'#1a6cb5', paid:'#1a7a46'};
+    const statusBg    = {pending:'#fff3e0', sent:'#eaf4ff', paid:'#eafaf1'};
+    const st = (inv.status || 'pending').toLowerCase();
+
+    const html = `<!DOCTYPE html><html><head><meta charset="UTF-8">
+<title>Invoice ${inv.invoiceId}</title>
+<link href="https://fonts.googleapis.com/css2?family=DM+Sans:wght@400;600;700;800&display=swap" rel="stylesheet">
+<style>
+  *{box-sizing:border-box;margin:0;padding:0}
+  body{font-family:'DM Sans',sans-serif;color:#222;padding:48px;max-width:720px;margin:0 auto;}
+  .logo{font-size:1.4rem;font-weight:800;color:#00465e;margin-bottom:4px;}
+  .logo span{color:#0077a3;}
+  .inv-header{display:flex;justify-content:space-between;align-items:flex-start;margin-bottom:36px;}
+  .inv-meta{font-size:.85rem;color:#484848;line-height:1.7;}
+  .status-badge{display:inline-block;padding:3px 12px;border-radius:99px;font-size:.75rem;font-weight:700;}
+  h2{font-size:1rem;font-weight:700;margin-bottom:14px;text-transform:uppercase;letter-spacing:.4px;color:#717171;}
+  table{width:100%;border-collapse:collapse;margin-bottom:24px;}
+  th{text-align:left;font-size:.72rem;font-weight:700;text-transform:uppercase;letter-spacing:.4px;color:#717171;padding:8px 10px;border-bottom:1px solid #ebebeb;}
+  td{padding:10px 10px;border-bottom:1px solid #ebebeb;font-size:.88rem;}
+  .total-row{display:flex;justify-content:space-between;align-items:center;padding:14px 0;border-top:2.5px solid #222;margin-top:4px;}
+  .total-label{font-size:.85rem;font-weight:700;text-transform:uppercase;letter-spacing:.4px;}
+  .total-val{font-size:1.3rem;font-weight:900;}
+  .footer{margin-top:48px;font-size:.78rem;color:#717171;border-top:1px solid #ebebeb;padding-top:16px;}
+  @media print{body{padding:24px}}
+</style></head><body>
+<div class="inv-header">
+  <div>
+    <div class="logo">Better<span>Day</span></div>
+    <div style="font-size:.78rem;color:#717171;margin-top:2px;">BetterDay Corporate</div>
+  </div>
+  <div style="text-align:right;">
+    <div style="font-size:.72rem;font-weight:700;text-transform:uppercase;letter-spacing:.4px;color:#717171;margin-bottom:4px;">Invoice</div>
+    <div style="font-size:1.1rem;font-weight:800;">${inv.invoiceId}</div>
+    <div style="margin-top:8px;">
+      <span class="status-badge" style="background:${statusBg[st]};color:${statusColor[st]};">${st.charAt(0).toUpperCase()+st.slice(1)}</span>
+    </div>
+  </div>
+</div>
+
+<div style="display:flex;gap:40px;margin-bottom:36px;">
+  <div class="inv-meta">
+    <strong>Billed to</strong><br>
+    ${COMPANY_NAME}<br>
+    ${COMPANY_ADDR || ''}
+  </div>
+  <div class="inv-meta">
+    <strong>Invoice Date</strong><br>${fmtDate(inv.createdAt)}<br>
+    <strong style="display:block;margin-top:8px;">Week Of</strong>${fmtDate(inv.weekOf)}<br>
+    ${inv.status === 'paid' ? `<strong style="display:block;margin-top:8px;">Paid</strong>${fmtDate(inv.paidAt)}${inv.paymentMethod ? ' · '+inv.paymentMethod : ''}` : ''}
+  </div>
+</div>
+
+<h2>Meal Breakdown</h2>
+<table>
+  <thead><tr><th>Tier</th><th style="text-align:right">Meals</th><th style="text-align:right">Company Total</th></tr></thead>
+  <tbody>${tierRows || '<tr><td colspan="3" style="color:#717171">No breakdown available</td></tr>'}</tbody>
+</table>
+
+<div style="display:flex;gap:32px;margin-bottom:24px;font-size:.82rem;color:#484848;">
+  <div><strong style="display:block;color:#222">Total Meals</strong>${inv.totalMeals}</div>
+  <div><strong style="display:block;color:#222">Employees</strong>${inv.totalEmployees}</div>
+  <div><strong style="display:block;color:#222">Employee Paid</strong>${fmt$(inv.employeePaid)}</div>
+  <div><strong style="display:block;color:#222">BD Contributed</strong>${fmt$(inv.bdContributed)}</div>
+</div>
+
+<div class="total-row">
+  <span class="total-label">Total Owed by ${COMPANY_NAME}</span>
+  <span class="total-val">${fmt$(inv.companyOwed)}</span>
+</div>
+
+${inv.notes ? `<div style="margin-top:16px;font-size:.82rem;color:#484848;"><strong>Notes:</strong> ${inv.notes}</div>` : ''}
+
+<div class="footer">
+  Questions? Contact BetterDay at support@betterday.ca · Invoice ${inv.invoiceId}
+</div>
+<script>window.onload=function(){window.print();}<\/script>
+</body></html>`;
+
+    const win = window.open('', '_blank');
+    win.document.write(html);
+    win.document.close();
+}
@@ -0,0 +1,1459 @@
+// ══ HELPERS ══
+// Anchored to March 15, 2026 — first row of synced menu data
+function getLastSunday(){
+  return new Date(2026,2,15); // March 15, 2026 (month is 0-indexed)
+}
+function getNextSunday(){
+  const d=new Date();const diff=(7-d.getDay())%7||7;d.setDate(d.getDate()+diff);return d;
+}
+
+const DISH_ATTRS = {"#556":{"ch":1,"tr":0,"bf":0,"pk":0,"sf":0,"da":1,"gl":1,"st":"Pasta","ps":3},"#568":{"ch":0,"tr":1,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"","ps":0},"#565":{"ch":1,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":1,"st":"","ps":0},"#561":{"ch":1,"tr":0,"bf":0,"pk":0,"sf":0,"da":1,"gl":0,"st":"","ps":0},"#302":{"ch":0,"tr":0,"bf":1,"pk":0,"sf":0,"da":0,"gl":0,"st":"Potato","ps":2},"#564":{"ch":1,"tr":0,"bf":0,"pk":0,"sf":0,"da":1,"gl":1,"st":"","ps":0},"#563":{"ch":1,"tr":0,"bf":0,"pk":0,"sf":0,"da":1,"gl":1,"st":"","ps":0},"#507":{"ch":0,"tr":0,"bf":1,"pk":1,"sf":0,"da":0,"gl":0,"st":"Potato","ps":1},"#560":{"ch":0,"tr":0,"bf":1,"pk":0,"sf":0,"da":1,"gl":1,"st":"","ps":0},"#526":{"ch":0,"tr":1,"bf":0,"pk":0,"sf":0,"da":1,"gl":1,"st":"Pasta","ps":3},"#566":{"ch":0,"tr":0,"bf":1,"pk":0,"sf":0,"da":1,"gl":1,"st":"","ps":0},"#562":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":1,"da":0,"gl":0,"st":"Rice","ps":0},"#567":{"ch":1,"tr":0,"bf":0,"pk":0,"sf":0,"da":1,"gl":0,"st":"","ps":0},"#573":{"ch":1,"tr":0,"bf":0,"pk":0,"sf":0,"da":1,"gl":0,"st":"","ps":0},"#54":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Other","ps":2},"#396":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":1,"da":0,"gl":0,"st":"Rice","ps":4},"#574":{"ch":1,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"","ps":0},"#575":{"ch":1,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"","ps":0},"#537":{"ch":1,"tr":0,"bf":0,"pk":0,"sf":0,"da":1,"gl":0,"st":"Potato","ps":2},"#509":{"ch":1,"tr":0,"bf":0,"pk":0,"sf":0,"da":1,"gl":0,"st":"Potato","ps":2},"#515":{"ch":0,"tr":0,"bf":1,"pk":0,"sf":0,"da":1,"gl":0,"st":"Rice","ps":4},"#527":{"ch":0,"tr":1,"bf":0,"pk":0,"sf":0,"da":1,"gl":1,"st":"Pasta","ps":3},"#521":{"ch":0,"tr":1,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Other","ps":3},"#508":{"ch":0,"tr":1,"bf":0,"pk":0,"sf":0,"da":1,"gl":1,"st":"Pasta","ps":3},"#489":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Rice","ps":1},"#80":{"ch":0,"tr":0,"bf":0,"pk":1,"sf":1,"da":1,"gl":0,"st":"Pasta","ps":1},"#475":{"ch":0,"tr":0,"bf":1,"pk":0,"sf":0,"da":1,"gl":0,"st":"Potato","ps":4},"#429":{"ch":0,"tr":0,"bf":1,"pk":1,"sf":0,"da":1,"gl":1,"st":"Pasta","ps":1},"#382":{"ch":0,"tr":0,"bf":1,"pk":0,"sf":0,"da":0,"gl":1,"st":"Potato","ps":3},"#491":{"ch":0,"tr":0,"bf":1,"pk":0,"sf":0,"da":1,"gl":0,"st":"Potato","ps":2},"#360":{"ch":1,"tr":0,"bf":0,"pk":0,"sf":0,"da":1,"gl":0,"st":"Other","ps":4},"#490":{"ch":1,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Potato","ps":2},"#359":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":1,"st":"Other","ps":2},"#463":{"ch":1,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Rice","ps":3},"#545":{"ch":1,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Rice","ps":3},"#514":{"ch":0,"tr":0,"bf":1,"pk":0,"sf":0,"da":1,"gl":1,"st":"Potato","ps":2},"#466":{"ch":0,"tr":0,"bf":1,"pk":0,"sf":0,"da":0,"gl":0,"st":"Rice","ps":2},"#358":{"ch":0,"tr":0,"bf":0,"pk":1,"sf":0,"da":0,"gl":1,"st":"Pasta","ps":2},"#397":{"ch":1,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Rice","ps":1},"#533":{"ch":0,"tr":0,"bf":1,"pk":0,"sf":0,"da":1,"gl":1,"st":"Pasta","ps":1},"#333":{"ch":0,"tr":0,"bf":1,"pk":0,"sf":0,"da":0,"gl":0,"st":"Rice","ps":4},"#542":{"ch":1,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Rice","ps":2},"#469":{"ch":1,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":1,"st":"Pasta","ps":3},"#474":{"ch":1,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Rice","ps":1},"#539":{"ch":1,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Rice","ps":2},"#99":{"ch":1,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":1,"st":"Pasta","ps":2},"#394":{"ch":1,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Rice","ps":3},"#332":{"ch":1,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Potato","ps":2},"#327":{"ch":1,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Potato","ps":3},"#284":{"ch":1,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Other","ps":2},"#536":{"ch":0,"tr":0,"bf":1,"pk":0,"sf":0,"da":0,"gl":1,"st":"Other","ps":3},"#535":{"ch":0,"tr":0,"bf":1,"pk":0,"sf":0,"da":0,"gl":0,"st":"Rice","ps":3},"#391":{"ch":1,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Potato","ps":1},"#538":{"ch":1,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":1,"st":"Pasta","ps":2},"#328":{"ch":0,"tr":0,"bf":1,"pk":0,"sf":0,"da":0,"gl":0,"st":"Potato","ps":1},"#305":{"ch":0,"tr":0,"bf":1,"pk":0,"sf":0,"da":0,"gl":0,"st":"Potato","ps":2},"#280":{"ch":1,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":1,"st":"Pasta","ps":1},"#457":{"ch":0,"tr":0,"bf":1,"pk":0,"sf":0,"da":0,"gl":1,"st":"Other","ps":2},"#354":{"ch":1,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":1,"st":"Other","ps":4},"#309":{"ch":0,"tr":0,"bf":1,"pk":0,"sf":0,"da":0,"gl":0,"st":"Other","ps":2},"#498":{"ch":1,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Potato","ps":1},"#476":{"ch":1,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Rice","ps":1},"#518":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":1,"da":0,"gl":0,"st":"Rice","ps":2},"#520":{"ch":1,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Rice","ps":2},"#388":{"ch":1,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":1,"st":"Pasta","ps":1},"#549":{"ch":1,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Other","ps":3},"#488":{"ch":1,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Other","ps":4},"#477":{"ch":0,"tr":0,"bf":1,"pk":0,"sf":0,"da":1,"gl":1,"st":"Potato","ps":2},"#407":{"ch":1,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Other","ps":4},"#494":{"ch":1,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Rice","ps":1},"#353":{"ch":0,"tr":0,"bf":1,"pk":0,"sf":0,"da":0,"gl":0,"st":"Rice","ps":4},"#377":{"ch":0,"tr":0,"bf":1,"pk":0,"sf":0,"da":0,"gl":1,"st":"Other","ps":2},"#362":{"ch":1,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":1,"st":"Pasta","ps":1},"#550":{"ch":0,"tr":0,"bf":1,"pk":0,"sf":0,"da":0,"gl":1,"st":"Pasta","ps":3},"#330":{"ch":1,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Rice","ps":3},"#478":{"ch":1,"tr":0,"bf":0,"pk":0,"sf":0,"da":1,"gl":0,"st":"Potato","ps":3},"#351":{"ch":1,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Rice","ps":4},"#393":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":1,"da":0,"gl":1,"st":"Pasta","ps":2},"#464":{"ch":0,"tr":1,"bf":0,"pk":0,"sf":0,"da":0,"gl":1,"st":"Pasta","ps":1},"#414":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":1,"da":0,"gl":0,"st":"Other","ps":3},"#516":{"ch":1,"tr":0,"bf":0,"pk":0,"sf":0,"da":1,"gl":1,"st":"Other","ps":3},"#381":{"ch":0,"tr":0,"bf":0,"pk":1,"sf":0,"da":0,"gl":0,"st":"Rice","ps":4},"#6":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Rice","ps":3},"#467":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Rice","ps":3},"#425":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Rice","ps":1},"#62":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Rice","ps":3},"#468":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":1,"st":"Pasta","ps":2},"#1":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Rice","ps":1},"#480":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Rice","ps":2},"#473":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":1,"st":"Pasta","ps":2},"#86":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Rice","ps":3},"#183":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Potato","ps":2},"#146":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Potato","ps":3},"#14":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Other","ps":3},"#424":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Other","ps":4},"#344":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":1,"st":"Other","ps":3},"#423":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Potato","ps":1},"#252":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":1,"st":"Pasta","ps":1},"#162":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Potato","ps":1},"#454":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Rice","ps":3},"#410":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":1,"st":"Pasta","ps":1},"#87":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":1,"st":"Other","ps":3},"#453":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":1,"st":"Other","ps":4},"#180":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Other","ps":3},"#534":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Other","ps":2},"#440":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Rice","ps":4},"#411":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Rice","ps":2},"#557":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":1,"st":"Pasta","ps":2},"#465":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Other","ps":3},"#114":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Rice","ps":1},"#196":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Rice","ps":2},"#148":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Rice","ps":1},"#55":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":1,"st":"Pasta","ps":1},"#163":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Potato","ps":3},"#487":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Other","ps":4},"#409":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Potato","ps":3},"#339":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":1,"st":"Other","ps":1},"#413":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Other","ps":4},"#493":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Potato","ps":2},"#455":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Rice","ps":4},"#138":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Rice","ps":4},"#230":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":1,"st":"Potato","ps":3},"#486":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":1,"st":"Pasta","ps":2},"#462":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":1,"st":"Pasta","ps":1},"#227":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":1,"st":"Pasta","ps":2},"#558":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":1,"st":"Potato","ps":3},"#422":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Rice","ps":2},"#401":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":1,"st":"Pasta","ps":1},"#479":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Potato","ps":3},"#452":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Rice","ps":4},"#136":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":1,"st":"Pasta","ps":2},"#31":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":1,"st":"Pasta","ps":1},"#543":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Other","ps":3},"#544":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Potato","ps":3},"#481":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":1,"st":"Other","ps":3},"#495":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":1,"st":"Other","ps":4},"#287":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Rice","ps":4},"#37":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Rice","ps":3},"#234":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Potato","ps":2},"#275":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":1,"st":"Other","ps":2},"#30":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":1,"st":"Pasta","ps":3},"#273":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":1,"st":"Other","ps":1},"#50":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Rice","ps":2},"#250":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":1,"st":"Pasta","ps":1},"#441":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Potato","ps":3},"#278":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Potato","ps":3},"#402":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Other","ps":4},"#282":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Rice","ps":1},"#541":{"ch":1,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Rice","ps":2},"#375":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"Other","ps":2},"#TBD1":{"ch":1,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"","ps":0},"#TBD2":{"ch":0,"tr":0,"bf":1,"pk":0,"sf":0,"da":0,"gl":0,"st":"","ps":0},"#TBD3":{"ch":0,"tr":0,"bf":0,"pk":0,"sf":0,"da":0,"gl":0,"st":"","ps":0}};
+
+const OMNI_PAIRS = {"#556":"#557","#567":"#569","#396":"#440","#463":"#62","#545":"#6","#514":"#558","#466":"#467","#358":"#486","#397":"#425","#533":"#401","#333":"#138","#542":"#114","#469":"#468","#474":"#1","#539":"#480","#99":"#473","#394":"#86","#332":"#183","#327":"#146","#284":"#14","#536":"#344","#535":"#50","#391":"#423","#538":"#252","#328":"#162","#305":"#454","#280":"#410","#457":"#87","#354":"#453","#309":"#180","#498":"#534","#476":"#411","#518":"#465","#520":"#148","#388":"#55","#549":"#163","#488":"#487","#477":"#339","#407":"#413","#494":"#493","#353":"#455","#377":"#230","#362":"#462","#550":"#457","#330":"#422","#478":"#479","#351":"#452","#393":"#136","#464":"#31","#414":"#481","#516":"#517","#381":"#287"};
+
+const EXTRA_NAMES = {
+  '':'',
+  '#1':'Curry Club Butt’r Tofu',
+  '#6':'Bali Peanut Satay',
+  '#14':'Full Moon Party Pad Thai',
+  '#30':'Falafel Fusion Power Bowl',
+  '#31':'Twirl of the Town Spaghetti & Neat-balls',
+  '#37':'California Roll Sushi Bowl',
+  '#50':'Gobi Glaze Mongolian B’eef',
+  '#54':'NEW IMPROVEDUnder the Tuscan Sun',
+  '#55':'Pesto Party Rotini',
+  '#62':'Blackened Chick\'n Caesar Bowl',
+  '#80':'Pesto Party Bacon & Prawn Ravioli',
+  '#86':'Dreamy Tahini Shawarma Bowl',
+  '#87':'Hot Dang Veggie Hoisin Udon',
+  '#99':'Dill With It Chicken Stroganoff',
+  '#114':'Neon Night Sweet & Sour',
+  '#136':'Tuscan Blush Chick\'n Primavera',
+  '#138':'Sizzlin\' Veggie Fajita Fiesta',
+  '#146':'Flamin\' Floret Power Bowl',
+  '#148':'Peanut Paradise Yellow Thai Curry',
+  '#162':'Gringos Chili Con Queso',
+  '#163':'Pickles Be Poppin\' Power Bowl',
+  '#180':'K-Pop Veggie Glass Noodles',
+  '#183':'Finger Lickin\' Chick\'n Bowl',
+  '#196':'Opa-Licious Chick\'n Souvlaki',
+  '#227':'Spicy Sichuan Veggie Dan Dan',
+  '#230':'Smokeshow Black Bean Enchiladas',
+  '#234':'Cranberry Glazed Neatloaf',
+  '#250':'Mediterranean Pearl Coucous Power Bowl',
+  '#252':'Green Goddess Penne',
+  '#273':'Flaky-Five Samosa Platter',
+  '#275':'Dumpling Party Udon',
+  '#278':'Steak Your Claim',
+  '#280':'Herb Roasted Chicken Alfredo',
+  '#282':'Wok n\' Roll Ginger B\'eef',
+  '#284':'Full Moon Party Chicken Pad Thai',
+  '#287':'Zesty Verde Burrito Bowl',
+  '#302':'Gaucho Grill Chimichurri Sirloin',
+  '#305':'Halifax Hero Donair Bowl',
+  '#309':'K-Pop Beef Glass Noodles',
+  '#327':'Flamin\' Chicken Power Bowl',
+  '#328':'Gringos Beef Chili Con Queso',
+  '#330':'Sweet Heat Jamaican Jerk Chicken',
+  '#332':'Finger Lickin\' Chicken Bowl',
+  '#333':'Braised Beef Fajita Fiesta Bowl',
+  '#339':'Salsa Verde Smothered Veggie Burrito',
+  '#344':'Go-Go Gochujang Udon',
+  '#351':'Tiki Teriyaki Chicken Poke Bowl',
+  '#353':'Seoul-ful Korean Beef BBQ',
+  '#354':'Hulk & Harvest Power Bowl',
+  '#358':'BBQ Pulled Pork Mac Attack',
+  '#359':'Zen Garden Salmon Soba Bowl',
+  '#360':'The Ranch Hand Salad',
+  '#362':'Spice Trail Moroccan Chicken',
+  '#377':'Smokeshow Beef Enchiladas',
+  '#381':'Zesty Chorizo Burrito Bowl',
+  '#382':'Saddle Up Burger Bowl',
+  '#388':'Pesto Party Chicken Rotini',
+  '#391':'Golden Hour Chicken & Cashew Curry',
+  '#393':'Tuscan Blush Prawn Primavera',
+  '#394':'Dreamy Tahini Chicken Shawarma',
+  '#396':'Prawn Dragon Roll Sushi Bowl',
+  '#397':'Beach Bum Chicken Thai Green Curry',
+  '#401':'Tempeh Twist Bolognese',
+  '#402':'Thai Mango Crunch Power Bowl',
+  '#407':'Santa Fe Sunset Chicken Salad',
+  '#409':'Saddle Up Black Bean Burger Bowl',
+  '#410':'Herb Roasted Chick\'n Alfredo',
+  '#411':'Mango Red Thai Curry',
+  '#413':'Santa Fe Sunset Chick\'n Salad',
+  '#414':'Vietnamese Shrimp Salad Roll Remix',
+  '#422':'Sweet Heat Jamaican Jerk Tempeh',
+  '#423':'Golden Hour Cashew Curry',
+  '#424':'Get Rooted Power Bowl',
+  '#425':'Beach Bum Veggie Thai Green Curry',
+  '#429':'Roma Rollup Stuffed Cannelloni',
+  '#440':'Mango Dragon Roll Sushi Bowl',
+  '#441':'Miso Hungry Buddha Bowl',
+  '#452':'Tiki Teriyaki Tofu Poke Bowl',
+  '#453':'Hulk & Harvest Veggie Power Bowl',
+  '#454':'Halifax Hero Veggie Donair Bowl',
+  '#455':'Seoul-ful Korean Chick\'n BBQ',
+  '#457':'Hot Dang Hoisin Beef Udon',
+  '#462':'Spice Trail Moroccan Chick\'n',
+  '#463':'All Hail the Chicken Caesar',
+  '#464':'Twirl of the Town Spaghetti & Meatballs',
+  '#465':'Monkey Business Tempeh Khao Soi',
+  '#466':'Bangkok Basil Beef Pad Krapow',
+  '#467':'Bangkok Basil Tempeh Pad Krapow',
+  '#468':'Ciao Bella Bruschetta Linguine',
+  '#469':'Ciao Bella Chicken Bruschetta Linguine',
+  '#473':'Dill With It Mushroom Stroganoff',
+  '#474':'Curry Club Butter Chicken',
+  '#475':'Rockstar Reuben Hash',
+  '#476':'Mango Tango Chicken Red Thai Curry',
+  '#477':'Salsa Verde Smothered Burrito',
+  '#478':'The Corn Star Cajun Chicken',
+  '#479':'The Corn Star Cajun Soy Curls',
+  '#480':'Curry Hut Tikka Masala',
+  '#481':'Vietnamese Tofu Salad Roll Remix',
+  '#486':'Smoky BBQ Mac Attack',
+  '#487':'Ruby Pistachio Power Bowl',
+  '#488':'Ruby Pistachio & Chicken Power Bowl',
+  '#489':'Maple Menagerie Salmon Harvest',
+  '#490':'Winner Winner, Chicken Dinner',
+  '#491':'Straight Outta Philly',
+  '#493':'Savanna Peanut Curry',
+  '#494':'Savanna Peanut Chicken Curry',
+  '#495':'Zen Garden Glazed Tofu Soba',
+  '#498':'Keepin\' It Irie Jamaican Chicken Curry',
+  '#507':'Kabayan Kaldereta Beef Stew',
+  '#508':'Mama Mia Meatball Orzo',
+  '#509':'Casanova Chicken Parm',
+  '#514':'Ballin’ In Gravy Swedish Meatballs',
+  '#515':'Flex Mex Taco Salad',
+  '#516':'Winter Berry Power Bowl',
+  '#518':'Monkey Business Prawn Khao Soi',
+  '#520':'Peanut Paradise Yellow Thai Chicken Curry',
+  '#521':'Jade Curry Noodles with Turkey Meatballs',
+  '#526':'NEW IMPROVED Zesty Zaatar Kofta Mezze',
+  '#527':'Grand Bazaar Turkish Pasta',
+  '#533':'Bolognese-y Does It',
+  '#534':'Keepin\' It Irie Jamaican Tempeh Curry',
+  '#535':'Gobi Glaze Mongolian Beef',
+  '#536':'Go-Go Gochujang Beef Udon',
+  '#537':'Backroads Honey Hot Glazed Chicken',
+  '#538':'Green Goddess Chicken Penne',
+  '#539':'Curry Hut Chicken Tikka Masala',
+  '#542':'Chicken Neon Night Sweet & Sour',
+  '#543':'Veggie Jade Curry Noodles',
+  '#544':'Veggie Machu Pichu Picnic',
+  '#545':'Bali Belly Peanut Chicken Satay',
+  '#549':'Pickles Be Poppin\' Chicken Power Bowl',
+  '#550':'Spicy Sichuan Beef Dan Dan',
+  '#556':'Mardi Gras Cajun Chicken Linguini',
+  '#557':'Mardi Gras Cajun Linguini',
+  '#558':'Swedish Vegan Neatball',
+  '#560':'Mac Daddy Burger Bowl',
+  '#561':'Athens Chicken Souvlaki',
+  '#562':'Sizzlin\' Honey Ginger Shrimp',
+  '#563':'Italiano Chopped Powerbowl',
+  '#564':'Honey Hot Mac Attack',
+  '#565':'Asian Chopped Soy Good Salad',
+  '#566':'Root & Roast Beef Stew',
+  '#567':'Chicken Shawarma Crunch Salad',
+  '#568':'Aloha Teriyaki Turkey Meatballs',
+  '#573':'Drippin’ Honey Mustard Chicken',
+  '#574':'Sticky Wok Orange Chicken',
+  '#575':'The Big Dill Chicken Bowl',
+  '#541':'Curry Hut Tikka Masala',
+  '#375':'Machu Pichu Picnic',
+  '#TBD1':'[TBD] Drippin\' Honey Mustard Chicken',
+  '#TBD2':'[TBD] Elote Braised Beef Wedges',
+  '#TBD3':'[TBD] Vegan Teriyaki Hawaiian Balls',
+};
+
+const ALL_DISHES = [
+  {id:'#463',name:'All Hail the Chicken Caesar',diet:'meat',type:'Omni'},
+  {id:'#568',name:'Aloha Teriyaki Turkey Meatballs',diet:'meat',type:'Meat Only'},
+  {id:'#565',name:'Asian Chopped Soy Good Salad',diet:'meat',type:'Meat Only'},
+  {id:'#561',name:'Athens Chicken Souvlaki',diet:'meat',type:'Meat Only'},
+  {id:'#358',name:'BBQ Pulled Pork Mac Attack',diet:'meat',type:'Omni'},
+  {id:'#537',name:'Backroads Honey Hot Glazed Chicken',diet:'meat',type:'Meat Only'},
+  {id:'#545',name:'Bali Belly Peanut Chicken Satay',diet:'meat',type:'Omni'},
+  {id:'#514',name:'Ballin’ In Gravy Swedish Meatballs',diet:'meat',type:'Omni'},
+  {id:'#466',name:'Bangkok Basil Beef Pad Krapow',diet:'meat',type:'Omni'},
+  {id:'#397',name:'Beach Bum Chicken Thai Green Curry',diet:'meat',type:'Omni'},
+  {id:'#533',name:'Bolognese-y Does It',diet:'meat',type:'Omni'},
+  {id:'#333',name:'Braised Beef Fajita Fiesta Bowl',diet:'meat',type:'Omni'},
+  {id:'#37',name:'California Roll Sushi Bowl',diet:'veg',type:'Vegan'},
+  {id:'#509',name:'Casanova Chicken Parm',diet:'meat',type:'Meat Only'},
+  {id:'#542',name:'Chicken Neon Night Sweet & Sour',diet:'meat',type:'Omni'},
+  {id:'#567',name:'Chicken Shawarma Crunch Salad',diet:'meat',type:'Omni'},
+  {id:'#469',name:'Ciao Bella Chicken Bruschetta Linguine',diet:'meat',type:'Omni'},
+  {id:'#234',name:'Cranberry Glazed Neatloaf',diet:'veg',type:'Vegan'},
+  {id:'#474',name:'Curry Club Butter Chicken',diet:'meat',type:'Omni'},
+  {id:'#539',name:'Curry Hut Chicken Tikka Masala',diet:'meat',type:'Omni'},
+  {id:'#99',name:'Dill With It Chicken Stroganoff',diet:'meat',type:'Omni'},
+  {id:'#394',name:'Dreamy Tahini Chicken Shawarma',diet:'meat',type:'Omni'},
+  {id:'#573',name:'Drippin’ Honey Mustard Chicken',diet:'meat',type:'Omni'},
+  {id:'#275',name:'Dumpling Party Udon',diet:'veg',type:'Vegan'},
+  {id:'#30',name:'Falafel Fusion Power Bowl',diet:'veg',type:'Vegan'},
+  {id:'#332',name:'Finger Lickin\' Chicken Bowl',diet:'meat',type:'Omni'},
+  {id:'#273',name:'Flaky-Five Samosa Platter',diet:'veg',type:'Vegan'},
+  {id:'#327',name:'Flamin\' Chicken Power Bowl',diet:'meat',type:'Omni'},
+  {id:'#515',name:'Flex Mex Taco Salad',diet:'meat',type:'Meat Only'},
+  {id:'#284',name:'Full Moon Party Chicken Pad Thai',diet:'meat',type:'Omni'},
+  {id:'#302',name:'Gaucho Grill Chimichurri Sirloin',diet:'meat',type:'Meat Only'},
+  {id:'#536',name:'Go-Go Gochujang Beef Udon',diet:'meat',type:'Omni'},
+  {id:'#535',name:'Gobi Glaze Mongolian Beef',diet:'meat',type:'Omni'},
+  {id:'#50',name:'Gobi Glaze Mongolian B’eef',diet:'veg',type:'Vegan'},
+  {id:'#391',name:'Golden Hour Chicken & Cashew Curry',diet:'meat',type:'Omni'},
+  {id:'#527',name:'Grand Bazaar Turkish Pasta',diet:'meat',type:'Meat Only'},
+  {id:'#538',name:'Green Goddess Chicken Penne',diet:'meat',type:'Omni'},
+  {id:'#328',name:'Gringos Beef Chili Con Queso',diet:'meat',type:'Omni'},
+  {id:'#305',name:'Halifax Hero Donair Bowl',diet:'meat',type:'Omni'},
+  {id:'#280',name:'Herb Roasted Chicken Alfredo',diet:'meat',type:'Omni'},
+  {id:'#564',name:'Honey Hot Mac Attack',diet:'meat',type:'Meat Only'},
+  {id:'#457',name:'Hot Dang Hoisin Beef Udon',diet:'meat',type:'Omni'},
+  {id:'#354',name:'Hulk & Harvest Power Bowl',diet:'meat',type:'Omni'},
+  {id:'#563',name:'Italiano Chopped Powerbowl',diet:'meat',type:'Meat Only'},
+  {id:'#521',name:'Jade Curry Noodles with Turkey Meatballs',diet:'meat',type:'Meat Only'},
+  {id:'#309',name:'K-Pop Beef Glass Noodles',diet:'meat',type:'Omni'},
+  {id:'#507',name:'Kabayan Kaldereta Beef Stew',diet:'meat',type:'Meat Only'},
+  {id:'#498',name:'Keepin\' It Irie Jamaican Chicken Curry',diet:'meat',type:'Omni'},
+  {id:'#560',name:'Mac Daddy Burger Bowl',diet:'meat',type:'Meat Only'},
+  {id:'#508',name:'Mama Mia Meatball Orzo',diet:'meat',type:'Meat Only'},
+  {id:'#476',name:'Mango Tango Chicken Red Thai Curry',diet:'meat',type:'Omni'},
+  {id:'#489',name:'Maple Menagerie Salmon Harvest',diet:'meat',type:'Meat Only'},
+  {id:'#556',name:'Mardi Gras Cajun Chicken Linguini',diet:'meat',type:'Omni'},
+  {id:'#250',name:'Mediterranean Pearl Coucous Power Bowl',diet:'veg',type:'Vegan'},
+  {id:'#441',name:'Miso Hungry Buddha Bowl',diet:'veg',type:'Vegan'},
+  {id:'#518',name:'Monkey Business Prawn Khao Soi',diet:'meat',type:'Omni'},
+  {id:'#526',name:'NEW IMPROVED Zesty Zaatar Kofta Mezze',diet:'meat',type:'Meat Only'},
+  {id:'#54',name:'NEW IMPROVEDUnder the Tuscan Sun',diet:'veg',type:'Vegan'},
+  {id:'#520',name:'Peanut Paradise Yellow Thai Chicken Curry',diet:'meat',type:'Omni'},
+  {id:'#80',name:'Pesto Party Bacon & Prawn Ravioli',diet:'meat',type:'Meat Only'},
+  {id:'#388',name:'Pesto Party Chicken Rotini',diet:'meat',type:'Omni'},
+  {id:'#549',name:'Pickles Be Poppin\' Chicken Power Bowl',diet:'meat',type:'Omni'},
+  {id:'#396',name:'Prawn Dragon Roll Sushi Bowl',diet:'meat',type:'Omni'},
+  {id:'#475',name:'Rockstar Reuben Hash',diet:'meat',type:'Meat Only'},
+  {id:'#429',name:'Roma Rollup Stuffed Cannelloni',diet:'meat',type:'Meat Only'},
+  {id:'#566',name:'Root & Roast Beef Stew',diet:'meat',type:'Meat Only'},
+  {id:'#488',name:'Ruby Pistachio & Chicken Power Bowl',diet:'meat',type:'Omni'},
+  {id:'#382',name:'Saddle Up Burger Bowl',diet:'meat',type:'Meat Only'},
+  {id:'#477',name:'Salsa Verde Smothered Burrito',diet:'meat',type:'Omni'},
+  {id:'#407',name:'Santa Fe Sunset Chicken Salad',diet:'meat',type:'Omni'},
+  {id:'#494',name:'Savanna Peanut Chicken Curry',diet:'meat',type:'Omni'},
+  {id:'#353',name:'Seoul-ful Korean Beef BBQ',diet:'meat',type:'Omni'},
+  {id:'#562',name:'Sizzlin\' Honey Ginger Shrimp',diet:'meat',type:'Meat Only'},
+  {id:'#377',name:'Smokeshow Beef Enchiladas',diet:'meat',type:'Omni'},
+  {id:'#362',name:'Spice Trail Moroccan Chicken',diet:'meat',type:'Omni'},
+  {id:'#550',name:'Spicy Sichuan Beef Dan Dan',diet:'meat',type:'Omni'},
+  {id:'#278',name:'Steak Your Claim',diet:'veg',type:'Vegan'},
+  {id:'#574',name:'Sticky Wok Orange Chicken',diet:'meat',type:'Omni'},
+  {id:'#491',name:'Straight Outta Philly',diet:'meat',type:'Meat Only'},
+  {id:'#330',name:'Sweet Heat Jamaican Jerk Chicken',diet:'meat',type:'Omni'},
+  {id:'#402',name:'Thai Mango Crunch Power Bowl',diet:'veg',type:'Vegan'},
+  {id:'#575',name:'The Big Dill Chicken Bowl',diet:'meat',type:'Omni'},
+  {id:'#478',name:'The Corn Star Cajun Chicken',diet:'meat',type:'Omni'},
+  {id:'#360',name:'The Ranch Hand Salad',diet:'meat',type:'Meat Only'},
+  {id:'#351',name:'Tiki Teriyaki Chicken Poke Bowl',diet:'meat',type:'Omni'},
+  {id:'#393',name:'Tuscan Blush Prawn Primavera',diet:'meat',type:'Omni'},
+  {id:'#464',name:'Twirl of the Town Spaghetti & Meatballs',diet:'meat',type:'Omni'},
+  {id:'#414',name:'Vietnamese Shrimp Salad Roll Remix',diet:'meat',type:'Omni'},
+  {id:'#490',name:'Winner Winner, Chicken Dinner',diet:'meat',type:'Meat Only'},
+  {id:'#516',name:'Winter Berry Power Bowl',diet:'meat',type:'Omni'},
+  {id:'#282',name:'Wok n\' Roll Ginger B\'eef',diet:'veg',type:'Vegan'},
+  {id:'#359',name:'Zen Garden Salmon Soba Bowl',diet:'meat',type:'Meat Only'},
+  {id:'#381',name:'Zesty Chorizo Burrito Bowl',diet:'meat',type:'Omni'},
+];
+
+const COLUMNS = [
+  {id:'sig-a',name:'Signature A',short:'SIG A',color:'#9f3a38'},
+  {id:'sig-b',name:'Signature B',short:'SIG B',color:'#9f3a38'},
+  {id:'sig-c',name:'Signature C',short:'SIG C',color:'#9f3a38'},
+  {id:'sig-d',name:'Signature D',short:'SIG D',color:'#9f3a38'},
+  {id:'wildcard-meat',name:'Wildcard Meat',short:'WILD M',color:'#9f3a38'},
+  {id:'pasta-omni',name:'Pasta Omni',short:'PASTA',color:'#2d5fa6'},
+  {id:'curry-omni',name:'Curry Omni',short:'CURRY',color:'#2d5fa6'},
+  {id:'comfort-omni',name:'Comfort Omni',short:'COMFORT',color:'#2d5fa6'},
+  {id:'asian-omni',name:'Asian Omni',short:'ASIAN',color:'#2d5fa6'},
+  {id:'powerbowl-omni',name:'Powerbowl Omni',short:'POWER',color:'#2d5fa6'},
+  {id:'grocery-omni',name:'Grocery Omni',short:'GROCERY',color:'#2d5fa6'},
+  {id:'wildcard-vegan',name:'Wildcard Vegan',short:'VEGAN',color:'#2d7a4f'},
+];
+
+// ── Synced from 8.0 Menu Schedule (March 15, 2026 → row 13 onward) ──
+const queues = {
+  'sig-a':[{dishId:'#509'},{dishId:'#509'},{dishId:'#509'},{dishId:'#509'},{dishId:'#509'},{dishId:'#509'},{dishId:'#509'},{dishId:'#509'},{dishId:'#509'},{dishId:'#509'},{dishId:'#509'},{dishId:'#509'}],
+  'sig-b':[{dishId:'#305'},{dishId:'#305'},{dishId:'#305'},{dishId:'#305'},{dishId:'#305'},{dishId:'#305'},{dishId:'#305'},{dishId:'#305'},{dishId:'#305'},{dishId:'#305'},{dishId:'#305'},{dishId:'#305'}],
+  'sig-c':[{dishId:'#508'},{dishId:'#508'},{dishId:'#561'},{dishId:'#561'},{dishId:'#563'},{dishId:'#563'},{dishId:'#515'},{dishId:'#515'},{dishId:'#526'},{dishId:'#526'},{dishId:'#490'},{dishId:'#490'},{dishId:'#TBD1'},{dishId:'#TBD1'}],
+  'sig-d':[{dishId:'#516'},{dishId:'#516'},{dishId:'#562'},{dishId:'#562'},{dishId:'#568'},{dishId:'#568'},{dishId:'#537'},{dishId:'#537'},{dishId:'#565'},{dishId:'#565'},{dishId:'#574'},{dishId:'#574'},{dishId:'#54'},{dishId:'#54'}],
+  'wildcard-meat':[{dishId:'#382'},{dishId:'#382'},{dishId:'#521'},{dishId:'#521'},{dishId:'#566'},{dishId:'#566'},{dishId:'#560'},{dishId:'#560'},{dishId:'#429'},{dishId:'#429'},{dishId:'#489'},{dishId:'#489'},{dishId:'#TBD2'},{dishId:'#TBD2'}],
+  'pasta-omni':[{dishId:'#393'},{dishId:'#388'},{dishId:'#533'},{dishId:'#538'},{dishId:'#464'},{dishId:'#556'},{dishId:'#469'},{dishId:'#99'},{dishId:'#393'},{dishId:'#388'}],
+  'curry-omni':[{dishId:'#397'},{dishId:'#391'},{dishId:'#520'},{dishId:'#498'},{dishId:'#518'},{dishId:'#541'},{dishId:'#521'},{dishId:'#494'},{dishId:'#474'},{dishId:'#397'},{dishId:'#391'},{dishId:'#520'},{dishId:'#498'},{dishId:'#518'},{dishId:'#539'},{dishId:'#521'},{dishId:'#494'}],
+  'comfort-omni':[{dishId:'#328'},{dishId:'#327'},{dishId:'#333'},{dishId:'#333'},{dishId:'#332'},{dishId:'#330'},{dishId:'#477'},{dishId:'#6'},{dishId:'#478'},{dishId:'#328'},{dishId:'#327'},{dishId:'#478'},{dishId:'#333'},{dishId:'#332'},{dishId:'#330'},{dishId:'#477'},{dishId:'#6'},{dishId:'#377'}],
+  'asian-omni':[{dishId:'#309'},{dishId:'#466'},{dishId:'#353'},{dishId:'#457'},{dishId:'#50'},{dishId:'#344'},{dishId:'#114'},{dishId:'#359'},{dishId:'#227'},{dishId:'#351'},{dishId:'#562'}],
+  'powerbowl-omni':[{dishId:'#354'},{dishId:'#414'},{dishId:'#488'},{dishId:'#567'},{dishId:'#362'},{dishId:'#407'},{dishId:'#396'},{dishId:'#575'},{dishId:'#463'},{dishId:'#381'},{dishId:'#516'},{dishId:'#354'},{dishId:'#414'},{dishId:'#488'},{dishId:'#567'},{dishId:'#362'},{dishId:'#407'},{dishId:'#396'},{dishId:'#575'},{dishId:'#463'},{dishId:'#381'}],
+  'grocery-omni':[{dishId:'#476'},{dishId:'#280'},{dishId:'#558'},{dishId:'#284'},{dishId:'#476'},{dishId:'#280'},{dishId:'#558'},{dishId:'#284'},{dishId:'#476'},{dishId:'#280'},{dishId:'#476'},{dishId:'#280'},{dishId:'#514'},{dishId:'#284'},{dishId:'#476'},{dishId:'#280'},{dishId:'#514'},{dishId:'#284'},{dishId:'#476'},{dishId:'#280'}],
+  'wildcard-vegan':[{dishId:'#278'},{dishId:'#514'},{dishId:'#30'},{dishId:'#441'},{dishId:'#273'},{dishId:'#382'},{dishId:'#305'},{dishId:'#TBD3'},{dishId:'#275'},{dishId:'#282'}],
+};
+
+// ══ CORE HELPERS ══
+function getDish(id){return ALL_DISHES.find(d=>d.id===id)}
+function getAttrs(id){return DISH_ATTRS[id]||{ch:0,tr:0,bf:0,pk:0,sf:0,da:0,gl:0,st:'',ps:0}}
+function dndGetDish(id){const d=getDish(id);if(d)return d.name;return EXTRA_NAMES[id]||id}
+
+// Build reverse lookup for omni pairs
+const OMNI_REVERSE = {};
+Object.entries(OMNI_PAIRS).forEach(([m,p])=>{OMNI_REVERSE[p]=m});
+
+function getDietType(dishId){
+  if(OMNI_PAIRS[dishId]) return 'omni';
+  const d=getDish(dishId);
+  if(d && d.type==='Omni' && !OMNI_PAIRS[dishId]) return 'omni-missing';
+  if(d && d.diet==='veg') return 'vegan';
+  return 'meat';
+}
+
+// Scorecard helpers
+const CELL_MAX={ch:8,tr:5,bf:5,pk:5,sf:5,st_rice:5,st_pasta:5,st_potato:5,st_other:5,da:5,gl:5,peanut:5};
+function redCell(val,max){
+  if(!val) return {bg:'#ffffff',fg:'#aaa'};
+  const t=Math.min(val/max,1);
+  const L=Math.round(97-t*34);const S=Math.round(40+t*45);
+  const fg=L<75?'#5a1a1a':'#9a3030';
+  return {bg:`hsl(4,${S}%,${L}%)`,fg};
+}
+function psColor(total){
+  if(!total) return {bg:'#ffffff',fg:'#aaa'};
+  const t=Math.max(0,Math.min(1,(total-10)/20));
+  const L=Math.round(96-t*30);const S=Math.round(20+(1-t)*55);
+  const fg=L<72?'#14532d':'#166534';
+  return {bg:`hsl(142,${S}%,${L}%)`,fg};
+}
+const SC_GRID_ROW1=[{key:'ch',lbl:'Chicken'},{key:'tr',lbl:'Turkey'},{key:'bf',lbl:'Beef'},{key:'pk',lbl:'Pork'},{key:'sf',lbl:'Seafood'},{key:'da',lbl:'Dairy'}];
+const SC_GRID_ROW2=[{key:'gl',lbl:'Gluten'},{key:'peanut',lbl:'Peanut'},{key:'st_rice',lbl:'Rice'},{key:'st_pasta',lbl:'Pasta'},{key:'st_potato',lbl:'Potato'},{key:'st_other',lbl:'Other'}];
+
+// ══ GRID STATE ══
+const HOLE='__hole__';
+window.dndGrid = {}; // colId -> [dishId, dishId, ...]
+let dndPinnedCols = {};
+let dndToggles = {}; // dishId -> {meatOff, plantOff}
+let colUnlocked = false;
+let scSettingsOpen = false;
+
+// Scorecard range settings: {key: {max:number|null, minOn:bool, min:number|null}}
+const SC_ALL_KEYS = [...SC_GRID_ROW1.map(c=>c.key),...SC_GRID_ROW2.map(c=>c.key),'mt','pl'];
+const SC_ALL_LABELS = {};
+SC_GRID_ROW1.forEach(c=>{SC_ALL_LABELS[c.key]=c.lbl;});
+SC_GRID_ROW2.forEach(c=>{SC_ALL_LABELS[c.key]=c.lbl;});
+SC_ALL_LABELS['mt']='Meat';SC_ALL_LABELS['pl']='Plant';
+
+let scRanges = {};
+SC_ALL_KEYS.forEach(k=>{scRanges[k]={max:null,min:null};});
+// mt and pl use a single "required" value — preset defaults
+let scRequired = {mt:11, pl:7};
+
+function getScRange(key){return scRanges[key]||{max:null,min:null};}
+function isOutOfRange(key,val){
+  const r=getScRange(key);
+  if(r.max!==null && val>r.max) return true;
+  if(r.min!==null && val<r.min) return true;
+  return false;
+}
+function isMtPlMismatch(key,val){
+  const req=scRequired[key];
+  if(req===null||req===undefined||req===0) return false;
+  return val!==req;
+}
+function toggleScSettings(){
+  scSettingsOpen=!scSettingsOpen;
+  renderDnDGrid();
+}
+function setScMax(key,val){scRanges[key].max=(val===''||val===null)?null:parseInt(val);renderDnDGrid();}
+function setScMin(key,val){scRanges[key].min=(val===''||val===null)?null:parseInt(val);renderDnDGrid();}
+function stepScMax(key,delta){
+  const cur=scRanges[key].max;
+  if(cur===null) scRanges[key].max=Math.max(0,delta);
+  else scRanges[key].max=Math.max(0,cur+delta);
+  renderDnDGrid();
+}
+function stepScMin(key,delta){
+  const cur=scRanges[key].min;
+  if(cur===null) scRanges[key].min=Math.max(0,delta);
+  else scRanges[key].min=Math.max(0,cur+delta);
+  renderDnDGrid();
+}
+function clearScMax(key){scRanges[key].max=null;renderDnDGrid();}
+function clearScMin(key){scRanges[key].min=null;renderDnDGrid();}
+function setRequired(key,val){scRequired[key]=(val===''||val===null)?null:parseInt(val);renderDnDGrid();}
+function stepRequired(key,delta){
+  const cur=scRequired[key];
+  if(cur===null) scRequired[key]=Math.max(0,delta);
+  else scRequired[key]=Math.max(0,cur+delta);
+  renderDnDGrid();
+}
+function clearRequired(key){scRequired[key]=null;renderDnDGrid();}
+
+function buildReqStepper(key, val){
+  const v=val===null?0:val;
+  return `<div class="sc-req-stepper">
+    <button class="req-minus" onclick="event.stopPropagation();stepRequired('${key}',-1)">−</button>
+    <input class="req-val" type="text" value="${v}" onchange="event.stopPropagation();setRequired('${key}',this.value)" onclick="event.stopPropagation()"/>
+    <button class="req-plus" onclick="event.stopPropagation();stepRequired('${key}',1)">+</button>
+  </div>`;
+}
+function buildLimStepper(key, type){
+  const r=getScRange(key);
+  const val=type==='max'?r.max:r.min;
+  const setFn=type==='max'?'stepScMax':'stepScMin';
+  const clearFn=type==='max'?'clearScMax':'clearScMin';
+  const directFn=type==='max'?'setScMax':'setScMin';
+  const btnClass=type==='max'?'max-btn':'min-btn';
+  if(val===null||val===undefined){
+    return `<div class="sc-lim-wrap"><button class="sc-lim-add ${btnClass}" onclick="event.stopPropagation();${setFn}('${key}',1)">+ ${type}</button></div>`;
+  }
+  return `<div class="sc-lim-wrap"><div class="sc-lim-stepper">
+    <button onclick="event.stopPropagation();${setFn}('${key}',-1)">−</button>
+    <input class="lim-val" type="text" value="${val}" onchange="event.stopPropagation();${directFn}('${key}',this.value)" onclick="event.stopPropagation()"/>
+    <button onclick="event.stopPropagation();${setFn}('${key}',1)">+</button>
+  </div><button class="sc-lim-clear" onclick="event.stopPropagation();${clearFn}('${key}')" title="Clear">✕</button></div>`;
+}
+function buildSettingsPanel(){
+  let html=`<div class="sc-settings-panel open" onclick="event.stopPropagation()">`;
+
+  // ── Meat / Plant required rows (full-width colored bars, no header needed) ──
+  ['mt','pl'].forEach(k=>{
+    const lbl=k==='mt'?'Meat dishes':'Plant dishes';
+    const rowCls=k==='mt'?'meat-row':'plant-row';
+    html+=`<div class="sc-req-row ${rowCls}">
+      <span class="sc-req-label">${lbl}</span>
+      ${buildReqStepper(k, scRequired[k])}
+      <span class="sc-req-per">per week</span>
+    </div>`;
+  });
+
+  // ── Category limits section ──
+  html+=`<div class="sc-limits-head">Set min / max</div>`;
+  html+=`<div class="sc-limits-desc">Set limits per category. The scorecard cell turns red when it goes above max or below min. Without limits, cells shade naturally — darker red means a higher count.</div>`;
+  html+=`<table class="sc-limits-table"><colgroup><col class="col-cat"/><col class="col-lim"/><col class="col-lim"/></colgroup><thead><tr><th style="text-align:left">Category</th><th>Max</th><th>Min</th></tr></thead><tbody>`;
+
+  const statKeys=[...SC_GRID_ROW1.map(c=>c.key),...SC_GRID_ROW2.map(c=>c.key)];
+  statKeys.forEach((k,i)=>{
+    const lbl=SC_ALL_LABELS[k]||k;
+    const alt=i%2===1?' class="alt"':'';
+    html+=`<tr${alt}><td><span class="sc-limits-cat">${lbl}</span></td><td style="text-align:center">${buildLimStepper(k,'max')}</td><td style="text-align:center">${buildLimStepper(k,'min')}</td></tr>`;
+  });
+
+  html+=`</tbody></table></div>`;
+  return html;
+}
+const COL_COLORS = ['#9f3a38','#dc2626','#e04994','#003141','#2d5fa6','#4EA2FD','#2d7a4f','#0d9488','#7c3aed','#d97706','#475569','#92400e'];
+const PICKER_COLORS = ['#9f3a38','#2d5fa6','#2d7a4f','#0d9488','#7c3aed','#d97706'];
+
+// Init grid from queues
+function initDnDGrid(){
+  window.dndGrid = {};
+  COLUMNS.forEach(col=>{
+    const q = queues[col.id]||[];
+    window.dndGrid[col.id] = q.map(item=>item.dishId);
+  });
+}
+
+function getMaxRows(){
+  let max=0;
+  COLUMNS.forEach(col=>{
+    const arr=window.dndGrid[col.id]||[];
+    const len=arr.filter(d=>d&&d!==HOLE).length;
+    if(len>max) max=len;
+  });
+  return Math.max(max+1, 1);
+}
+
+function toggleDnDDrawer(){
+  document.getElementById('dnd-drawer').classList.toggle('open');
+}
+
+// ── Diet toggle (keyed by dishId) ──
+function getToggle(dishId){
+  return dndToggles[dishId]||{meatOff:false,plantOff:false};
+}
+function toggleDiet(dishId, side){
+  if(!dndToggles[dishId]) dndToggles[dishId]={meatOff:false,plantOff:false};
+  const t=dndToggles[dishId];
+  if(side==='meat' && !t.meatOff && t.plantOff){showToggleWarning();return;}
+  if(side==='plant' && !t.plantOff && t.meatOff){showToggleWarning();return;}
+  if(side==='meat') t.meatOff=!t.meatOff;
+  else t.plantOff=!t.plantOff;
+  renderDnDGrid();
+}
+function showToggleWarning(){
+  const el=document.createElement('div');
+  el.style.cssText='position:fixed;top:20px;left:50%;transform:translateX(-50%);background:#dc2626;color:white;padding:8px 16px;border-radius:8px;font-size:12px;font-weight:700;z-index:999;animation:fadeOut 2s forwards';
+  el.textContent='Cannot disable both — at least one version must be active';
+  document.body.appendChild(el);
+  setTimeout(()=>el.remove(),2000);
+}
+
+// ── Pin ──
+function togglePin(colId){
+  const arr=window.dndGrid[colId]||[];
+  if(arr.length>1 && !dndPinnedCols[colId]) return; // can't pin if >1 dish
+  if(dndPinnedCols[colId]) delete dndPinnedCols[colId];
+  else dndPinnedCols[colId]=true;
+  renderDnDGrid();
+}
+
+// ── Column management ──
+function toggleColLock(){
+  colUnlocked=!colUnlocked;
+  renderDnDGrid();
+  if(colUnlocked) setTimeout(()=>{if(colUnlocked){colUnlocked=false;renderDnDGrid();}},15000);
+}
+function autoLock(){colUnlocked=false;renderDnDGrid();}
+function renameCol(colId,newName){
+  const col=COLUMNS.find(c=>c.id===colId);
+  if(col){col.short=newName;col.name=newName;}
+  autoLock();
+}
+function deleteCol(colId){
+  const arr=window.dndGrid[colId]||[];
+  const count=arr.filter(d=>d&&d!==HOLE).length;
+  if(count>0 && !confirm(`Delete column with ${count} dishes? They'll return to unassigned.`)) return;
+  delete window.dndGrid[colId];
+  delete dndPinnedCols[colId];
+  const idx=COLUMNS.findIndex(c=>c.id===colId);
+  if(idx>=0) COLUMNS.splice(idx,1);
+  autoLock();
+}
+function addColumn(){
+  const id='col-'+Date.now();
+  COLUMNS.push({id,name:'New Column',short:'NEW',color:'#475569'});
+  window.dndGrid[id]=[];
+  autoLock();
+}
+function setColColor(colId,color){
+  const col=COLUMNS.find(c=>c.id===colId);
+  if(col) col.color=color;
+  autoLock();
+}
+function showColorPicker(colId,btn){
+  // Close any existing pickers
+  document.querySelectorAll('.color-picker-popup').forEach(p=>p.remove());
+  const popup=document.createElement('div');
+  popup.className='color-picker-popup open';
+  popup.onclick=(e)=>e.stopPropagation(); // prevent closing on self-click
+  PICKER_COLORS.forEach(c=>{
+    const sw=document.createElement('div');
+    sw.className='color-swatch';
+    sw.style.background=c;
+    sw.onclick=(e)=>{e.stopPropagation();popup.remove();setColColor(colId,c);};
+    popup.appendChild(sw);
+  });
+  btn.parentElement.appendChild(popup);
+  // Close on outside click — delay to avoid catching the triggering click
+  requestAnimationFrame(()=>{
+    document.addEventListener('click',function h(e){
+      if(!popup.contains(e.target)){popup.remove();document.removeEventListener('click',h);}
+    });
+  });
+}
+
+// ── Column drag-to-reorder ──
+let colDragId=null;
+function colDragStart(e,colId){
+  if(!colUnlocked) return;
+  colDragId=colId;
+  e.dataTransfer.effectAllowed='move';
+  e.dataTransfer.setData('text/plain',colId);
+  setTimeout(()=>{
+    const cell=e.target.closest('.dnd-hdr-cell');
+    if(cell) cell.style.opacity='0.4';
+  },0);
+}
+function colDragOver(e,colId){
+  if(!colDragId||colDragId===colId) return;
+  e.preventDefault();
+  e.dataTransfer.dropEffect='move';
+  // Highlight drop target
+  document.querySelectorAll('.dnd-hdr-cell').forEach(c=>c.style.outline='');
+  const cell=e.target.closest('.dnd-hdr-cell');
+  if(cell) cell.style.outline='2px solid var(--yellow)';
+}
+function colDrop(e,targetColId){
+  e.preventDefault();
+  if(!colDragId||colDragId===targetColId){colDragEnd(e);return;}
+  const fromIdx=COLUMNS.findIndex(c=>c.id===colDragId);
+  const toIdx=COLUMNS.findIndex(c=>c.id===targetColId);
+  if(fromIdx<0||toIdx<0){colDragEnd(e);return;}
+  // Reorder COLUMNS array
+  const [moved]=COLUMNS.splice(fromIdx,1);
+  COLUMNS.splice(toIdx,0,moved);
+  colDragId=null;
+  renderDnDGrid();
+}
+function colDragEnd(e){
+  colDragId=null;
+  document.querySelectorAll('.dnd-hdr-cell').forEach(c=>{c.style.opacity='';c.style.outline='';});
+}
+
+// ── Drag state ──
+let dndDrag={};
+let dndSnapshot=null;
+function clearDragState(){dndDrag={};dndSnapshot=null;}
+
+// ── Grid manipulation ──
+function dndRemoveAndCompact(colId,row){
+  const arr=window.dndGrid[colId]||[];
+  if(row<arr.length) arr.splice(row,1);
+}
+function dndInsertAt(colId,row,dishId){
+  const arr=window.dndGrid[colId];
+  if(!arr) return;
+  arr.splice(row,0,dishId);
+}
+function dndRemoveHole(){
+  COLUMNS.forEach(col=>{
+    const arr=window.dndGrid[col.id]||[];
+    for(let i=arr.length-1;i>=0;i--){
+      if(arr[i]===HOLE) arr.splice(i,1);
+    }
+  });
+}
+function dndReplaceHole(dishId){
+  for(const col of COLUMNS){
+    const arr=window.dndGrid[col.id]||[];
+    const idx=arr.indexOf(HOLE);
+    if(idx>=0){arr[idx]=dishId;return true;}
+  }
+  return false;
+}
+function dndTrimRows(){
+  COLUMNS.forEach(col=>{
+    const arr=window.dndGrid[col.id]||[];
+    while(arr.length>0 && !arr[arr.length-1]) arr.pop();
+  });
+}
+
+// ── Pool rendering ──
+function renderDnDPool(filter=''){
+  const fl=filter.toLowerCase();
+  const placed=new Set();
+  COLUMNS.forEach(col=>{
+    (window.dndGrid[col.id]||[]).forEach(d=>{if(d&&d!==HOLE)placed.add(d);});
+  });
+  // Also count pinned
+  Object.entries(dndPinnedCols).forEach(([colId])=>{
+    const arr=window.dndGrid[colId]||[];
+    if(arr[0]) placed.add(arr[0]);
+  });
+  const pools={meat:[],omni:[],vegan:[]};
+  ALL_DISHES.forEach(d=>{
+    if(placed.has(d.id))return;
+    if(fl&&!d.name.toLowerCase().includes(fl)&&!d.id.includes(fl))return;
+    if(d.diet==='veg') pools.vegan.push(d);
+    else if(d.type==='Omni') pools.omni.push(d);
+    else pools.meat.push(d);
+  });
+  ['meat','omni','vegan'].forEach(t=>{
+    pools[t].sort((a,b)=>a.name.localeCompare(b.name));
+    const body=document.getElementById('dnd-pool-'+t);
+    const cnt=document.getElementById('dnd-cnt-'+t);
+    if(!body)return;
+    body.innerHTML='';
+    if(cnt) cnt.textContent=pools[t].length;
+    pools[t].forEach(d=>{
+      const card=document.createElement('div');
+      card.className='dish-card';card.draggable=true;card.dataset.dishId=d.id;
+      card.innerHTML=`<div class="dc-name">${d.name}</div><div class="dc-id">${d.id}</div>`;
+      card.addEventListener('dragstart',e=>{
+        e.dataTransfer.effectAllowed='copyMove';
+        e.dataTransfer.setData('dishId',d.id);
+        e.dataTransfer.setData('source','dnd-pool');
+        dndDrag={dishId:d.id,poolDrag:true,holeRow:-1,holeCol:null,active:false};
+        setTimeout(()=>card.classList.add('dragging'),0);
+      });
+      card.addEventListener('dragend',()=>{
+        card.classList.remove('dragging');
+        if(dndSnapshot){window.dndGrid=dndSnapshot.grid;dndSnapshot=null;}
+        dndRemoveHole();clearDragState();renderDnDGrid();
+      });
+      body.appendChild(card);
+    });
+  });
+}
+
+// ══ BUILD GRID HTML ══
+function buildDnDHTML(){
+  const numRows=getMaxRows();
+  const lastSun=getLastSunday();
+
+  let html=`<div class="dnd-grid${colUnlocked?' col-unlocked':''}" style="grid-template-columns:380px repeat(${COLUMNS.length},var(--col-w)) 40px">`;
+
+  // ── Header row ──
+  html+=`<div class="dnd-hdr-cell sc-hdr" style="position:sticky;left:0;z-index:11">
+    <div class="dnd-sc-hdr-left"><span class="dnd-sc-hdr-title">Scorecard</span></div>
+    <div class="sc-hdr-btns">
+      <button class="sc-settings-btn" onclick="event.stopPropagation();toggleScSettings()">⚙ Set Min/Max</button>
+      <button class="dnd-unassigned-btn" onclick="toggleDnDDrawer()">▾ View All Meals</button>
+    </div>
+    ${scSettingsOpen?buildSettingsPanel():''}
+  </div>`;
+
+  COLUMNS.forEach((col,ci)=>{
+    const pinned=!!dndPinnedCols[col.id];
+    const arr=window.dndGrid[col.id]||[];
+    const canPin=arr.length<=1||pinned;
+    html+=`<div class="dnd-hdr-cell" style="background:${col.color||'#475569'};grid-column:${ci+2}" data-col-id="${col.id}" ${colUnlocked?'draggable="true" ondragstart="colDragStart(event,\''+col.id+'\')" ondragover="colDragOver(event,\''+col.id+'\')" ondrop="colDrop(event,\''+col.id+'\')" ondragend="colDragEnd(event)"':''}>
+      ${colUnlocked?`<input class="col-name-input" value="${col.short||col.name}" onchange="renameCol('${col.id}',this.value)" onclick="event.stopPropagation()" ondragstart="event.stopPropagation()"/>`:(col.short||col.name)}
+      ${canPin?`<button class="dnd-pin-btn${pinned?' pinned':''}" onclick="togglePin('${col.id}')" title="${pinned?'Unpin':'Pin'}">∞</button>`:''}
+      <div class="col-edit-dot" style="background:${col.color||'#475569'};border-color:rgba(255,255,255,.5)" onclick="event.stopPropagation();event.preventDefault();showColorPicker('${col.id}',this)" ondragstart="event.preventDefault();event.stopPropagation();return false" onmousedown="event.stopPropagation();event.preventDefault()" draggable="false"></div>
+      <button class="col-del-btn" onclick="event.stopPropagation();deleteCol('${col.id}')">×</button>
+    </div>`;
+  });
+
+  // Add column + lock button header
+  html+=`<div class="dnd-hdr-cell add-col-hdr" style="grid-column:${COLUMNS.length+2};flex-direction:column;gap:2px">
+    <button class="col-lock-btn${colUnlocked?' unlocked':''}" onclick="toggleColLock()" title="${colUnlocked?'Lock columns':'Unlock to edit'}">${colUnlocked?'🔓':'🔒'}</button>
+    <div style="font-size:14px;cursor:pointer;color:var(--g500)" onclick="addColumn()" title="Add column">+</div>
+  </div>`;
+
+  // ── Global frequency: count total appearances of each dish across entire grid ──
+  const dishFreqCount={};  // dishId -> total count of appearances
+  const dishFreqOrder={};  // dishId -> running counter for nth occurrence
+  COLUMNS.forEach(col=>{
+    const arr=window.dndGrid[col.id]||[];
+    arr.forEach(did=>{
+      if(did&&did!==HOLE){
+        dishFreqCount[did]=(dishFreqCount[did]||0)+1;
+      }
+    });
+  });
+  // Build occurrence map: for each (col,row), what occurrence # is this?
+  // We scan top-to-bottom, left-to-right to assign 1st, 2nd, 3rd...
+  const dishOccurrence={};  // "colId|row" -> occurrence number
+  const dishRunning={};
+  for(let rr=0;rr<getMaxRows();rr++){
+    COLUMNS.forEach(col=>{
+      const arr=window.dndGrid[col.id]||[];
+      const did=arr[rr];
+      if(did&&did!==HOLE){
+        if(!dishRunning[did]) dishRunning[did]=0;
+        dishRunning[did]++;
+        dishOccurrence[col.id+'|'+rr]=dishRunning[did];
+      }
+    });
+  }
+
+  // ── Data rows ──
+  for(let r=0;r<numRows;r++){
+    const weekDate=new Date(lastSun);weekDate.setDate(weekDate.getDate()+r*7);
+    const dateStr=weekDate.toLocaleDateString('en-CA',{month:'short',day:'numeric'});
+    const isCurrent=r===0;
+    const stats=computeDnDWeekStats(r);
+
+    // Scorecard cell
+    html+=`<div class="dnd-sc-cell" style="position:sticky;left:0;z-index:8">`;
+    if(stats){
+      const ps=stats.ps_total;
+      const {bg:psBg,fg:psFg}=psColor(ps);
+      const mtReq=scRequired.mt;
+      const plReq=scRequired.pl;
+      const mtBad=isMtPlMismatch('mt',stats.mt||0);
+      const plBad=isMtPlMismatch('pl',stats.pl||0);
+      html+=`<div class="dnd-sc-inner">
+        <div class="dnd-sc-wk-hdr">
+          <span class="sc-wk-num">${isCurrent?'NOW':'WK '+(r+1)}</span>
+          <span class="sc-wk-date">${dateStr}</span>
+          ${isCurrent?'<span class="sc-wk-badge cur">Current</span>':''}
+          <span class="sc-wk-ps" style="background:${psBg};color:${psFg}">
+            <span class="sc-wk-ps-lbl">Portion Score</span>${ps}
+          </span>
+          ${r>0?`<button class="sc-swap-btn" onclick="showSwapReport(${r})">Swaps</button>`:''}
+        </div>
+        <div class="dnd-sc-grid">`;
+      // Row 1: proteins + dairy + MEAT count
+      SC_GRID_ROW1.forEach(cell=>{
+        const val=stats[cell.key]||0;
+        const bad=isOutOfRange(cell.key,val);
+        const {bg,fg}=bad?{bg:'#dc2626',fg:'#fff'}:redCell(val,CELL_MAX[cell.key]||5);
+        html+=`<div class="sc-tile" style="background:${bg}" title="${cell.lbl}: ${val}"><span class="sc-tile-lbl" style="color:${fg}">${cell.lbl}</span><span class="sc-tile-val" style="color:${fg}">${val}</span></div>`;
+      });
+      html+=`<div class="sc-diet-tile meat-count${mtBad?' mismatch':''}" title="Meat: ${stats.mt||0}"><span class="sc-tile-lbl">MEAT</span><span class="sc-tile-val">${stats.mt||0}${mtReq!==null?'<span class="sc-diet-target">/'+mtReq+'</span>':''}</span></div>`;
+      // Row 2: allergens/starches + PLANT count
+      SC_GRID_ROW2.forEach(cell=>{
+        const val=stats[cell.key]||0;
+        const bad=isOutOfRange(cell.key,val);
+        const {bg,fg}=bad?{bg:'#dc2626',fg:'#fff'}:redCell(val,CELL_MAX[cell.key]||5);
+        html+=`<div class="sc-tile" style="background:${bg}" title="${cell.lbl}: ${val}"><span class="sc-tile-lbl" style="color:${fg}">${cell.lbl}</span><span class="sc-tile-val" style="color:${fg}">${val}</span></div>`;
+      });
+      html+=`<div class="sc-diet-tile plant-count${plBad?' mismatch':''}" title="Plant: ${stats.pl||0}"><span class="sc-tile-lbl">PLANT</span><span class="sc-tile-val">${stats.pl||0}${plReq!==null?'<span class="sc-diet-target">/'+plReq+'</span>':''}</span></div>`;
+      html+=`</div></div>`;
+    } else {
+      html+=`<div class="dnd-sc-inner"><div class="dnd-sc-wk-hdr"><span class="sc-wk-num">WK ${r+1}</span><span class="sc-wk-date">${dateStr}</span></div><div class="dnd-sc-incomplete">Incomplete Menu</div></div>`;
+    }
+    html+=`</div>`;
+
+    // Meal cells
+    COLUMNS.forEach((col,ci)=>{
+      const arr=window.dndGrid[col.id]||[];
+      let dishId=arr[r]||null;
+      const isPinned=dndPinnedCols[col.id]&&r>0&&!dishId&&arr[0]&&arr[0]!==HOLE;
+      if(isPinned) dishId=arr[0];
+      const isHole=(dishId===HOLE);
+
+      // Consecutive duplicate detection (vertical — same column)
+      const prevId=r>0?(isPinned?arr[0]:arr[r-1]||null):null;
+      const nextRaw=arr[r+1]||null;
+      const nextPinned=dndPinnedCols[col.id]&&!nextRaw&&arr[0];
+      const nextId=nextRaw||(nextPinned?arr[0]:null);
+      const sameAsPrev=dishId&&dishId!==HOLE&&prevId===dishId;
+      const sameAsNext=dishId&&dishId!==HOLE&&nextId===dishId;
+      let cellDup='';
+      if(sameAsPrev&&sameAsNext) cellDup=' dup-mid';
+      else if(sameAsPrev) cellDup=' dup-last';
+      else if(sameAsNext) cellDup=' dup-first';
+
+      // Frequency detection (only for non-consecutive-group cells)
+      const isInConsecutiveGroup=cellDup!=='';
+      let isFreqCard=false;
+      let freqOcc=0;
+      if(dishId&&dishId!==HOLE&&!isPinned&&!isInConsecutiveGroup){
+        const totalFreq=dishFreqCount[dishId]||1;
+        if(totalFreq>=2){
+          isFreqCard=true;
+          freqOcc=dishOccurrence[col.id+'|'+r]||1;
+        }
+      }
+
+      html+=`<div class="dnd-col-cell${isHole?' dnd-hole':''}${cellDup}" style="grid-column:${ci+2};${isFreqCard?'position:relative':''}" data-row="${r}" data-col="${col.id}">`;
+      if(isHole){
+        html+=`<div class="dnd-slot-hole"></div>`;
+      } else if(dishId){
+        const d=getDish(dishId);
+        const name=d?d.name:(EXTRA_NAMES[dishId]||dishId);
+        const diet=getDietType(dishId);
+        const plantId=OMNI_PAIRS[dishId]||null;
+        const tog=getToggle(dishId);
+        const attrs=getAttrs(dishId);
+        const isGluten=attrs.gl===1;
+        const pinnedCls=isPinned?' pinned-card':'';
+        const glutenCls=isGluten&&!isPinned?' gluten-card':'';
+        const draggable=isPinned?'false':'true';
+
+        // Cell-level frequency badge
+        if(isFreqCard) html+=`<div class="freq-badge"><span class="freq-badge-lbl">#</span><span class="freq-badge-num">${freqOcc}</span></div>`;
+
+        // Banner
+        html+=`<div class="dnd-card-wrap">`;
+        if(diet==='omni'&&plantId){
+          html+=`<div class="dnd-banner">
+            <div class="dnd-banner-half meat-side${tog.meatOff?' off':''}" onclick="toggleDiet('${dishId}','meat')" title="${tog.meatOff?'Enable':'Disable'} meat version"><span class="dnd-banner-id">${dishId}</span></div>
+            <div class="dnd-banner-half plant-side${tog.plantOff?' off':''}" onclick="toggleDiet('${dishId}','plant')" title="${tog.plantOff?'Enable':'Disable'} plant version"><span class="dnd-banner-id">${plantId}</span></div>
+          </div>`;
+        } else if(diet==='omni-missing'){
+          html+=`<div class="dnd-banner">
+            <div class="dnd-banner-half meat-side"><span class="dnd-banner-id">${dishId}</span></div>
+            <div class="dnd-banner-half missing" onclick="openPairModal('${dishId}')"><span class="dnd-banner-id">⚠ ???</span></div>
+          </div>`;
+        } else if(diet==='vegan'){
+          html+=`<div class="dnd-banner"><div class="dnd-banner-vegan"><span class="dnd-banner-id">${dishId}</span></div></div>`;
+        } else {
+          html+=`<div class="dnd-banner"><div class="dnd-banner-meat"><span class="dnd-banner-id">${dishId}</span></div></div>`;
+        }
+
+        const freqCls=isFreqCard?' freq-card':'';
+        html+=`<div class="dnd-card${pinnedCls}${glutenCls}${freqCls}" draggable="${draggable}" data-dish-id="${dishId}" data-row="${r}" data-col="${col.id}">
+          <div class="dnd-card-name">${name}</div>
+          ${!isPinned?`<div class="dnd-card-actions"><button class="dnd-action-btn dnd-action-dup" title="Duplicate">+</button><button class="dnd-action-btn dnd-action-rm" title="Remove">×</button></div>`:''}
+        </div></div>`;
+      } else {
+        html+=`<div class="dnd-slot-empty"></div>`;
+      }
+      html+=`</div>`;
+    });
+
+    // Empty cell for add-column
+    html+=`<div style="grid-column:${COLUMNS.length+2};border-bottom:var(--bd)"></div>`;
+  }
+
+  html+=`</div>`;
+  return html;
+}
+
+function renderDnDGrid(){
+  if(!Object.keys(window.dndGrid).length) initDnDGrid();
+  const container=document.getElementById('dnd-grid-body');
+  container.innerHTML=buildDnDHTML();
+  renderDnDPool(document.getElementById('dnd-pool-search')?.value||'');
+  updateScShadow();
+}
+
+function updateScShadow(){
+  const wrap=document.getElementById('dnd-wrap');
+  const cells=document.querySelectorAll('.dnd-sc-cell');
+  const scrolled=wrap.scrollLeft>2;
+  cells.forEach(c=>c.classList.toggle('has-shadow',scrolled));
+}
+
+// ══ EVENT DELEGATION ══
+function setupDnDEvents(){
+  const container=document.getElementById('dnd-grid-body');
+  if(container._dndBound) return;
+  container._dndBound=true;
+
+  function findCell(el){while(el&&el!==container){if(el.classList&&el.classList.contains('dnd-col-cell'))return el;el=el.parentElement;}return null;}
+
+  container.addEventListener('dragstart',e=>{
+    const card=e.target.closest('.dnd-card:not(.pinned-card)');
+    if(!card) return;
+    const dishId=card.dataset.dishId;const row=parseInt(card.dataset.row);const col=card.dataset.col;
+    e.dataTransfer.effectAllowed='move';
+    e.dataTransfer.setData('dishId',dishId);
+    e.dataTransfer.setData('source','dnd-grid');
+    dndDrag={dishId,fromRow:row,fromCol:col,holeRow:row,holeCol:col,active:true};
+    dndSnapshot={grid:JSON.parse(JSON.stringify(window.dndGrid))};
+    dndRemoveAndCompact(col,row);
+    const arr=window.dndGrid[col];
+    arr.splice(row,0,HOLE);
+    setTimeout(()=>{container.innerHTML=buildDnDHTML();},0);
+  });
+
+  container.addEventListener('dragover',e=>{
+    e.preventDefault();e.dataTransfer.dropEffect='move';
+    if(!dndDrag.active&&!dndDrag.poolDrag) return;
+    const cell=findCell(e.target);if(!cell) return;
+    const r=parseInt(cell.dataset.row);const colId=cell.dataset.col;
+    if(r===dndDrag.holeRow&&colId===dndDrag.holeCol) return;
+    if(dndDrag.poolDrag&&!dndSnapshot){dndSnapshot={grid:JSON.parse(JSON.stringify(window.dndGrid))};}
+    dndRemoveHole();
+    const arr=window.dndGrid[colId]||[];
+    arr.splice(r,0,HOLE);
+    dndDrag.holeRow=r;dndDrag.holeCol=colId;
+    container.innerHTML=buildDnDHTML();
+  });
+
+  container.addEventListener('drop',e=>{
+    e.preventDefault();
+    const dishId=e.dataTransfer.getData('dishId');
+    if(!dishId) return;
+    dndReplaceHole(dishId);
+    dndDrag={};dndSnapshot=null;
+    dndRemoveHole();dndTrimRows();renderDnDGrid();
+  });
+
+  container.addEventListener('dragend',e=>{
+    if(dndSnapshot){window.dndGrid=dndSnapshot.grid;dndSnapshot=null;}
+    dndRemoveHole();dndDrag={};renderDnDGrid();
+  });
+
+  container.addEventListener('click',e=>{
+    const dup=e.target.closest('.dnd-action-dup');
+    if(dup){
+      e.stopPropagation();
+      const card=dup.closest('.dnd-card');
+      const r=parseInt(card.dataset.row);const colId=card.dataset.col;const dishId=card.dataset.dishId;
+      dndInsertAt(colId,r+1,dishId);
+      renderDnDGrid();return;
+    }
+    const rm=e.target.closest('.dnd-action-rm');
+    if(rm){
+      e.stopPropagation();
+      const card=rm.closest('.dnd-card');
+      const r=parseInt(card.dataset.row);const colId=card.dataset.col;const dishId=card.dataset.dishId;
+      dndRemoveAndCompact(colId,r);
+      // Clear toggle on remove
+      delete dndToggles[dishId];
+      dndTrimRows();renderDnDGrid();return;
+    }
+  });
+
+  // Scroll shadow
+  document.getElementById('dnd-wrap').addEventListener('scroll',updateScShadow);
+
+  // Close settings panel on outside click
+  document.addEventListener('click',e=>{
+    if(scSettingsOpen && !e.target.closest('.sc-settings-panel') && !e.target.closest('.sc-settings-btn')){
+      scSettingsOpen=false;renderDnDGrid();
+    }
+  });
+}
+
+// ══ WEEK STATS ══
+function computeDnDWeekStats(rowIdx){
+  const g=window.dndGrid;
+  const s={ch:0,tr:0,bf:0,pk:0,sf:0,st_rice:0,st_pasta:0,st_potato:0,st_other:0,da:0,gl:0,peanut:0,ps_total:0,total:0,mt:0,pl:0};
+  let hasAny=false;
+  const countedMeat=new Set();
+  const countedPlant=new Set();
+
+  COLUMNS.forEach(col=>{
+    const arr=g[col.id]||[];
+    let dishId=arr[rowIdx];
+    if(!dishId||dishId===HOLE){
+      if(dndPinnedCols[col.id]&&arr[0]&&arr[0]!==HOLE) dishId=arr[0];
+      else return;
+    }
+    hasAny=true;
+    const tog=getToggle(dishId);
+    const diet=getDietType(dishId);
+    const plantId=OMNI_PAIRS[dishId]||null;
+
+    // Choose which attrs to count — deduplicate meat and plant SKUs
+    let attrId=dishId;
+    if(diet==='omni'&&plantId){
+      if(!tog.meatOff&&!countedMeat.has(dishId)){s.mt++;countedMeat.add(dishId);attrId=dishId;}
+      else if(tog.meatOff){attrId=plantId;}
+      if(!tog.plantOff&&!countedPlant.has(plantId)){s.pl++;countedPlant.add(plantId);}
+    } else if(diet==='vegan'){
+      if(!countedPlant.has(dishId)){s.pl++;countedPlant.add(dishId);}
+      attrId=dishId;
+    } else {
+      if(!tog.meatOff&&!countedMeat.has(dishId)){s.mt++;countedMeat.add(dishId);}
+      attrId=dishId;
+    }
+
+    const a=getAttrs(attrId);
+    s.total++;s.ps_total+=a.ps;
+    s.ch+=a.ch;s.tr+=a.tr;s.bf+=a.bf;s.pk+=a.pk;s.sf+=a.sf;
+    s.da+=a.da;s.gl+=a.gl;
+    const n=dndGetDish(attrId).toLowerCase();
+    if(n.includes('peanut')||n.includes('satay')) s.peanut++;
+    if(a.st==='Rice') s.st_rice++;
+    else if(a.st==='Pasta') s.st_pasta++;
+    else if(a.st==='Potato') s.st_potato++;
+    else if(a.st) s.st_other++;
+  });
+  return hasAny?s:null;
+}
+
+// ══ SWAP ENGINE ══
+function getWeekActiveSKUs(rowIdx){
+  const skus=[];const g=window.dndGrid;
+  COLUMNS.forEach(col=>{
+    const arr=g[col.id]||[];
+    let dishId=arr[rowIdx];
+    if(!dishId||dishId===HOLE){
+      if(dndPinnedCols[col.id]&&arr[0]&&arr[0]!==HOLE) dishId=arr[0];
+      else return;
+    }
+    const tog=getToggle(dishId);
+    const plantId=OMNI_PAIRS[dishId]||null;
+    const diet=getDietType(dishId);
+    if(diet==='omni'&&plantId){
+      if(!tog.meatOff) skus.push({sku:dishId,diet:'meat',colId:col.id,name:dndGetDish(dishId)});
+      if(!tog.plantOff) skus.push({sku:plantId,diet:'plant',colId:col.id,name:dndGetDish(plantId)});
+    } else if(diet==='vegan'){
+      skus.push({sku:dishId,diet:'plant',colId:col.id,name:dndGetDish(dishId)});
+    } else {
+      if(!tog.meatOff) skus.push({sku:dishId,diet:'meat',colId:col.id,name:dndGetDish(dishId)});
+    }
+  });
+  return skus;
+}
+
+function computeSwaps(fromRow,toRow){
+  const outSKUs=getWeekActiveSKUs(fromRow);
+  const inSKUs=getWeekActiveSKUs(toRow);
+  const trace=[];const swaps=[];
+  const inClaimed=new Set();const outMatched=new Set();
+
+  trace.push({type:'header',text:'Step 1: Direct Column Matches'});
+  trace.push({type:'info',text:`Comparing Week ${fromRow+1} (${outSKUs.length} SKUs) → Week ${toRow+1} (${inSKUs.length} SKUs)`});
+
+  outSKUs.forEach(out=>{
+    const match=inSKUs.find(ins=>ins.colId===out.colId&&ins.diet===out.diet&&!inClaimed.has(ins.sku));
+    if(match){
+      swaps.push({outSku:out.sku,outName:out.name,outDiet:out.diet,inSku:match.sku,inName:match.name,inDiet:match.diet,colId:out.colId,status:'direct'});
+      inClaimed.add(match.sku);outMatched.add(out.sku);
+      const cn=COLUMNS.find(c=>c.id===out.colId)?.short||out.colId;
+      trace.push({type:'match',text:`✓ ${cn} [${out.diet}]: ${out.sku} → ${match.sku}`});
+    }
+  });
+
+  const unmatchedOut=outSKUs.filter(s=>!outMatched.has(s.sku));
+  const unmatchedIn=inSKUs.filter(s=>!inClaimed.has(s.sku));
+  trace.push({type:'header',text:'Step 2: Unmatched Pool'});
+  trace.push({type:'info',text:`${unmatchedOut.length} out, ${unmatchedIn.length} in`});
+
+  trace.push({type:'header',text:'Step 3: Cross-Column Matching'});
+  ['meat','plant'].forEach(diet=>{
+    const outs=unmatchedOut.filter(s=>s.diet===diet);
+    const ins=unmatchedIn.filter(s=>s.diet===diet&&!inClaimed.has(s.sku));
+    for(let i=0;i<outs.length;i++){
+      if(i<ins.length){
+        swaps.push({outSku:outs[i].sku,outName:outs[i].name,outDiet:diet,inSku:ins[i].sku,inName:ins[i].name,inDiet:diet,colId:outs[i].colId,status:'cross'});
+        inClaimed.add(ins[i].sku);outMatched.add(outs[i].sku);
+        trace.push({type:'cross',text:`↔ Cross [${diet}]: ${outs[i].sku} → ${ins[i].sku}`});
+      } else {
+        swaps.push({outSku:outs[i].sku,outName:outs[i].name,outDiet:diet,inSku:null,inName:null,inDiet:diet,colId:outs[i].colId,status:'orphan'});
+        trace.push({type:'orphan',text:`⚠ Orphan [${diet}]: ${outs[i].sku} — no match`});
+      }
+    }
+  });
+
+  const dc=swaps.filter(s=>s.status==='direct').length;
+  const cc=swaps.filter(s=>s.status==='cross').length;
+  const oc=swaps.filter(s=>s.status==='orphan').length;
+  trace.push({type:'header',text:`Result: ${dc} direct, ${cc} cross, ${oc} orphan`});
+  return {swaps,trace,outSKUs,inSKUs};
+}
+
+let currentSwapData=null;let swapOverrides={};
+
+function showSwapReport(weekRow){
+  const fromRow=weekRow-1,toRow=weekRow;
+  const lastSun=getLastSunday();
+  const fd=new Date(lastSun);fd.setDate(fd.getDate()+fromRow*7);
+  const td=new Date(lastSun);td.setDate(td.getDate()+toRow*7);
+  document.getElementById('swap-modal-title').textContent=`Swap Report — Week ${fromRow+1} → Week ${toRow+1}`;
+  document.getElementById('swap-modal-sub').textContent=`${fd.toLocaleDateString('en-CA',{month:'short',day:'numeric'})} → ${td.toLocaleDateString('en-CA',{month:'short',day:'numeric'})}`;
+  currentSwapData=computeSwaps(fromRow,toRow);swapOverrides={};
+  renderSwapSummary();renderSwapTrace();renderSwapOverride();
+  switchSwapTab('summary',document.querySelector('.swap-tab'));
+  document.getElementById('swap-modal-bg').classList.add('open');
+}
+function closeSwapModal(){document.getElementById('swap-modal-bg').classList.remove('open');}
+function switchSwapTab(id,el){
+  document.querySelectorAll('#swap-tabs .swap-tab').forEach(t=>t.classList.remove('active'));
+  el.classList.add('active');
+  document.querySelectorAll('.swap-panel').forEach(p=>p.classList.remove('active'));
+  document.getElementById('swap-'+id).classList.add('active');
+}
+
+function renderSwapSummary(){
+  const {swaps}=currentSwapData;
+  if(!swaps.length){document.getElementById('swap-summary').innerHTML='<div style="color:var(--g400);padding:20px;text-align:center">No swaps.</div>';return;}
+  const finalSwaps=swaps.map(s=>swapOverrides[s.outSku]?{...s,inSku:swapOverrides[s.outSku],inName:dndGetDish(swapOverrides[s.outSku]),status:'manual'}:s);
+  let html=`<div style="display:flex;gap:12px;margin-bottom:14px;font-size:11px;font-weight:600">`;
+  const dc=finalSwaps.filter(s=>s.status==='direct').length;const cc=finalSwaps.filter(s=>s.status==='cross').length;
+  const mc=finalSwaps.filter(s=>s.status==='manual').length;const oc=finalSwaps.filter(s=>s.status==='orphan').length;
+  html+=`<span style="color:#166534">✓ ${dc} Direct</span><span style="color:#92400e">↔ ${cc} Cross</span>`;
+  if(mc) html+=`<span style="color:#5b21b6">✎ ${mc} Manual</span>`;
+  if(oc) html+=`<span style="color:#991b1b">⚠ ${oc} Orphan</span>`;
+  html+=`<span style="color:var(--g400);margin-left:auto">${finalSwaps.length} total</span></div>`;
+  html+=`<table class="swap-table"><thead><tr><th>Diet</th><th>Out</th><th>Outgoing</th><th></th><th>In</th><th>Incoming</th><th>Status</th></tr></thead><tbody>`;
+  finalSwaps.forEach(s=>{
+    html+=`<tr><td><span class="swap-diet-tag ${s.outDiet}">${s.outDiet==='meat'?'Meat':'Plant'}</span></td><td><span class="swap-sku ${s.outDiet}">${s.outSku}</span></td><td style="font-weight:600">${s.outName}</td><td class="swap-arrow">→</td><td><span class="swap-sku">${s.inSku||'—'}</span></td><td style="font-weight:600">${s.inName||'No match'}</td><td><span class="swap-status ${s.status}">${s.status==='direct'?'Direct':s.status==='cross'?'Cross':s.status==='manual'?'Manual':'⚠ Orphan'}</span></td></tr>`;
+  });
+  html+=`</tbody></table>`;
+  document.getElementById('swap-summary').innerHTML=html;
+}
+
+function renderSwapTrace(){
+  const {trace}=currentSwapData;
+  let html='<div class="swap-trace">';
+  trace.forEach(t=>{
+    if(t.type==='header') html+=`<div style="font-weight:800;color:var(--navy);margin:14px 0 6px;font-size:12px;text-transform:uppercase">${t.text}</div>`;
+    else html+=`<div class="swap-trace-step ${t.type==='match'?'match':t.type==='cross'?'cross':t.type==='orphan'?'orphan':''}">${t.text}</div>`;
+  });
+  html+='</div>';
+  document.getElementById('swap-trace').innerHTML=html;
+}
+
+function renderSwapOverride(){
+  const {swaps,inSKUs}=currentSwapData;
+  if(!swaps.length){document.getElementById('swap-override').innerHTML='<div style="color:var(--g400);padding:20px">No swaps to override.</div>';return;}
+  const avail={meat:[],plant:[]};
+  inSKUs.forEach(s=>{avail[s.diet].push({sku:s.sku,name:s.name});});
+  let html=`<table class="swap-table"><thead><tr><th>Diet</th><th>Out</th><th>Outgoing</th><th></th><th>Override</th><th>Status</th></tr></thead><tbody>`;
+  swaps.forEach(s=>{
+    const cur=swapOverrides[s.outSku]||s.inSku||'';const isOvr=!!swapOverrides[s.outSku];
+    const opts=avail[s.outDiet]||[];
+    html+=`<tr><td><span class="swap-diet-tag ${s.outDiet}">${s.outDiet==='meat'?'Meat':'Plant'}</span></td><td><span class="swap-sku">${s.outSku}</span></td><td style="font-weight:600">${s.outName}</td><td class="swap-arrow">→</td><td><select class="swap-override-select" onchange="applySwapOverride('${s.outSku}',this.value)">`;
+    if(s.inSku) html+=`<option value="${s.inSku}" ${!isOvr?'selected':''}>${s.inSku} — ${s.inName}</option>`;
+    else html+=`<option value="">— None —</option>`;
+    opts.filter(o=>o.sku!==s.inSku).forEach(o=>{html+=`<option value="${o.sku}" ${cur===o.sku?'selected':''}>${o.sku} — ${o.name}</option>`;});
+    html+=`</select></td><td><span class="swap-status ${isOvr?'manual':s.status}">${isOvr?'Manual':s.status==='direct'?'Direct':s.status==='cross'?'Cross':'Orphan'}</span></td></tr>`;
+  });
+  html+=`</tbody></table>`;
+  document.getElementById('swap-override').innerHTML=html;
+}
+
+function applySwapOverride(outSku,inSku){
+  const orig=currentSwapData.swaps.find(s=>s.outSku===outSku);
+  if(orig&&inSku===orig.inSku) delete swapOverrides[outSku];
+  else if(inSku) swapOverrides[outSku]=inSku;
+  else delete swapOverrides[outSku];
+  renderSwapSummary();renderSwapOverride();
+}
+
+// ══ PAIR MODAL ══
+let pairModalMeatId=null;
+function openPairModal(meatId){
+  pairModalMeatId=meatId;
+  const name=dndGetDish(meatId);
+  document.querySelector('.pair-modal-sub').textContent=`For: ${name} (${meatId})`;
+  renderPairList('');
+  document.getElementById('pair-search').value='';
+  document.getElementById('pair-modal-bg').classList.add('open');
+}
+function closePairModal(){document.getElementById('pair-modal-bg').classList.remove('open');pairModalMeatId=null;}
+
+function renderPairList(filter){
+  const fl=filter.toLowerCase();
+  const list=document.getElementById('pair-list');
+  let allPlant=ALL_DISHES.filter(d=>d.diet==='veg').map(d=>({...d}));
+  const existingPlantIds=new Set(Object.values(OMNI_PAIRS));
+  Object.entries(EXTRA_NAMES).forEach(([id,name])=>{
+    if(!id||allPlant.find(d=>d.id===id))return;
+    if(existingPlantIds.has(id)||OMNI_REVERSE[id]){
+      if(!fl||name.toLowerCase().includes(fl)||id.includes(fl)) allPlant.push({id,name,diet:'veg',type:'Vegan'});
+    }
+  });
+  if(fl) allPlant=allPlant.filter(d=>d.name.toLowerCase().includes(fl)||d.id.includes(fl));
+  allPlant.sort((a,b)=>a.name.localeCompare(b.name));
+  if(!allPlant.length){list.innerHTML='<div class="pair-modal-none">No plant-based dishes found</div>';return;}
+  list.innerHTML=allPlant.map(d=>`<div class="pair-modal-item" onclick="assignPair('${d.id}')"><div class="pair-modal-item-dot"></div><div class="pair-modal-item-name">${d.name}</div><div class="pair-modal-item-id">${d.id}</div></div>`).join('');
+}
+
+function assignPair(plantId){
+  if(!pairModalMeatId)return;
+  OMNI_PAIRS[pairModalMeatId]=plantId;
+  OMNI_REVERSE[plantId]=pairModalMeatId;
+  closePairModal();renderDnDGrid();
+}
+
+// ══ GOOGLE APPS SCRIPT SYNC ══
+const GAS_URL='https://script.google.com/macros/s/AKfycbxq3luL1drUibsdP5a1atkx6tyfztn6gR90MrFHmKVP_4CKlobYWXmBxI9s4hMM3DgdkA/exec';
+
+function saveToSheet(){
+  const btn=document.getElementById('save-btn');
+  btn.textContent='Saving...';btn.disabled=true;btn.style.opacity='.7';
+  // Build dish name lookup for sheet output
+  const nameMap={};
+  ALL_DISHES.forEach(d=>{nameMap[d.id]=d.name;});
+  Object.entries(EXTRA_NAMES).forEach(([id,name])=>{if(id&&name)nameMap[id]=name;});
+  const payload={
+    action:'save_menu_state',
+    grid:JSON.stringify(window.dndGrid),
+    columns:JSON.stringify(COLUMNS),
+    queues:JSON.stringify(queues),
+    dishNames:JSON.stringify(nameMap)
+  };
+  fetch(GAS_URL,{method:'POST',body:JSON.stringify(payload)})
+    .then(r=>r.json())
+    .then(d=>{
+      if(d.success){
+        // Have the app reload its cached weekly menus
+        fetch('/api/menu/refresh',{method:'POST'}).catch(()=>{});
+        btn.textContent='Saved!';btn.style.background='#16a34a';btn.style.opacity='1';
+        btn.style.transform='scale(1.1)';btn.style.transition='all .2s';
+        setTimeout(()=>{btn.style.transform='';btn.textContent='Save';btn.style.background='';btn.disabled=false;},2000);
+      } else {
+        saveFail(btn,d.error);
+      }
+    })
+    .catch(err=>saveFail(btn,err));
+}
+
+function saveFail(btn,err){
+  btn.textContent='Failed!';btn.style.background='#dc2626';btn.style.opacity='1';
+  btn.style.animation='shake .4s ease';
+  console.error('Save failed:',err);
+  setTimeout(()=>{btn.textContent='Save';btn.style.background='';btn.style.animation='';btn.disabled=false;},3000);
+}
+
+function loadFromSheet(){
+  return fetch(GAS_URL+'?action=load_menu_state')
+    .then(r=>r.json())
+    .then(d=>{
+      if(d.success && d.found){
+        try{
+          const grid=JSON.parse(d.grid);
+          const cols=JSON.parse(d.columns);
+          if(grid && Object.keys(grid).length){
+            window.dndGrid=grid;
+            // Restore columns if saved
+            if(cols && cols.length){
+              COLUMNS.length=0;
+              cols.forEach(c=>COLUMNS.push(c));
+            }
+            renderDnDGrid();
+            console.log('Loaded menu state from',d.timestamp);
+            return true;
+          }
+        }catch(e){console.error('Parse error:',e);}
+      }
+      return false;
+    })
+    .catch(err=>{console.error('Load failed:',err);return false;});
+}
+
+// ══ INIT ══
+const advInfo=getLastSunday().toLocaleDateString('en-CA',{weekday:'short',month:'short',day:'numeric'});
+document.getElementById('wi-info').textContent='Queue as of '+advInfo;
+initDnDGrid();
+renderDnDGrid();
+setupDnDEvents();
+
+// Try loading saved state from Google Sheet
+loadFromSheet().then(loaded=>{
+  if(loaded) console.log('Menu loaded from sheet');
+  else console.log('Using default queues');
+});
+
+// Add fadeOut animation
+const style=document.createElement('style');
+style.textContent='@keyframes fadeOut{0%{opacity:1}70%{opacity:1}100%{opacity:0}}';
+document.head.appendChild(style);
+
+// ═══════════════════════════════════════
+// BRE'S INSPIRATIONAL POP-UP SYSTEM
+// ═══════════════════════════════════════
+(function(){
+  const breCSS = document.createElement('style');
+  breCSS.textContent = `
+    @keyframes bre-entrance{0%{transform:scale(0) rotate(-180deg);opacity:0}50%{transform:scale(1.3) rotate(10deg);opacity:1}70%{transform:scale(0.9) rotate(-5deg)}100%{transform:scale(1) rotate(0)}}
+    @keyframes bre-rainbow{0%{background-position:0% 50%}50%{background-position:100% 50%}100%{background-position:0% 50%}}
+    @keyframes bre-float{0%,100%{transform:translateY(0)}50%{transform:translateY(-10px)}}
+    @keyframes bre-sparkle{0%,100%{opacity:1;transform:scale(1)}50%{opacity:.5;transform:scale(1.5)}}
+    @keyframes bre-shake{0%,100%{transform:rotate(0)}25%{transform:rotate(-8deg)}75%{transform:rotate(8deg)}}
+    @keyframes bre-confetti-fall{0%{transform:translateY(-100vh) rotate(0deg);opacity:1}100%{transform:translateY(100vh) rotate(720deg);opacity:0}}
+    @keyframes bre-glow{0%,100%{text-shadow:0 0 10px #ff6b9d,0 0 20px #ff6b9d,0 0 40px #ff6b9d}50%{text-shadow:0 0 20px #c44dff,0 0 40px #c44dff,0 0 80px #c44dff}}
+    @keyframes bre-bounce{0%,100%{transform:translateY(0)}20%{transform:translateY(-20px)}40%{transform:translateY(0)}60%{transform:translateY(-10px)}80%{transform:translateY(0)}}
+    @keyframes bre-heart-float{0%{transform:translateY(0) scale(1);opacity:1}100%{transform:translateY(-200px) scale(2);opacity:0}}
+    .bre-overlay{position:fixed;inset:0;z-index:99999;display:flex;align-items:center;justify-content:center;background:rgba(0,0,0,.6);backdrop-filter:blur(4px)}
+    .bre-confetti{position:fixed;top:0;left:0;width:100%;height:100%;pointer-events:none;z-index:100000;overflow:hidden}
+    .bre-confetti-piece{position:absolute;width:12px;height:12px;animation:bre-confetti-fall linear forwards}
+    .bre-modal{background:linear-gradient(135deg,#ff9a9e,#fecfef,#fdfbfb,#a8edea,#fed6e3,#ff9a9e);background-size:400% 400%;animation:bre-entrance .8s cubic-bezier(.34,1.56,.64,1) forwards,bre-rainbow 3s ease infinite;border-radius:24px;padding:40px 50px;max-width:550px;width:90%;text-align:center;box-shadow:0 0 60px rgba(255,107,157,.5),0 0 120px rgba(196,77,255,.3),0 20px 60px rgba(0,0,0,.3);position:relative;z-index:100001}
+    .bre-modal h1{font-size:32px;font-weight:900;background:linear-gradient(90deg,#ff6b9d,#c44dff,#4dc9f6,#f7d94e,#ff6b9d);background-size:200% auto;-webkit-background-clip:text;-webkit-text-fill-color:transparent;animation:bre-rainbow 2s linear infinite;margin-bottom:8px;line-height:1.2}
+    .bre-modal .bre-emoji-row{font-size:36px;margin:12px 0;animation:bre-shake 1s ease infinite;letter-spacing:8px}
+    .bre-modal .bre-msg{font-size:16px;line-height:1.7;color:#4a2040;font-weight:500;margin:16px 0;text-shadow:0 1px 2px rgba(255,255,255,.5)}
+    .bre-modal .bre-msg em{font-style:normal;font-weight:800;color:#c44dff;animation:bre-glow 2s ease infinite}
+    .bre-modal .bre-close{margin-top:20px;padding:14px 36px;font-size:15px;font-weight:800;border:none;border-radius:50px;cursor:pointer;background:linear-gradient(135deg,#ff6b9d,#c44dff);color:white;box-shadow:0 4px 20px rgba(196,77,255,.4);transition:all .2s;letter-spacing:.5px;text-transform:uppercase}
+    .bre-modal .bre-close:hover{transform:scale(1.08);box-shadow:0 6px 30px rgba(196,77,255,.6)}
+    .bre-modal .bre-sparkle-corner{position:absolute;font-size:24px;animation:bre-sparkle 1.5s ease infinite}
+    .bre-modal .bre-float-emoji{position:absolute;font-size:20px;animation:bre-float 2s ease infinite}
+    .bre-hearts-container{position:fixed;bottom:0;left:0;width:100%;height:100%;pointer-events:none;z-index:100000}
+    .bre-heart{position:absolute;bottom:-20px;font-size:24px;animation:bre-heart-float 3s ease forwards}
+  `;
+  document.head.appendChild(breCSS);
+
+  function spawnConfetti(container, count){
+    const colors=['#ff6b9d','#c44dff','#4dc9f6','#f7d94e','#6bbe6a','#ff9a9e','#fecfef','#a8edea','#ff4081','#7c4dff','#00e5ff','#ffd740'];
+    const shapes=['circle','square','star'];
+    for(let i=0;i<count;i++){
+      const piece=document.createElement('div');
+      piece.className='bre-confetti-piece';
+      const color=colors[Math.floor(Math.random()*colors.length)];
+      const shape=shapes[Math.floor(Math.random()*shapes.length)];
+      const left=Math.random()*100;
+      const dur=2+Math.random()*3;
+      const delay=Math.random()*2;
+      const size=6+Math.random()*12;
+      piece.style.left=left+'%';
+      piece.style.width=size+'px';
+      piece.style.height=size+'px';
+      piece.style.animationDuration=dur+'s';
+      piece.style.animationDelay=delay+'s';
+      if(shape==='circle'){piece.style.borderRadius='50%';piece.style.background=color;}
+      else if(shape==='star'){piece.style.background='none';piece.innerHTML='⭐';piece.style.fontSize=size+'px';}
+      else{piece.style.background=color;piece.style.borderRadius='2px';piece.style.transform='rotate('+Math.random()*360+'deg)';}
+      container.appendChild(piece);
+    }
+  }
+
+  function spawnHearts(container){
+    const hearts=['💖','💗','💕','💝','💘','❤️','🩷','💜','✨','🌟','⭐','🦋'];
+    for(let i=0;i<30;i++){
+      const h=document.createElement('div');
+      h.className='bre-heart';
+      h.textContent=hearts[Math.floor(Math.random()*hearts.length)];
+      h.style.left=Math.random()*100+'%';
+      h.style.animationDelay=Math.random()*3+'s';
+      h.style.animationDuration=(2+Math.random()*3)+'s';
+      h.style.fontSize=(16+Math.random()*20)+'px';
+      container.appendChild(h);
+    }
+  }
+
+  function showBrePopup(msgNum){
+    const overlay=document.createElement('div');
+    overlay.className='bre-overlay';
+
+    const confetti=document.createElement('div');
+    confetti.className='bre-confetti';
+    spawnConfetti(confetti,150);
+    document.body.appendChild(confetti);
+
+    const hearts=document.createElement('div');
+    hearts.className='bre-hearts-container';
+    spawnHearts(hearts);
+    document.body.appendChild(hearts);
+
+    const modal=document.createElement('div');
+    modal.className='bre-modal';
+
+    if(msgNum===1){
+      modal.innerHTML=`
+        <div class="bre-sparkle-corner" style="top:-10px;left:-10px;animation-delay:0s">✨</div>
+        <div class="bre-sparkle-corner" style="top:-10px;right:-10px;animation-delay:.3s">💖</div>
+        <div class="bre-sparkle-corner" style="bottom:-10px;left:-10px;animation-delay:.6s">🌟</div>
+        <div class="bre-sparkle-corner" style="bottom:-10px;right:-10px;animation-delay:.9s">✨</div>
+        <div class="bre-float-emoji" style="top:10px;left:30%;animation-delay:.2s">🦋</div>
+        <div class="bre-float-emoji" style="top:15px;right:25%;animation-delay:.7s">🌈</div>
+        <div class="bre-emoji-row">👑 🍳 ✨ 🏆 ✨ 🍳 👑</div>
+        <h1>EXCUSE US, CHEF BRE?!</h1>
+        <div class="bre-msg">
+          We need to talk about something <em>extremely serious</em>.<br><br>
+          Since the dawn of civilization, humanity has celebrated many achievements.
+          Fire. The wheel. The printing press. Sliced bread.<br><br>
+          But <em>NOTHING</em> — and we mean absolutely <em>NOTHING</em> — has ever come
+          close to the sheer magnificence, the jaw-dropping brilliance, the
+          earth-shattering culinary wizardry that is <em>Chef Bre</em>.<br><br>
+          Scientists have confirmed: your cooking makes flowers bloom,
+          birds sing, and grown adults weep tears of pure joy. 🌸🐦😭<br><br>
+          The United Nations is considering making your menu a
+          <em>World Heritage Site</em>. UNESCO called. Twice.<br><br>
+          You're not just the best thing since sliced bread —
+          <em>sliced bread wishes it could be you</em>. 🍞💅
+        </div>
+        <div class="bre-emoji-row" style="animation-delay:.5s">💖 🔥 💖 🔥 💖 🔥 💖</div>
+        <button class="bre-close" onclick="this.closest('.bre-overlay').remove();document.querySelectorAll('.bre-confetti,.bre-hearts-container').forEach(e=>e.remove())">
+          I'm blushing, stop it 😳
+        </button>
+      `;
+    } else {
+      modal.innerHTML=`
+        <div class="bre-sparkle-corner" style="top:-10px;left:-10px;animation-delay:0s">🔥</div>
+        <div class="bre-sparkle-corner" style="top:-10px;right:-10px;animation-delay:.3s">💜</div>
+        <div class="bre-sparkle-corner" style="bottom:-10px;left:-10px;animation-delay:.6s">🔥</div>
+        <div class="bre-sparkle-corner" style="bottom:-10px;right:-10px;animation-delay:.9s">💜</div>
+        <div class="bre-float-emoji" style="top:8px;left:25%;animation-delay:.4s">👸</div>
+        <div class="bre-float-emoji" style="top:12px;right:20%;animation-delay:.1s">💎</div>
+        <div class="bre-emoji-row">🚨 🚨 🚨 ALERT 🚨 🚨 🚨</div>
+        <h1>THIS JUST IN!!!</h1>
+        <div class="bre-msg">
+          <em>BREAKING NEWS:</em> Local chef discovered to be
+          actual <em>culinary superhero</em>. Cape made entirely of fresh herbs.<br><br>
+          Eyewitnesses report that every dish Chef Bre touches turns to
+          <em>absolute gold</em>. Gordon Ramsay seen taking notes.
+          Anthony Bourdain's ghost gave a standing ovation. 👻👏<br><br>
+          Her menus don't just feed people — they <em>change lives</em>.
+          One customer reportedly ate her food and immediately
+          got a promotion, found true love, AND won the lottery. 🎰💕<br><br>
+          The BetterDay team has officially filed paperwork to rename
+          the company to <em>"BetterBre"</em> because honestly,
+          that's more accurate at this point. 📝<br><br>
+          In conclusion: Bre, you are a <em>national treasure</em> and
+          we are <em>not worthy</em>. 🙇‍♂️🙇‍♀️🙇
+        </div>
+        <div class="bre-emoji-row" style="animation-delay:.3s">👑 💎 ✨ 💎 👑</div>
+        <div style="animation:bre-bounce 1.5s ease infinite;display:inline-block">
+          <button class="bre-close" style="background:linear-gradient(135deg,#f7d94e,#ff6b9d,#c44dff)" onclick="this.closest('.bre-overlay').remove();document.querySelectorAll('.bre-confetti,.bre-hearts-container').forEach(e=>e.remove())">
+            OK PLEASE put an end to this 😂
+          </button>
+        </div>
+      `;
+    }
+
+    overlay.appendChild(modal);
+    document.body.appendChild(overlay);
+
+    // More confetti waves
+    setTimeout(()=>spawnConfetti(confetti,80),1500);
+    setTimeout(()=>spawnConfetti(confetti,60),3000);
+  }
+
+  // First popup after 5 seconds, then every 5 seconds
+  setTimeout(()=>showBrePopup(1), 5000);
+  setTimeout(()=>showBrePopup(2), 35000);
+})();
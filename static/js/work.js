@@ -0,0 +1,1383 @@
+const SCRIPT_URL = "/api/gas";
+
+// ── STATE ──
+let currentCompany      = null;
+let currentEmployee     = null; // { firstName, lastName, email }
+let cart                = [];
+let weeks               = [];
+let activeWeekIndex     = 0;
+let menuCache           = {};
+let _companiesCache     = null; // prefetched company list [{CompanyID, CompanyName, ...}]
+let joinPin             = '';
+let existingOrderCounts = {}; // { sundayAnchor: count } — meals already placed this week
+let _prefetchedCounts   = null; // { email, counts } — hydrated before enterMenu()
+
+// ── SESSION (localStorage) ──
+const LS_SESSION = 'bd_work_session';
+const LS_COUNTS  = email => `bd_counts_${email}`;
+function saveSession(emp, company) {
+  try { localStorage.setItem(LS_SESSION, JSON.stringify({ emp, companyId: company.CompanyID, savedAt: Date.now() })); } catch(e){}
+}
+function loadSession() {
+  try {
+    const raw = localStorage.getItem(LS_SESSION);
+    if (!raw) return null;
+    const s = JSON.parse(raw);
+    // Expire after 30 days
+    if (Date.now() - s.savedAt > 30 * 24 * 60 * 60 * 1000) { localStorage.removeItem(LS_SESSION); return null; }
+    return s;
+  } catch(e) { return null; }
+}
+function clearSession() {
+  try {
+    if (currentEmployee?.email) localStorage.removeItem(LS_COUNTS(currentEmployee.email));
+    localStorage.removeItem(LS_SESSION);
+  } catch(e) {}
+}
+
+// ── NAV ──
+function goTo(id) {
+  document.querySelectorAll('.screen').forEach(s => s.classList.remove('active'));
+  document.getElementById(id).classList.add('active');
+  window.scrollTo(0,0);
+}
+
+// ── STEP 1: COMPANY CODE ──
+let _compDebounce = null;
+function previewCompanyCode(input) {
+  const code = input.value.trim().toUpperCase();
+  const check = document.getElementById('companyCodeCheck');
+  const btn   = document.getElementById('companyNextBtn');
+  const err   = document.getElementById('companyError');
+  err.classList.remove('show');
+  check.textContent = ''; check.classList.remove('show'); btn.disabled = true; currentCompany = null;
+  if (code.length < 2) return;
+
+  // If companies are already prefetched, match instantly — no spinner, no debounce
+  if (_companiesCache) {
+    const match = _companiesCache.find(c => String(c.CompanyID).trim().toUpperCase() === code);
+    if (match) {
+      check.textContent = '✅'; check.classList.add('show'); input.classList.add('valid');
+      currentCompany = match; btn.disabled = false;
+    }
+    // No match while typing — stay silent (button stays disabled); ❌ shown only on submit attempt
+    return;
+  }
+
+  // Cache not ready yet — ask the server's in-memory search; only an exact
+  // code (or a server whose table isn't loaded yet) needs the full record
+  clearTimeout(_compDebounce);
+  _compDebounce = setTimeout(async () => {
+    document.getElementById('companyLoadingWrap').classList.remove('hidden');
+    try {
+      const s = await fetch(`/api/companies/search?q=${encodeURIComponent(code)}`).then(r => r.json());
+      const exact = (s.results || []).some(c => String(c.CompanyID).trim().toUpperCase() === code);
+      const d = (exact || !s.complete)
+        ? await fetch(`/api/company/${encodeURIComponent(code)}`).then(r => r.json())
+        : { found: false };
+      if (input.value.trim().toUpperCase() !== code) return;   // typed on meanwhile
+      if (d.found) {
+        check.textContent = '✅'; check.classList.add('show'); input.classList.add('valid');
+        currentCompany = d.company; btn.disabled = false;
+      } else if (d.error && d.error !== 'lookup failed') {
+        check.textContent = '⚠️'; check.classList.add('show');
+        err.textContent = 'Connection error — please try again in a moment.';
+        err.classList.add('show');
+      }
+      // No match — stay silent while typing; ❌ shown only on submit attempt
+    } catch(e) {
+      check.textContent = '⚠️'; check.classList.add('show');
+      err.textContent = 'Connection error — please try again in a moment.';
+      err.classList.add('show');
+    } finally {
+      document.getElementById('companyLoadingWrap').classList.add('hidden');
+    }
+  }, 300);
+}
+
+async function doCompanyNext() {
+  if (!currentCompany) {
+    const check = document.getElementById('companyCodeCheck');
+    const err   = document.getElementById('companyError');
+    check.textContent = '❌'; check.classList.add('show');
+    err.textContent = "That code doesn't exist. Double-check with your office manager.";
+    err.classList.add('show');
+    return;
+  }
+  // Check for saved session matching this company
+  const sess = loadSession();
+  if (sess && sess.companyId === currentCompany.CompanyID) {
+    // Show session chip on auth screen
+    showSessionChip(sess.emp);
+  } else {
+    hideSessionChip();
+  }
+  populateAuthCompanySplash();
+  switchAuthTab('signin');
+  goTo('sAuth');
+  // 🚀 Start warming menu cache while user is on auth screen
+  const _now = new Date();
+  const _s0 = new Date(_now); _s0.setDate(_s0.getDate()-_s0.getDay()); _s0.setHours(0,0,0,0);
+  for (let _i = 0; _i < 3; _i++) {
+    const _sun = new Date(_s0); _sun.setDate(_sun.getDate() + 7*_i);
+    const _anchor = _sun.toISOString().split('T')[0];
+    const _cutoff = new Date(_sun); _cutoff.setDate(_cutoff.getDate()+3); _cutoff.setHours(23,59,0,0);
+    if (_now < _cutoff && !menuCache[_anchor]) {
+      fetchMenu(_anchor)
+        .then(m => { menuCache[_anchor] = m; })
+        .catch(() => {});
+    }
+  }
+}
+
+function populateAuthCompanySplash() {
+  const c = currentCompany;
+  document.getElementById('authCompanyAvatar').textContent = c.CompanyName.slice(0,2).toUpperCase();
+  document.getElementById('authCompanyName').textContent   = c.CompanyName;
+}
+
+function showSessionChip(emp) {
+  const chip = document.getElementById('sessionChip');
+  const div  = document.getElementById('sessionDivider');
+  document.getElementById('sessionAvatar').textContent = (emp.firstName[0]+(emp.lastName[0]||'')).toUpperCase();
+  document.getElementById('sessionName').textContent   = emp.firstName + ' ' + emp.lastName;
+  chip.classList.remove('hidden'); div.style.display = 'block';
+}
+function hideSessionChip() {
+  document.getElementById('sessionChip').classList.add('hidden');
+  document.getElementById('sessionDivider').style.display = 'none';
+}
+
+function resumeSession() {
+  const sess = loadSession();
+  if (!sess) return;
+  currentEmployee = sess.emp;
+  preloadActiveWeekMenu();
+  preloadOrderCounts(sess.emp.email); // fire counts fetch before transition
+  enterMenu();
+}
+
+// ── AUTH TABS ──
+function switchAuthTab(tab) {
+  document.getElementById('tabSignIn').classList.toggle('active', tab === 'signin');
+  document.getElementById('tabJoin').classList.toggle('active', tab === 'join');
+  document.getElementById('panelSignIn').classList.toggle('hidden', tab !== 'signin');
+  document.getElementById('panelJoin').classList.toggle('hidden', tab !== 'join');
+}
+
+// ── SIGN IN: MAGIC LINK ──
+async function doSendMagicLink(isResend = false) {
+  const email = document.getElementById('signinEmail').value.trim().toLowerCase();
+  const err   = document.getElementById('signinError');
+  const btn   = document.getElementById('signinBtn');
+  const resendBtn = document.getElementById('resendBtn');
+  err.classList.remove('show');
+  if (!email || !email.includes('@')) { err.textContent = 'Please enter a valid email address.'; err.classList.add('show'); return; }
+
+  if (isResend) {
+    // Resend feedback — swap button text
+    resendBtn.disabled = true;
+    resendBtn.textContent = 'Sending…';
+  } else {
+    btn.classList.add('btn-loading');
+    btn.disabled = true;
+    btn.textContent = 'Sending…';
+  }
+
+  try {
+    if (!isResend) {
+      // First: verify employee exists (skip check on resend)
+      const chk = await apiFetch({ action: 'get_employee_by_email', email, company_id: currentCompany.CompanyID });
+      if (!chk.found) {
+        err.textContent = 'No account found for that email. Try joining instead.';
+        err.classList.add('show');
+        btn.classList.remove('btn-loading'); btn.disabled = false; btn.textContent = 'Send sign-in link →';
+        return;
+      }
+    }
+    // Send real magic link email via Apps Script
+    await apiFetch({ action: 'create_magic_token', email, company_id: currentCompany.CompanyID });
+    // Fire menu + counts preload NOW — user will be in inbox for 30+ seconds, use that time
+    preloadActiveWeekMenu();
+    preloadOrderCounts(email);
+    if (isResend) {
+      resendBtn.textContent = '✓ Sent! Check your inbox';
+      setTimeout(() => { resendBtn.disabled = false; resendBtn.textContent = 'Resend email'; }, 4000);
+    } else {
+      // Show "check inbox" state — user must click the link
+      document.getElementById('magicSentEmail').textContent = email;
+      document.getElementById('magicSentWrap').classList.remove('hidden');
+      document.getElementById('magicSendBtn').classList.add('hidden');
+    }
+  } catch(e) {
+    if (isResend) {
+      resendBtn.textContent = 'Failed — try again';
+      setTimeout(() => { resendBtn.disabled = false; resendBtn.textContent = 'Resend email'; }, 3000);
+    } else {
+      err.textContent = 'Something went wrong. Please try again.';
+      err.classList.add('show');
+      btn.classList.remove('btn-loading'); btn.disabled = false; btn.textContent = 'Send sign-in link →';
+    }
+  }
+}
+
+// ── JOIN: EMAIL CHECK ──
+let _emailCheckTimer = null;
+function checkJoinEmail(input) {
+  const email = input.value.trim().toLowerCase();
+  const companyDomain = (currentCompany?.CompanyEmailDomain || '').toLowerCase().replace(/^@/, '');
+  const pinSection = document.getElementById('joinPinSection');
+  const existsHint = document.getElementById('joinEmailExistsHint');
+
+  if (existsHint) existsHint.style.display = 'none';
+  if (!email.includes('@')) { pinSection.classList.add('hidden'); checkJoinReady(); return; }
+
+  const emailDomain = email.split('@')[1] || '';
+  const isCompanyEmail = companyDomain && emailDomain === companyDomain;
+
+  if (isCompanyEmail) {
+    pinSection.classList.add('hidden');
+    joinPin = '__COMPANY_EMAIL__'; // bypass token
+  } else {
+    pinSection.classList.remove('hidden');
+    if (joinPin === '__COMPANY_EMAIL__') joinPin = ''; // reset if switched back
+    updateJoinPinDisplay();
+  }
+
+  // Debounced real-time duplicate check
+  clearTimeout(_emailCheckTimer);
+  _emailCheckTimer = setTimeout(async () => {
+    if (!email.includes('@') || !currentCompany) return;
+    try {
+      const chk = await apiFetch({ action: 'get_employee_by_email', email, company_id: currentCompany.CompanyID });
+      if (chk.found && existsHint) {
+        existsHint.style.display = 'block';
+        const safeEmail = email.replace(/'/g, "\\'");
+        existsHint.innerHTML = `Account already exists — <button onclick="switchAuthTab('signin');document.getElementById('signinEmail').value='${safeEmail}'" style="background:none;border:none;color:var(--primary);font-weight:800;cursor:pointer;font-family:inherit;font-size:inherit;padding:0;">sign in instead →</button>`;
+      }
+    } catch(e) {}
+  }, 700);
+  checkJoinReady();
+}
+
+// ── JOIN: PIN PAD ──
+function joinPinKey(digit) {
+  if (joinPin === '__COMPANY_EMAIL__' || joinPin.length >= 4) return;
+  joinPin += digit;
+  updateJoinPinDisplay();
+  checkJoinReady();
+}
+function joinPinDel() {
+  if (joinPin === '__COMPANY_EMAIL__') return;
+  joinPin = joinPin.slice(0, -1);
+  updateJoinPinDisplay();
+  checkJoinReady();
+}
+function updateJoinPinDisplay() {
+  for (let i = 0; i < 4; i++) {
+    const dot = document.getElementById(`jpd${i}`);
+    dot.classList.toggle('filled', i < joinPin.length);
+    dot.classList.remove('error');
+  }
+}
+function flashPinError() {
+  for (let i = 0; i < 4; i++) document.getElementById(`jpd${i}`).classList.add('error');
+  setTimeout(() => { joinPin = ''; updateJoinPinDisplay(); }, 600);
+}
+
+function checkJoinReady() {
+  const first = document.getElementById('joinFirst').value.trim();
+  const last  = document.getElementById('joinLast').value.trim();
+  const email = document.getElementById('joinEmail').value.trim();
+  const pinSection = document.getElementById('joinPinSection');
+  const pinOk = !pinSection.classList.contains('hidden')
+    ? (joinPin.length === 4)
+    : true;
+  document.getElementById('joinBtn').disabled = !(first && last && email.includes('@') && pinOk);
+}
+
+async function doJoin() {
+  const first = document.getElementById('joinFirst').value.trim();
+  const last  = document.getElementById('joinLast').value.trim();
+  const email = document.getElementById('joinEmail').value.trim().toLowerCase();
+  const err   = document.getElementById('joinError');
+  const suc   = document.getElementById('joinSuccess');
+  const btn   = document.getElementById('joinBtn');
+  err.classList.remove('show'); suc.classList.remove('show');
+
+  // Loading state
+  btn.classList.add('btn-loading'); btn.disabled = true; btn.textContent = 'Creating account…';
+
+  const resetBtn = () => { btn.classList.remove('btn-loading'); btn.disabled = false; btn.textContent = 'Create account →'; };
+
+  // Verify PIN if needed
+  const pinSection = document.getElementById('joinPinSection');
+  const needsPin   = !pinSection.classList.contains('hidden');
+
+  if (needsPin) {
+    // Check PIN against company
+    try {
+      const pv = await apiFetch({ action: 'verify_company_pin', company_id: currentCompany.CompanyID, pin: joinPin });
+      if (!pv.valid) { flashPinError(); err.textContent = 'Incorrect company PIN. Ask your office manager.'; err.classList.add('show'); resetBtn(); return; }
+    } catch(e) { err.textContent = 'Could not verify PIN. Try again.'; err.classList.add('show'); resetBtn(); return; }
+  }
+
+  // Register employee
+  try {
+    const d = await apiFetch({ action: 'register_employee', company_id: currentCompany.CompanyID, first_name: first, last_name: last, email });
+    if (d.success) {
+      currentEmployee = { firstName: first, lastName: last, email };
+      saveSession(currentEmployee, currentCompany);
+      preloadActiveWeekMenu();
+      preloadOrderCounts(email); // new user will have 0 counts, loads instantly
+      enterMenu();
+    } else if (d.exists) {
+      err.textContent = 'An account with that email already exists. Sign in instead.';
+      err.classList.add('show');
+      resetBtn();
+      switchAuthTab('signin');
+      document.getElementById('signinEmail').value = email;
+    } else {
+      err.textContent = d.error || 'Something went wrong. Please try again.';
+      err.classList.add('show'); resetBtn();
+    }
+  } catch(e) { err.textContent = 'Could not create account. Try again.'; err.classList.add('show'); resetBtn(); }
+}
+
+// ── MANAGER GATE ──
+function enterMenu() {
+  // Managers always see the gate screen first — every sign-in, even auto-restore
+  if (currentEmployee?.isManager) {
+    document.getElementById('gateName').textContent    = currentEmployee.firstName + ' ' + currentEmployee.lastName;
+    document.getElementById('gateCompany').textContent = currentCompany?.CompanyName || '';
+    goTo('sGate');
+    return;
+  }
+  proceedToMenu();
+}
+
+function proceedToMenu() {
+  cart = []; existingOrderCounts = {}; computeWeeks();
+  const email = currentEmployee?.email;
+  if (_prefetchedCounts?.email === email) {
+    // Preload already completed — use fresh counts immediately, no extra fetch needed
+    existingOrderCounts = _prefetchedCounts.counts;
+  } else if (email) {
+    // Seed from localStorage so render is instant while counts load
+    try {
+      const cached = localStorage.getItem(LS_COUNTS(email));
+      if (cached) existingOrderCounts = JSON.parse(cached);
+    } catch(e) {}
+    // Counts weren't prefetched yet — start the fetch now (preloadOrderCounts self-applies on completion)
+    preloadOrderCounts(email);
+  }
+  setupMenu(); goTo('sMenu');
+  // Preload other open weeks in the background
+  weeks.forEach((w, i) => {
+    if (i === activeWeekIndex || menuCache[w.sundayAnchor] || !w.isOpen) return;
+    fetchMenu(w.sundayAnchor)
+      .then(m => { menuCache[w.sundayAnchor] = m; })
+      .catch(() => {});
+  });
+}
+
+async function doManagerDashboard() {
+  const btn = document.querySelector('.gate-card.gate-manager');
+  btn.disabled = true;
+  btn.querySelector('.gate-card-arrow').textContent = '…';
+  try {
+    const d = await apiFetch({ action: 'create_manager_session', email: currentEmployee.email, company_id: currentCompany.CompanyID });
+    if (d.success && d.token) {
+      window.location.href = '/manager/auth?token=' + encodeURIComponent(d.token);
+    } else {
+      btn.disabled = false; btn.querySelector('.gate-card-arrow').textContent = '→';
+    }
+  } catch(e) {
+    btn.disabled = false; btn.querySelector('.gate-card-arrow').textContent = '→';
+  }
+}
+
+// ── PRE-LOAD ACTIVE WEEK DURING SIGN-IN ──
+// Called as soon as we know who the user is — fires the menu fetch
+// while user is still in transition (inbox wait, session resume, etc.)
+function preloadActiveWeekMenu() {
+  computeWeeks();
+  const active = weeks[activeWeekIndex];
+  if (!active || menuCache[active.sundayAnchor]) return;
+  fetchMenu(active.sundayAnchor)
+    .then(m => { menuCache[active.sundayAnchor] = m; })
+    .catch(() => {});
+}
+
+// ── PRE-LOAD ORDER COUNTS DURING SIGN-IN ──
+// Fired as early as possible so counts are ready (or nearly ready) by
+// the time enterMenu() runs — eliminates the post-render stale window.
+function preloadOrderCounts(email) {
+  if (!email) return;
+  apiFetch({ action: 'get_week_order_counts', email })
+    .then(r => {
+      if (!r?.counts) return;
+      _prefetchedCounts = { email, counts: r.counts };
+      try { localStorage.setItem(LS_COUNTS(email), JSON.stringify(r.counts)); } catch(e) {}
+      // If the menu is already showing for this user, apply immediately
+      if (currentEmployee?.email === email && document.getElementById('sMenu')?.classList.contains('active')) {
+        existingOrderCounts = r.counts;
+        [...new Set(cart.map(i=>i.weekIndex))].forEach(wi=>recomputeTiers(wi));
+        document.getElementById('nextMealPrice').textContent = getNextPriceLabel(activeWeekIndex);
+        buildPricingBanner();
+        buildWeekTabs();
+      }
+    })
+    .catch(err => { console.error('[BetterDay] get_week_order_counts failed:', err); });
+}
+
+async function doChangeEmail() {
+  const input = document.getElementById('changeEmailInput');
+  const btn   = document.getElementById('changeEmailBtn');
+  const msg   = document.getElementById('changeEmailMsg');
+  const newEmail = input.value.trim().toLowerCase();
+  msg.className = 'profile-change-email-msg hidden';
+  if (!newEmail || !newEmail.includes('@')) {
+    msg.textContent = 'Please enter a valid email address.';
+    msg.className = 'profile-change-email-msg err'; return;
+  }
+  if (newEmail === currentEmployee?.email) {
+    msg.textContent = 'That\'s already your current email.';
+    msg.className = 'profile-change-email-msg err'; return;
+  }
+  btn.disabled = true; btn.textContent = 'Saving…';
+  try {
+    const r = await apiFetch({ action: 'update_employee_email', old_email: currentEmployee.email, new_email: newEmail, company_id: currentCompany.CompanyID });
+    if (r.success) {
+      currentEmployee.email = newEmail;
+      saveSession(currentEmployee, currentCompany);
+      document.getElementById('profileEmailLg').textContent = newEmail;
+      input.value = '';
+      msg.textContent = '✓ Email updated successfully.';
+      msg.className = 'profile-change-email-msg ok';
+    } else {
+      msg.textContent = r.error || 'Could not update email. Try again.';
+      msg.className = 'profile-change-email-msg err';
+    }
+  } catch(e) {
+    msg.textContent = 'Something went wrong. Please try again.';
+    msg.className = 'profile-change-email-msg err';
+  }
+  btn.disabled = false; btn.textContent = 'Save';
+}
+
+function doLogout() {
+  clearSession();
+  currentEmployee = null; currentCompany = null; cart = []; weeks = []; menuCache = {}; _prefetchedCounts = null;
+  // Reset company code screen
+  document.getElementById('companyCodeInput').value = '';
+  document.getElementById('companyCodeCheck').classList.remove('show');
+  document.getElementById('companyNextBtn').disabled = true;
+  goTo('sCompany');
+}
+
+// ── API HELPER ──
+// Reads come back with an ETag; repeating one sends If-None-Match and an
+// unchanged answer is a bodiless 304 served from _apiCopies.
+const _apiCopies = {};
+async function apiFetch(payload) {
+  const body = JSON.stringify(payload);
+  const held = _apiCopies[body];
+  const r = await fetch(SCRIPT_URL, {
+    method: 'POST', body, headers: held ? { 'If-None-Match': held.etag } : {}
+  });
+  if (r.status === 304 && held) return held.data;
+  const data = await r.json();
+  const etag = r.headers.get('ETag');
+  if (etag) _apiCopies[body] = { etag, data };
+  return data;
+}
+
+// Weekly menus come from the menu service; the browser revalidates its copy
+// with the ETag, so an unchanged menu is a 304.
+async function fetchMenu(anchor) {
+  const r = await fetch('/api/menu/' + encodeURIComponent(anchor));
+  if (!r.ok) throw new Error('menu ' + r.status);
+  return r.json();
+}
+
+// ── ON LOAD: Check magic link token → saved session → URL pre-fill ──
+// Card number auto-format (groups of 4)
+document.addEventListener('DOMContentLoaded', () => {
+  const cardInput = document.getElementById('paySimCard');
+  if (cardInput) {
+    cardInput.addEventListener('input', e => {
+      let v = e.target.value.replace(/\D/g,'').slice(0,16);
+      e.target.value = v.match(/.{1,4}/g)?.join(' ') || v;
+    });
+  }
+  const expiryInput = document.getElementById('paySimExpiry');
+  if (expiryInput) {
+    expiryInput.addEventListener('input', e => {
+      let v = e.target.value.replace(/\D/g,'').slice(0,4);
+      if (v.length > 2) v = v.slice(0,2) + '/' + v.slice(2);
+      e.target.value = v;
+    });
+  }
+});
+
+window.addEventListener('DOMContentLoaded', async () => {
+  const params = new URLSearchParams(window.location.search);
+  const token = params.get('token');
+  const companyCode = params.get('co'); // e.g. /work?co=BROCK&token=xxx
+
+  // 0. Prefetch all companies from Flask cache — instant lookup while user types
+  fetch('/api/companies')
+    .then(r => r.json())
+    .then(r => { if (r?.companies?.length) _companiesCache = r.companies; })
+    .catch(() => {});
+
+  // 0.5. Server-side magic session (set by /lander route) — highest priority
+  try {
+    const ms = await fetch('/api/magic-session').then(r => r.json());
+    if (ms.valid) {
+      currentCompany  = ms.company;
+      currentEmployee = ms.employee;
+      saveSession(currentEmployee, currentCompany);
+      preloadActiveWeekMenu();
+      preloadOrderCounts(ms.employee.email);
+      enterMenu();
+      return;
+    }
+  } catch(e) {}
+
+  // 1. Magic link token in URL — show spinner while verifying
+  if (token) {
+    goTo('sMagicVerify');
+    try {
+      const d = await apiFetch({ action: 'verify_magic_token', token });
+      if (d.valid) {
+        currentCompany  = d.company;
+        currentEmployee = d.employee;
+        saveSession(currentEmployee, currentCompany);
+        preloadActiveWeekMenu();
+        preloadOrderCounts(d.employee.email);
+        enterMenu();
+        window.history.replaceState({}, '', window.location.pathname);
+        return;
+      }
+    } catch(e) {}
+    // Token invalid/expired — fall back to company screen
+    goTo('sCompany');
+  }
+
+  // 2. Restore saved session — skip company code screen entirely
+  const sess = loadSession();
+  if (sess && sess.companyId) {
+    try {
+      const compData = await apiFetch({ action: 'get_company', company_id: sess.companyId });
+      if (compData.found) {
+        currentCompany  = compData.company;
+        currentEmployee = sess.emp;
+        preloadActiveWeekMenu();
+        preloadOrderCounts(sess.emp.email);
+        enterMenu();
+        window.history.replaceState({}, '', window.location.pathname);
+        return;
+      }
+    } catch(e) {}
+    // Company lookup failed — clear stale session and show login
+    clearSession();
+  }
+
+  // 3. Pre-fill company code from URL param e.g. betterday.ca/work?co=BROCK
+  if (companyCode) {
+    const input = document.getElementById('companyCodeInput');
+    input.value = companyCode.toUpperCase();
+    previewCompanyCode(input);
+  }
+});
+
+// ══════════════════════════════════════════
+// WEEK LOGIC
+// ══════════════════════════════════════════
+function getSundayAnchor(d) { const r=new Date(d); r.setDate(r.getDate()-r.getDay()); r.setHours(0,0,0,0); return r; }
+function getDeliveryMonday(s) { const d=new Date(s); d.setDate(d.getDate()+1); return d; }
+function getCutoff(s) { const d=new Date(s); d.setDate(d.getDate()+3); d.setHours(23,59,0,0); return d; }
+function formatDateShort(d) { return d.toLocaleDateString('en-CA',{month:'short',day:'numeric'}); }
+function formatDateFull(d)  { return d.toLocaleDateString('en-CA',{weekday:'long',month:'short',day:'numeric'}); }
+function toYMD(d) { return d.toISOString().split('T')[0]; }
+
+function computeWeeks() {
+  const now = new Date(); weeks = [];
+  const firstSunday = getSundayAnchor(now);
+  for (let i = 0; i < 4; i++) {
+    const sun = new Date(firstSunday); sun.setDate(sun.getDate() + 7*i);
+    const cutoff   = getCutoff(sun);
+    const delivery = getDeliveryMonday(sun);
+    weeks.push({ sundayAnchor: toYMD(sun), deliveryDate: delivery, deliveryStr: formatDateFull(delivery),
+      deliveryShort: formatDateShort(delivery), cutoff, cutoffStr: cutoff.toLocaleDateString('en-CA',{weekday:'long',month:'short',day:'numeric'})+' at 11:59 PM',
+      isOpen: now < cutoff && delivery > now, isPast: delivery < now });
+  }
+  activeWeekIndex = weeks.findIndex(w => w.isOpen);
+  if (activeWeekIndex < 0) activeWeekIndex = 0;
+}
+
+// ══════════════════════════════════════════
+// MENU SETUP
+// ══════════════════════════════════════════
+function setupMenu() {
+  const emp = currentEmployee, c = currentCompany;
+  const initials = ((emp.firstName[0]||'')+(emp.lastName[0]||'')).toUpperCase();
+  document.getElementById('userAvatar').textContent = initials;
+  document.getElementById('userName').textContent   = emp.firstName;
+  buildPricingBanner(); buildWeekTabs(); renderWeek(activeWeekIndex);
+  document.getElementById('nextMealPrice').textContent = getNextPriceLabel(activeWeekIndex);
+}
+
+function buildPricingBanner() {
+  const c=currentCompany; let tiers=[];
+  const free=parseInt(c.FreeMealsPerWeek)||0, t1=parseInt(c.Tier1_Meals)||0, t2=parseInt(c.Tier2_Meals)||0, t3=parseInt(c.Tier3_Meals)||0, fp=parseFloat(c.FullPrice)||16.99;
+  if(free>0) tiers.push({range:`Meals 1–${free}`, price:'FREE', green:true});
+  let cur=free;
+  if(t1>0){tiers.push({range:`Meals ${cur+1}–${cur+t1}`, price:`$${parseFloat(c.Tier1_EmployeePrice).toFixed(2)}`});cur+=t1;}
+  if(t2>0){tiers.push({range:`Meals ${cur+1}–${cur+t2}`, price:`$${parseFloat(c.Tier2_EmployeePrice).toFixed(2)}`});cur+=t2;}
+  if(t3>0){tiers.push({range:`Meals ${cur+1}–${cur+t3}`, price:`$${parseFloat(c.Tier3_EmployeePrice).toFixed(2)}`});cur+=t3;}
+  if(c.AllowExtraAtFullPrice==='TRUE'||c.AllowExtraAtFullPrice===true) tiers.push({range:'Additional', price:`$${fp.toFixed(2)}`});
+  const tiersHtml = tiers.map((t,i)=>
+    (i>0?'<span class="pricing-vsep"></span>':'')+
+    `<span class="pricing-tier">`+
+      `<span class="pricing-tier-range">${t.range}</span>`+
+      `<span class="pricing-tier-price"${t.green?' style="color:#4cd97b"':''}>${t.price}</span>`+
+    `</span>`
+  ).join('');
+  document.getElementById('pricingBannerInner').innerHTML=
+    `<div class="pricing-company-block">`+
+      `<span class="pricing-plan-label">Employer Subsidy Plan</span>`+
+      `<span class="pricing-company">${c.CompanyName}</span>`+
+    `</div>`+
+    `<span class="pricing-vsep" style="height:30px;margin:0 14px"></span>`+
+    tiersHtml;
+}
+
+function buildWeekTabs() {
+  const bar=document.getElementById('weekTabsBar'); bar.innerHTML='';
+  weeks.forEach((w,i)=>{
+    if (!w.isOpen) return; // hide past/closed weeks entirely
+    const firstOpen = weeks.findIndex(wk=>wk.isOpen);
+    const badge = `<span class="tab-badge ${i===firstOpen?'tab-badge-open':'tab-badge-next'}">${i===firstOpen?'Open':'Pre-order'}</span>`;
+    const orderedCount = existingOrderCounts[w.sundayAnchor] || 0;
+    const subLabel = orderedCount > 0
+      ? `${orderedCount} meal${orderedCount!==1?'s':''} ordered`
+      : 'No orders yet';
+    const btn=document.createElement('button');
+    btn.className='week-tab'+(i===activeWeekIndex?' active':'');
+    btn.innerHTML=`${w.deliveryShort}${badge}<span class="tab-date">${subLabel}</span>`;
+    btn.onclick=()=>switchWeek(i); bar.appendChild(btn);
+  });
+}
+
+async function switchWeek(i) { activeWeekIndex=i; buildWeekTabs(); buildPricingBanner(); renderWeek(i); document.getElementById('nextMealPrice').textContent=getNextPriceLabel(i); }
+
+
+async function renderWeek(index) {
+  const w=weeks[index], inner=document.getElementById('menuInner');
+  inner.innerHTML='<div class="spinner-wrap"><div class="spinner"></div><div class="spinner-label">Loading menu…</div></div>';
+  if (!w.isOpen) {
+    const nextOpen=weeks.findIndex(wk=>wk.isOpen);
+    inner.innerHTML=`<div class="closed-overlay"><div class="closed-icon">⏰</div><div class="closed-title">Just missed it!</div>
+      <div class="closed-sub">Ordering for <strong>${w.deliveryStr}</strong> has closed.</div>
+      <div class="closed-cutoff">Cutoff was: ${w.cutoffStr}</div>
+      ${nextOpen>=0?`<button class="btn-next-week" onclick="switchWeek(${nextOpen})">Pre-order for ${weeks[nextOpen].deliveryShort} →</button>`:''}
+    </div>`; return;
+  }
+  let menu=menuCache[w.sundayAnchor];
+  if (!menu) {
+    try { menu=await fetchMenu(w.sundayAnchor); menuCache[w.sundayAnchor]=menu; }
+    catch(e) { inner.innerHTML=`<div class="closed-overlay"><div class="closed-icon">😕</div><div class="closed-title">Couldn't load menu</div></div>`; return; }
+  }
+  const meat=menu.meat||[], veg=menu.vegan||[];
+  if (!meat.length&&!veg.length) { inner.innerHTML=`<div class="closed-overlay"><div class="closed-icon">🗓️</div><div class="closed-title">Menu not set yet</div><div class="closed-sub">Check back soon!</div></div>`; return; }
+  const hasBoth = meat.length>0 && veg.length>0;
+  const slot = document.getElementById('pricingToggleSlot');
+  if (slot) slot.innerHTML = hasBoth
+    ? `<div class="cat-float-inner"><button class="cat-btn active" id="catBtnMeat" onclick="filterCategory('meat')">🥩 Meat</button><button class="cat-btn" id="catBtnVeg" onclick="filterCategory('veg')">🌱 Plant</button></div>`
+    : '';
+  let html = '';
+  if (meat.length) { html+=`<div id="sec-meat-wrap"><div class="menu-section-title">Meat &amp; Omnivore Options</div><div class="meal-grid">`; meat.forEach(i=>{html+=mealCardHTML(i,index);}); html+='</div></div>'; }
+  if (veg.length)  { html+=`<div id="sec-veg-wrap"><div class="menu-section-title">Plant-Based Options</div><div class="meal-grid">`;  veg.forEach(i=>{html+=mealCardHTML(i,index);}); html+='</div></div>'; }
+  inner.innerHTML=html;
+  const seen=new Set();
+  cart.filter(i=>i.weekIndex===index).forEach(i=>{
+    if(!seen.has(i.mealId)){seen.add(i.mealId); renderMealControl(i.mealId,cart.filter(x=>x.mealId===i.mealId&&x.weekIndex===index).length,index);}
+  });
+}
+
+// ══════════════════════════════════════════
+// MEAL CARD
+// ══════════════════════════════════════════
+function mealCardHTML(item, weekIndex) {
+  const id=String(item.id), isVeg=item.diet==='veg'||item.diet==='vegan';
+  let macros='';
+  if (item.cal||item.protein) {
+    macros='<div class="macros-row" style="margin-bottom:2px;">';
+    if(item.cal)     macros+=`<span class="macro-chip cal">${Math.round(item.cal)} cal</span>`;
+    if(item.protein) macros+=`<span class="macro-chip pro">${Math.round(item.protein)}g protein</span>`;
+    macros+='</div>';
+  }
+  const desc=item.description?`<div class="meal-desc">${item.description}</div>`:'';
+  const j=JSON.stringify(item).replace(/"/g,'&quot;');
+  const hasInfo=item.description||item.cal||item.protein||item.carbs||item.fat||item.tags;
+  return `<div class="meal-card${hasInfo?' has-info':''}" id="mcard-${weekIndex}-${id}"${hasInfo?` onclick="openInfoModal(${j})"`:''}>
+    <div class="meal-img-wrap">
+      <img class="meal-img" src="${item.image||''}" referrerpolicy="no-referrer" onerror="this.parentElement.innerHTML='<div class=meal-img-placeholder>🍽️</div>'">
+      <span class="diet-badge ${isVeg?'diet-badge-veg':'diet-badge-meat'}">${isVeg?'Plant-Based':'Meat'}</span>
+    </div>
+    <div class="meal-body">
+      <div class="meal-name">${item.name}</div>
+      ${desc}${macros}
+      <div class="meal-footer"><div id="ctrl-${weekIndex}-${id}">
+        <button class="btn-add" onclick="event.stopPropagation();addMeal('${id}',${weekIndex},${j})">+ Add to order</button>
+      </div></div>
+    </div>
+  </div>`;
+}
+
+function openInfoModal(item) {
+  const isVeg=item.diet==='veg'||item.diet==='vegan';
+  let macros='';
+  if(item.cal||item.protein||item.carbs||item.fat){
+    if(item.cal)     macros+=`<span class="macro-chip cal">${Math.round(item.cal)} cal</span>`;
+    if(item.protein) macros+=`<span class="macro-chip pro">${Math.round(item.protein)}g protein</span>`;
+    if(item.carbs)   macros+=`<span class="macro-chip carb">${Math.round(item.carbs)}g carb</span>`;
+    if(item.fat)     macros+=`<span class="macro-chip fat">${Math.round(item.fat)}g fat</span>`;
+  }
+  let tags='';
+  if(item.tags){const tl=item.tags.toString().split(',').map(t=>t.trim()).filter(Boolean);if(tl.length)tags=`<div class="info-modal-tags-label">Tags</div><div class="info-modal-tags">`+tl.map(t=>`<span class="info-modal-tag">${t}</span>`).join('')+`</div>`;}
+  const el=document.createElement('div'); el.id='infoModalOverlay'; el.className='info-modal-overlay';
+  el.innerHTML=`<div class="info-modal-backdrop" onclick="closeInfoModal()"></div>
+    <div class="info-modal-card">
+      <button class="info-modal-close" onclick="closeInfoModal()">×</button>
+      ${item.image?`<img class="info-modal-img" src="${item.image}" referrerpolicy="no-referrer" onerror="this.outerHTML='<div class=info-modal-img-placeholder>🍽️</div>'">`:`<div class="info-modal-img-placeholder">🍽️</div>`}
+      <div class="info-modal-body">
+        <div class="info-modal-diet ${isVeg?'info-modal-diet-veg':'info-modal-diet-meat'}">${isVeg?'🌱 Plant-Based':'🥩 Meat'}</div>
+        <div class="info-modal-name">${item.name}</div>
+        ${item.description?`<div class="info-modal-desc">${item.description}</div>`:''}
+        ${macros?`<div class="info-modal-macros">${macros}</div>`:''}
+        ${tags}
+      </div>
+    </div>`;
+  document.getElementById('infoModalOverlay')?.remove();
+  document.body.appendChild(el);
+}
+function filterCategory(cat) {
+  const meatWrap = document.getElementById('sec-meat-wrap');
+  const vegWrap  = document.getElementById('sec-veg-wrap');
+  if (meatWrap) meatWrap.style.display = cat === 'meat' ? '' : 'none';
+  if (vegWrap)  vegWrap.style.display  = cat === 'veg'  ? '' : 'none';
+  document.getElementById('catBtnMeat')?.classList.toggle('active', cat === 'meat');
+  document.getElementById('catBtnVeg')?.classList.toggle('active',  cat === 'veg');
+  document.querySelector('.menu-scroll')?.scrollTo({ top: 0, behavior: 'smooth' });
+}
+function closeInfoModal() { document.getElementById('infoModalOverlay')?.remove(); }
+
+// ══════════════════════════════════════════
+// TIER PRICING
+// ══════════════════════════════════════════
+function getTierForPosition(weekIndex, pos) {
+  const c=currentCompany; if(!c) return null;
+  const free=parseInt(c.FreeMealsPerWeek)||0, t1=parseInt(c.Tier1_Meals)||0, t2=parseInt(c.Tier2_Meals)||0, t3=parseInt(c.Tier3_Meals)||0;
+  if(pos<free)          return {tier:'free', price:0};
+  if(pos<free+t1)       return {tier:'tier1',price:parseFloat(c.Tier1_EmployeePrice)||0};
+  if(pos<free+t1+t2)    return {tier:'tier2',price:parseFloat(c.Tier2_EmployeePrice)||0};
+  if(pos<free+t1+t2+t3) return {tier:'tier3',price:parseFloat(c.Tier3_EmployeePrice)||0};
+  if(c.AllowExtraAtFullPrice==='TRUE'||c.AllowExtraAtFullPrice===true) return {tier:'full',price:parseFloat(c.FullPrice)||16.99};
+  return null;
+}
+function getTierForNextItem(wi) {
+  const anchor = weeks[wi]?.sundayAnchor || '';
+  const already = existingOrderCounts[anchor] || 0;
+  return getTierForPosition(wi, already + cart.filter(i=>i.weekIndex===wi).length);
+}
+function recomputeTiers(wi) {
+  const anchor=weeks[wi]?.sundayAnchor||'';
+  const offset=existingOrderCounts[anchor]||0;
+  cart.filter(i=>i.weekIndex===wi).forEach((item,idx)=>{const t=getTierForPosition(wi,offset+idx);if(t){item.tier=t.tier;item.price=t.price;}});
+}
+function getNextPriceLabel(wi) { const t=getTierForNextItem(wi); if(!t) return 'Max'; return t.tier==='free'?'FREE 🎉':'$'+t.price.toFixed(2); }
+// Returns {co, bd} subsidy split for a cart item using per-tier company columns.
+// Falls back to full remainder → company if columns not yet populated.
+function getCoverage(item) {
+  const c=currentCompany, fp=parseFloat(c.FullPrice)||16.99;
+  const pfx = item.tier==='free'?'FreeTier':item.tier==='tier1'?'Tier1':item.tier==='tier2'?'Tier2':item.tier==='tier3'?'Tier3':null;
+  if (pfx) {
+    const co=parseFloat(c[pfx+'_CompanySubsidy']), bd=parseFloat(c[pfx+'_BDSubsidy']);
+    if (!isNaN(co) && !isNaN(bd)) return {co, bd};
+  }
+  return {co: fp-item.price, bd: 0};
+}
+
+// ══════════════════════════════════════════
+// TOAST
+// ══════════════════════════════════════════
+let _toastTimer;
+function showToast(msg, variant) {
+  const el = document.getElementById('toast');
+  el.textContent = msg;
+  el.classList.remove('toast--warn');
+  if (variant) el.classList.add('toast--' + variant);
+  el.classList.add('show');
+  clearTimeout(_toastTimer);
+  _toastTimer = setTimeout(() => el.classList.remove('show'), 2800);
+}
+
+// ══════════════════════════════════════════
+// CART
+// ══════════════════════════════════════════
+function addMeal(id, wi, meal) {
+  const t=getTierForNextItem(wi); if(!t){showToast('Maximum meals reached for this week', 'warn');return;}
+  cart.push({mealId:id,meal,price:t.price,tier:t.tier,weekIndex:wi});
+  renderMealControl(id,cart.filter(i=>i.mealId===id&&i.weekIndex===wi).length,wi);
+  renderCart(); document.getElementById('nextMealPrice').textContent=getNextPriceLabel(activeWeekIndex);
+}
+function removeMeal(id, wi) {
+  let idx=-1; for(let i=cart.length-1;i>=0;i--){if(cart[i].mealId===id&&cart[i].weekIndex===wi){idx=i;break;}}
+  if(idx<0)return; cart.splice(idx,1); recomputeTiers(wi);
+  renderMealControl(id,cart.filter(i=>i.mealId===id&&i.weekIndex===wi).length,wi);
+  renderCart(); document.getElementById('nextMealPrice').textContent=getNextPriceLabel(activeWeekIndex);
+}
+function findMealInCache(id, wi) {
+  const m=menuCache[weeks[wi]?.sundayAnchor]; if(!m) return {id,name:'',image:''};
+  return [...(m.meat||[]),...(m.vegan||[])].find(x=>String(x.id)===String(id))||{id,name:'',image:''};
+}
+function renderMealControl(id, qty, wi) {
+  const wrap=document.getElementById(`ctrl-${wi}-${id}`); if(!wrap)return;
+  const m=findMealInCache(id,wi), j=JSON.stringify(m).replace(/"/g,'&quot;');
+  wrap.innerHTML=qty===0
+    ?`<button class="btn-add" onclick="event.stopPropagation();addMeal('${id}',${wi},${j})">+ Add to order</button>`
+    :`<div class="qty-pill" onclick="event.stopPropagation()"><button class="qty-btn" onclick="removeMeal('${id}',${wi})">−</button><span class="qty-val">${qty}</span><button class="qty-btn" onclick="addMeal('${id}',${wi},${j})">+</button></div>`;
+}
+function clearCart() { cart=[]; renderWeek(activeWeekIndex); renderCart(); }
+function buildCartItemRows(ic, tc, nc, mc, pc) {
+  // ic=itemClass tc=thumbClass nc=nameClass mc=metaClass pc=priceClass
+  // Group by week first, then by meal within each week
+  const byWeek={};
+  cart.forEach(item=>{
+    if(!byWeek[item.weekIndex]) byWeek[item.weekIndex]={};
+    const k=item.mealId;
+    if(!byWeek[item.weekIndex][k]) byWeek[item.weekIndex][k]={meal:item.meal,entries:[]};
+    byWeek[item.weekIndex][k].entries.push(item);
+  });
+  const weekIndices=Object.keys(byWeek).map(Number).sort((a,b)=>a-b);
+  const multiWeek=weekIndices.length>1;
+  return weekIndices.map(wi=>{
+    const header=multiWeek?`<div class="cart-week-header">${weeks[wi]?.deliveryShort||'Week'} Delivery</div>`:'';
+    const rows=Object.values(byWeek[wi]).map(({meal,entries})=>{
+      const lt=entries.reduce((s,e)=>s+e.price,0);
+      const priceHtml=lt===0?`<span style="color:var(--green);font-weight:800">FREE</span>`:'$'+lt.toFixed(2);
+      const meta=entries.length+'× '+entries.map(e=>e.tier==='free'?'FREE':'$'+e.price.toFixed(2)).join('+');
+      return `<div class="${ic}"><div class="${tc}"><img src="${meal?.image||''}" referrerpolicy="no-referrer" onerror="this.style.display='none'"></div><div style="flex:1;min-width:0"><div class="${nc}">${meal?.name||'Meal'}</div><div class="${mc}">${meta}</div></div><div class="${pc}">${priceHtml}</div></div>`;
+    }).join('');
+    return header+rows;
+  }).join('');
+}
+function renderMobSheet() {
+  const total=cart.reduce((s,i)=>s+i.price,0), n=cart.length;
+  const fp=parseFloat(currentCompany?.FullPrice)||16.99;
+  const savings=cart.reduce((s,i)=>s+(i.tier!=='full'?fp-i.price:0),0);
+  const delivStr=(weeks[activeWeekIndex]?.deliveryStr||'')+(currentCompany?.FridgeLocationDescription||currentCompany?.AddressLine1?' · '+(currentCompany.FridgeLocationDescription||currentCompany.AddressLine1):'');
+  document.getElementById('mcsDelivery').textContent=delivStr;
+  document.getElementById('mcsItems').innerHTML=n>0?buildCartItemRows('mcs-item-row','mcs-thumb','mcs-item-name','mcs-item-meta','mcs-item-price'):'<div style="text-align:center;color:#b0c4cc;padding:16px;font-size:.82rem;">No meals added yet</div>';
+  const sub=document.getElementById('mcsSubtotals');
+  sub.style.display=savings>0?'':'none';
+  sub.innerHTML=`<div class="mcs-subtotal-row"><span>Full retail (${n} meal${n!==1?'s':''})</span><span>$${(n*fp).toFixed(2)}</span></div>`+(savings>0?`<div class="mcs-subtotal-row mcs-savings-row"><span>${currentCompany.CompanyName} contribution</span><span>–$${savings.toFixed(2)}</span></div>`:'');
+  document.getElementById('mcsTotal').textContent='$'+total.toFixed(2);
+}
+let _mobCartOpen=false;
+function toggleMobCart(){
+  _mobCartOpen=!_mobCartOpen;
+  document.getElementById('mobCartSheet').style.display=_mobCartOpen?'':'none';
+  document.getElementById('mobCartChevron').classList.toggle('open',_mobCartOpen);
+  const hint=document.getElementById('mobCartHint');
+  if(hint){ const n=cart.length; hint.textContent=_mobCartOpen?'Tap to close':(n>0?'Tap to review order':'Tap to expand'); }
+  if(_mobCartOpen) renderMobSheet();
+}
+function closeMobCart(){
+  _mobCartOpen=false;
+  document.getElementById('mobCartSheet').style.display='none';
+  document.getElementById('mobCartChevron').classList.remove('open');
+  const hint=document.getElementById('mobCartHint');
+  if(hint){ const n=cart.length; hint.textContent=n>0?'Tap to review order':'Tap to expand'; }
+}
+function renderCart() {
+  const total=cart.reduce((s,i)=>s+i.price,0), n=cart.length;
+  const fp=parseFloat(currentCompany?.FullPrice)||16.99;
+  const savings=cart.reduce((s,i)=>s+(i.tier!=='full'?fp-i.price:0),0);
+  // ── Desktop side cart ──
+  document.getElementById('scDelivery').textContent=weeks[activeWeekIndex]?.deliveryStr||'';
+  if(n===0){
+    document.getElementById('scItems').innerHTML='<div class="sc-empty-msg">Add meals to get started</div>';
+    document.getElementById('scFooter').style.display='none';
+  } else {
+    document.getElementById('scItems').innerHTML=buildCartItemRows('sc-item-row','sc-thumb','sc-item-name','sc-item-meta','sc-item-price');
+    document.getElementById('scSubtotals').innerHTML=`<div class="sc-subtotal-row"><span>Full retail (${n} meal${n!==1?'s':''})</span><span>$${(n*fp).toFixed(2)}</span></div>`+(savings>0?`<div class="sc-subtotal-row sc-savings-row"><span>${currentCompany.CompanyName} savings</span><span>–$${savings.toFixed(2)}</span></div>`:'');
+    document.getElementById('scTotal').textContent='$'+total.toFixed(2);
+    document.getElementById('scFooter').style.display='';
+  }
+  // ── Mobile bar ──
+  document.getElementById('mobCartBadge').textContent=n;
+  document.getElementById('mobCartTotalLabel').textContent='$'+total.toFixed(2);
+  const hint=document.getElementById('mobCartHint');
+  if(hint) hint.textContent=_mobCartOpen?'Tap to close':(n>0?'Tap to review order':'Tap to expand');
+  if(_mobCartOpen) renderMobSheet();
+  // ── Next-meal chip ──
+  document.getElementById('nextMealPrice').textContent=getNextPriceLabel(activeWeekIndex);
+}
+
+// ══════════════════════════════════════════
+// ORDER SUMMARY MODAL
+// ══════════════════════════════════════════
+function openSummary() {
+  if(!cart.length)return;
+  closeMobCart();
+  const c=currentCompany, fp=parseFloat(c.FullPrice)||16.99;
+  const byWeek={}; cart.forEach(i=>{if(!byWeek[i.weekIndex])byWeek[i.weekIndex]=[];byWeek[i.weekIndex].push(i);});
+  const total=cart.reduce((s,i)=>s+i.price,0), fv=cart.length*fp, savings=fv-total;
+  document.getElementById('modalDelivery').textContent=Object.keys(byWeek).map(wi=>weeks[wi]?.deliveryStr||'').join(', ')+' · '+(c.FridgeLocationDescription||c.AddressLine1||'');
+  let rows='';
+  Object.entries(byWeek).forEach(([wi,items])=>{
+    if(Object.keys(byWeek).length>1) rows+=`<div style="font-size:.7rem;font-weight:800;text-transform:uppercase;color:var(--primary);padding:8px 0 4px;">${weeks[wi]?.deliveryShort} delivery</div>`;
+    const g={}; items.forEach(i=>{if(!g[i.mealId])g[i.mealId]={meal:i.meal,entries:[]};g[i.mealId].entries.push(i);});
+    Object.values(g).forEach(({meal,entries})=>{
+      const lt=entries.reduce((s,e)=>s+e.price,0), tl=entries.map(e=>e.tier==='free'?'FREE':'$'+e.price.toFixed(2)).join(' + ');
+      rows+=`<div class="modal-row"><div class="modal-thumb"><img src="${meal.image||''}" referrerpolicy="no-referrer" style="width:100%;height:100%;object-fit:cover;" onerror="this.style.display='none'"></div><div><div class="modal-meal-name">${meal.name||'Meal'}</div><div class="modal-meal-qty">${entries.length}× ${tl}</div></div><div class="modal-meal-price">${lt===0?'<span style="color:var(--green);font-weight:800">FREE</span>':'$'+lt.toFixed(2)}</div></div>`;
+    });
+  });
+  document.getElementById('modalRows').innerHTML=rows;
+  document.getElementById('modalSubtotals').innerHTML=`<div class="modal-subtotal-row"><span style="color:#50657a">Full retail value (${cart.length} meals)</span><span style="font-weight:700">$${fv.toFixed(2)}</span></div>${savings>0?`<div class="modal-subtotal-row"><span style="color:var(--green)">${c.CompanyName} savings</span><span style="font-weight:700;color:var(--green)">–$${savings.toFixed(2)}</span></div>`:''}`;
+  document.getElementById('modalTotal').textContent='$'+total.toFixed(2);
+  const fc=cart.filter(i=>i.tier==='free').length, t1c=cart.filter(i=>i.tier==='tier1').length, t2c=cart.filter(i=>i.tier==='tier2').length, t3c=cart.filter(i=>i.tier==='tier3').length;
+  const bel=document.getElementById('modalBenefit');
+  if(savings>0){
+    let br='';
+    if(fc)  br+=`<div class="benefit-row"><span>${fc} complimentary meal${fc>1?'s':''}</span><span style="color:var(--green);font-weight:700">–$${(fc*fp).toFixed(2)}</span></div>`;
+    if(t1c) br+=`<div class="benefit-row"><span>Tier 1 subsidy (${t1c})</span><span style="color:var(--green);font-weight:700">–$${(t1c*(fp-parseFloat(c.Tier1_EmployeePrice||0))).toFixed(2)}</span></div>`;
+    if(t2c) br+=`<div class="benefit-row"><span>Tier 2 subsidy (${t2c})</span><span style="color:var(--green);font-weight:700">–$${(t2c*(fp-parseFloat(c.Tier2_EmployeePrice||0))).toFixed(2)}</span></div>`;
+    if(t3c) br+=`<div class="benefit-row"><span>Tier 3 subsidy (${t3c})</span><span style="color:var(--green);font-weight:700">–$${(t3c*(fp-parseFloat(c.Tier3_EmployeePrice||0))).toFixed(2)}</span></div>`;
+    document.getElementById('benefitRows').innerHTML=br; bel.style.display='block';
+  } else { bel.style.display='none'; }
+  document.getElementById('summaryModal').classList.remove('hidden');
+}
+function closeSummary() { document.getElementById('summaryModal').classList.add('hidden'); }
+
+let _checkoutInProgress = false;
+
+// One Idempotency-Key per cart: a retry after a lost response resends the
+// same key, so the server drops the copy. A changed cart gets a new key;
+// so does the next cart once one has been accepted.
+let _cartKey = null;   // {body, key}
+function _cartSubmissionKey(body) {
+  if (!_cartKey || _cartKey.body !== body) {
+    const key = (window.crypto && crypto.randomUUID) ? crypto.randomUUID()
+              : Date.now().toString(36) + Math.random().toString(36).slice(2);
+    _cartKey = { body, key };
+  }
+  return _cartKey.key;
+}
+async function doCheckout() {
+  if (_checkoutInProgress) return;
+  _checkoutInProgress = true;
+  const btn = document.getElementById('payBtn');
+  if (btn) { btn.disabled = true; btn.textContent = 'Placing order…'; }
+  const total = cart.reduce((s,i) => s+i.price, 0);
+  if (total > 0) {
+    closeSummary();
+    openPaymentModal(total);
+    return; // payment modal calls _executeCheckout() on confirm
+  }
+  await _executeCheckout();
+}
+
+function openPaymentModal(total) {
+  const c = currentCompany, emp = currentEmployee;
+  const deliveries = [...new Set(cart.map(i => weeks[i.weekIndex]?.deliveryShort))].join(', ');
+  document.getElementById('paySimAmount').textContent = '$' + total.toFixed(2);
+  document.getElementById('paySimDesc').textContent = cart.length + ' meal' + (cart.length !== 1 ? 's' : '') + ' · Delivery ' + deliveries;
+  document.getElementById('paySimBtn').textContent = 'Pay $' + total.toFixed(2);
+  document.getElementById('paySimBtn').disabled = false;
+  document.getElementById('paySimName').value = emp ? `${emp.firstName} ${emp.lastName}` : '';
+  document.getElementById('paySimProcessing').classList.add('hidden');
+  document.getElementById('paymentModal').classList.remove('hidden');
+}
+
+function closePaymentModal() {
+  document.getElementById('paymentModal').classList.add('hidden');
+  _checkoutInProgress = false;
+  const btn = document.getElementById('payBtn');
+  if (btn) { btn.disabled = false; btn.textContent = 'Place Order'; }
+  document.getElementById('summaryModal').classList.remove('hidden');
+}
+
+async function submitPayment() {
+  const btn = document.getElementById('paySimBtn');
+  btn.disabled = true;
+  document.getElementById('paySimProcessing').classList.remove('hidden');
+  await new Promise(r => setTimeout(r, 1800));
+  document.getElementById('paymentModal').classList.add('hidden');
+  await _executeCheckout();
+}
+
+async function _executeCheckout() {
+  document.getElementById('checkoutOverlay').classList.remove('hidden');
+
+  const c=currentCompany, emp=currentEmployee;
+  const total=cart.reduce((s,i)=>s+i.price,0), fp=parseFloat(c.FullPrice)||16.99, savings=cart.length*fp-total;
+  const cartSnapshot = [...cart];
+
+  // One cart submission: the server reserves the OrderID per delivery week
+  // and records every meal together. The key lets it drop a resent copy.
+  const lines = cartSnapshot.map(item => {
+    const w = weeks[item.weekIndex];
+    return {
+      sunday_anchor:w.sundayAnchor, delivery_date:toYMD(w.deliveryDate),
+      meal_id:item.mealId, dish_name:item.meal?.name||'',
+      diet_type:item.meal?.diet||'', tier:item.tier, employee_price:item.price,
+      company_coverage:getCoverage(item).co.toFixed(2), bd_coverage:getCoverage(item).bd.toFixed(2)
+    };
+  });
+  const body = JSON.stringify({
+    company_id:c.CompanyID, company_name:c.CompanyName,
+    employee_name:`${emp.firstName} ${emp.lastName}`, employee_email:emp.email, lines
+  });
+  try {
+    const r = await fetch('/work/cart', {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json', 'Idempotency-Key': _cartSubmissionKey(body) },
+      body
+    });
+    const res = await r.json();
+    if (r.status !== 202) {
+      // The cart is accepted whole or not at all — say which meal failed
+      const i = (res.lines || []).findIndex(l => !l.ok);
+      const what = i >= 0 ? `${cartSnapshot[i]?.meal?.name || 'A meal'}: ${res.lines[i].error}` : res.message;
+      return _checkoutFailed(`Order not placed — ${what || 'please try again'}`);
+    }
+    _cartKey = null;
+  } catch(e) {
+    console.error('Checkout error:', e);
+    return _checkoutFailed('Order not placed — please check your connection and try again');
+  }
+
+  document.getElementById('checkoutOverlay').classList.add('hidden');
+  _checkoutInProgress = false;
+
+  const byWeek={}; cartSnapshot.forEach(i=>{if(!byWeek[i.weekIndex])byWeek[i.weekIndex]=[];byWeek[i.weekIndex].push(i);});
+  let dh=`<div class="thankyou-row"><span>Name</span><span>${emp.firstName} ${emp.lastName}</span></div>`;
+  Object.entries(byWeek).forEach(([wi,items])=>{
+    const w=weeks[wi];
+    dh+=`<div class="thankyou-row"><span>Delivery</span><span>${w?.deliveryStr||''}</span></div>`;
+    dh+=`<div class="thankyou-row"><span>Location</span><span>${c.FridgeLocationDescription||c.AddressLine1||''}</span></div>`;
+    const mg={}; items.forEach(i=>{const n=i.meal?.name||'Meal';mg[n]=(mg[n]||0)+1;});
+    const mealLine=Object.entries(mg).map(([n,q])=>q>1?`${n} ×${q}`:n).join(' &nbsp;|&nbsp; ');
+    dh+=`<div class="thankyou-row"><span>Meals (${items.length})</span><span style="text-align:right;line-height:1.5;">${mealLine}</span></div>`;
+  });
+  dh+=`<div class="thankyou-row" style="border-top:1px solid #e8edf2;margin-top:6px;padding-top:8px;"><span style="font-weight:800">${c.CompanyName} covered</span><span style="font-weight:800;color:var(--green)">–$${savings.toFixed(2)}</span></div><div class="thankyou-row"><span style="font-weight:800">You paid</span><span style="font-weight:800">${total>0?'$'+total.toFixed(2):'Nothing 🎉'}</span></div>`;
+  document.getElementById('tyDetail').innerHTML=dh;
+  cartSnapshot.forEach(i => {
+    const anchor = weeks[i.weekIndex]?.sundayAnchor;
+    if (anchor) existingOrderCounts[anchor] = (existingOrderCounts[anchor] || 0) + 1;
+  });
+  cart=[]; goTo('sThankYou');
+}
+
+function _checkoutFailed(msg) {
+  document.getElementById('checkoutOverlay').classList.add('hidden');
+  _checkoutInProgress = false;
+  const btn = document.getElementById('payBtn');
+  if (btn) { btn.disabled = false; btn.textContent = 'Place Order'; }
+  openSummary();
+  showToast(msg, 'warn');
+}
+
+function goBackToMenu() { computeWeeks(); setupMenu(); goTo('sMenu'); }
+
+// ── PROFILE ──
+async function openProfile() {
+  const emp = currentEmployee, c = currentCompany;
+  if (!emp) return;
+  const initials = ((emp.firstName[0]||'')+(emp.lastName[0]||'')).toUpperCase();
+  document.getElementById('profileAvatarLg').textContent = initials;
+  document.getElementById('profileNameLg').textContent   = emp.firstName + ' ' + emp.lastName;
+  document.getElementById('profileEmailLg').textContent  = emp.email;
+  document.getElementById('profileCompanyChip').textContent = c?.CompanyName || '';
+  const sess = loadSession();
+  if (sess && sess.savedAt) {
+    const daysLeft = Math.max(0, 30 - Math.floor((Date.now() - sess.savedAt) / 86400000));
+    document.getElementById('profileSessionDesc').textContent =
+      `You're signed in on this device. Session expires in ${daysLeft} day${daysLeft!==1?'s':''} — no password or link needed until then.`;
+  }
+  goTo('sProfile');
+  const list = document.getElementById('profileOrdersList');
+  list.innerHTML = '<div class="spinner-wrap"><div class="spinner"></div><div class="spinner-label">Loading your orders…</div></div>';
+  try {
+    const rows = await apiFetch({ action: 'get_orders_by_employee', email: emp.email });
+    if (!Array.isArray(rows) || !rows.length) {
+      list.innerHTML = '<div class="profile-empty"><div class="profile-empty-icon">🍽️</div><div>No orders yet — your history will appear here after your first delivery</div></div>';
+      return;
+    }
+    list.innerHTML = renderOrderHistory(rows, c);
+  } catch(e) {
+    list.innerHTML = '<div class="profile-empty"><div class="profile-empty-icon">😕</div><div>Couldn\'t load orders — try again later</div></div>';
+  }
+}
+
+function parsePrice(v) { return (p => (isNaN(p)||p<0)?0:p)(parseFloat(String(v??'').replace(/[^0-9.-]/g,''))); }
+function fmtDate(d) { const dt=new Date(d+'T12:00:00'); return isNaN(dt)?d:dt.toLocaleDateString('en-CA',{weekday:'short',month:'short',day:'numeric',year:'numeric'}); }
+function isSwappable(sundayAnchor) { return sundayAnchor && new Date() < getCutoff(new Date(sundayAnchor+'T12:00:00')); }
+function getMealImage(mealId, sundayAnchor) {
+  const cache = menuCache[sundayAnchor];
+  if (!cache) return '';
+  const all = [...(cache.meat||[]), ...(cache.vegan||[])];
+  const m = all.find(x => String(x.id) === String(mealId));
+  return m?.image || '';
+}
+
+let _ordersAllKeys = [], _ordersGroups = {}, _ordersPage = 0;
+const ORDERS_PER_PAGE = 10;
+
+function renderOrderHistory(rows, company) {
+  // Group by OrderID (new orders). Fall back to SundayAnchor for legacy rows without OrderID.
+  const groups = {};
+  rows.forEach(o => {
+    const key = o.OrderID ? String(o.OrderID) : ('legacy-' + (o.SundayAnchor || o.DeliveryDate || 'unknown'));
+    if (!groups[key]) groups[key] = [];
+    groups[key].push(o);
+  });
+  // Sort groups: most recent delivery first
+  const sortedKeys = Object.keys(groups).sort((a, b) => {
+    const da = groups[a][0].DeliveryDate || '';
+    const db = groups[b][0].DeliveryDate || '';
+    return db.localeCompare(da);
+  });
+  _ordersGroups = groups;
+  _ordersAllKeys = sortedKeys;
+  _ordersPage = 0;
+  return renderOrdersPage(company);
+}
+
+function renderOrderCard(key, company) {
+  const meals = _ordersGroups[key];
+  const first = meals[0];
+  const hasOrderId = !!first.OrderID;
+  const totalPaid = meals.reduce((s, o) => s + parsePrice(o.EmployeePrice), 0);
+  const fp = parseFloat(company?.FullPrice) || 16.99;
+  const totalSaved = meals.length * fp - totalPaid;
+  const anchor = first.SundayAnchor || '';
+  const swappable = hasOrderId && isSwappable(anchor);
+  const cutoff = anchor ? getCutoff(new Date(anchor+'T12:00:00')) : null;
+  const paidStr = totalPaid === 0
+    ? `<span style="color:var(--green);font-weight:900">FREE</span>`
+    : `$${totalPaid.toFixed(2)}`;
+  const savedStr = totalSaved > 0 ? ` · saved $${totalSaved.toFixed(2)}` : '';
+  const statusBadge = (hasOrderId && swappable)
+    ? `<span class="order-status-badge order-status-open">Open</span>`
+    : '';
+  const swapBtn = hasOrderId && swappable
+    ? `<button class="order-btn-icon order-btn-swap" onclick="openSwapModal('${key}')">Swap</button>`
+    : '';
+  _orderCache[key] = { meals, anchor, cutoff };
+  return `<div class="order-card">
+    <div class="order-card-info">
+      <div class="order-delivery-date">${fmtDate(first.DeliveryDate)}</div>
+      <div class="order-meta">${meals.length} meal${meals.length!==1?'s':''} · ${first.CompanyName||''}</div>
+    </div>
+    <div class="order-card-right">
+      <div class="order-price-block">
+        <div class="order-paid-amt">${paidStr}</div>
+        ${savedStr?`<div class="order-saved-line">${savedStr}</div>`:''}
+      </div>
+      ${statusBadge}
+      <button class="order-btn-icon order-btn-view" onclick="openOrderInvoice('${key}')">View</button>
+      ${swapBtn}
+    </div>
+  </div>`;
+}
+
+function renderOrdersPage(company) {
+  const total = _ordersAllKeys.length;
+  const start = _ordersPage * ORDERS_PER_PAGE;
+  const end = Math.min(start + ORDERS_PER_PAGE, total);
+  const cardsHtml = _ordersAllKeys.slice(start, end).map(k => renderOrderCard(k, company)).join('');
+  const paginationHtml = total > ORDERS_PER_PAGE
+    ? `<div class="orders-pagination">
+        <button class="pg-btn" onclick="changeOrdersPage(-1)" ${_ordersPage===0?'disabled':''}>← Prev 10</button>
+        <span class="pg-info">${start+1}–${end} of ${total}</span>
+        <button class="pg-btn" onclick="changeOrdersPage(1)" ${end>=total?'disabled':''}>Next 10 →</button>
+      </div>`
+    : '';
+  return cardsHtml + paginationHtml;
+}
+
+function changeOrdersPage(dir) {
+  const maxPage = Math.ceil(_ordersAllKeys.length / ORDERS_PER_PAGE) - 1;
+  _ordersPage = Math.max(0, Math.min(_ordersPage + dir, maxPage));
+  const list = document.getElementById('profileOrdersList');
+  list.innerHTML = renderOrdersPage(currentCompany);
+  list.scrollIntoView({ behavior: 'smooth', block: 'start' });
+}
+
+// ── ORDER INVOICE MODAL ──
+let _orderCache = {}; // populated by renderOrderHistory
+function openOrderInvoice(key) {
+  const data = _orderCache[key]; if (!data) return;
+  const { meals } = data;
+  const first = meals[0];
+  const tierLabel = {free:'Complimentary',tier1:'Tier 1',tier2:'Tier 2',tier3:'Tier 3',full:'Full price'};
+  const fp = parseFloat(currentCompany?.FullPrice) || 16.99;
+  const totalPaid = meals.reduce((s,o) => s + parsePrice(o.EmployeePrice), 0);
+  const totalSaved = meals.length * fp - totalPaid;
+  let rows = meals.map(o => {
+    const price = parsePrice(o.EmployeePrice);
+    const mealIdStr = String(o.MealID||'');
+    const dishName = (o.DishName && !o.DishName.startsWith('#') && !o.DishName.includes('@'))
+      ? o.DishName
+      : (/^\d+$/.test(mealIdStr) ? 'Meal #' + mealIdStr : 'Legacy meal');
+    const priceStr = price === 0
+      ? `<span style="color:var(--green);font-weight:800">FREE</span>`
+      : `$${price.toFixed(2)}`;
+    return `<div class="invoice-row">
+      <span class="invoice-meal-name">${dishName}<br><span style="font-size:.7rem;color:#9aabb8;">${tierLabel[o.Tier]||'Full price'}</span></span>
+      <span class="invoice-meal-price">${priceStr}</span>
+    </div>`;
+  }).join('');
+  let totals = `<div class="invoice-totals">`;
+  if (totalSaved > 0) totals += `<div class="invoice-total-row"><span>${first.CompanyName||'Company'} covered</span><span style="color:var(--green);">–$${totalSaved.toFixed(2)}</span></div>`;
+  totals += `<div class="invoice-total-row bold"><span>You paid</span><span>${totalPaid===0?'Nothing 🎉':'$'+totalPaid.toFixed(2)}</span></div></div>`;
+  const location = currentCompany?.FridgeLocationDescription || currentCompany?.AddressLine1 || '';
+  const locationHtml = location ? `<div class="invoice-location">📦 Delivery: ${fmtDate(first.DeliveryDate)}<br>${location?`📍 ${location}`:''}</div>` : `<div class="invoice-location">📦 Delivery: ${fmtDate(first.DeliveryDate)}</div>`;
+  document.getElementById('invoiceTitle').textContent = first.OrderID ? `Order #${first.OrderID}` : 'Order Details';
+  document.getElementById('invoiceDelivery').textContent = `${meals.length} meal${meals.length!==1?'s':''} · ${first.CompanyName||''}`;
+  document.getElementById('invoiceBody').innerHTML = rows + totals + locationHtml;
+  document.getElementById('orderInvoiceModal').classList.remove('hidden');
+}
+function closeOrderInvoice() { document.getElementById('orderInvoiceModal').classList.add('hidden'); }
+
+// ── SWAP MEALS MODAL ──
+let _swapKey = null;
+function openSwapModal(key) {
+  const data = _orderCache[key]; if (!data) return;
+  _swapKey = key;
+  const { meals, anchor, cutoff } = data;
+  const first = meals[0];
+  document.getElementById('swapTitle').textContent = `Swap Meals — Order #${key}`;
+  document.getElementById('swapDelivery').textContent = fmtDate(first.DeliveryDate);
+  if (cutoff) {
+    document.getElementById('swapCutoffNote').textContent =
+      `Deadline: ${cutoff.toLocaleDateString('en-CA',{weekday:'long',month:'short',day:'numeric'})} at 11:59 PM`;
+  }
+  renderSwapBody(meals, anchor);
+  document.getElementById('swapModal').classList.remove('hidden');
+}
+function renderSwapBody(meals, anchor) {
+  const tierLabel = {free:'Complimentary',tier1:'Tier 1',tier2:'Tier 2',tier3:'Tier 3',full:'Full price'};
+  document.getElementById('swapBody').innerHTML = meals.map((o, idx) => {
+    const mealIdStr = String(o.MealID||'');
+    const dishName = (o.DishName && !o.DishName.startsWith('#') && !o.DishName.includes('@'))
+      ? o.DishName
+      : (/^\d+$/.test(mealIdStr) ? 'Meal #' + mealIdStr : 'Legacy meal');
+    const price = parsePrice(o.EmployeePrice);
+    const priceStr = price === 0 ? 'FREE' : `$${price.toFixed(2)}`;
+    const img = getMealImage(o.MealID, anchor);
+    return `<div class="swap-meal-row" id="swap-row-${idx}">
+      <div class="swap-thumb"><img src="${img}" referrerpolicy="no-referrer" onerror="this.style.display='none'"></div>
+      <div>
+        <div class="swap-meal-name">${dishName}</div>
+        <div class="swap-meal-sub">${priceStr} · ${tierLabel[o.Tier]||'Full price'}</div>
+      </div>
+      <button class="swap-change-btn" id="swap-btn-${idx}" onclick="openMealPicker(${idx})">Change</button>
+    </div>`;
+  }).join('');
+}
+function closeSwapModal() { document.getElementById('swapModal').classList.add('hidden'); _swapKey = null; }
+
+// ── MEAL PICKER ──
+let _pickerSlotIdx = null;
+async function openMealPicker(slotIdx) {
+  if (!_swapKey) return;
+  const data = _orderCache[_swapKey]; if (!data) return;
+  const { meals, anchor } = data;
+  _pickerSlotIdx = slotIdx;
+  const currentMealId = String(meals[slotIdx].MealID);
+  document.getElementById('pickerSub').textContent = `Replacing: ${meals[slotIdx].DishName || 'Meal #'+meals[slotIdx].MealID}`;
+  document.getElementById('pickerBody').innerHTML = '<div class="spinner-wrap"><div class="spinner"></div><div class="spinner-label">Loading menu…</div></div>';
+  document.getElementById('mealPickerOverlay').classList.remove('hidden');
+  // Fetch menu if not already cached
+  if (!menuCache[anchor]) {
+    try {
+      menuCache[anchor] = await fetchMenu(anchor);
+    } catch(e) {
+      document.getElementById('pickerBody').innerHTML = '<div class="profile-empty"><div class="profile-empty-icon">😕</div><div>Couldn\'t load menu — try again</div></div>';
+      return;
+    }
+  }
+  const menu = menuCache[anchor];
+  let html = '';
+  {
+    const buildSection = (items, label) => {
+      if (!items.length) return '';
+      let s = `<div class="picker-section-label">${label}</div><div class="picker-grid">`;
+      s += items.map(item => {
+        const isCurrent = String(item.id) === currentMealId;
+        return `<div class="picker-meal-card">
+          <div class="picker-thumb"><img src="${item.image||''}" referrerpolicy="no-referrer" onerror="this.style.display='none'"></div>
+          <div>
+            <div class="picker-meal-name">${item.name}</div>
+            <div class="picker-meal-diet">${item.diet==='veg'||item.diet==='vegan'?'🌱 Plant-Based':'🥩 Meat'}</div>
+          </div>
+          <button class="picker-select-btn ${isCurrent?'current':'available'}"
+            ${isCurrent?'disabled':'onclick="pickMeal('+JSON.stringify(item).replace(/"/g,"'")+')"'}>
+            ${isCurrent?'Current':'Select'}
+          </button>
+        </div>`;
+      }).join('');
+      s += '</div>';
+      return s;
+    };
+    html = buildSection(menu.meat||[], '🥩 Meat & Omnivore') + buildSection(menu.vegan||[], '🌱 Plant-Based');
+  }
+  document.getElementById('pickerBody').innerHTML = html ||
+    '<div class="profile-empty"><div class="profile-empty-icon">🗓️</div><div>Menu not available yet for this week — check back soon</div></div>';
+}
+function closeMealPicker() { document.getElementById('mealPickerOverlay').classList.add('hidden'); _pickerSlotIdx = null; }
+
+async function pickMeal(newMeal) {
+  if (_pickerSlotIdx === null || !_swapKey) return;
+  const data = _orderCache[_swapKey]; if (!data) return;
+  const { meals, anchor } = data;
+  const slotIdx = _pickerSlotIdx;
+  const oldMeal = { ...meals[slotIdx] };
+  closeMealPicker();
+  // Optimistic update — show new meal instantly
+  meals[slotIdx] = { ...oldMeal, MealID: String(newMeal.id), DishName: newMeal.name||'', DietType: newMeal.diet||'' };
+  renderSwapBody(meals, anchor);
+  document.getElementById('swapSavingOverlay').classList.remove('hidden');
+  try {
+    const res = await apiFetch({
+      action: 'swap_order_meal',
+      order_id: String(_swapKey),
+      old_meal_id: String(oldMeal.MealID),
+      new_meal_id: String(newMeal.id),
+      new_dish_name: newMeal.name || '',
+      new_diet_type: newMeal.diet || '',
+      email: currentEmployee.email
+    });
+    document.getElementById('swapSavingOverlay').classList.add('hidden');
+    if (res.success) {
+      showToast(`Swapped to ${newMeal.name||'new meal'} ✓`, 'warn');
+    } else {
+      meals[slotIdx] = oldMeal; // revert
+      renderSwapBody(meals, anchor);
+      showToast('Swap failed — please try again');
+    }
+  } catch(e) {
+    document.getElementById('swapSavingOverlay').classList.add('hidden');
+    meals[slotIdx] = oldMeal; // revert
+    renderSwapBody(meals, anchor);
+    showToast('Swap failed — please try again');
+  }
+}
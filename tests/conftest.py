@@ -0,0 +1,50 @@
+"""Runs the app against gas_emulator and a throwaway local store.
+
+The environment has to be set before app is imported: it reads
+GOOGLE_SCRIPT_URL and LOCAL_DB_PATH at import time.
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gas_emulator
+
+_tmp = tempfile.mkdtemp(prefix='betterday-tests-')
+os.environ['LOCAL_DB_PATH']        = os.path.join(_tmp, 'local.db')
+os.environ['REPLICA_SYNC_SECONDS'] = '0'
+
+_hub = gas_emulator.Hub(companies=3, weeks=2)
+_server, _emulator = gas_emulator.serve(port=0, hub=_hub)
+os.environ['GOOGLE_SCRIPT_URL'] = f'http://127.0.0.1:{_server.server_port}/exec'
+
+import app as betterday   # noqa: E402  (needs the environment above)
+
+# No warm-up threads: tests drive refreshes and journal flushes themselves.
+betterday._warmup_done = True
+
+
+@pytest.fixture
+def app_module():
+    return betterday
+
+
+@pytest.fixture
+def hub():
+    return _hub
+
+
+@pytest.fixture
+def emulator():
+    return _emulator
+
+
+@pytest.fixture
+def admin_client():
+    client = betterday.app.test_client()
+    with client.session_transaction() as s:
+        s['admin_logged_in'] = True
+    return client
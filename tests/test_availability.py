@@ -0,0 +1,52 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+DAY = '2031-06-04'
+
+
+def _blocked(app_module):
+    return app_module.availability()[1]
+
+
+def test_toggle_updates_index_without_a_reload(app_module, admin_client, hub):
+    app_module.reconcile_availability()
+    reconciles = app_module._availability_stats['reconciles']
+
+    assert admin_client.post('/toggle-date', data={'date': DAY}).status_code == 200
+    assert DAY in _blocked(app_module)
+    assert [DAY] in hub.blocked
+
+    admin_client.post('/toggle-date', data={'date': DAY})
+    assert DAY not in _blocked(app_module)
+    assert app_module._availability_stats['reconciles'] == reconciles
+
+
+@pytest.fixture
+def error_page_url():
+    """A GAS stand-in that answers every call with an HTML error page."""
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get('Content-Length') or 0))
+            self.send_response(502)
+            self.send_header('Content-Type', 'text/html')
+            self.end_headers()
+            self.wfile.write(b'<html>Bad Gateway</html>')
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_port}/exec'
+    server.shutdown()
+
+
+def test_unconfirmed_write_leaves_index_alone(app_module, admin_client, error_page_url, monkeypatch):
+    app_module.reconcile_availability()
+    before = _blocked(app_module)
+
+    monkeypatch.setattr(app_module, 'GOOGLE_SCRIPT_URL', error_page_url)
+    admin_client.post('/toggle-date', data={'date': DAY})
+    assert _blocked(app_module) == before
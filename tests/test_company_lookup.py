@@ -0,0 +1,46 @@
+def test_company_saved_after_warmup_is_found(app_module, admin_client):
+    assert app_module._refresh_all_companies()   # warm company table
+    assert admin_client.get('/api/company/SAVED1').get_json()['found'] is False
+
+    r = admin_client.post('/work/company/SAVED1',
+                          data={'CompanyID': 'SAVED1', 'CompanyName': 'Saved Later'})
+    assert r.status_code == 200
+
+    data = admin_client.get('/api/company/SAVED1').get_json()
+    assert data['found'] is True
+    assert data['company']['CompanyName'] == 'Saved Later'
+
+
+def test_unknown_company_is_not_found(app_module, admin_client):
+    assert app_module._refresh_all_companies()
+    r = admin_client.get('/api/company/NOSUCHCO')
+    assert r.status_code == 200
+    assert r.get_json()['found'] is False
+
+
+def test_unknown_code_on_a_warm_table_skips_gas(app_module, admin_client, emulator):
+    assert app_module._refresh_all_companies()
+    calls = emulator.stats()['by_action'].get('get_company', 0)
+    for code in ('TYPO1', 'TYPO12', 'TYPO123'):
+        assert admin_client.get(f'/api/company/{code}').get_json()['found'] is False
+    assert emulator.stats()['by_action'].get('get_company', 0) == calls
+
+
+def test_saved_company_is_searchable_at_once(app_module, admin_client):
+    assert app_module._refresh_all_companies()
+    admin_client.post('/work/company/ZEPHYR', data={'CompanyID': 'ZEPHYR', 'CompanyName': 'Zephyr Labs'})
+
+    r = admin_client.get('/api/companies/search?q=labs').get_json()
+    assert r['complete'] is True
+    assert {'CompanyID': 'ZEPHYR', 'CompanyName': 'Zephyr Labs'} in r['results']
+    with app_module._company_cache_lock:
+        index = list(app_module._company_index)
+    app_module._rebuild_company_index()
+    assert index == app_module._company_index
+
+
+def test_lookup_hit_moves_entry_to_the_end(app_module, admin_client):
+    assert app_module._refresh_all_companies()
+    first = next(iter(app_module._company_cache))
+    admin_client.get(f'/api/company/{first}')
+    assert next(reversed(app_module._company_cache)) == first
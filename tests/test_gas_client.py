@@ -0,0 +1,59 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+
+@pytest.fixture
+def slow_url():
+    """A GAS stand-in that takes 3 s to answer anything."""
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get('Content-Length') or 0))
+            time.sleep(3)
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.end_headers()
+            self.wfile.write(b'{}')
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_port}/exec'
+    server.shutdown()
+
+
+def test_table_timeout_is_the_default(app_module):
+    assert app_module._gas_timeout('get_all_companies') == app_module._GAS_TIMEOUTS['get_all_companies']
+    assert app_module._gas_timeout('get_all_companies', 5) == 5
+    assert app_module._gas_timeout('no_such_action') == app_module._GAS_TIMEOUT_DEFAULT
+
+
+def test_cap_bounds_a_tabled_read_and_its_retries(app_module, slow_url, monkeypatch):
+    monkeypatch.setattr(app_module, 'GOOGLE_SCRIPT_URL', slow_url)
+    started = time.monotonic()
+    with pytest.raises(requests.Timeout):
+        app_module._gas_fetch({'action': 'get_all_companies'}, cap=0.6)
+    assert time.monotonic() - started < 1.5
+
+
+def test_single_call_fallback_keeps_to_the_request_deadline(app_module, slow_url, monkeypatch):
+    monkeypatch.setattr(app_module, 'GOOGLE_SCRIPT_URL', slow_url)
+    monkeypatch.setattr(app_module, '_REQUEST_DEADLINE', 1.0)
+    with app_module.app.test_request_context('/'):
+        started = time.monotonic()
+        assert app_module._gas_batch([{'action': 'get_corporate_orders'}]) == [None]
+    assert time.monotonic() - started < 2
+
+
+def test_read_classification_covers_batches(app_module):
+    reads  = {'action': 'batch', 'calls': [{'action': 'get_menu'}, {'action': 'get_bookings'}]}
+    mixed  = {'action': 'batch', 'calls': [{'action': 'get_menu'}, {'action': 'save_company'}]}
+    assert app_module._gas_is_read(reads, 'POST')
+    assert not app_module._gas_is_read(mixed, 'POST')
+    assert app_module._gas_is_read({'action': 'save_company'}, 'GET')
@@ -0,0 +1,14 @@
+def test_refresh_reloads_a_sheet_edited_menu(app_module, hub):
+    anchor = sorted(hub.schedule)[0]
+    app_module._load_menus([anchor])
+    assert app_module.week_menu(anchor)['data']['meat']
+
+    # Edited straight in the sheet: no save_menu_state, so nothing invalidates.
+    meat, vegan = hub.schedule[anchor]
+    hub.schedule[anchor] = (meat[:1], vegan)
+    try:
+        app_module._load_menus([anchor], fresh=True)
+        assert len(app_module.week_menu(anchor)['data']['meat']) == 1
+    finally:
+        hub.schedule[anchor] = (meat, vegan)
+        app_module._load_menus([anchor], fresh=True)
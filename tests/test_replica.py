@@ -0,0 +1,63 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+ROWS = [{'school': 'Tag School', 'date': '2031-06-04', 'meal_id': '#101', 'dish_name': 'Dish 101',
+         'diet': 'Meat'}]
+
+
+@pytest.fixture
+def orders_url():
+    """get_all_orders stand-in; tag_full / tag_incremental choose which reads
+    carry the _row tag."""
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)))
+            full = not payload.get('since_row')
+            tagged = Handler.tag_full if full else Handler.tag_incremental
+            rows = [dict(r, **({'_row': n} if tagged else {})) for n, r in enumerate(ROWS, 2)]
+            body = json.dumps({'rows': rows,
+                               'next_row': (payload.get('since_row') or 0) + len(ROWS) + 2}).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield Handler, f'http://127.0.0.1:{server.server_port}/exec'
+    server.shutdown()
+
+
+def _rows(app_module):
+    return app_module._local_db().execute(
+        "SELECT row_num, data FROM replica_rows WHERE sheet = 'teacher_orders' ORDER BY row_num").fetchall()
+
+
+def test_untagged_rows_fall_back_to_a_full_sync(app_module, orders_url, monkeypatch):
+    handler, url = orders_url
+    handler.tag_full, handler.tag_incremental = True, False
+    app_module._replica_sync('teacher_orders', full=True)   # cursor from the emulator
+    monkeypatch.setattr(app_module, 'GOOGLE_SCRIPT_URL', url)
+    try:
+        app_module._replica_sync('teacher_orders')
+        assert [r['row_num'] for r in _rows(app_module)] == [2]
+    finally:
+        monkeypatch.undo()
+        app_module._replica_sync('teacher_orders', full=True)
+
+
+def test_untagged_full_read_is_skipped(app_module, orders_url, monkeypatch):
+    handler, url = orders_url
+    handler.tag_full = handler.tag_incremental = False
+    app_module._replica_sync('teacher_orders', full=True)
+    before = [tuple(r) for r in _rows(app_module)]
+    monkeypatch.setattr(app_module, 'GOOGLE_SCRIPT_URL', url)
+    with pytest.raises(ValueError):
+        app_module._replica_sync('teacher_orders')
+    assert [tuple(r) for r in _rows(app_module)] == before
@@ -0,0 +1,40 @@
+def _order(email):
+    return {'action': 'submit_corporate_order', 'company_id': 'CO001', 'company_name': 'Co 1',
+            'delivery_date': '2026-10-22', 'sunday_anchor': '2026-10-18',
+            'employee_name': 'Journal Test', 'employee_email': email, 'meal_id': '#101',
+            'dish_name': 'Dish 101', 'tier': 'Tier1', 'employee_price': '0.00',
+            'company_coverage': '12.00', 'bd_coverage': '0.00'}
+
+
+def _rows_for(hub, email):
+    return [r for r in hub.corp[1:] if r[6] == email]
+
+
+def test_duplicate_key_is_journaled_once(app_module, hub):
+    email = 'dup-key@co001.example.com'
+    duplicates = app_module._submission_stats['duplicates']
+
+    key, created = app_module.enqueue_submission(_order(email), 'dup-key-1')
+    assert (key, created) == ('dup-key-1', True)
+    assert app_module.enqueue_submission(_order(email), 'dup-key-1') == ('dup-key-1', False)
+    assert app_module._submission_stats['duplicates'] == duplicates + 1
+
+    app_module.flush_submissions()
+    assert len(_rows_for(hub, email)) == 1
+
+
+def test_resent_entry_is_applied_once(app_module, hub):
+    # GAS applied the write but the reply was lost: the retry carries the same
+    # key, so the script answers "duplicate" instead of appending again.
+    email = 'resent@co001.example.com'
+    app_module.enqueue_submission(_order(email), 'resent-1')
+    app_module.flush_submissions()
+    app_module._local_db().execute(
+        "UPDATE submissions SET status = 'pending', next_attempt = 0 WHERE idem_key = ?",
+        ('resent-1',))
+    app_module.flush_submissions()
+
+    assert len(_rows_for(hub, email)) == 1
+    status = app_module._local_db().execute(
+        'SELECT status FROM submissions WHERE idem_key = ?', ('resent-1',)).fetchone()[0]
+    assert status == 'sent'
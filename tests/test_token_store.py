@@ -0,0 +1,19 @@
+import time
+
+import pytest
+
+
+@pytest.mark.parametrize('backend', ['memory', 'sqlite'])
+def test_store_is_capped(app_module, monkeypatch, backend):
+    monkeypatch.setattr(app_module, '_TOKEN_BACKEND', backend)
+    monkeypatch.setattr(app_module, '_TOKEN_MAX', 3)
+    monkeypatch.setattr(app_module, '_token_store', {})
+    app_module._local_db().execute('DELETE FROM magic_tokens')
+    # A sweep just ran: only the cap can trigger the next one.
+    monkeypatch.setattr(app_module, '_token_last_sweep', time.time())
+
+    for n in range(6):
+        app_module._store_magic_token(f'{backend}-{n}', 'cap@co001.example.com', 'CO001')
+    assert app_module.token_store_status()['tokens'] <= 3
+    assert app_module._verify_magic_token_flask(f'{backend}-5') == ('cap@co001.example.com', 'CO001')
+    assert app_module._verify_magic_token_flask(f'{backend}-0') is None